@@ -74,6 +74,14 @@ def example_full_text_search():
         print(f"  Found {len(results)} matches:")
         for ep in results:
             print(f"  - {ep['title']} ({ep['show_name']}, {ep['date']})")
+            print(f"    ...{ep['snippet']}...")
+    
+    # Facet counts for the whole result set, alongside the top hits
+    search = metadata_mgr.faceted_search("climate", limit=3)
+    print(f"\n'climate' matched {search['total']} episodes")
+    for facet in ('show', 'year', 'guest'):
+        counts = ', '.join(f"{f['value']} ({f['count']})" for f in search['facets'][facet])
+        print(f"  By {facet}: {counts}")
 
 
 def example_load_full_json():
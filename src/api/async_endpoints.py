@@ -10,7 +10,7 @@ from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Query
 from typing import Optional, List
 from pydantic import BaseModel, Field
 
-from ..core.job_queue import get_job_queue, JobStatus
+from ..core.job_queue import get_job_queue, configure_persistent_job_queue, JobStatus, JobWorker, Job
 from ..core.models import ProcessingStage
 from ..core import get_logger
 
@@ -18,6 +18,9 @@ logger = get_logger('pipeline.api.async')
 
 router = APIRouter(prefix="/async", tags=["async"])
 
+# Worker draining the durable queue; while it runs it is the only executor of submitted jobs
+_job_worker: Optional[JobWorker] = None
+
 
 # Request/Response Models
 class AsyncProcessRequest(BaseModel):
@@ -76,8 +79,9 @@ async def process_episode_job(job_id: str, episode_id: str, target_stage: str, f
     job_queue = get_job_queue()
     
     try:
-        # Mark job as running
-        job_queue.mark_job_running(job_id)
+        # Mark job as running (another worker may have claimed it already)
+        if not job_queue.mark_job_running(job_id):
+            return
         
         # Get orchestrator
         from .server import _server_instance
@@ -147,8 +151,9 @@ async def render_clips_job(
     job_queue = get_job_queue()
     
     try:
-        # Mark job as running
-        job_queue.mark_job_running(job_id)
+        # Mark job as running (another worker may have claimed it already)
+        if not job_queue.mark_job_running(job_id):
+            return
         
         # Get orchestrator
         from .server import _server_instance
@@ -247,16 +252,17 @@ async def process_episode_async(
                 'target_stage': request.target_stage,
                 'force_reprocess': request.force_reprocess
             },
-            webhook_url=request.webhook_url
+            webhook_url=request.webhook_url,
+            **_retry_options(orchestrator)
         )
         
-        # Start background processing in a separate thread
-        import threading
-        thread = threading.Thread(
-            target=lambda: asyncio.run(process_episode_job(job_id, episode_id, request.target_stage, request.force_reprocess)),
-            daemon=True
-        )
-        thread.start()
+        # The durable job worker claims the job; run it directly only without one
+        if _job_worker is None:
+            thread = threading.Thread(
+                target=lambda: asyncio.run(process_episode_job(job_id, episode_id, request.target_stage, request.force_reprocess)),
+                daemon=True
+            )
+            thread.start()
         
         logger.info(f"Async processing started for episode {episode_id}, job_id: {job_id}")
         
@@ -304,16 +310,17 @@ async def render_clips_async(
             webhook_url=request.webhook_url
         )
         
-        # Start background rendering
-        background_tasks.add_task(
-            render_clips_job,
-            job_id,
-            episode_id,
-            request.clip_ids,
-            request.variants,
-            request.aspect_ratios,
-            request.force_rerender
-        )
+        # The durable job worker claims the job; run it directly only without one
+        if _job_worker is None:
+            background_tasks.add_task(
+                render_clips_job,
+                job_id,
+                episode_id,
+                request.clip_ids,
+                request.variants,
+                request.aspect_ratios,
+                request.force_rerender
+            )
         
         logger.info(f"Async clip rendering started for episode {episode_id}, job_id: {job_id}")
         
@@ -400,6 +407,59 @@ async def get_queue_stats():
     return job_queue.get_queue_stats()
 
 
+def _retry_options(orchestrator) -> dict:
+    """Retry settings for resumable jobs when the durable queue is active"""
+    from ..core.job_queue import PersistentJobQueue
+    
+    if not isinstance(get_job_queue(), PersistentJobQueue):
+        return {}
+    return {'max_attempts': max(1, orchestrator.config.processing.max_retry_attempts)}
+
+
+async def _run_process_episode_job(job: Job) -> None:
+    """Job worker handler for queued process_episode jobs"""
+    await process_episode_job(job.job_id, **job.parameters)
+
+
+async def _run_render_clips_job(job: Job) -> None:
+    """Job worker handler for queued render_clips jobs"""
+    await render_clips_job(job.job_id, **job.parameters)
+
+
+def start_job_worker(db_manager, config) -> JobWorker:
+    """
+    Switch the API to the durable job queue and start draining it
+    
+    Jobs queued before a restart, requeued after a lease expiry or waiting
+    on retry backoff are picked up by this worker. Once it is started,
+    newly submitted jobs are run only by this worker, which heartbeats
+    their lease for the whole run.
+    """
+    global _job_worker
+    
+    job_queue = configure_persistent_job_queue(
+        db_manager,
+        max_workers=config.processing.max_concurrent_episodes,
+        retry_base_delay=config.processing.retry_delay_seconds
+    )
+    worker = JobWorker(job_queue, {
+        'process_episode': _run_process_episode_job,
+        'render_clips': _run_render_clips_job
+    })
+    worker.start()
+    _job_worker = worker
+    return worker
+
+
+def stop_job_worker() -> None:
+    """Stop the durable job worker started by start_job_worker"""
+    global _job_worker
+    
+    if _job_worker is not None:
+        _job_worker.stop()
+        _job_worker = None
+
+
 def register_async_endpoints(app):
     """Register async endpoints with FastAPI app"""
     app.include_router(router)
@@ -188,8 +188,7 @@ def register_clip_endpoints(app: FastAPI):
             )
             
             # Register clips in database
-            for clip in clips:
-                clip_registry.register_clip(clip)
+            clip_registry.register_clips_bulk(clips)
             
             # Convert to API format
             clip_metadata = [_convert_clip_to_metadata(clip) for clip in clips]
@@ -328,8 +327,7 @@ def register_clip_endpoints(app: FastAPI):
             )
             
             # Register assets in database
-            for asset in assets:
-                clip_registry.register_asset(asset)
+            clip_registry.register_assets_bulk(assets)
             
             # Update clip status to rendered
             clip_registry.update_clip_status(clip_id, ClipStatus.RENDERED)
@@ -528,8 +526,7 @@ def register_clip_endpoints(app: FastAPI):
                     )
                     
                     # Register assets in database
-                    for asset in assets:
-                        clip_registry.register_asset(asset)
+                    clip_registry.register_assets_bulk(assets)
                     
                     # Update clip status to rendered
                     clip_registry.update_clip_status(clip.id, ClipStatus.RENDERED)
@@ -8,10 +8,11 @@ and webhook handlers for workflow integration.
 import asyncio
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Query
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Query, Response
 from fastapi.responses import JSONResponse
 
 from ..core.models import ProcessingStage
+from ..core.exceptions import ValidationError
 from .models import (
     ProcessEpisodeRequest,
     ProcessBatchRequest,
@@ -236,7 +237,8 @@ def register_endpoints(app: FastAPI):
                 processed=stats.processed,
                 failed=stats.failed,
                 success_rate=stats.success_rate,
-                duration=stats.duration
+                duration=stats.duration,
+                resource_pools=stats.resource_pools
             )
             
         except Exception as e:
@@ -262,17 +264,41 @@ def register_endpoints(app: FastAPI):
     
     @app.get("/episodes", response_model=List[EpisodeStatusResponse])
     async def list_episodes(
+        response: Response,
         stage: Optional[str] = Query(None, description="Filter by processing stage"),
-        limit: int = Query(20, description="Maximum number of episodes to return"),
+        limit: int = Query(20, ge=1, le=1000, description="Maximum number of episodes to return"),
+        show: Optional[str] = Query(None, description="Filter by show name"),
+        created_after: Optional[datetime] = Query(None, description="Only episodes created at or after this time"),
+        created_before: Optional[datetime] = Query(None, description="Only episodes created before this time"),
+        order_by: str = Query("updated_at", description="Sort by updated_at or created_at (newest first)"),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
         orchestrator = Depends(get_orchestrator)
     ):
-        """List episodes with optional filtering"""
+        """
+        List episodes with optional filtering
+        
+        Results are paged by cursor: when more episodes match, the
+        X-Next-Cursor response header holds the cursor of the next page.
+        """
         try:
             stage_filter = ProcessingStage(stage) if stage else None
-            episodes = orchestrator.list_episodes(stage_filter, limit)
+            episodes, next_cursor = orchestrator.list_episodes_page(
+                stage_filter=stage_filter,
+                limit=limit,
+                show=show,
+                created_after=created_after,
+                created_before=created_before,
+                order_by=order_by,
+                cursor=cursor
+            )
+            
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
             
             return [EpisodeStatusResponse(**episode) for episode in episodes]
             
+        except (ValueError, ValidationError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             logger.error(f"Error listing episodes: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -102,6 +102,7 @@ class PipelineStatsResponse(BaseModel):
     failed: int
     success_rate: float
     duration: float
+    resource_pools: Dict[str, Dict[str, Any]] = Field(default_factory=dict, description="Per-resource-class queue depth and utilisation")
 
 
 class ConfigurationResponse(BaseModel):
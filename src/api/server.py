@@ -25,6 +25,7 @@ class APIServer:
         self.config_path = config_path
         self.orchestrator: Optional[PipelineOrchestrator] = None
         self.app: Optional[FastAPI] = None
+        self.job_worker = None
     
     async def startup(self):
         """Initialize pipeline orchestrator on startup"""
@@ -39,6 +40,15 @@ class APIServer:
             # Verify SQLite configuration
             self._verify_sqlite_config()
             
+            # Move async jobs to the durable queue and resume pending ones
+            from .async_endpoints import start_job_worker
+            self.job_worker = start_job_worker(self.orchestrator.registry.db_manager, self.orchestrator.config)
+            logger.info("Durable job queue initialized")
+            
+            if self.orchestrator.config.discovery.watch:
+                self.orchestrator.start_discovery_watcher()
+                logger.info("Discovery watcher started")
+            
         except Exception as e:
             logger.error(f"Failed to initialize pipeline orchestrator: {e}")
             raise
@@ -47,15 +57,14 @@ class APIServer:
         """Verify SQLite is configured correctly for concurrency"""
         try:
             db_manager = self.orchestrator.registry.db_manager
-            conn = db_manager.connection.get_connection()
-            
-            # Check journal mode
-            cursor = conn.execute("PRAGMA journal_mode")
-            journal_mode = cursor.fetchone()[0]
-            
-            # Check busy timeout
-            cursor = conn.execute("PRAGMA busy_timeout")
-            busy_timeout = cursor.fetchone()[0]
+            with db_manager.connection.reader() as conn:
+                # Check journal mode
+                cursor = conn.execute("PRAGMA journal_mode")
+                journal_mode = cursor.fetchone()[0]
+                
+                # Check busy timeout
+                cursor = conn.execute("PRAGMA busy_timeout")
+                busy_timeout = cursor.fetchone()[0]
             
             logger.info("SQLite configuration verified",
                        journal_mode=journal_mode,
@@ -74,6 +83,11 @@ class APIServer:
     
     async def shutdown(self):
         """Cleanup on shutdown"""
+        if self.job_worker:
+            from .async_endpoints import stop_job_worker
+            stop_job_worker()
+            self.job_worker = None
+        
         if self.orchestrator:
             self.orchestrator.request_shutdown()
             logger.info("Pipeline orchestrator shutdown requested")
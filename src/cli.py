@@ -176,7 +176,8 @@ async def recover_command(args) -> int:
         print(f"Errors: {status['errors'] or 'None'}")
         
         if args.clear_errors:
-            # Clear errors (would implement in registry)
+            # Clear errors and claim attempts so workers pick the episode up again
+            orchestrator.get_registry().reset_episode_claims(args.episode_id)
             print("✓ Errors cleared")
         
         if args.from_stage:
@@ -320,6 +321,91 @@ async def process_command(args) -> int:
         return 1
 
 
+async def worker_command(args) -> int:
+    """Run as a headless worker claiming episodes from the shared registry"""
+    import signal
+    from src.core.episode_worker import EpisodeWorker
+    
+    try:
+        orchestrator = PipelineOrchestrator(config_path=args.config)
+        target_stage = ProcessingStage(args.stage) if args.stage else ProcessingStage.RENDERED
+        
+        worker = EpisodeWorker(
+            orchestrator,
+            target_stage=target_stage,
+            worker_id=args.worker_id,
+            concurrency=args.concurrency
+        )
+        
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, worker.request_stop)
+            except (NotImplementedError, RuntimeError):
+                pass  # Signal handlers unavailable (e.g. Windows); Ctrl+C still interrupts
+        
+        print(f"Worker {worker.worker_id} processing episodes to stage: {target_stage.value}")
+        
+        stats = await worker.run(max_episodes=args.max_episodes, exit_when_idle=args.exit_when_idle)
+        
+        print(f"\nWorker Results:")
+        print(f"  Claimed: {stats.claimed}")
+        print(f"  Processed: {stats.processed}")
+        print(f"  Failed: {stats.failed}")
+        
+        return 0 if stats.failed == 0 else 1
+        
+    except Exception as e:
+        print(f"✗ Worker error: {e}")
+        return 1
+
+
+async def model_server_command(args) -> int:
+    """Run the persistent model server"""
+    import signal
+    from src.core.model_server import ModelServer
+    
+    try:
+        config = ConfigurationManager(args.config).load_config()
+        settings = config.model_server
+        
+        server = ModelServer(
+            socket_path=args.socket or settings.socket_path,
+            memory_budget_mb=args.memory_budget_mb or settings.memory_budget_mb,
+            idle_unload_seconds=settings.idle_unload_seconds,
+            batch_window_ms=settings.embed_batch_window_ms,
+            max_batch_size=settings.max_embed_batch
+        )
+        await server.start()
+        
+        if args.preload:
+            # Warm the models the pipeline asks for first
+            await server.handle_request({'op': 'load', 'kind': 'whisper', 'model': {'name': config.models.whisper}})
+            await server.handle_request({
+                'op': 'load', 'kind': 'sentence_transformer',
+                'model': {'name': config.clip_generation.embedding_model}
+            })
+        
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop_event.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+        
+        print(f"Model server listening on {server.socket_path}")
+        print("Press Ctrl+C to stop")
+        
+        await stop_event.wait()
+        await server.stop()
+        return 0
+        
+    except Exception as e:
+        print(f"✗ Model server error: {e}")
+        return 1
+
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -393,6 +479,53 @@ def main():
         help='Show progress monitoring during processing'
     )
     
+    # Worker command
+    worker_parser = subparsers.add_parser('worker', help='Run as a headless worker sharing the registry with other nodes')
+    worker_parser.add_argument(
+        '--stage',
+        type=str,
+        choices=[stage.value for stage in ProcessingStage],
+        help='Target processing stage (default: rendered)'
+    )
+    worker_parser.add_argument(
+        '--worker-id',
+        type=str,
+        help='Lease owner identifier (default: host:pid)'
+    )
+    worker_parser.add_argument(
+        '--concurrency',
+        type=int,
+        help='Episodes processed at once on this node (default: max_concurrent_episodes)'
+    )
+    worker_parser.add_argument(
+        '--max-episodes',
+        type=int,
+        help='Exit after claiming this many episodes'
+    )
+    worker_parser.add_argument(
+        '--exit-when-idle',
+        action='store_true',
+        help='Exit once no episode is claimable instead of polling'
+    )
+    
+    # Model server command
+    model_server_parser = subparsers.add_parser('model-server', help='Run the persistent model server for pipeline workers')
+    model_server_parser.add_argument(
+        '--socket',
+        type=str,
+        help='Unix socket path (default: model_server.socket_path)'
+    )
+    model_server_parser.add_argument(
+        '--memory-budget-mb',
+        type=int,
+        help='Resident model memory before LRU unloading (default: model_server.memory_budget_mb)'
+    )
+    model_server_parser.add_argument(
+        '--preload',
+        action='store_true',
+        help='Load the configured Whisper and embedding models at start-up'
+    )
+    
     # Health command
     health_parser = subparsers.add_parser('health', help='Show system health and metrics')
     health_parser.add_argument(
@@ -492,6 +625,10 @@ def main():
             return asyncio.run(status_command(args))
         elif args.command == 'process':
             return asyncio.run(process_command(args))
+        elif args.command == 'worker':
+            return asyncio.run(worker_command(args))
+        elif args.command == 'model-server':
+            return asyncio.run(model_server_command(args))
         elif args.command == 'health':
             return asyncio.run(health_command(args))
         elif args.command == 'list':
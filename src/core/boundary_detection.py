@@ -0,0 +1,208 @@
+"""
+Topic Boundary Detection
+
+Kernel change-point detection over sentence embeddings for topic
+segmentation. Segment costs are evaluated from cumulative sums of the
+normalised embeddings, so detection needs memory linear in the number of
+sentences and never materialises an N x N distance or kernel matrix.
+"""
+
+import heapq
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .logging import get_logger
+
+logger = get_logger('clip_generation.boundary_detection')
+
+
+@dataclass
+class BoundaryResult:
+    """Topic boundaries together with the engine that produced them"""
+    boundaries: List[int]
+    engine: str
+    penalty: Optional[float] = None
+
+    @property
+    def segment_count(self) -> int:
+        """Number of segments described by the boundaries"""
+        return len(self.boundaries) + 1
+
+
+class KernelChangePointDetector:
+    """
+    Cosine-kernel change-point detection with cached cost sums
+
+    The cost of a segment is its within-segment scatter under the cosine
+    (normalised linear) kernel, ``len - ||sum of vectors||^2 / len``, which is
+    O(d) to evaluate from prefix sums. A single greedy binary segmentation
+    pass builds a nested solution path: the first k splits give the
+    segmentation with k + 1 segments and the gain of each split is the
+    penalty at which it enters, so every segment count is available without
+    re-running detection per penalty.
+    """
+
+    def __init__(self, min_size: int = 2, refine_passes: int = 2):
+        """
+        Initialize detector
+
+        Args:
+            min_size: Minimum number of sentences per segment
+            refine_passes: Local boundary refinement passes after the path search
+        """
+        self.min_size = max(1, min_size)
+        self.refine_passes = refine_passes
+        self._sums: Optional[np.ndarray] = None
+        self._sq_sums: Optional[np.ndarray] = None
+        self._path: List[Tuple[int, float]] = []
+
+    @property
+    def n_samples(self) -> int:
+        """Number of fitted sentences"""
+        return 0 if self._sums is None else self._sums.shape[0] - 1
+
+    def fit(self, embeddings: np.ndarray, max_segments: Optional[int] = None) -> 'KernelChangePointDetector':
+        """
+        Cache cumulative sums for the embeddings and compute the solution path
+
+        Args:
+            embeddings: Sentence embeddings array (n_sentences, embedding_dim)
+            max_segments: Stop the path at this many segments (default: full path)
+
+        Returns:
+            The fitted detector
+        """
+        signal = np.asarray(embeddings, dtype=np.float64)
+        if signal.ndim != 2:
+            raise ValueError("embeddings must be a 2-D array")
+
+        norms = np.linalg.norm(signal, axis=1, keepdims=True)
+        signal = signal / np.where(norms > 0, norms, 1.0)
+
+        n, dim = signal.shape
+        self._sums = np.zeros((n + 1, dim))
+        np.cumsum(signal, axis=0, out=self._sums[1:])
+        self._sq_sums = np.zeros(n + 1)
+        np.cumsum(np.einsum('ij,ij->i', signal, signal), out=self._sq_sums[1:])
+
+        self._path = self._solution_path(max_segments)
+        return self
+
+    def cost(self, start: int, end: int) -> float:
+        """Within-segment scatter of sentences [start, end)"""
+        length = end - start
+        if length <= 0:
+            return 0.0
+        total = self._sums[end] - self._sums[start]
+        return float(self._sq_sums[end] - self._sq_sums[start] - total.dot(total) / length)
+
+    def penalty_path(self) -> List[float]:
+        """Gain of each split in path order (the penalty breakpoints)"""
+        return [gain for _, gain in self._path]
+
+    def predict(self, n_segments: int) -> List[int]:
+        """
+        Boundaries for the requested number of segments
+
+        Args:
+            n_segments: Number of segments; capped at the longest path available
+
+        Returns:
+            Sorted boundary indices (sentence indices where segments end)
+        """
+        splits = max(0, min(n_segments - 1, len(self._path)))
+        boundaries = sorted(index for index, _ in self._path[:splits])
+        for _ in range(self.refine_passes):
+            if not self._refine(boundaries):
+                break
+        return boundaries
+
+    def penalty_for(self, n_segments: int) -> Optional[float]:
+        """Penalty at which the path yields the requested number of segments"""
+        splits = min(n_segments - 1, len(self._path))
+        if splits <= 0:
+            return None
+        return self._path[splits - 1][1]
+
+    def _best_split(self, start: int, end: int) -> Optional[Tuple[float, int]]:
+        """Best single split of [start, end) as (gain, index), if one is allowed"""
+        lo, hi = start + self.min_size, end - self.min_size
+        if lo > hi:
+            return None
+
+        candidates = np.arange(lo, hi + 1)
+        left = self._sums[candidates] - self._sums[start]
+        right = self._sums[end] - self._sums[candidates]
+        total = self._sums[end] - self._sums[start]
+
+        gains = (np.einsum('ij,ij->i', left, left) / (candidates - start)
+                 + np.einsum('ij,ij->i', right, right) / (end - candidates)
+                 - total.dot(total) / (end - start))
+        best = int(np.argmax(gains))
+        return float(gains[best]), int(candidates[best])
+
+    def _solution_path(self, max_segments: Optional[int]) -> List[Tuple[int, float]]:
+        """Greedy binary segmentation over the whole sequence"""
+        max_splits = self.n_samples if max_segments is None else max_segments - 1
+        heap = []
+
+        def push(start: int, end: int) -> None:
+            split = self._best_split(start, end)
+            if split is not None:
+                heapq.heappush(heap, (-split[0], split[1], start, end))
+
+        push(0, self.n_samples)
+        path = []
+        while heap and len(path) < max_splits:
+            neg_gain, index, start, end = heapq.heappop(heap)
+            path.append((index, -neg_gain))
+            push(start, index)
+            push(index, end)
+        return path
+
+    def _refine(self, boundaries: List[int]) -> bool:
+        """Move each boundary to its best position between its neighbours"""
+        moved = False
+        edges = [0] + boundaries + [self.n_samples]
+        for i in range(1, len(edges) - 1):
+            split = self._best_split(edges[i - 1], edges[i + 1])
+            if split is not None and split[1] != edges[i]:
+                edges[i] = split[1]
+                moved = True
+        boundaries[:] = edges[1:-1]
+        return moved
+
+
+def detect_kernel_boundaries(embeddings: np.ndarray,
+                             target_segments: int,
+                             min_segments: int = 6,
+                             max_segments: int = 20,
+                             min_size: int = 2) -> BoundaryResult:
+    """
+    Detect topic boundaries with the cosine-kernel change-point detector
+
+    Args:
+        embeddings: Sentence embeddings array
+        target_segments: Preferred number of segments
+        min_segments: Lower bound on the segment count
+        max_segments: Upper bound on the segment count
+        min_size: Minimum number of sentences per segment
+
+    Returns:
+        Boundary result tagged with the ``kernel`` engine
+    """
+    n_segments = max(min_segments, min(max_segments, target_segments))
+    detector = KernelChangePointDetector(min_size=min_size).fit(embeddings, max_segments=n_segments)
+    boundaries = detector.predict(n_segments)
+
+    logger.debug("Kernel change-point path computed",
+                 sentences=detector.n_samples,
+                 path_length=len(detector.penalty_path()),
+                 requested_segments=n_segments,
+                 segments=len(boundaries) + 1)
+
+    return BoundaryResult(boundaries=boundaries,
+                          engine="kernel",
+                          penalty=detector.penalty_for(len(boundaries) + 1))
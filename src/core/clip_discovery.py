@@ -11,6 +11,7 @@ import json
 
 from . import get_logger
 from .models import ClipObject, ClipStatus
+from .columnar_transcript import ColumnarTranscript
 from .sentence_alignment import SentenceAlignmentEngine
 from .topic_segmentation import TopicSegmentationEngine
 from .highlight_scoring import HighlightScoringSystem
@@ -38,9 +39,14 @@ class ClipDiscoveryEngine:
         
         # Initialize pipeline components
         self.sentence_alignment = SentenceAlignmentEngine()
+        clip_config = getattr(config, 'clip_generation', config)
         self.topic_segmentation = TopicSegmentationEngine(
             min_duration_ms=min_duration_ms,
-            max_duration_ms=max_duration_ms
+            max_duration_ms=max_duration_ms,
+            embedding_backend=getattr(clip_config, 'embedding_backend', 'torch'),
+            embedding_threads=getattr(clip_config, 'embedding_threads', 0),
+            onnx_model_dir=getattr(clip_config, 'onnx_model_dir', None),
+            onnx_max_batch_tokens=getattr(clip_config, 'onnx_max_batch_tokens', 8192)
         )
         self.highlight_scoring = HighlightScoringSystem()
         
@@ -56,6 +62,18 @@ class ClipDiscoveryEngine:
                    min_duration_ms=min_duration_ms,
                    max_duration_ms=max_duration_ms)
     
+    @staticmethod
+    def _load_words(episode):
+        """Columnar word timestamps from the transcription's .npz file, else its word dicts"""
+        words_path = episode.transcription.words_path
+        if words_path and Path(words_path).exists():
+            try:
+                return ColumnarTranscript.load(words_path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("Failed to load columnar word timestamps, using stored words",
+                             episode_id=episode.episode_id, path=words_path, error=str(e))
+        return episode.transcription.words
+    
     async def discover_clips(
         self,
         episode_id: str,
@@ -97,7 +115,7 @@ class ClipDiscoveryEngine:
             # Step 1: Sentence alignment
             logger.info(f"Aligning sentences", episode_id=episode_id)
             sentences = self.sentence_alignment.align_sentences(
-                words=episode.transcription.words
+                words=self._load_words(episode)
             )
             
             if not sentences:
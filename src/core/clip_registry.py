@@ -20,6 +20,39 @@ from .clip_resource_manager import with_database_retry
 logger = get_logger('pipeline.clip_registry')
 
 
+# Re-discovery keeps a clip's status unless its timing changed
+_UPSERT_CLIP = """
+    INSERT INTO clips (
+        id, episode_id, start_ms, end_ms, duration_ms, score,
+        title, caption, hashtags, status, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        status = CASE
+            WHEN clips.start_ms = excluded.start_ms AND clips.end_ms = excluded.end_ms
+            THEN clips.status ELSE excluded.status
+        END,
+        start_ms = excluded.start_ms,
+        end_ms = excluded.end_ms,
+        duration_ms = excluded.duration_ms,
+        score = excluded.score,
+        title = excluded.title,
+        caption = excluded.caption,
+        hashtags = excluded.hashtags
+"""
+
+# Re-rendering a variant replaces its asset row
+_UPSERT_ASSET = """
+    INSERT INTO clip_assets (
+        id, clip_id, path, variant, aspect_ratio, size_bytes, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(clip_id, variant, aspect_ratio) DO UPDATE SET
+        id = excluded.id,
+        path = excluded.path,
+        size_bytes = excluded.size_bytes,
+        created_at = excluded.created_at
+"""
+
+
 class ClipRegistry:
     """
     Registry for managing clips and their assets
@@ -94,6 +127,94 @@ class ClipRegistry:
                         error=str(e))
             raise DatabaseError(f"Failed to register clip: {e}")
     
+    @with_database_retry("register_clips_bulk")
+    def register_clips_bulk(self, clips: List[ClipObject]) -> List[bool]:
+        """
+        Register or update many clips in a single transaction
+        
+        Clips are validated in memory, and their episodes and already
+        registered IDs are looked up with one query each instead of per
+        clip. A clip whose ID is already registered for the same episode is
+        updated in place, so re-discovery does not fail; it keeps its status
+        (e.g. rendered) unless its start or end changed.
+        
+        Args:
+            clips: Clip objects to register
+            
+        Returns:
+            List[bool]: For each clip, True if it was inserted, False if it
+            updated an existing clip
+            
+        Raises:
+            DatabaseError: If database operation fails
+            ValidationError: If any clip is invalid (nothing is registered)
+        """
+        clip_ids = set()
+        for clip in clips:
+            self._validate_clip(clip)
+            if clip.id in clip_ids:
+                raise ValidationError(f"Duplicate clip ID in batch: {clip.id}")
+            clip_ids.add(clip.id)
+        
+        if not clips:
+            return []
+        
+        try:
+            with self.connection.transaction() as conn:
+                episode_ids = {clip.episode_id for clip in clips}
+                found_episodes = {row[0] for row in conn.execute(
+                    "SELECT id FROM episodes WHERE id IN (SELECT value FROM json_each(?))",
+                    (json.dumps(sorted(episode_ids)),)
+                )}
+                missing = sorted(episode_ids - found_episodes)
+                if missing:
+                    raise ValidationError(f"Episode not found: {missing[0]}")
+                
+                existing = {row[0]: row[1] for row in conn.execute(
+                    "SELECT id, episode_id FROM clips WHERE id IN (SELECT value FROM json_each(?))",
+                    (json.dumps(sorted(clip_ids)),)
+                )}
+                for clip in clips:
+                    if existing.get(clip.id, clip.episode_id) != clip.episode_id:
+                        raise ValidationError(
+                            f"Clip ID already exists for episode {existing[clip.id]}: {clip.id}"
+                        )
+                
+                conn.executemany(_UPSERT_CLIP, [
+                    (
+                        clip.id,
+                        clip.episode_id,
+                        clip.start_ms,
+                        clip.end_ms,
+                        clip.duration_ms,
+                        clip.score,
+                        clip.title,
+                        clip.caption,
+                        json.dumps(clip.hashtags),
+                        clip.status.value,
+                        clip.created_at.isoformat() if clip.created_at else None
+                    )
+                    for clip in clips
+                ])
+            
+            inserted = [clip.id not in existing for clip in clips]
+            
+            logger.info("Clips registered in bulk",
+                       submitted=len(clips),
+                       inserted=sum(inserted),
+                       updated=len(clips) - sum(inserted))
+            
+            return inserted
+            
+        except ValidationError:
+            raise
+        
+        except Exception as e:
+            logger.error("Bulk clip registration failed",
+                        clips=len(clips),
+                        error=str(e))
+            raise DatabaseError(f"Failed to register clips: {e}")
+    
     @with_database_retry("get_clip")
     def get_clip(self, clip_id: str) -> Optional[ClipObject]:
         """
@@ -286,13 +407,9 @@ class ClipRegistry:
             if not self._clip_exists(asset.clip_id):
                 raise ValidationError(f"Clip not found: {asset.clip_id}")
             
-            # Register asset in database
+            # Register asset in database; re-rendering a variant replaces its row
             with self.connection.transaction() as conn:
-                conn.execute("""
-                    INSERT INTO clip_assets (
-                        id, clip_id, path, variant, aspect_ratio, size_bytes, created_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
+                conn.execute(_UPSERT_ASSET, (
                     asset.id,
                     asset.clip_id,
                     asset.path,
@@ -323,6 +440,100 @@ class ClipRegistry:
                         error=str(e))
             raise DatabaseError(f"Failed to register asset: {e}")
     
+    @with_database_retry("register_assets_bulk")
+    def register_assets_bulk(self, assets: List[ClipAsset]) -> List[bool]:
+        """
+        Register many clip assets in a single transaction
+        
+        Assets are validated in memory, and their clips and existing assets
+        are looked up with one query each instead of per asset. An asset for
+        a clip variant (variant and aspect ratio) that is already registered
+        replaces that row, so re-rendering does not leave stale duplicates.
+        
+        Args:
+            assets: Clip assets to register
+            
+        Returns:
+            List[bool]: For each asset, True if it was inserted, False if it
+            replaced the existing asset of its clip variant
+            
+        Raises:
+            DatabaseError: If database operation fails
+            ValidationError: If any asset is invalid (nothing is registered)
+        """
+        asset_ids = set()
+        variant_keys = set()
+        for asset in assets:
+            self._validate_asset(asset)
+            key = (asset.clip_id, asset.variant, asset.aspect_ratio)
+            if asset.id in asset_ids:
+                raise ValidationError(f"Duplicate asset ID in batch: {asset.id}")
+            if key in variant_keys:
+                raise ValidationError(f"Duplicate clip variant in batch: {'/'.join(key)}")
+            asset_ids.add(asset.id)
+            variant_keys.add(key)
+        
+        if not assets:
+            return []
+        
+        try:
+            with self.connection.transaction() as conn:
+                clip_ids = {asset.clip_id for asset in assets}
+                found_clips = {row[0] for row in conn.execute(
+                    "SELECT id FROM clips WHERE id IN (SELECT value FROM json_each(?))",
+                    (json.dumps(sorted(clip_ids)),)
+                )}
+                missing = sorted(clip_ids - found_clips)
+                if missing:
+                    raise ValidationError(f"Clip not found: {missing[0]}")
+                
+                existing_keys = {}
+                for row in conn.execute("""
+                    SELECT id, clip_id, variant, aspect_ratio FROM clip_assets
+                    WHERE clip_id IN (SELECT value FROM json_each(?))
+                       OR id IN (SELECT value FROM json_each(?))
+                """, (json.dumps(sorted(clip_ids)), json.dumps(sorted(asset_ids)))):
+                    existing_keys[row[0]] = (row[1], row[2], row[3])
+                for asset in assets:
+                    key = (asset.clip_id, asset.variant, asset.aspect_ratio)
+                    if existing_keys.get(asset.id, key) != key:
+                        raise ValidationError(f"Asset ID already exists: {asset.id}")
+                
+                conn.executemany(_UPSERT_ASSET, [
+                    (
+                        asset.id,
+                        asset.clip_id,
+                        asset.path,
+                        asset.variant,
+                        asset.aspect_ratio,
+                        asset.size_bytes,
+                        asset.created_at.isoformat() if asset.created_at else None
+                    )
+                    for asset in assets
+                ])
+            
+            registered_keys = set(existing_keys.values())
+            inserted = [
+                (asset.clip_id, asset.variant, asset.aspect_ratio) not in registered_keys
+                for asset in assets
+            ]
+            
+            logger.info("Clip assets registered in bulk",
+                       submitted=len(assets),
+                       inserted=sum(inserted),
+                       replaced=len(assets) - sum(inserted))
+            
+            return inserted
+            
+        except ValidationError:
+            raise
+        
+        except Exception as e:
+            logger.error("Bulk asset registration failed",
+                        assets=len(assets),
+                        error=str(e))
+            raise DatabaseError(f"Failed to register assets: {e}")
+    
     def get_assets_for_clip(self, clip_id: str) -> List[ClipAsset]:
         """
         Get all assets for a clip
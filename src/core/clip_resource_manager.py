@@ -18,7 +18,7 @@ from .resource_manager import (
 from .database import DatabaseConnection
 from .exceptions import (
     ClipGenerationError, EmbeddingError, ExportError, 
-    DatabaseError, TransientError
+    DatabaseError, TransientError, ValidationError
 )
 from .logging import get_logger
 
@@ -268,6 +268,7 @@ class ClipDatabaseRetryManager:
             
         Raises:
             DatabaseError: If all retry attempts fail
+            ValidationError: If the operation rejects its input (not retried)
         """
         last_error = None
         
@@ -287,6 +288,10 @@ class ClipDatabaseRetryManager:
                 
                 return result
                 
+            except ValidationError:
+                # Invalid input fails the same way on every attempt
+                raise
+                
             except DatabaseError as e:
                 last_error = e
                 
@@ -200,14 +200,25 @@ class ClipSpecificationEngine:
         try:
             logger.info("Storing clip specifications", specifications=len(specifications))
             
+            # Convert to ClipObjects and store them in one transaction
+            convertible = []
+            clip_objects = []
+            for specification in specifications:
+                try:
+                    clip_objects.append(specification.to_clip_object())
+                    convertible.append(specification)
+                except Exception as e:
+                    logger.error("Failed to convert clip specification",
+                               clip_id=specification.clip_id,
+                               error=str(e))
+            
+            if clip_objects:
+                self.clip_registry.register_clips_bulk(clip_objects)
+            
             stored_count = 0
             
-            for specification in specifications:
+            for specification in convertible:
                 try:
-                    # Convert to ClipObject and store in database
-                    clip_object = specification.to_clip_object()
-                    self.clip_registry.register_clip(clip_object)
-                    
                     # Store specification metadata as JSON file
                     self._store_specification_metadata(specification)
                     
@@ -0,0 +1,325 @@
+"""
+Columnar transcript container
+
+Word timestamps for a long episode are hundreds of thousands of small dicts
+when kept as Whisper produces them. ``ColumnarTranscript`` holds the same
+data as a handful of NumPy arrays:
+
+    starts, ends        float64 seconds per word
+    probabilities       float32 per word
+    speaker_ids         int16 per word, index into ``speakers`` (-1 = unknown)
+    word_ids            int32 per word, index into the interned vocabulary
+    vocab_buffer        uint8, UTF-8 bytes of every distinct word once
+    vocab_offsets       int64, start of each vocabulary entry in the buffer
+    sentence_offsets    int64, first word of each sentence plus the word count
+
+Words are kept in start order, so ``slice_time`` finds a time range with two
+binary searches and returns views of the word arrays sharing the
+vocabulary. The on-disk format is an ``.npz`` archive of these arrays and
+loads without pickle.
+
+Adapters convert to and from the ``Word``/``Sentence`` objects used by
+sentence alignment and build ``TopicSegment`` lists for segmentation
+consumers.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .sentence_alignment import Word, Sentence
+from .logging import get_logger
+
+logger = get_logger('clip_generation.columnar_transcript')
+
+FORMAT_VERSION = 1
+
+
+class ColumnarTranscript:
+    """Array-backed word timestamps with interned text and optional sentence spans"""
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, probabilities: np.ndarray,
+                 word_ids: np.ndarray, speaker_ids: np.ndarray,
+                 vocab_buffer: np.ndarray, vocab_offsets: np.ndarray,
+                 speakers: Sequence[str] = (), sentence_offsets: Optional[np.ndarray] = None):
+        """
+        Wrap existing arrays (no copies); use the ``from_*`` constructors to build one
+
+        Args:
+            starts: Word start times in seconds, non-decreasing
+            ends: Word end times in seconds
+            probabilities: Word probabilities
+            word_ids: Vocabulary index of each word
+            speaker_ids: Speaker index of each word (-1 = unknown)
+            vocab_buffer: UTF-8 bytes of the vocabulary
+            vocab_offsets: Offsets of vocabulary entries in the buffer (n_vocab + 1)
+            speakers: Speaker labels
+            sentence_offsets: First word of each sentence followed by the word count
+        """
+        if not (len(starts) == len(ends) == len(probabilities) == len(word_ids) == len(speaker_ids)):
+            raise ValueError("word columns must have equal length")
+
+        self.starts = starts
+        self.ends = ends
+        self.probabilities = probabilities
+        self.word_ids = word_ids
+        self.speaker_ids = speaker_ids
+        self.vocab_buffer = vocab_buffer
+        self.vocab_offsets = vocab_offsets
+        self.speakers = list(speakers)
+        self.sentence_offsets = sentence_offsets
+        self._vocabulary: Optional[List[str]] = None
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_words(cls, words: Iterable[Dict[str, Any]],
+                   sentence_offsets: Optional[Sequence[int]] = None) -> 'ColumnarTranscript':
+        """
+        Build from word dicts as produced by Whisper or stored in the registry
+
+        Accepts ``word``/``text``, ``start``, ``end``, ``probability``/``confidence``
+        and an optional ``speaker`` key per word. Words are stably sorted by
+        start if they are out of order (sentence offsets require ordered input).
+        """
+        vocab: Dict[str, int] = {}
+        speaker_index: Dict[str, int] = {}
+        starts, ends, probabilities, word_ids, speaker_ids = [], [], [], [], []
+
+        for word in words:
+            text = word.get('word', word.get('text', ''))
+            starts.append(word.get('start', 0.0))
+            ends.append(word.get('end', 0.0))
+            probabilities.append(word.get('probability', word.get('confidence', 0.0)))
+            word_ids.append(vocab.setdefault(text, len(vocab)))
+            speaker = word.get('speaker')
+            speaker_ids.append(-1 if speaker is None else speaker_index.setdefault(speaker, len(speaker_index)))
+
+        columns = (
+            np.array(starts, dtype=np.float64),
+            np.array(ends, dtype=np.float64),
+            np.array(probabilities, dtype=np.float32),
+            np.array(word_ids, dtype=np.int32),
+            np.array(speaker_ids, dtype=np.int16)
+        )
+        if len(columns[0]) and np.any(np.diff(columns[0]) < 0):
+            if sentence_offsets is not None:
+                raise ValueError("sentence offsets require words in start order")
+            order = np.argsort(columns[0], kind='stable')
+            columns = tuple(column[order] for column in columns)
+
+        encoded = [text.encode('utf-8') for text in vocab]
+        vocab_offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(item) for item in encoded], out=vocab_offsets[1:])
+        vocab_buffer = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+        if sentence_offsets is not None:
+            sentence_offsets = np.asarray(sentence_offsets, dtype=np.int64)
+
+        return cls(*columns, vocab_buffer, vocab_offsets, speakers=list(speaker_index),
+                   sentence_offsets=sentence_offsets)
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Dict[str, Any]]) -> 'ColumnarTranscript':
+        """Build from Whisper segments, concatenating their ``words`` lists"""
+        return cls.from_words(word for segment in segments for word in segment.get('words') or [])
+
+    @classmethod
+    def from_sentences(cls, sentences: Sequence[Sentence]) -> 'ColumnarTranscript':
+        """Build from aligned sentences, keeping sentence spans and speakers"""
+        offsets = [0]
+        words = []
+        for sentence in sentences:
+            for word in sentence.words:
+                words.append({'word': word.text, 'start': word.start, 'end': word.end,
+                              'probability': word.confidence, 'speaker': sentence.speaker})
+            offsets.append(len(words))
+        return cls.from_words(words, sentence_offsets=offsets)
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def sentence_count(self) -> int:
+        """Number of sentence spans (0 when the transcript has none)"""
+        return 0 if self.sentence_offsets is None else len(self.sentence_offsets) - 1
+
+    @property
+    def vocabulary(self) -> List[str]:
+        """Decoded vocabulary, built once on first use"""
+        if self._vocabulary is None:
+            data = self.vocab_buffer.tobytes()
+            offsets = self.vocab_offsets.tolist()
+            self._vocabulary = [data[a:b].decode('utf-8') for a, b in zip(offsets, offsets[1:])]
+        return self._vocabulary
+
+    def word_text(self, index: int) -> str:
+        """Text of one word"""
+        word_id = int(self.word_ids[index])
+        a, b = int(self.vocab_offsets[word_id]), int(self.vocab_offsets[word_id + 1])
+        return self.vocab_buffer[a:b].tobytes().decode('utf-8')
+
+    def texts(self) -> List[str]:
+        """Text of every word"""
+        vocabulary = self.vocabulary
+        return [vocabulary[word_id] for word_id in self.word_ids.tolist()]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays"""
+        arrays = [self.starts, self.ends, self.probabilities, self.word_ids, self.speaker_ids,
+                  self.vocab_buffer, self.vocab_offsets]
+        if self.sentence_offsets is not None:
+            arrays.append(self.sentence_offsets)
+        return sum(array.nbytes for array in arrays)
+
+    def slice_time(self, start_s: float, end_s: float) -> 'ColumnarTranscript':
+        """
+        Words starting in ``[start_s, end_s)`` as a view on this transcript
+
+        Word columns are array views and the vocabulary is shared; only the
+        sentence offsets (one entry per sentence) are rebuilt. Sentences cut
+        by the range edges are kept partially.
+        """
+        lo = int(np.searchsorted(self.starts, start_s, side='left'))
+        hi = max(lo, int(np.searchsorted(self.starts, end_s, side='left')))
+
+        sentence_offsets = None
+        if self.sentence_offsets is not None:
+            inner = self.sentence_offsets[(self.sentence_offsets > lo) & (self.sentence_offsets < hi)]
+            sentence_offsets = np.concatenate(([lo], inner, [hi])) - lo if hi > lo else np.zeros(1, dtype=np.int64)
+
+        view = ColumnarTranscript(
+            self.starts[lo:hi], self.ends[lo:hi], self.probabilities[lo:hi],
+            self.word_ids[lo:hi], self.speaker_ids[lo:hi],
+            self.vocab_buffer, self.vocab_offsets, self.speakers, sentence_offsets
+        )
+        view._vocabulary = self._vocabulary
+        return view
+
+    # ------------------------------------------------------------------
+    # Adapters
+    # ------------------------------------------------------------------
+
+    def to_word_dicts(self) -> List[Dict[str, Any]]:
+        """Word dicts in the registry format (``word``, ``start``, ``end``, ``probability``)"""
+        words = []
+        for text, start, end, probability, speaker_id in zip(
+                self.texts(), self.starts.tolist(), self.ends.tolist(),
+                self.probabilities.tolist(), self.speaker_ids.tolist()):
+            word = {'word': text, 'start': start, 'end': end, 'probability': probability}
+            if speaker_id >= 0:
+                word['speaker'] = self.speakers[speaker_id]
+            words.append(word)
+        return words
+
+    def to_words(self) -> List[Word]:
+        """``Word`` objects for sentence alignment, skipping empty words"""
+        return [
+            Word(text=text.strip(), start=start, end=end, confidence=probability)
+            for text, start, end, probability in zip(
+                self.texts(), self.starts.tolist(), self.ends.tolist(), self.probabilities.tolist())
+            if text.strip()
+        ]
+
+    def to_sentences(self) -> List[Sentence]:
+        """``Sentence`` objects for each sentence span"""
+        if self.sentence_offsets is None:
+            raise ValueError("transcript has no sentence spans; align it or build it with from_sentences")
+
+        words = [
+            Word(text=text, start=start, end=end, confidence=probability)
+            for text, start, end, probability in zip(
+                self.texts(), self.starts.tolist(), self.ends.tolist(), self.probabilities.tolist())
+        ]
+        speaker_ids = self.speaker_ids.tolist()
+        offsets = self.sentence_offsets.tolist()
+
+        sentences = []
+        for a, b in zip(offsets, offsets[1:]):
+            if a == b:
+                continue
+            sentence_words = words[a:b]
+            sentences.append(Sentence(
+                text=' '.join(word.text for word in sentence_words).strip(),
+                start_ms=int(sentence_words[0].start * 1000),
+                end_ms=int(sentence_words[-1].end * 1000),
+                words=sentence_words,
+                speaker=self.speakers[speaker_ids[a]] if speaker_ids[a] >= 0 else None,
+                confidence=sum(word.confidence for word in sentence_words) / len(sentence_words)
+            ))
+        return sentences
+
+    def to_topic_segments(self, boundaries: Sequence[int]) -> List[Any]:
+        """
+        ``TopicSegment`` objects from sentence boundary indices
+
+        Args:
+            boundaries: Sentence indices where segments end, as returned by
+                ``TopicSegmentationEngine.detect_boundaries``
+        """
+        from .topic_segmentation import TopicSegment
+
+        sentences = self.to_sentences()
+        segments = []
+        start = 0
+        for boundary in sorted(boundaries) + [len(sentences)]:
+            if boundary > start:
+                segment_sentences = sentences[start:boundary]
+                segments.append(TopicSegment(
+                    sentences=segment_sentences,
+                    start_ms=segment_sentences[0].start_ms,
+                    end_ms=segment_sentences[-1].end_ms
+                ))
+                start = boundary
+        return segments
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def save(self, path: Path, compress: bool = True) -> Path:
+        """Write the transcript as an ``.npz`` archive"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        writer = np.savez_compressed if compress else np.savez
+        with open(path, 'wb') as f:
+            writer(
+                f,
+                format_version=np.array(FORMAT_VERSION),
+                starts=self.starts,
+                ends=self.ends,
+                probabilities=self.probabilities,
+                word_ids=self.word_ids,
+                speaker_ids=self.speaker_ids,
+                vocab_buffer=self.vocab_buffer,
+                vocab_offsets=self.vocab_offsets,
+                speakers=np.array(self.speakers, dtype=str),
+                sentence_offsets=(self.sentence_offsets if self.sentence_offsets is not None
+                                  else np.zeros(0, dtype=np.int64))
+            )
+        logger.debug("Saved columnar transcript", path=str(path), words=len(self), bytes=self.nbytes)
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> 'ColumnarTranscript':
+        """Read a transcript written by ``save``"""
+        with np.load(Path(path), allow_pickle=False) as data:
+            version = int(data['format_version'])
+            if version != FORMAT_VERSION:
+                raise ValueError(f"Unsupported columnar transcript format version: {version}")
+            sentence_offsets = data['sentence_offsets']
+            return cls(
+                data['starts'], data['ends'], data['probabilities'],
+                data['word_ids'], data['speaker_ids'],
+                data['vocab_buffer'], data['vocab_offsets'],
+                speakers=data['speakers'].tolist(),
+                sentence_offsets=sentence_offsets if len(sentence_offsets) else None
+            )
@@ -40,6 +40,9 @@ class DiscoveryConfig:
     stability_minutes: int = 5
     max_concurrent_scans: int = 4
     scan_interval_seconds: int = 300
+    hash_mode: str = "full"  # "full" hashes new files now; "fast" fingerprints and hashes in background
+    watch: bool = False  # Register stable new files from filesystem events instead of rescanning
+    watch_backend: str = "auto"  # "auto" (inotify on local Linux filesystems), "inotify" or "poll"
 
 
 @dataclass
@@ -66,8 +69,18 @@ class DatabaseConfig:
     path: str = "data/pipeline.db"
     backup_enabled: bool = True
     backup_interval_hours: int = 24
+    backup_pages_per_step: int = 1024  # Pages copied per online backup step
+    backup_step_sleep_ms: int = 50  # Writer left free between backup steps
+    backup_compress: bool = False  # Gzip backup files
+    backup_verify: bool = True  # Re-read backups and compare page checksums
+    backup_retention_days: int = 7
+    backup_max_total_mb: int = 0  # Delete oldest backups beyond this total size (0 = no limit)
     connection_timeout: int = 10  # SQLite connection timeout (seconds)
-    max_connections: int = 10
+    max_connections: int = 10  # One writer plus max_connections - 1 pooled readers
+    idle_timeout_seconds: float = 300.0  # Close pooled readers unused for this long
+    event_flush_interval_ms: int = 200  # Processing log/metric rows are written in batches
+    event_batch_size: int = 500
+    event_queue_size: int = 10000  # Callers block when this many rows are waiting
     journal_mode: str = "WAL"  # Write-Ahead Logging for better concurrency
     synchronous: str = "NORMAL"  # Safe with WAL, reduces filesystem thrashing
     busy_timeout: int = 10000  # Wait up to 10 seconds if database is locked (10000ms)
@@ -91,6 +104,17 @@ class ProcessingConfig:
     max_retry_attempts: int = 3
     retry_delay_seconds: int = 30
     timeout_minutes: int = 60
+    # Batch scheduling: episodes in flight and per-resource-class stage slots
+    max_episodes_in_flight: int = 8
+    stage_pool_sizes: Dict[str, int] = field(default_factory=lambda: {
+        'transcription': 1,
+        'ffmpeg': 2,
+        'llm': 1,
+        'disk_io': 4
+    })
+    # Multi-node workers: episode lease duration and idle poll interval
+    worker_lease_seconds: int = 300
+    worker_poll_interval_seconds: float = 5.0
 
 
 @dataclass
@@ -112,6 +136,17 @@ class TranscriptionConfig:
         "en", "es", "fr", "de", "it", "pt", "ru", "ja", "ko", "zh"
     ])
     fallback_language: str = "en"
+    # Streaming: decode audio through an ffmpeg pipe instead of a prep-stage WAV
+    streaming: bool = False
+    stream_chunk_seconds: float = 300.0
+    stream_buffered_chunks: int = 2
+    stream_silence_search_seconds: float = 10.0  # Chunks are cut at the quietest point in this window
+    stream_prompt_chars: int = 200  # Previous-chunk text passed as Whisper prompt
+    # Parallel: on hosts without CUDA, transcribe silence-split chunks in a faster-whisper process pool
+    parallel: bool = False
+    parallel_chunk_seconds: float = 300.0
+    parallel_workers: int = 0  # 0 = CPU cores / parallel_cpu_threads
+    parallel_cpu_threads: int = 2  # Threads per worker model
 
 
 @dataclass
@@ -128,6 +163,10 @@ class ClipGenerationConfig:
     llm_timeout: int = 30
     cache_embeddings: bool = True
     embedding_batch_size: int = 32
+    embedding_backend: str = "torch"  # "torch" or "onnx" (int8-quantized ONNX Runtime, CPU)
+    embedding_threads: int = 0  # CPU inference threads (0 = library default)
+    onnx_model_dir: str = "data/models/onnx"
+    onnx_max_batch_tokens: int = 8192  # Padded token budget per ONNX batch
     
     # Scoring weights
     heuristic_weights: Dict[str, float] = field(default_factory=lambda: {
@@ -151,6 +190,25 @@ class ClipGenerationConfig:
     max_cpu_percent: float = 70.0
 
 
+@dataclass
+class ModelServerConfig:
+    """Configuration for the persistent model server"""
+    enabled: bool = False
+    socket_path: str = "data/run/model_server.sock"
+    memory_budget_mb: int = 12000  # Resident models before LRU unloading
+    idle_unload_seconds: int = 900
+    embed_batch_window_ms: float = 20.0
+    max_embed_batch: int = 256
+
+
+@dataclass
+class StageCacheConfig:
+    """Configuration for the content-addressed stage result cache"""
+    enabled: bool = False
+    directory: str = "data/cache/stages"
+    max_size_gb: float = 50.0  # Least recently used entries are evicted above this
+
+
 @dataclass
 class PipelineConfig:
     """Main configuration class for the pipeline"""
@@ -165,6 +223,8 @@ class PipelineConfig:
     processing: ProcessingConfig = field(default_factory=ProcessingConfig)
     resources: ResourceConfig = field(default_factory=ResourceConfig)
     clip_generation: ClipGenerationConfig = field(default_factory=ClipGenerationConfig)
+    model_server: ModelServerConfig = field(default_factory=ModelServerConfig)
+    stage_cache: StageCacheConfig = field(default_factory=StageCacheConfig)
     
     # Environment-specific overrides
     newsroom_path: Optional[str] = None
@@ -267,6 +327,19 @@ class ConfigurationManager:
             'DATABASE_PATH': 'database.path',
             'STAGING_PATH': 'staging.path',
             'MAX_CONCURRENT_EPISODES': 'processing.max_concurrent_episodes',
+            'MAX_EPISODES_IN_FLIGHT': 'processing.max_episodes_in_flight',
+            'WORKER_LEASE_SECONDS': 'processing.worker_lease_seconds',
+            'WORKER_POLL_INTERVAL_SECONDS': 'processing.worker_poll_interval_seconds',
+            'TRANSCRIPTION_STREAMING': 'transcription.streaming',
+            'TRANSCRIPTION_PARALLEL': 'transcription.parallel',
+            'MODEL_SERVER_ENABLED': 'model_server.enabled',
+            'MODEL_SERVER_SOCKET': 'model_server.socket_path',
+            'DISCOVERY_HASH_MODE': 'discovery.hash_mode',
+            'DISCOVERY_WATCH': 'discovery.watch',
+            'DISCOVERY_WATCH_BACKEND': 'discovery.watch_backend',
+            'STAGE_CACHE_ENABLED': 'stage_cache.enabled',
+            'STAGE_CACHE_DIRECTORY': 'stage_cache.directory',
+            'STAGE_CACHE_MAX_SIZE_GB': 'stage_cache.max_size_gb',
             
             # Clip Generation Settings
             'CLIP_GENERATION_ENABLED': 'clip_generation.enabled',
@@ -280,6 +353,8 @@ class ConfigurationManager:
             'CLIP_LLM_TIMEOUT': 'clip_generation.llm_timeout',
             'CLIP_CACHE_EMBEDDINGS': 'clip_generation.cache_embeddings',
             'CLIP_EMBEDDING_BATCH_SIZE': 'clip_generation.embedding_batch_size',
+            'CLIP_EMBEDDING_BACKEND': 'clip_generation.embedding_backend',
+            'CLIP_EMBEDDING_THREADS': 'clip_generation.embedding_threads',
             'CLIP_MAX_MEMORY_PERCENT': 'clip_generation.max_memory_percent',
             'CLIP_MAX_CPU_PERCENT': 'clip_generation.max_cpu_percent'
         }
@@ -355,12 +430,15 @@ class ConfigurationManager:
             staging = StagingConfig(**config_dict.get('staging', {}))
             discovery = DiscoveryConfig(**config_dict.get('discovery', {}))
             models = ModelConfig(**config_dict.get('models', {}))
+            transcription = TranscriptionConfig(**config_dict.get('transcription', {}))
             thresholds = ThresholdConfig(**config_dict.get('thresholds', {}))
             database = DatabaseConfig(**config_dict.get('database', {}))
             logging_config = LoggingConfig(**config_dict.get('logging', {}))
             processing = ProcessingConfig(**config_dict.get('processing', {}))
             resources = ResourceConfig(**config_dict.get('resources', {}))
             clip_generation = ClipGenerationConfig(**config_dict.get('clip_generation', {}))
+            model_server = ModelServerConfig(**config_dict.get('model_server', {}))
+            stage_cache = StageCacheConfig(**config_dict.get('stage_cache', {}))
             
             # Create main config
             return PipelineConfig(
@@ -368,12 +446,15 @@ class ConfigurationManager:
                 staging=staging,
                 discovery=discovery,
                 models=models,
+                transcription=transcription,
                 thresholds=thresholds,
                 database=database,
                 logging=logging_config,
                 processing=processing,
                 resources=resources,
                 clip_generation=clip_generation,
+                model_server=model_server,
+                stage_cache=stage_cache,
                 newsroom_path=config_dict.get('newsroom_path'),
                 hf_token=config_dict.get('hf_token'),
                 ollama_url=config_dict.get('ollama_url', 'http://localhost:11434'),
@@ -409,9 +490,59 @@ class ConfigurationManager:
         if config.processing.max_concurrent_episodes < 1:
             errors.append("max_concurrent_episodes must be at least 1")
         
+        if config.processing.max_episodes_in_flight < 1:
+            errors.append("max_episodes_in_flight must be at least 1")
+        
+        for pool_name, pool_size in config.processing.stage_pool_sizes.items():
+            if pool_size < 1:
+                errors.append(f"stage_pool_sizes.{pool_name} must be at least 1")
+        
         if config.processing.max_retry_attempts < 0:
             errors.append("max_retry_attempts must be non-negative")
         
+        if config.transcription.stream_chunk_seconds < 30:
+            errors.append("stream_chunk_seconds must be at least 30 (one Whisper window)")
+        
+        if config.transcription.parallel_chunk_seconds < 30:
+            errors.append("parallel_chunk_seconds must be at least 30 (one Whisper window)")
+        
+        if config.processing.worker_lease_seconds < 1:
+            errors.append("worker_lease_seconds must be at least 1")
+        
+        if config.processing.worker_poll_interval_seconds <= 0:
+            errors.append("worker_poll_interval_seconds must be positive")
+        
+        if config.database.backup_pages_per_step < 1:
+            errors.append("database.backup_pages_per_step must be at least 1")
+        
+        if config.database.backup_max_total_mb < 0:
+            errors.append("database.backup_max_total_mb must be non-negative")
+        
+        if config.database.max_connections < 1:
+            errors.append("database.max_connections must be at least 1")
+        
+        if config.database.idle_timeout_seconds <= 0:
+            errors.append("database.idle_timeout_seconds must be positive")
+        
+        if config.database.event_batch_size < 1 or config.database.event_queue_size < 1:
+            errors.append("database.event_batch_size and event_queue_size must be at least 1")
+        
+        if config.discovery.hash_mode not in ('full', 'fast'):
+            errors.append(f"discovery.hash_mode must be 'full' or 'fast', got {config.discovery.hash_mode}")
+        
+        if config.discovery.watch_backend not in ('auto', 'inotify', 'poll'):
+            errors.append(f"discovery.watch_backend must be 'auto', 'inotify' or 'poll', got {config.discovery.watch_backend}")
+        
+        if config.clip_generation.embedding_backend not in ('torch', 'onnx'):
+            errors.append(f"clip_generation.embedding_backend must be 'torch' or 'onnx', "
+                         f"got {config.clip_generation.embedding_backend}")
+        
+        if config.model_server.memory_budget_mb < 1:
+            errors.append("model_server.memory_budget_mb must be at least 1")
+        
+        if config.stage_cache.max_size_gb <= 0:
+            errors.append("stage_cache.max_size_gb must be positive")
+        
         # Validate model configuration
         valid_whisper_models = ['tiny', 'base', 'small', 'medium', 'large', 'large-v2', 'large-v3']
         if config.models.whisper not in valid_whisper_models:
@@ -456,7 +587,10 @@ class ConfigurationManager:
             'discovery': {
                 'stability_minutes': config.discovery.stability_minutes,
                 'max_concurrent_scans': config.discovery.max_concurrent_scans,
-                'scan_interval_seconds': config.discovery.scan_interval_seconds
+                'scan_interval_seconds': config.discovery.scan_interval_seconds,
+                'hash_mode': config.discovery.hash_mode,
+                'watch': config.discovery.watch,
+                'watch_backend': config.discovery.watch_backend
             },
             'models': {
                 'whisper': config.models.whisper,
@@ -474,8 +608,18 @@ class ConfigurationManager:
                 'path': config.database.path,
                 'backup_enabled': config.database.backup_enabled,
                 'backup_interval_hours': config.database.backup_interval_hours,
+                'backup_pages_per_step': config.database.backup_pages_per_step,
+                'backup_step_sleep_ms': config.database.backup_step_sleep_ms,
+                'backup_compress': config.database.backup_compress,
+                'backup_verify': config.database.backup_verify,
+                'backup_retention_days': config.database.backup_retention_days,
+                'backup_max_total_mb': config.database.backup_max_total_mb,
                 'connection_timeout': config.database.connection_timeout,
                 'max_connections': config.database.max_connections,
+                'idle_timeout_seconds': config.database.idle_timeout_seconds,
+                'event_flush_interval_ms': config.database.event_flush_interval_ms,
+                'event_batch_size': config.database.event_batch_size,
+                'event_queue_size': config.database.event_queue_size,
                 'journal_mode': config.database.journal_mode,
                 'synchronous': config.database.synchronous
             },
@@ -491,7 +635,27 @@ class ConfigurationManager:
                 'max_concurrent_episodes': config.processing.max_concurrent_episodes,
                 'max_retry_attempts': config.processing.max_retry_attempts,
                 'retry_delay_seconds': config.processing.retry_delay_seconds,
-                'timeout_minutes': config.processing.timeout_minutes
+                'timeout_minutes': config.processing.timeout_minutes,
+                'max_episodes_in_flight': config.processing.max_episodes_in_flight,
+                'stage_pool_sizes': config.processing.stage_pool_sizes,
+                'worker_lease_seconds': config.processing.worker_lease_seconds,
+                'worker_poll_interval_seconds': config.processing.worker_poll_interval_seconds
+            },
+            'transcription': {
+                'language': config.transcription.language,
+                'translate_to_english': config.transcription.translate_to_english,
+                'task': config.transcription.task,
+                'supported_languages': config.transcription.supported_languages,
+                'fallback_language': config.transcription.fallback_language,
+                'streaming': config.transcription.streaming,
+                'stream_chunk_seconds': config.transcription.stream_chunk_seconds,
+                'stream_buffered_chunks': config.transcription.stream_buffered_chunks,
+                'stream_silence_search_seconds': config.transcription.stream_silence_search_seconds,
+                'stream_prompt_chars': config.transcription.stream_prompt_chars,
+                'parallel': config.transcription.parallel,
+                'parallel_chunk_seconds': config.transcription.parallel_chunk_seconds,
+                'parallel_workers': config.transcription.parallel_workers,
+                'parallel_cpu_threads': config.transcription.parallel_cpu_threads
             },
             'resources': {
                 'max_memory_percent': config.resources.max_memory_percent,
@@ -511,6 +675,10 @@ class ConfigurationManager:
                 'llm_timeout': config.clip_generation.llm_timeout,
                 'cache_embeddings': config.clip_generation.cache_embeddings,
                 'embedding_batch_size': config.clip_generation.embedding_batch_size,
+                'embedding_backend': config.clip_generation.embedding_backend,
+                'embedding_threads': config.clip_generation.embedding_threads,
+                'onnx_model_dir': config.clip_generation.onnx_model_dir,
+                'onnx_max_batch_tokens': config.clip_generation.onnx_max_batch_tokens,
                 'heuristic_weights': config.clip_generation.heuristic_weights,
                 'aspect_ratios': config.clip_generation.aspect_ratios,
                 'variants': config.clip_generation.variants,
@@ -521,6 +689,19 @@ class ConfigurationManager:
                 'max_memory_percent': config.clip_generation.max_memory_percent,
                 'max_cpu_percent': config.clip_generation.max_cpu_percent
             },
+            'model_server': {
+                'enabled': config.model_server.enabled,
+                'socket_path': config.model_server.socket_path,
+                'memory_budget_mb': config.model_server.memory_budget_mb,
+                'idle_unload_seconds': config.model_server.idle_unload_seconds,
+                'embed_batch_window_ms': config.model_server.embed_batch_window_ms,
+                'max_embed_batch': config.model_server.max_embed_batch
+            },
+            'stage_cache': {
+                'enabled': config.stage_cache.enabled,
+                'directory': config.stage_cache.directory,
+                'max_size_gb': config.stage_cache.max_size_gb
+            },
             'newsroom_path': config.newsroom_path,
             'hf_token': config.hf_token,
             'ollama_url': config.ollama_url,
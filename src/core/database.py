@@ -5,13 +5,16 @@ Provides SQLite database schema, connection management, and migration system
 for tracking episode processing state and deduplication.
 """
 
+import gzip
+import hashlib
 import sqlite3
 import json
 import threading
 import time
+import zlib
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Union, Generator
+from typing import Callable, Dict, Any, Optional, List, Tuple, Union, Generator
 from datetime import datetime
 
 from .logging import get_logger
@@ -21,149 +24,373 @@ from .config import DatabaseConfig
 logger = get_logger('pipeline.database')
 
 
+class QueryResult:
+    """
+    Fully fetched result of execute_query
+    
+    Rows are read before the connection goes back to the pool, so the
+    result stays usable after other threads have reused the connection.
+    Supports the cursor methods callers rely on.
+    """
+    
+    def __init__(self, cursor: sqlite3.Cursor):
+        self._rows = cursor.fetchall() if cursor.description else []
+        self._position = 0
+        self.description = cursor.description
+        self.rowcount = cursor.rowcount
+        self.lastrowid = cursor.lastrowid
+    
+    def fetchone(self) -> Optional[sqlite3.Row]:
+        if self._position >= len(self._rows):
+            return None
+        row = self._rows[self._position]
+        self._position += 1
+        return row
+    
+    def fetchmany(self, size: int = 1) -> List[sqlite3.Row]:
+        rows = self._rows[self._position:self._position + size]
+        self._position += len(rows)
+        return rows
+    
+    def fetchall(self) -> List[sqlite3.Row]:
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+        return rows
+    
+    def __iter__(self):
+        return iter(self.fetchall())
+
+
 class DatabaseConnection:
-    """Thread-safe database connection wrapper with NullPool-like behavior"""
+    """
+    Connection pool with a single serialized writer and read-only readers
+    
+    All writes go through one connection, taken by one thread at a time,
+    so in-process writers queue on a lock instead of competing for the
+    SQLite write lock. Reads are served by up to max_connections - 1
+    query-only connections that are checked out per query and returned to
+    the pool; with WAL they never wait for the writer. Readers idle for
+    longer than idle_timeout_seconds are closed.
+    """
+    
+    # Statements that can be answered by a query-only reader
+    _READ_KEYWORDS = ('SELECT', 'WITH', 'EXPLAIN')
     
     def __init__(self, db_path: str, config: DatabaseConfig):
         self.db_path = db_path
         self.config = config
-        self._local = threading.local()
-        self._lock = threading.Lock()
-        self._connection_count = 0
-        self._use_nullpool = True  # Close connections aggressively to avoid lock retention
+        self.max_readers = max(config.max_connections - 1, 0)
+        self.idle_timeout = getattr(config, 'idle_timeout_seconds', 300.0)
+        
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.RLock()
+        self._writer_owner: Optional[int] = None
+        
+        self._pool_lock = threading.Condition(threading.Lock())
+        self._idle_readers: List[tuple] = []  # (connection, returned_at), most recent last
+        self._open_readers = 0
         
+        self._stats = {
+            'writer_acquisitions': 0,
+            'writer_wait_seconds': 0.0,
+            'reader_checkouts': 0,
+            'reader_waits': 0,
+            'reader_wait_seconds': 0.0,
+            'reader_timeouts': 0,
+            'readers_created': 0,
+            'readers_closed_idle': 0
+        }
+    
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        """Open a connection with the pipeline's SQLite settings"""
+        try:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.config.connection_timeout,
+                check_same_thread=False,  # Pooled connections move between threads
+                isolation_level=None  # Autocommit mode, we'll manage transactions explicitly
+            )
+            
+            # Configure connection with optimal SQLite settings
+            conn.row_factory = sqlite3.Row
+            
+            # Critical PRAGMAs for concurrency
+            if not read_only:
+                conn.execute(f"PRAGMA journal_mode = {self.config.journal_mode}")
+            conn.execute(f"PRAGMA synchronous = {self.config.synchronous}")
+            conn.execute(f"PRAGMA busy_timeout = {self.config.busy_timeout}")
+            
+            # Additional optimizations
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute("PRAGMA cache_size = -64000")  # 64MB cache
+            if read_only:
+                conn.execute("PRAGMA query_only = ON")
+            
+            logger.debug("Database connection created",
+                        read_only=read_only,
+                        thread_id=threading.get_ident())
+            return conn
+        
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to connect to database: {e}")
+    
     def get_connection(self) -> sqlite3.Connection:
-        """Get thread-local database connection"""
-        if not hasattr(self._local, 'connection') or self._local.connection is None:
-            with self._lock:
-                if self._connection_count >= self.config.max_connections:
-                    raise DatabaseError("Maximum database connections exceeded")
-                
-                try:
-                    conn = sqlite3.connect(
-                        self.db_path,
-                        timeout=self.config.connection_timeout,
-                        check_same_thread=False,  # Allow connection sharing across threads
-                        isolation_level=None  # Autocommit mode, we'll manage transactions explicitly
-                    )
-                    
-                    # Configure connection with optimal SQLite settings
-                    conn.row_factory = sqlite3.Row
-                    
-                    # Critical PRAGMAs for concurrency
-                    conn.execute(f"PRAGMA journal_mode = {self.config.journal_mode}")
-                    conn.execute(f"PRAGMA synchronous = {self.config.synchronous}")
-                    conn.execute(f"PRAGMA busy_timeout = {self.config.busy_timeout}")
-                    
-                    # Additional optimizations
-                    conn.execute("PRAGMA foreign_keys = ON")
-                    conn.execute("PRAGMA temp_store = MEMORY")
-                    conn.execute("PRAGMA cache_size = -64000")  # 64MB cache
-                    
-                    self._local.connection = conn
-                    self._connection_count += 1
-                    
-                    logger.debug("Database connection created", 
-                               thread_id=threading.get_ident(),
-                               connection_count=self._connection_count)
-                    
-                except sqlite3.Error as e:
-                    raise DatabaseError(f"Failed to connect to database: {e}")
+        """
+        The writer connection
+        
+        Only use it while holding writer() or inside transaction(); reads
+        should go through execute_query or reader().
+        """
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._connect(read_only=False)
+            return self._writer
+    
+    @contextmanager
+    def writer(self) -> Generator[sqlite3.Connection, None, None]:
+        """Hold the writer connection exclusively (re-entrant within a thread)"""
+        start_time = time.time()
+        with self._writer_lock:
+            outermost = self._writer_owner is None
+            if outermost:
+                self._writer_owner = threading.get_ident()
+                self._stats['writer_acquisitions'] += 1
+                self._stats['writer_wait_seconds'] += time.time() - start_time
+            try:
+                yield self.get_connection()
+            finally:
+                if outermost:
+                    self._writer_owner = None
+    
+    def holds_writer(self) -> bool:
+        """Whether the calling thread currently holds the writer connection"""
+        return self._writer_owner == threading.get_ident()
+    
+    @contextmanager
+    def reader(self) -> Generator[sqlite3.Connection, None, None]:
+        """
+        Check out a read-only connection for the duration of the block
+        
+        Inside a transaction the thread's own writer connection is used, so
+        reads see its uncommitted changes.
+        
+        Raises:
+            DatabaseError: If no reader is returned within connection_timeout
+        """
+        if self.holds_writer() or self.max_readers == 0:
+            with self.writer() as conn:
+                yield conn
+            return
         
-        return self._local.connection
+        conn = self._checkout_reader()
+        try:
+            yield conn
+        except sqlite3.Error:
+            # Do not hand a possibly broken connection to the next caller
+            self._discard_reader(conn)
+            conn = None
+            raise
+        finally:
+            if conn is not None:
+                self._return_reader(conn)
+    
+    def _checkout_reader(self) -> sqlite3.Connection:
+        deadline = time.time() + self.config.connection_timeout
+        with self._pool_lock:
+            self._stats['reader_checkouts'] += 1
+            waited = False
+            while not self._idle_readers and self._open_readers >= self.max_readers:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    self._stats['reader_timeouts'] += 1
+                    raise DatabaseError("Timed out waiting for a database reader connection")
+                if not waited:
+                    waited = True
+                    self._stats['reader_waits'] += 1
+                wait_start = time.time()
+                self._pool_lock.wait(remaining)
+                self._stats['reader_wait_seconds'] += time.time() - wait_start
+            
+            if self._idle_readers:
+                conn, _ = self._idle_readers.pop()
+                return conn
+            self._open_readers += 1
+        
+        try:
+            conn = self._connect(read_only=True)
+        except Exception:
+            with self._pool_lock:
+                self._open_readers -= 1
+                self._pool_lock.notify()
+            raise
+        with self._pool_lock:
+            self._stats['readers_created'] += 1
+        return conn
+    
+    def _return_reader(self, conn: sqlite3.Connection) -> None:
+        now = time.time()
+        expired = []
+        with self._pool_lock:
+            self._idle_readers.append((conn, now))
+            # Least recently used readers sit at the front
+            while self._idle_readers and now - self._idle_readers[0][1] > self.idle_timeout:
+                expired.append(self._idle_readers.pop(0)[0])
+            self._open_readers -= len(expired)
+            self._stats['readers_closed_idle'] += len(expired)
+            self._pool_lock.notify()
+        for stale in expired:
+            stale.close()
+    
+    def _discard_reader(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._pool_lock:
+            self._open_readers -= 1
+            self._pool_lock.notify()
     
     def close_connection(self) -> None:
-        """Close thread-local connection"""
-        if hasattr(self._local, 'connection') and self._local.connection:
-            with self._lock:
+        """Close the writer and every idle reader"""
+        with self._writer_lock:
+            if self._writer is not None:
                 try:
-                    self._local.connection.close()
-                    self._connection_count -= 1
-                    logger.debug("Database connection closed",
-                               thread_id=threading.get_ident(),
-                               connection_count=self._connection_count)
+                    self._writer.close()
                 except sqlite3.Error as e:
                     logger.warning("Error closing database connection", error=str(e))
                 finally:
-                    self._local.connection = None
+                    self._writer = None
+        
+        with self._pool_lock:
+            idle = [conn for conn, _ in self._idle_readers]
+            self._idle_readers.clear()
+            self._open_readers -= len(idle)
+        for conn in idle:
+            conn.close()
+        
+        logger.debug("Database connections closed", readers_in_use=self._open_readers)
+    
+    def backup(self, target: sqlite3.Connection, pages: int = 1024, step_sleep: float = 0.05,
+               progress: Optional[Callable[[int, int], None]] = None) -> None:
+        """
+        Online backup into target, copying pages at a time
+        
+        The copy runs on the writer connection, which is released between
+        steps so stage writes keep going. Because those writes use the same
+        connection as the backup, SQLite carries them into the copy instead
+        of restarting it.
+        
+        Args:
+            target: Destination connection
+            pages: Pages copied per step
+            step_sleep: Seconds the writer is left free between steps
+            progress: Called with (remaining, total) pages after each step
+        """
+        if self.holds_writer():
+            raise DatabaseError("Cannot back up while holding the database writer")
+        
+        def between_steps(status: int, remaining: int, total: int) -> None:
+            self._writer_owner = None
+            self._writer_lock.release()
+            try:
+                time.sleep(step_sleep)
+            finally:
+                self._writer_lock.acquire()
+                self._writer_owner = threading.get_ident()
+            if progress:
+                progress(remaining, total)
+        
+        with self.writer() as conn:
+            conn.backup(target, pages=pages, progress=between_steps, sleep=step_sleep)
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Pool size and checkout metrics"""
+        with self._pool_lock:
+            stats = dict(self._stats)
+            stats.update({
+                'max_readers': self.max_readers,
+                'readers_open': self._open_readers,
+                'readers_idle': len(self._idle_readers),
+                'readers_in_use': self._open_readers - len(self._idle_readers),
+                'writer_busy': self._writer_owner is not None
+            })
+        return stats
     
     @contextmanager
     def transaction(self, max_retries: int = 5, retry_delay: float = 0.5, immediate: bool = True) -> Generator[sqlite3.Connection, None, None]:
         """Context manager for database transactions with aggressive retry logic
         
+        Runs on the writer connection, which the calling thread holds until
+        the transaction ends.
+        
         Args:
             max_retries: Maximum number of retry attempts
             retry_delay: Base delay between retries (exponential backoff applied)
             immediate: If True, use BEGIN IMMEDIATE (exclusive lock). Default True for writes.
         """
-        conn = self.get_connection()
         begin_statement = "BEGIN IMMEDIATE" if immediate else "BEGIN DEFERRED"
         
-        for attempt in range(max_retries):
-            transaction_started = False
-            try:
-                conn.execute(begin_statement)
-                transaction_started = True
-                yield conn
-                conn.commit()
-                
-                # NullPool behavior: close connection after successful transaction
-                if self._use_nullpool:
-                    self.close_connection()
-                
-                return  # Success - exit the function
-            except sqlite3.OperationalError as e:
-                if transaction_started:
-                    try:
-                        conn.rollback()
-                    except:
-                        pass
-                
-                # Close stale connection on error
-                self.close_connection()
+        with self.writer() as conn:
+            for attempt in range(max_retries):
+                transaction_started = False
+                try:
+                    conn.execute(begin_statement)
+                    transaction_started = True
+                    yield conn
+                    conn.commit()
+                    return  # Success - exit the function
+                except sqlite3.OperationalError as e:
+                    if transaction_started:
+                        try:
+                            conn.rollback()
+                        except:
+                            pass
                     
-                if "database is locked" in str(e) and attempt < max_retries - 1:
-                    wait_time = retry_delay * (2 ** attempt)
-                    logger.warning(f"Database locked, retrying in {wait_time}s ({attempt + 1}/{max_retries})...", 
-                                 error=str(e), begin_mode=begin_statement)
-                    time.sleep(wait_time)
-                    continue  # Try again
-                else:
-                    logger.error("Database transaction failed after all retries", error=str(e), attempt=attempt + 1)
+                    if "database is locked" in str(e) and attempt < max_retries - 1:
+                        # Another process holds the write lock
+                        wait_time = retry_delay * (2 ** attempt)
+                        logger.warning(f"Database locked, retrying in {wait_time}s ({attempt + 1}/{max_retries})...",
+                                     error=str(e), begin_mode=begin_statement)
+                        time.sleep(wait_time)
+                        continue  # Try again
+                    else:
+                        logger.error("Database transaction failed after all retries", error=str(e), attempt=attempt + 1)
+                        raise
+                except Exception as e:
+                    if transaction_started:
+                        try:
+                            conn.rollback()
+                        except:
+                            pass
+                    
+                    logger.error("Database transaction rolled back", error=str(e))
                     raise
-            except Exception as e:
-                if transaction_started:
-                    try:
-                        conn.rollback()
-                    except:
-                        pass
-                
-                # Close connection on any error
-                self.close_connection()
-                
-                logger.error("Database transaction rolled back", error=str(e))
-                raise
         
         # If we get here, all retries failed
         raise DatabaseError("Database transaction failed after all retry attempts")
     
-    def execute_query(self, query: str, params: Optional[tuple] = None) -> sqlite3.Cursor:
-        """Execute a query with automatic connection management"""
-        conn = self.get_connection()
+    def execute_query(self, query: str, params: Optional[tuple] = None) -> QueryResult:
+        """
+        Execute a single statement
+        
+        Reads run on a pooled reader, anything else on the writer (in
+        autocommit mode unless the thread is inside a transaction). The
+        result is fetched before the connection is released.
+        """
+        words = query.lstrip().split(None, 1)
+        is_read = bool(words) and words[0].upper() in self._READ_KEYWORDS and 'RETURNING' not in query.upper()
         try:
-            if params:
-                return conn.execute(query, params)
-            else:
-                return conn.execute(query)
+            with (self.reader() if is_read else self.writer()) as conn:
+                return QueryResult(conn.execute(query, params or ()))
         except sqlite3.Error as e:
             raise DatabaseError(f"Query execution failed: {e}")
     
     def execute_many(self, query: str, params_list: List[tuple]) -> None:
         """Execute query with multiple parameter sets"""
-        conn = self.get_connection()
         try:
-            conn.executemany(query, params_list)
-            conn.commit()
+            with self.transaction() as conn:
+                conn.executemany(query, params_list)
         except sqlite3.Error as e:
             raise DatabaseError(f"Batch query execution failed: {e}")
 
@@ -330,6 +557,271 @@ CREATE INDEX IF NOT EXISTS idx_clips_episode_id ON clips(episode_id);
 CREATE INDEX IF NOT EXISTS idx_clips_status ON clips(status);
 CREATE INDEX IF NOT EXISTS idx_clips_score ON clips(score DESC);
 CREATE INDEX IF NOT EXISTS idx_clip_assets_clip_id ON clip_assets(clip_id);
+            ''',
+
+            6: '''
+-- Durable async job queue shared by API and CLI workers
+CREATE TABLE IF NOT EXISTS job_queue (
+    job_id TEXT PRIMARY KEY,
+    job_type TEXT NOT NULL,
+    parameters JSON NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',  -- queued|running|completed|failed|cancelled
+    priority INTEGER NOT NULL DEFAULT 2,    -- lower value is claimed first
+    progress REAL NOT NULL DEFAULT 0.0,
+    current_stage TEXT,
+    message TEXT,
+    result JSON,
+    error TEXT,
+    webhook_url TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 1,
+    available_at REAL NOT NULL,             -- epoch seconds, pushed forward by retry backoff
+    lease_owner TEXT,
+    lease_expires_at REAL,                  -- epoch seconds
+    heartbeat_at REAL,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    completed_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_queue_claim ON job_queue(status, priority, available_at);
+CREATE INDEX IF NOT EXISTS idx_job_queue_lease ON job_queue(status, lease_expires_at);
+CREATE INDEX IF NOT EXISTS idx_job_queue_completed_at ON job_queue(completed_at);
+            ''',
+
+            7: '''
+-- Episode leases for multi-node workers sharing one registry
+ALTER TABLE episodes ADD COLUMN lease_owner TEXT;
+ALTER TABLE episodes ADD COLUMN lease_expires_at REAL;       -- epoch seconds
+ALTER TABLE episodes ADD COLUMN claim_attempts INTEGER NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS idx_episodes_stage_lease ON episodes(stage, lease_expires_at);
+
+-- Lease claims and heartbeats are not content changes
+DROP TRIGGER IF EXISTS episodes_updated_at;
+CREATE TRIGGER IF NOT EXISTS episodes_updated_at
+    AFTER UPDATE ON episodes
+    FOR EACH ROW
+    WHEN OLD.lease_expires_at IS NEW.lease_expires_at
+BEGIN
+    UPDATE episodes SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END
+            ''',
+            8: '''
+-- Discovery manifest: file identity -> content hash, so unchanged files are not rehashed
+CREATE TABLE IF NOT EXISTS discovery_manifest (
+    path TEXT PRIMARY KEY,
+    file_size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,         -- size + sampled head/middle/tail blocks
+    full_hash TEXT,                    -- SHA-256 of the whole file, NULL until computed
+    updated_at REAL NOT NULL           -- epoch seconds
+);
+
+CREATE INDEX IF NOT EXISTS idx_discovery_manifest_pending ON discovery_manifest(full_hash) WHERE full_hash IS NULL;
+            ''',
+
+            9: '''
+-- Episode listing: keyset pagination and show filtering without reading metadata blobs
+CREATE INDEX IF NOT EXISTS idx_episodes_updated_id ON episodes(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_episodes_created_id ON episodes(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_episodes_stage_updated_id ON episodes(stage, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_episodes_stage_created_id ON episodes(stage, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_episodes_show_name ON episodes(json_extract(metadata, '$.metadata.show_name'));
+            ''',
+
+            10: '''
+-- Episode content parts, stored apart from the metadata blob so each stage writes only what it produced
+CREATE TABLE IF NOT EXISTS episode_content (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    episode_id TEXT NOT NULL,
+    part TEXT NOT NULL,                -- transcription|enrichment|editorial|media
+    data JSON,                         -- NULL once a produced part is cleared
+    version INTEGER NOT NULL DEFAULT 1,  -- incremented on every write of the part
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (episode_id, part),
+    FOREIGN KEY (episode_id) REFERENCES episodes(id) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+INSERT OR IGNORE INTO episode_content (episode_id, part, data)
+SELECT e.id, part.key, part.value
+FROM (SELECT id, metadata FROM episodes WHERE json_valid(metadata)) AS e, json_each(e.metadata) AS part
+WHERE part.key IN ('transcription', 'enrichment', 'editorial', 'media') AND part.type = 'object';
+
+-- Moving the parts out is not a content change
+DROP TRIGGER IF EXISTS episodes_updated_at;
+UPDATE episodes
+SET metadata = json_remove(metadata, '$.transcription', '$.enrichment', '$.editorial', '$.media')
+WHERE json_valid(metadata);
+CREATE TRIGGER IF NOT EXISTS episodes_updated_at
+    AFTER UPDATE ON episodes
+    FOR EACH ROW
+    WHEN OLD.lease_expires_at IS NEW.lease_expires_at
+BEGIN
+    UPDATE episodes SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END;
+            ''',
+
+            11: '''
+-- Backup verification: digest of per-page CRC32s, recorded when the backup is written
+ALTER TABLE backup_log ADD COLUMN page_count INTEGER;
+ALTER TABLE backup_log ADD COLUMN page_size INTEGER;
+ALTER TABLE backup_log ADD COLUMN checksum TEXT;
+ALTER TABLE backup_log ADD COLUMN compressed INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE backup_log ADD COLUMN verified_at TIMESTAMP;
+            ''',
+
+            12: '''
+-- Guests and topics per indexed episode, so filters and facets use an index instead of LIKE over JSON text
+CREATE TABLE IF NOT EXISTS episode_guests (
+    episode_id TEXT NOT NULL,
+    guest_name TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (episode_id, guest_name),
+    FOREIGN KEY (episode_id) REFERENCES json_metadata_index(episode_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS episode_topics (
+    episode_id TEXT NOT NULL,
+    topic TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (episode_id, topic),
+    FOREIGN KEY (episode_id) REFERENCES json_metadata_index(episode_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_episode_guests_name ON episode_guests(guest_name, episode_id);
+CREATE INDEX IF NOT EXISTS idx_episode_topics_topic ON episode_topics(topic, episode_id);
+
+INSERT OR IGNORE INTO episode_guests (episode_id, guest_name)
+SELECT jmi.episode_id, trim(guest.value)
+FROM (SELECT episode_id, guest_names FROM json_metadata_index WHERE json_valid(guest_names)) AS jmi,
+     json_each(jmi.guest_names) AS guest
+WHERE guest.type = 'text' AND trim(guest.value) != '';
+
+INSERT OR IGNORE INTO episode_topics (episode_id, topic)
+SELECT jmi.episode_id, trim(topic.value)
+FROM (SELECT episode_id, topics FROM json_metadata_index WHERE json_valid(topics)) AS jmi,
+     json_each(jmi.topics) AS topic
+WHERE topic.type = 'text' AND trim(topic.value) != '';
+            ''',
+
+            13: '''
+-- Full-text search over a content table with a stable integer key, kept in sync by triggers
+DROP TABLE IF EXISTS episodes_search;
+
+CREATE TABLE IF NOT EXISTS episode_search_content (
+    id INTEGER PRIMARY KEY,
+    episode_id TEXT NOT NULL UNIQUE,
+    title TEXT,
+    summary TEXT,
+    transcript_text TEXT,
+    topics TEXT,                       -- space-separated, as indexed
+    guest_names TEXT,                  -- space-separated, as indexed
+    FOREIGN KEY (episode_id) REFERENCES json_metadata_index(episode_id) ON DELETE CASCADE
+);
+
+-- Stores only the inverted index; column values are read back from episode_search_content
+CREATE VIRTUAL TABLE IF NOT EXISTS episodes_search USING fts5(
+    episode_id UNINDEXED,
+    title,
+    summary,
+    transcript_text,
+    topics,
+    guest_names,
+    content='episode_search_content',
+    content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS episode_search_content_ai
+    AFTER INSERT ON episode_search_content
+BEGIN
+    INSERT INTO episodes_search (rowid, episode_id, title, summary, transcript_text, topics, guest_names)
+    VALUES (NEW.id, NEW.episode_id, NEW.title, NEW.summary, NEW.transcript_text, NEW.topics, NEW.guest_names);
+END;
+
+CREATE TRIGGER IF NOT EXISTS episode_search_content_ad
+    AFTER DELETE ON episode_search_content
+BEGIN
+    INSERT INTO episodes_search (episodes_search, rowid, episode_id, title, summary, transcript_text, topics, guest_names)
+    VALUES ('delete', OLD.id, OLD.episode_id, OLD.title, OLD.summary, OLD.transcript_text, OLD.topics, OLD.guest_names);
+END;
+
+-- Re-saving an episode whose text did not change leaves the index untouched
+CREATE TRIGGER IF NOT EXISTS episode_search_content_au
+    AFTER UPDATE ON episode_search_content
+    WHEN OLD.title IS NOT NEW.title
+      OR OLD.summary IS NOT NEW.summary
+      OR OLD.transcript_text IS NOT NEW.transcript_text
+      OR OLD.topics IS NOT NEW.topics
+      OR OLD.guest_names IS NOT NEW.guest_names
+BEGIN
+    INSERT INTO episodes_search (episodes_search, rowid, episode_id, title, summary, transcript_text, topics, guest_names)
+    VALUES ('delete', OLD.id, OLD.episode_id, OLD.title, OLD.summary, OLD.transcript_text, OLD.topics, OLD.guest_names);
+    INSERT INTO episodes_search (rowid, episode_id, title, summary, transcript_text, topics, guest_names)
+    VALUES (NEW.id, NEW.episode_id, NEW.title, NEW.summary, NEW.transcript_text, NEW.topics, NEW.guest_names);
+END;
+
+INSERT OR IGNORE INTO episode_search_content (episode_id, title, summary, transcript_text, topics, guest_names)
+SELECT jmi.episode_id,
+       coalesce(jmi.title, ''),
+       coalesce((SELECT json_extract(ec.data, '$.summary') FROM episode_content ec
+                 WHERE ec.episode_id = jmi.episode_id AND ec.part = 'editorial'), ''),
+       coalesce((SELECT json_extract(ec.data, '$.text') FROM episode_content ec
+                 WHERE ec.episode_id = jmi.episode_id AND ec.part = 'transcription'), ''),
+       coalesce((SELECT group_concat(topic, ' ') FROM episode_topics et
+                 WHERE et.episode_id = jmi.episode_id), ''),
+       coalesce((SELECT group_concat(guest_name, ' ') FROM episode_guests eg
+                 WHERE eg.episode_id = jmi.episode_id), '')
+FROM json_metadata_index jmi;
+            ''',
+
+            14: '''
+-- One asset per clip variant, so re-rendering replaces the row instead of adding another
+DELETE FROM clip_assets
+WHERE rowid NOT IN (SELECT MAX(rowid) FROM clip_assets GROUP BY clip_id, variant, aspect_ratio);
+
+DROP INDEX IF EXISTS idx_clip_assets_clip_id;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_clip_assets_variant ON clip_assets(clip_id, variant, aspect_ratio);
+            ''',
+
+            15: '''
+-- Every suffix of each guest name and topic, so partial-match filters become prefix ranges on an index
+CREATE TABLE IF NOT EXISTS episode_guest_suffixes (
+    episode_id TEXT NOT NULL,
+    suffix TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (episode_id, suffix),
+    FOREIGN KEY (episode_id) REFERENCES json_metadata_index(episode_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS episode_topic_suffixes (
+    episode_id TEXT NOT NULL,
+    suffix TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (episode_id, suffix),
+    FOREIGN KEY (episode_id) REFERENCES json_metadata_index(episode_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_episode_guest_suffixes ON episode_guest_suffixes(suffix, episode_id);
+CREATE INDEX IF NOT EXISTS idx_episode_topic_suffixes ON episode_topic_suffixes(suffix, episode_id);
+
+WITH RECURSIVE suffixes(episode_id, suffix) AS (
+    SELECT episode_id, guest_name FROM episode_guests
+    UNION ALL
+    SELECT episode_id, substr(suffix, 2) FROM suffixes WHERE length(suffix) > 1
+)
+INSERT OR IGNORE INTO episode_guest_suffixes (episode_id, suffix)
+SELECT episode_id, suffix FROM suffixes;
+
+WITH RECURSIVE suffixes(episode_id, suffix) AS (
+    SELECT episode_id, topic FROM episode_topics
+    UNION ALL
+    SELECT episode_id, substr(suffix, 2) FROM suffixes WHERE length(suffix) > 1
+)
+INSERT OR IGNORE INTO episode_topic_suffixes (episode_id, suffix)
+SELECT episode_id, suffix FROM suffixes;
+            ''',
+
+            16: '''
+-- Failed episodes back off before workers may claim them again
+ALTER TABLE episodes ADD COLUMN retry_after REAL;            -- epoch seconds
             '''
         }
     
@@ -421,6 +913,8 @@ class DatabaseManager:
         self.db_path = Path(self.config.path)
         self.connection: Optional[DatabaseConnection] = None
         self.migration: Optional[DatabaseMigration] = None
+        self._event_writer = None
+        self._event_writer_lock = threading.Lock()
         
         # Ensure database directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -485,43 +979,130 @@ class DatabaseManager:
             raise DatabaseError("Database not initialized. Call initialize() first.")
         return self.connection
     
-    def backup_database(self, backup_path: Optional[str] = None) -> str:
-        """Create database backup"""
+    def backup_database(self, backup_path: Optional[str] = None,
+                        compress: Optional[bool] = None,
+                        verify: Optional[bool] = None) -> str:
+        """
+        Create an online database backup
+        
+        Pages are copied in steps of backup_pages_per_step with the writer
+        released for backup_step_sleep_ms between steps, so stage writes are
+        not stalled for the length of the copy. The copy is checked with
+        PRAGMA quick_check, a digest of its page checksums is recorded in
+        backup_log, and it is optionally gzip-compressed.
+        
+        Args:
+            backup_path: Destination (defaults to a timestamped file next to
+                the database; '.gz' is appended when compressing)
+            compress: Gzip the backup (defaults to config.backup_compress)
+            verify: Re-read the written file and compare page checksums
+                (defaults to config.backup_verify)
+            
+        Returns:
+            str: Path of the backup file
+        """
         if not self.connection:
             raise DatabaseError("Database not initialized")
         
+        compress = self.config.backup_compress if compress is None else compress
+        verify = self.config.backup_verify if verify is None else verify
+        
         if backup_path is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = f"{self.db_path.stem}_backup_{timestamp}.db"
+            backup_path = self.db_path.parent / f"{self.db_path.stem}_backup_{timestamp}.db"
         
         backup_path = Path(backup_path)
+        if compress and backup_path.suffix != '.gz':
+            backup_path = backup_path.with_name(backup_path.name + '.gz')
         backup_path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = backup_path.with_name(backup_path.name + '.partial')
         
+        start_time = time.time()
         try:
-            # Use SQLite backup API for consistent backup
-            source_conn = self.connection.get_connection()
-            backup_conn = sqlite3.connect(str(backup_path))
+            backup_conn = sqlite3.connect(str(partial_path))
+            try:
+                self.connection.backup(
+                    backup_conn,
+                    pages=self.config.backup_pages_per_step,
+                    step_sleep=self.config.backup_step_sleep_ms / 1000
+                )
+                result = backup_conn.execute("PRAGMA quick_check").fetchone()[0]
+                if result != "ok":
+                    raise DatabaseError(f"Backup copy failed quick_check: {result}")
+                # Single-file copy regardless of the source's journal mode
+                backup_conn.execute("PRAGMA journal_mode = DELETE")
+            finally:
+                backup_conn.close()
             
-            source_conn.backup(backup_conn)
-            backup_conn.close()
+            if compress:
+                with open(partial_path, 'rb') as source, gzip.open(backup_path, 'wb', compresslevel=6) as target:
+                    checksum, page_count, page_size = _page_checksum(source, copy_to=target)
+                partial_path.unlink()
+            else:
+                with open(partial_path, 'rb') as source:
+                    checksum, page_count, page_size = _page_checksum(source)
+                partial_path.replace(backup_path)
             
-            # Record backup in log
             backup_size = backup_path.stat().st_size
             self.connection.execute_query(
-                "INSERT INTO backup_log (backup_path, backup_size) VALUES (?, ?)",
-                (str(backup_path), backup_size)
+                """INSERT INTO backup_log (backup_path, backup_size, page_count, page_size, checksum, compressed)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (str(backup_path), backup_size, page_count, page_size, checksum, int(compress))
             )
             
+            if verify and not self.verify_backup(str(backup_path)):
+                raise DatabaseError(f"Backup verification failed: {backup_path}")
+            
             logger.info("Database backup created successfully",
                        backup_path=str(backup_path),
-                       backup_size=backup_size)
+                       backup_size=backup_size,
+                       pages=page_count,
+                       compressed=compress,
+                       duration=time.time() - start_time)
             
             return str(backup_path)
             
         except Exception as e:
+            partial_path.unlink(missing_ok=True)
             logger.error("Database backup failed", error=str(e))
             raise DatabaseError(f"Failed to create database backup: {e}")
     
+    def verify_backup(self, backup_path: str) -> bool:
+        """
+        Check a backup file against the page checksums recorded when it was made
+        
+        Args:
+            backup_path: Backup file created by backup_database
+            
+        Returns:
+            bool: True if every page matches; False if the file is corrupt
+            or has no recorded checksum
+        """
+        backup_path = Path(backup_path)
+        row = self.connection.execute_query(
+            "SELECT id, checksum, page_count FROM backup_log WHERE backup_path = ? ORDER BY id DESC LIMIT 1",
+            (str(backup_path),)
+        ).fetchone()
+        if not row or not row['checksum']:
+            logger.warning("No checksum recorded for backup", backup_path=str(backup_path))
+            return False
+        
+        try:
+            with _open_backup(backup_path) as source:
+                checksum, page_count, _ = _page_checksum(source)
+        except (OSError, EOFError, ValueError) as e:
+            logger.error("Backup could not be read", backup_path=str(backup_path), error=str(e))
+            return False
+        
+        if (checksum, page_count) != (row['checksum'], row['page_count']):
+            logger.error("Backup checksum mismatch", backup_path=str(backup_path))
+            return False
+        
+        self.connection.execute_query(
+            "UPDATE backup_log SET verified_at = CURRENT_TIMESTAMP WHERE id = ?", (row['id'],)
+        )
+        return True
+    
     def restore_database(self, backup_path: str) -> None:
         """Restore database from backup"""
         backup_path = Path(backup_path)
@@ -531,6 +1112,9 @@ class DatabaseManager:
         
         try:
             # Close existing connections
+            if self._event_writer:
+                self._event_writer.stop()
+                self._event_writer = None
             if self.connection:
                 self.connection.close_connection()
             
@@ -541,7 +1125,8 @@ class DatabaseManager:
             
             # Copy backup to main location
             import shutil
-            shutil.copy2(backup_path, self.db_path)
+            with _open_backup(backup_path) as source, open(self.db_path, 'wb') as target:
+                shutil.copyfileobj(source, target, 1024 * 1024)
             
             # Reinitialize connection
             self.initialize()
@@ -566,6 +1151,9 @@ class DatabaseManager:
         try:
             stats = {}
             
+            if self._event_writer:
+                self._event_writer.flush()
+            
             # Table row counts
             cursor = self.connection.execute_query("SELECT COUNT(*) FROM episodes")
             stats['episodes_count'] = cursor.fetchone()[0]
@@ -585,19 +1173,77 @@ class DatabaseManager:
             )
             stats['stage_distribution'] = dict(cursor.fetchall())
             
+            stats['pool'] = self.connection.get_pool_stats()
+            
             return stats
             
         except Exception as e:
             logger.error("Failed to get database stats", error=str(e))
             raise DatabaseError(f"Failed to get database statistics: {e}")
     
+    def get_event_writer(self) -> 'ProcessingEventWriter':
+        """Shared batched writer for processing_log and processing_metrics rows"""
+        if not self.connection:
+            raise DatabaseError("Database not initialized. Call initialize() first.")
+        
+        with self._event_writer_lock:
+            if self._event_writer is None:
+                from .event_writer import ProcessingEventWriter
+                self._event_writer = ProcessingEventWriter(
+                    self.connection,
+                    flush_interval_ms=self.config.event_flush_interval_ms,
+                    batch_size=self.config.event_batch_size,
+                    max_queue_size=self.config.event_queue_size
+                )
+            return self._event_writer
+    
     def close(self) -> None:
-        """Close database connections"""
+        """Flush queued processing events and close database connections"""
+        if self._event_writer:
+            self._event_writer.stop()
+            self._event_writer = None
         if self.connection:
             self.connection.close_connection()
             logger.info("Database connections closed")
 
 
+def _open_backup(backup_path: Path):
+    """Open a backup file for reading, decompressing .gz backups"""
+    if backup_path.suffix == '.gz':
+        return gzip.open(backup_path, 'rb')
+    return open(backup_path, 'rb')
+
+
+def _page_checksum(source, copy_to=None) -> Tuple[str, int, int]:
+    """
+    Digest of the CRC32 of every page of a SQLite database file
+    
+    Args:
+        source: Binary stream positioned at the start of the database
+        copy_to: Optional stream that receives the bytes as they are read
+        
+    Returns:
+        (hex digest, page count, page size)
+    """
+    header = source.read(100)
+    if len(header) < 100 or not header.startswith(b"SQLite format 3\x00"):
+        raise ValueError("Not a SQLite database file")
+    page_size = int.from_bytes(header[16:18], 'big')
+    if page_size == 1:
+        page_size = 65536
+    
+    digest = hashlib.sha256()
+    page = header + source.read(page_size - len(header))
+    page_count = 0
+    while page:
+        if copy_to is not None:
+            copy_to.write(page)
+        digest.update(zlib.crc32(page).to_bytes(4, 'big'))
+        page_count += 1
+        page = source.read(page_size)
+    return digest.hexdigest(), page_count, page_size
+
+
 # Utility functions for common database operations
 def create_database_manager(config: DatabaseConfig) -> DatabaseManager:
     """Factory function to create and initialize database manager"""
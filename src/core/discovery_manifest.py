@@ -0,0 +1,212 @@
+"""
+Discovery manifest for the Video Processing Pipeline
+
+Remembers the content hash of every scanned video together with the file's
+identity (path, size, mtime, inode). Discovery only hashes files that are new
+or have changed since the last scan, instead of streaming every byte of the
+archive through SHA-256 on each run.
+
+In fast mode a new file is identified by a fingerprint (size plus sampled
+head, middle and tail blocks) and its full SHA-256 is filled in later by
+``complete_full_hashes``.
+"""
+
+import hashlib
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from .database import DatabaseManager
+from .models import ContentHasher
+from .logging import get_logger
+
+logger = get_logger('pipeline.discovery_manifest')
+
+
+def compute_full_hash(file_path: Path, algorithm: str = 'sha256') -> str:
+    """Hash of the whole file, read in 1 MB chunks"""
+    hash_func = hashlib.new(algorithm)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            hash_func.update(chunk)
+    return hash_func.hexdigest()
+
+
+def compute_fingerprint(file_path: Path) -> str:
+    """Fast content fingerprint from the file size and sampled blocks"""
+    size = file_path.stat().st_size
+    sampled = ContentHasher.calculate_content_hash(file_path)
+    return hashlib.sha256(f"{size}:{sampled}".encode()).hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """Stored identity and hashes of one file"""
+    path: str
+    file_size: int
+    mtime_ns: int
+    inode: int
+    fingerprint: str
+    full_hash: Optional[str]
+
+    @property
+    def content_hash(self) -> str:
+        """Hash used as the episode content hash (full hash once known)"""
+        return self.full_hash or self.fingerprint
+
+    def matches(self, stat: os.stat_result) -> bool:
+        """Whether the file is unchanged since it was hashed"""
+        return (self.file_size == stat.st_size and
+                self.mtime_ns == stat.st_mtime_ns and
+                self.inode == stat.st_ino)
+
+
+class DiscoveryManifest:
+    """Manifest of hashed files stored in the pipeline database"""
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
+        self.connection = db_manager.get_connection()
+
+    @staticmethod
+    def _key(file_path: Path) -> str:
+        return str(Path(file_path).resolve())
+
+    def get(self, file_path: Path) -> Optional[ManifestEntry]:
+        """Stored entry for a path, whether or not the file has changed"""
+        cursor = self.connection.execute_query(
+            """SELECT path, file_size, mtime_ns, inode, fingerprint, full_hash
+               FROM discovery_manifest WHERE path = ?""",
+            (self._key(file_path),)
+        )
+        row = cursor.fetchone()
+        return ManifestEntry(*row) if row else None
+
+    def resolve(self, file_path: Path, fast: bool = False) -> ManifestEntry:
+        """
+        Content hash entry for a file, hashing it only if new or changed
+
+        Args:
+            file_path: Video file
+            fast: Record only the fingerprint for new files; the full hash
+                is left for complete_full_hashes
+
+        Returns:
+            ManifestEntry: Entry whose content_hash identifies the file
+        """
+        file_path = Path(file_path)
+        stat = file_path.stat()
+
+        entry = self.get(file_path)
+        if entry and entry.matches(stat):
+            if entry.full_hash or fast:
+                return entry
+            # Fingerprinted in an earlier fast scan; full hash now required
+            return self.set_full_hash(file_path, compute_full_hash(file_path)) or entry
+
+        entry = ManifestEntry(
+            path=self._key(file_path),
+            file_size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            inode=stat.st_ino,
+            fingerprint=compute_fingerprint(file_path),
+            full_hash=None if fast else compute_full_hash(file_path)
+        )
+
+        with self.connection.transaction() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO discovery_manifest
+                   (path, file_size, mtime_ns, inode, fingerprint, full_hash, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (entry.path, entry.file_size, entry.mtime_ns, entry.inode,
+                 entry.fingerprint, entry.full_hash, time.time())
+            )
+
+        logger.debug("Hashed file for discovery",
+                    path=entry.path, fast=fast, size=entry.file_size)
+        return entry
+
+    def set_full_hash(self, file_path: Path, full_hash: str) -> Optional[ManifestEntry]:
+        """Record the full hash of a fingerprinted file if it is still unchanged"""
+        file_path = Path(file_path)
+        stat = file_path.stat()
+
+        with self.connection.transaction() as conn:
+            cursor = conn.execute(
+                """UPDATE discovery_manifest SET full_hash = ?, updated_at = ?
+                   WHERE path = ? AND file_size = ? AND mtime_ns = ? AND inode = ?""",
+                (full_hash, time.time(), self._key(file_path), stat.st_size, stat.st_mtime_ns, stat.st_ino)
+            )
+            if cursor.rowcount == 0:
+                return None
+
+        return self.get(file_path)
+
+    def pending_full_hashes(self, limit: int = 100) -> List[ManifestEntry]:
+        """Fingerprinted entries still waiting for their full hash"""
+        cursor = self.connection.execute_query(
+            """SELECT path, file_size, mtime_ns, inode, fingerprint, full_hash
+               FROM discovery_manifest WHERE full_hash IS NULL
+               ORDER BY updated_at LIMIT ?""",
+            (limit,)
+        )
+        return [ManifestEntry(*row) for row in cursor.fetchall()]
+
+    def forget(self, file_path: Path) -> None:
+        """Drop the entry for a path (e.g. a deleted file)"""
+        with self.connection.transaction() as conn:
+            conn.execute("DELETE FROM discovery_manifest WHERE path = ?", (self._key(file_path),))
+
+    def complete_full_hashes(self, registry, max_files: Optional[int] = None) -> int:
+        """
+        Compute full hashes for fingerprinted files
+
+        Episodes registered under a file's fingerprint are moved to its full
+        hash. Runs in the background after a fast discovery scan.
+
+        Args:
+            registry: EpisodeRegistry holding episodes to update
+            max_files: Stop after this many files (None for all pending)
+
+        Returns:
+            int: Number of files whose full hash was recorded
+        """
+        completed = 0
+        while max_files is None or completed < max_files:
+            batch = self.pending_full_hashes(limit=10 if max_files is None else min(10, max_files - completed))
+            if not batch:
+                break
+
+            # Every entry in the batch is either completed or dropped
+            for entry in batch:
+                file_path = Path(entry.path)
+                try:
+                    full_hash = compute_full_hash(file_path)
+                    updated = self.set_full_hash(file_path, full_hash)
+                except FileNotFoundError:
+                    self.forget(file_path)
+                    continue
+
+                if updated is None:
+                    # Changed while hashing; the next scan fingerprints it again
+                    self.forget(file_path)
+                    continue
+
+                completed += 1
+                episode = registry.get_episode_by_hash(entry.fingerprint)
+                if episode:
+                    try:
+                        registry.update_episode_hash(
+                            episode.episode_id, full_hash, episode.source.file_size, episode.source.last_modified
+                        )
+                    except Exception as e:
+                        # e.g. the full hash reveals a duplicate of another episode
+                        logger.warning("Could not replace fingerprint with full hash",
+                                      episode_id=episode.episode_id, error=str(e))
+
+        if completed:
+            logger.info("Completed full hashes for fingerprinted files", files=completed)
+        return completed
+
@@ -0,0 +1,525 @@
+"""
+Incremental discovery watcher for the Video Processing Pipeline
+
+Keeps an in-memory view of candidate video files in the configured sources
+and registers each file once it has stopped changing. Discovery work is then
+proportional to what changed rather than to the size of the archive, and
+``discover_episodes`` can answer from the view without walking any tree.
+
+On Linux, sources on local filesystems are watched with inotify. Network
+shares (NFS, SMB) do not deliver inotify events for writes made by other
+hosts, so those sources, and every source on other platforms, fall back to
+periodic polling with a stat-only diff.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from .config import SourceConfig
+from .discovery import PatternMatcher
+from .exceptions import DiscoveryError
+from .logging import get_logger
+from .models import EpisodeObject
+from .path_utils import normalize_path
+
+logger = get_logger('pipeline.discovery_watcher')
+
+# inotify event bits (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+               IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR)
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+# Filesystems whose remote writes never reach the local inotify queue
+_NETWORK_FILESYSTEMS = {'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', '9p', 'fuse.sshfs', 'afs', 'ceph'}
+
+# (changed paths, removed paths); None means events were lost and a rescan is needed
+FileChanges = Optional[Tuple[Set[str], Set[str]]]
+
+
+def _walk_files(root: str) -> Iterator[str]:
+    """Yield every regular file below root, skipping unreadable directories"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.debug("Skipping unreadable directory", directory=directory, error=str(e))
+
+
+def _filesystem_type(path: str) -> Optional[str]:
+    """Filesystem type of the mount holding path, from the longest matching mount point"""
+    try:
+        import psutil
+        partitions = psutil.disk_partitions(all=True)
+    except Exception:
+        return None
+
+    path = os.path.realpath(path)
+    best = None
+    for partition in partitions:
+        mountpoint = partition.mountpoint
+        if path == mountpoint or path.startswith(mountpoint.rstrip(os.sep) + os.sep):
+            if best is None or len(mountpoint) > len(best.mountpoint):
+                best = partition
+    return best.fstype if best else None
+
+
+def inotify_supported(path: str) -> bool:
+    """Whether changes below path are reliably reported by inotify"""
+    if not sys.platform.startswith('linux'):
+        return False
+    return (_filesystem_type(path) or '').lower() not in _NETWORK_FILESYSTEMS
+
+
+class PollingBackend:
+    """Detects changes by diffing file sizes and mtimes every interval"""
+
+    name = "poll"
+
+    def __init__(self, roots: List[str], interval_seconds: float):
+        self.roots = roots
+        self.interval_seconds = interval_seconds
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        self._next_scan = 0.0
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for root in self.roots:
+            for path in _walk_files(root):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def start(self) -> List[str]:
+        """Take the initial snapshot and return every file found"""
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + self.interval_seconds
+        return list(self._snapshot)
+
+    def poll(self, timeout: float) -> FileChanges:
+        """Rescan if the interval has elapsed within timeout; otherwise report no changes"""
+        remaining = self._next_scan - time.monotonic()
+        if remaining > 0:
+            time.sleep(min(timeout, remaining))
+            if time.monotonic() < self._next_scan:
+                return set(), set()
+
+        snapshot = self._scan()
+        self._next_scan = time.monotonic() + self.interval_seconds
+        changed = {path for path, state in snapshot.items() if self._snapshot.get(path) != state}
+        removed = set(self._snapshot) - set(snapshot)
+        self._snapshot = snapshot
+        return changed, removed
+
+    @property
+    def watch_count(self) -> int:
+        return len(self.roots)
+
+    def close(self) -> None:
+        self._snapshot = {}
+
+
+class InotifyBackend:
+    """Receives change events from the Linux kernel through inotify"""
+
+    name = "inotify"
+
+    def __init__(self, roots: List[str]):
+        self.roots = roots
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise DiscoveryError(f"inotify_init1 failed: {os.strerror(errno)}")
+        self._watches: Dict[int, str] = {}
+
+    def _add_watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            # ENOSPC means fs.inotify.max_user_watches is exhausted
+            logger.warning("Could not watch directory", directory=directory, error=os.strerror(errno))
+            return
+        self._watches[wd] = directory
+
+    def _add_tree(self, root: str) -> List[str]:
+        """Watch root and every directory below it; return the files already present"""
+        files = []
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            # Watch before listing so files created in between are not missed
+            self._add_watch(directory)
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file():
+                                files.append(entry.path)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return files
+
+    def _remove_tree(self, root: str) -> None:
+        """Forget watches for a directory that was moved away"""
+        prefix = root.rstrip(os.sep) + os.sep
+        for wd, directory in list(self._watches.items()):
+            if directory == root or directory.startswith(prefix):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                self._watches.pop(wd, None)
+
+    def start(self) -> List[str]:
+        """Install watches on every root and return the files found"""
+        files = []
+        for root in self.roots:
+            files.extend(self._add_tree(root))
+        return files
+
+    def _read(self, timeout: float) -> bytes:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return b''
+        try:
+            return os.read(self._fd, 256 * 1024)
+        except BlockingIOError:
+            return b''
+
+    def poll(self, timeout: float) -> FileChanges:
+        """Wait up to timeout for events and translate them into path changes"""
+        changed: Set[str] = set()
+        removed: Set[str] = set()
+
+        data = self._read(timeout)
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b'\0')
+            offset += _EVENT_HEADER.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                logger.warning("inotify queue overflowed, rescanning sources")
+                return None
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+
+            if mask & IN_DELETE_SELF:
+                removed.add(directory)
+            elif mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    changed.update(self._add_tree(path))
+                elif mask & IN_MOVED_FROM:
+                    self._remove_tree(path)
+                    removed.add(path)
+                elif mask & IN_DELETE:
+                    removed.add(path)
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                removed.add(path)
+                changed.discard(path)
+            else:
+                changed.add(path)
+                removed.discard(path)
+
+        return changed, removed
+
+    @property
+    def watch_count(self) -> int:
+        return len(self._watches)
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._watches = {}
+
+
+@dataclass
+class _Candidate:
+    """A matching file that has not been registered since it last changed"""
+    last_change: float  # Wall-clock time of the last observed change
+
+
+class DiscoveryWatcher:
+    """
+    Watches source directories and registers stable new files
+
+    A file is registered once neither an event nor its mtime shows a change
+    for ``stability_seconds``. Registered files stay in the view until they
+    are deleted; a later change makes them candidates again.
+    """
+
+    def __init__(self, sources: List[SourceConfig],
+                 register: Callable[[List[Path]], List[Optional[EpisodeObject]]],
+                 stability_seconds: float = 300,
+                 backend: str = "auto",
+                 poll_interval_seconds: float = 300,
+                 tick_seconds: float = 1.0,
+                 register_batch_size: int = 50):
+        """
+        Initialize discovery watcher
+
+        Args:
+            sources: Source directories to watch (disabled sources are skipped)
+            register: Registers a batch of stable files, returning the episode
+                for each path or None if registration failed
+            stability_seconds: Quiet period before a file is registered
+            backend: "auto", "inotify" or "poll"
+            poll_interval_seconds: Rescan interval for polled sources
+            tick_seconds: Longest wait for events before checking stability
+            register_batch_size: Files passed to register per call
+        """
+        if backend not in ('auto', 'inotify', 'poll'):
+            raise DiscoveryError(f"Unknown watch backend: {backend}")
+
+        self.sources = [s for s in sources if s.enabled]
+        self.register = register
+        self.stability_seconds = stability_seconds
+        self.backend = backend
+        self.poll_interval_seconds = poll_interval_seconds
+        self.tick_seconds = tick_seconds
+        self.register_batch_size = register_batch_size
+
+        self._matchers: List[Tuple[str, PatternMatcher]] = []
+        self._backends: List = []
+        self._candidates: Dict[str, _Candidate] = {}
+        self._episodes: Dict[str, EpisodeObject] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._registered_count = 0
+        self._rescans = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the initial scan has been registered and the view is complete"""
+        return self.is_running and self._ready.is_set()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def _create_backends(self) -> None:
+        inotify_roots, polled_roots = [], []
+        for source in self.sources:
+            root = str(normalize_path(source.path))
+            if not os.path.isdir(root):
+                logger.warning("Watched source does not exist", path=root)
+                continue
+            self._matchers.append((root, PatternMatcher(source.include, source.exclude)))
+
+            use_inotify = self.backend == 'inotify' or (self.backend == 'auto' and inotify_supported(root))
+            (inotify_roots if use_inotify else polled_roots).append(root)
+
+        if inotify_roots:
+            try:
+                self._backends.append(InotifyBackend(inotify_roots))
+            except (OSError, AttributeError, DiscoveryError) as e:
+                logger.warning("inotify unavailable, polling instead", error=str(e))
+                polled_roots.extend(inotify_roots)
+        if polled_roots:
+            self._backends.append(PollingBackend(polled_roots, self.poll_interval_seconds))
+
+    def _matches(self, path: str) -> bool:
+        for root, matcher in self._matchers:
+            if path.startswith(root.rstrip(os.sep) + os.sep):
+                return matcher.matches(path)
+        return False
+
+    def start(self) -> None:
+        """Install watches and start the watcher thread"""
+        if self.is_running:
+            return
+
+        self._stop.clear()
+        self._ready.clear()
+        self._create_backends()
+
+        self._thread = threading.Thread(target=self._run, name="discovery-watcher", daemon=True)
+        self._thread.start()
+        logger.info("Discovery watcher started",
+                   backends=[b.name for b in self._backends], sources=len(self._matchers))
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop the watcher thread and release its watches"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        for backend in self._backends:
+            backend.close()
+        self._backends = []
+        self._matchers = []
+        logger.info("Discovery watcher stopped")
+
+    def _run(self) -> None:
+        try:
+            for backend in self._backends:
+                self._seed(backend.start())
+            self._promote_stable()
+            self._ready.set()
+            logger.info("Discovery watcher ready",
+                       episodes=len(self._episodes), pending=len(self._candidates))
+
+            while not self._stop.is_set():
+                for index, backend in enumerate(self._backends):
+                    # Only the first backend blocks; the rest are checked in passing
+                    changes = backend.poll(self.tick_seconds if index == 0 else 0)
+                    if changes is None:
+                        self._rescan()
+                    else:
+                        self._apply(*changes)
+                if not self._backends:
+                    self._stop.wait(self.tick_seconds)
+                self._promote_stable()
+        except Exception as e:
+            logger.error("Discovery watcher failed", error=str(e))
+            raise
+
+    def _seed(self, paths: List[str]) -> None:
+        """Add files found by a full scan; old files are stable straight away"""
+        with self._lock:
+            for path in paths:
+                if path in self._episodes or not self._matches(path):
+                    continue
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    continue
+                self._candidates[path] = _Candidate(last_change=mtime)
+
+    def _rescan(self) -> None:
+        """Rebuild the view after events were lost"""
+        self._rescans += 1
+        present: Set[str] = set()
+        for root, _matcher in self._matchers:
+            present.update(path for path in _walk_files(root) if self._matches(path))
+
+        with self._lock:
+            for path in set(self._episodes) - present:
+                del self._episodes[path]
+            for path in set(self._candidates) - present:
+                del self._candidates[path]
+            for path in present:
+                # Anything could have changed while events were dropped
+                self._episodes.pop(path, None)
+                self._candidates.setdefault(path, _Candidate(last_change=time.time()))
+
+    def _apply(self, changed: Set[str], removed: Set[str]) -> None:
+        if not changed and not removed:
+            return
+
+        now = time.time()
+        with self._lock:
+            for path in removed:
+                prefix = path.rstrip(os.sep) + os.sep
+                for view in (self._candidates, self._episodes):
+                    for known in [p for p in view if p == path or p.startswith(prefix)]:
+                        del view[known]
+
+            for path in changed:
+                if not self._matches(path):
+                    continue
+                self._episodes.pop(path, None)
+                self._candidates[path] = _Candidate(last_change=now)
+
+    def _promote_stable(self) -> None:
+        """Register candidates that have been quiet for the stability window"""
+        now = time.time()
+        stable: List[str] = []
+
+        with self._lock:
+            for path, candidate in list(self._candidates.items()):
+                if now - candidate.last_change < self.stability_seconds:
+                    continue
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    del self._candidates[path]
+                    continue
+                if now - mtime < self.stability_seconds:
+                    # Written to without an event (e.g. polled share); wait for the mtime
+                    candidate.last_change = mtime
+                    continue
+                stable.append(path)
+
+        for start in range(0, len(stable), self.register_batch_size):
+            if self._stop.is_set():
+                return
+            batch = stable[start:start + self.register_batch_size]
+            episodes = self.register([Path(p) for p in batch])
+
+            with self._lock:
+                for path, episode in zip(batch, episodes):
+                    candidate = self._candidates.get(path)
+                    if candidate is None or candidate.last_change > now:
+                        continue  # Removed or changed again while registering
+                    if episode is None:
+                        # Retry after another stability window
+                        candidate.last_change = time.time()
+                        continue
+                    del self._candidates[path]
+                    self._episodes[path] = episode
+                    self._registered_count += 1
+
+    def get_episodes(self) -> List[EpisodeObject]:
+        """Episodes for every registered file currently in the sources"""
+        with self._lock:
+            return list(self._episodes.values())
+
+    def get_stats(self) -> Dict[str, object]:
+        """Watcher state for status endpoints"""
+        with self._lock:
+            return {
+                'running': self.is_running,
+                'ready': self._ready.is_set(),
+                'backends': [{'name': b.name, 'watches': b.watch_count} for b in self._backends],
+                'episodes': len(self._episodes),
+                'pending': len(self._candidates),
+                'registered': self._registered_count,
+                'rescans': self._rescans
+            }
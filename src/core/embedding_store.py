@@ -0,0 +1,303 @@
+"""
+Content-addressed sentence embedding store
+
+Embeddings are keyed by hash(model name, normalized sentence text), so a
+sentence is embedded once per model no matter which episode, transcript
+revision or component asks for it. Correcting one sentence of a transcript
+only embeds that sentence again.
+
+Vectors are stored as float16 in fixed-capacity ``.npy`` shards that are
+appended to and read through memory maps; only the rows a caller asks for
+are paged in. A small SQLite index maps keys to (shard, row) and records how
+many rows of each shard are committed. Appends hold the index's write lock,
+so several worker processes can share one store directory.
+
+Layout:
+    {store_dir}/index.db                 key -> (shard, row), shard fill levels
+    {store_dir}/shards/{shard:06d}.npy   float16 vectors (capacity, dim)
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import unicodedata
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .logging import get_logger
+
+logger = get_logger('clip_generation.embedding_store')
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class EmbeddingStore:
+    """
+    Sentence embedding store shared by every component that embeds text
+
+    Use ``embed`` with the component's encode function: cached vectors are
+    read from the shards, only unseen (and de-duplicated) sentences are
+    passed to the encoder, and the new vectors are appended for next time.
+    """
+
+    def __init__(self, store_dir: Path, shard_rows: int = 16384):
+        """
+        Initialize embedding store
+
+        Args:
+            store_dir: Root directory of the store
+            shard_rows: Number of vectors per shard file
+        """
+        self.store_dir = Path(store_dir)
+        self.shard_dir = self.store_dir / "shards"
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        self.shard_rows = shard_rows
+        self._index_path = self.store_dir / "index.db"
+        self._shards: Dict[int, np.memmap] = {}
+        self._lock = threading.Lock()
+
+        with self._index() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS shards (
+                    shard INTEGER PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    dim INTEGER NOT NULL,
+                    capacity INTEGER NOT NULL,
+                    rows INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS vectors (
+                    key TEXT PRIMARY KEY,
+                    shard INTEGER NOT NULL,
+                    row INTEGER NOT NULL
+                ) WITHOUT ROWID
+            """)
+
+    @contextmanager
+    def _index(self):
+        """Autocommit connection to the key index"""
+        conn = sqlite3.connect(str(self._index_path), timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Unicode-normalize a sentence and collapse its whitespace"""
+        return _WHITESPACE.sub(' ', unicodedata.normalize('NFKC', text)).strip()
+
+    @classmethod
+    def compute_key(cls, model_name: str, text: str) -> str:
+        """Store key for a sentence embedded with the given model"""
+        content = f"{model_name}\0{cls.normalize_text(text)}"
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()[:32]
+
+    def _shard_path(self, shard: int) -> Path:
+        return self.shard_dir / f"{shard:06d}.npy"
+
+    def _open_shard(self, shard: int) -> np.memmap:
+        """Read-only memory map of a shard, opened once per process"""
+        with self._lock:
+            vectors = self._shards.get(shard)
+            if vectors is None:
+                vectors = np.load(self._shard_path(shard), mmap_mode='r')
+                self._shards[shard] = vectors
+            return vectors
+
+    def get_many(self, model_name: str, texts: Sequence[str]) -> Tuple[List[Optional[np.ndarray]], int]:
+        """
+        Look up stored vectors for sentences
+
+        Args:
+            model_name: Embedding model name
+            texts: Sentence texts
+
+        Returns:
+            Tuple of (float16 vector or None per text, number of hits)
+        """
+        keys = [self.compute_key(model_name, text) for text in texts]
+        with self._index() as conn:
+            rows = conn.execute(
+                "SELECT key, shard, row FROM vectors WHERE key IN (SELECT value FROM json_each(?))",
+                (json.dumps(sorted(set(keys))),)
+            ).fetchall()
+
+        locations = {key: (shard, row) for key, shard, row in rows}
+        by_shard: Dict[int, List[Tuple[int, int]]] = {}
+        for position, key in enumerate(keys):
+            if key in locations:
+                shard, row = locations[key]
+                by_shard.setdefault(shard, []).append((position, row))
+
+        vectors: List[Optional[np.ndarray]] = [None] * len(keys)
+        for shard, entries in by_shard.items():
+            block = self._open_shard(shard)[[row for _, row in entries]]
+            for (position, _), vector in zip(entries, block):
+                vectors[position] = vector
+
+        return vectors, sum(len(entries) for entries in by_shard.values())
+
+    def put_many(self, model_name: str, texts: Sequence[str], vectors: np.ndarray) -> int:
+        """
+        Append vectors for sentences that are not stored yet
+
+        Args:
+            model_name: Embedding model name
+            texts: Sentence texts
+            vectors: Embeddings, one row per text
+
+        Returns:
+            int: Number of vectors appended
+        """
+        vectors = np.asarray(vectors, dtype=np.float16)
+        if vectors.ndim != 2 or vectors.shape[0] != len(texts):
+            raise ValueError("vectors must have one row per text")
+
+        pending: Dict[str, int] = {}
+        for position, text in enumerate(texts):
+            pending.setdefault(self.compute_key(model_name, text), position)
+        if not pending:
+            return 0
+        dim = vectors.shape[1]
+
+        with self._index() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                existing = conn.execute(
+                    "SELECT key FROM vectors WHERE key IN (SELECT value FROM json_each(?))",
+                    (json.dumps(list(pending)),)
+                ).fetchall()
+                for (key,) in existing:
+                    del pending[key]
+
+                items = list(pending.items())
+                while items:
+                    shard, rows, capacity = self._writable_shard(conn, model_name, dim)
+                    chunk, items = items[:capacity - rows], items[capacity - rows:]
+
+                    shard_vectors = np.load(self._shard_path(shard), mmap_mode='r+')
+                    shard_vectors[rows:rows + len(chunk)] = vectors[[position for _, position in chunk]]
+                    shard_vectors.flush()
+                    del shard_vectors
+
+                    conn.executemany(
+                        "INSERT INTO vectors (key, shard, row) VALUES (?, ?, ?)",
+                        [(key, shard, rows + offset) for offset, (key, _) in enumerate(chunk)]
+                    )
+                    conn.execute("UPDATE shards SET rows = ? WHERE shard = ?", (rows + len(chunk), shard))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+        if pending:
+            logger.debug("Stored sentence embeddings", model_name=model_name, vectors=len(pending))
+        return len(pending)
+
+    def _writable_shard(self, conn: sqlite3.Connection, model_name: str, dim: int) -> Tuple[int, int, int]:
+        """Shard with free rows for the model, creating one if needed"""
+        row = conn.execute(
+            """SELECT shard, rows, capacity FROM shards
+               WHERE model = ? AND dim = ? AND rows < capacity
+               ORDER BY shard DESC LIMIT 1""",
+            (model_name, dim)
+        ).fetchone()
+        if row is not None:
+            return row
+
+        shard = conn.execute("SELECT COALESCE(MAX(shard), -1) + 1 FROM shards").fetchone()[0]
+        np.lib.format.open_memmap(
+            self._shard_path(shard), mode='w+', dtype=np.float16, shape=(self.shard_rows, dim)
+        ).flush()
+        conn.execute(
+            "INSERT INTO shards (shard, model, dim, capacity, rows) VALUES (?, ?, ?, ?, 0)",
+            (shard, model_name, dim, self.shard_rows)
+        )
+        logger.info("Created embedding shard", shard=shard, model_name=model_name, dim=dim)
+        return shard, 0, self.shard_rows
+
+    def embed(self, model_name: str, texts: Sequence[str],
+              encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Embeddings for sentences, encoding only the ones not stored yet
+
+        Args:
+            model_name: Embedding model name
+            texts: Sentence texts
+            encode: Function embedding a list of texts into an (n, dim) array
+
+        Returns:
+            float32 array of embeddings in the order of ``texts``
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        try:
+            cached, hits = self.get_many(model_name, texts)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            logger.warning("Embedding store lookup failed", error=str(e))
+            cached, hits = [None] * len(texts), 0
+
+        missing: Dict[str, List[int]] = {}
+        for position, vector in enumerate(cached):
+            if vector is None:
+                missing.setdefault(self.normalize_text(texts[position]), []).append(position)
+
+        if missing:
+            unseen = list(missing)
+            # Round fresh vectors like stored ones so results do not depend on cache state
+            encoded = np.asarray(encode(unseen)).astype(np.float16)
+            for text, vector in zip(unseen, encoded):
+                for position in missing[text]:
+                    cached[position] = vector
+            try:
+                self.put_many(model_name, unseen, encoded)
+            except (OSError, ValueError, sqlite3.Error) as e:
+                logger.warning("Failed to store sentence embeddings", error=str(e))
+
+        logger.info("Sentence embeddings resolved",
+                   model_name=model_name,
+                   sentences=len(texts),
+                   cached=hits,
+                   encoded=len(missing))
+
+        return np.vstack(cached).astype(np.float32)
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Vector counts, shard counts and sizes per model"""
+        with self._index() as conn:
+            rows = conn.execute(
+                "SELECT model, dim, COUNT(*), SUM(rows), SUM(capacity) FROM shards GROUP BY model, dim"
+            ).fetchall()
+        return {
+            model: {'dim': dim, 'shards': shards, 'vectors': vectors, 'size_bytes': capacity * dim * 2}
+            for model, dim, shards, vectors, capacity in rows
+        }
+
+
+_stores: Dict[str, EmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(store_dir: Optional[Path] = None) -> EmbeddingStore:
+    """
+    Process-wide embedding store for a directory
+
+    Topic segmentation, editorial related-content search and highlight
+    scoring share vectors by asking for the same store directory.
+    """
+    path = Path(store_dir or Path("data") / "cache" / "embeddings").resolve()
+    with _stores_lock:
+        store = _stores.get(str(path))
+        if store is None:
+            store = EmbeddingStore(path)
+            _stores[str(path)] = store
+        return store
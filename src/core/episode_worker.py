@@ -0,0 +1,176 @@
+"""
+Headless episode worker for multi-node processing
+
+Several workers, on one machine or on several hosts that share the data
+directory and pipeline database, drain the same EpisodeRegistry. Each worker
+leases an episode, processes it to the target stage while heartbeating the
+lease, and releases it. Stage transitions are checkpointed in the registry,
+so an episode whose worker died is reclaimed after its lease expires and
+resumes from the last completed stage on another node.
+
+The shared database must live on a filesystem with working POSIX locks.
+"""
+
+import asyncio
+import os
+import socket
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from .logging import get_logger
+from .models import EpisodeObject, ProcessingStage
+from .stage_scheduler import StageScheduler, set_current_scheduler, reset_current_scheduler
+
+logger = get_logger('pipeline.worker')
+
+
+@dataclass
+class WorkerStats:
+    """Counters for a worker run"""
+    claimed: int = 0
+    processed: int = 0
+    failed: int = 0
+    lost_leases: int = 0
+
+
+def default_worker_id() -> str:
+    """Worker identifier recorded as lease owner (host:pid:suffix)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class EpisodeWorker:
+    """
+    Claims episodes from the registry and processes them
+
+    Runs up to ``concurrency`` episodes at once, with their stages sharing
+    one StageScheduler like a batch run.
+    """
+
+    def __init__(self, orchestrator, target_stage: ProcessingStage = ProcessingStage.RENDERED,
+                 worker_id: Optional[str] = None, concurrency: Optional[int] = None):
+        """
+        Initialize episode worker
+
+        Args:
+            orchestrator: PipelineOrchestrator used to process claimed episodes
+            target_stage: Stage claimed episodes are processed to
+            worker_id: Lease owner identifier (defaults to host:pid)
+            concurrency: Episodes processed at once (defaults to
+                processing.max_concurrent_episodes)
+        """
+        processing = orchestrator.config.processing
+
+        self.orchestrator = orchestrator
+        self.registry = orchestrator.get_registry()
+        self.target_stage = target_stage
+        self.worker_id = worker_id or default_worker_id()
+        self.concurrency = concurrency or processing.max_concurrent_episodes
+        self.lease_seconds = processing.worker_lease_seconds
+        self.poll_interval = processing.worker_poll_interval_seconds
+        self.max_attempts = max(1, processing.max_retry_attempts)
+        self.retry_delay = processing.retry_delay_seconds
+        self.stats = WorkerStats()
+        self._stop_event = asyncio.Event()
+        self._claimed_budget: Optional[int] = None
+
+    def request_stop(self) -> None:
+        """Stop claiming new episodes; episodes in progress are finished"""
+        self._stop_event.set()
+
+    async def run(self, max_episodes: Optional[int] = None, exit_when_idle: bool = False) -> WorkerStats:
+        """
+        Claim and process episodes until stopped
+
+        Args:
+            max_episodes: Stop after claiming this many episodes
+            exit_when_idle: Stop once no episode is claimable
+
+        Returns:
+            WorkerStats: Counters for this run
+        """
+        self._claimed_budget = max_episodes
+        scheduler = StageScheduler(self.orchestrator.config.processing.stage_pool_sizes)
+
+        logger.info("Worker started",
+                   worker_id=self.worker_id,
+                   target_stage=self.target_stage.value,
+                   concurrency=self.concurrency,
+                   lease_seconds=self.lease_seconds)
+
+        token = set_current_scheduler(scheduler)
+        try:
+            await asyncio.gather(*(
+                self._claim_loop(exit_when_idle) for _ in range(self.concurrency)
+            ))
+        finally:
+            reset_current_scheduler(token)
+
+        logger.info("Worker stopped",
+                   worker_id=self.worker_id,
+                   claimed=self.stats.claimed,
+                   processed=self.stats.processed,
+                   failed=self.stats.failed)
+        return self.stats
+
+    async def _claim_loop(self, exit_when_idle: bool) -> None:
+        """One processing slot: claim, process, release, repeat"""
+        while not self._stop_event.is_set():
+            if self._claimed_budget is not None and self._claimed_budget <= 0:
+                return
+
+            episode = self.registry.claim_next_episode(
+                self.worker_id, self.target_stage, self.lease_seconds, self.max_attempts
+            )
+
+            if episode is None:
+                if exit_when_idle:
+                    return
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self.stats.claimed += 1
+            if self._claimed_budget is not None:
+                self._claimed_budget -= 1
+
+            await self._process_claimed(episode)
+
+    async def _process_claimed(self, episode: EpisodeObject) -> None:
+        """Process a leased episode, heartbeating until it is released"""
+        episode_id = episode.episode_id
+        heartbeat_task = asyncio.create_task(self._heartbeat(episode_id))
+        error = None
+
+        try:
+            result = await self.orchestrator.process_episode(episode_id, self.target_stage)
+            if not result.success:
+                error = result.error or "Processing failed"
+        except Exception as e:
+            error = str(e)
+        finally:
+            heartbeat_task.cancel()
+
+        if not self.registry.release_episode_lease(episode_id, self.worker_id, error, self.retry_delay):
+            self.stats.lost_leases += 1
+            logger.warning("Lease was lost before release", episode_id=episode_id, worker_id=self.worker_id)
+
+        if error is None:
+            self.stats.processed += 1
+        else:
+            self.stats.failed += 1
+            logger.error("Worker failed to process episode",
+                        episode_id=episode_id,
+                        worker_id=self.worker_id,
+                        error=error)
+
+    async def _heartbeat(self, episode_id: str) -> None:
+        """Renew the lease at a third of its duration"""
+        interval = max(1.0, self.lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            if not self.registry.renew_episode_lease(episode_id, self.worker_id, self.lease_seconds):
+                logger.warning("Lost lease on episode", episode_id=episode_id, worker_id=self.worker_id)
+                return
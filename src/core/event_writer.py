@@ -0,0 +1,234 @@
+"""
+Batched writer for processing events and metrics
+
+processing_log and processing_metrics rows are small and frequent. Writing
+each one in its own immediate transaction makes them compete with stage
+writes for the database writer, so they are buffered in a bounded queue and
+flushed by a background thread in one transaction per batch.
+"""
+
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from .logging import get_logger
+
+logger = get_logger('pipeline.event_writer')
+
+_INSERT_EVENT = """
+    INSERT INTO processing_log
+    (episode_id, stage, status, duration_seconds, error_message)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_INSERT_METRIC = """
+    INSERT INTO processing_metrics (episode_id, stage, metric_name, metric_value)
+    VALUES (?, ?, ?, ?)
+"""
+
+# Queue item: (statement, params); a threading.Event marks a flush request
+_Row = Tuple[str, tuple]
+
+
+class ProcessingEventWriter:
+    """
+    Background writer for processing_log and processing_metrics rows
+
+    Rows are written every flush_interval_ms or as soon as batch_size rows
+    are buffered, whichever comes first. When max_queue_size rows are
+    waiting, callers block (backpressure) for up to enqueue_timeout_seconds
+    and then write their row themselves. stop() and interpreter exit flush
+    everything still queued.
+    """
+
+    def __init__(self, connection, flush_interval_ms: int = 200, batch_size: int = 500,
+                 max_queue_size: int = 10000, enqueue_timeout_seconds: float = 5.0):
+        self.connection = connection
+        self.flush_interval = flush_interval_ms / 1000
+        self.batch_size = batch_size
+        self.enqueue_timeout = enqueue_timeout_seconds
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        # Updated from producer threads and the flush thread
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'rows_written': 0,
+            'rows_dropped': 0,
+            'batches': 0,
+            'backpressure_waits': 0,
+            'direct_writes': 0
+        }
+
+    def start(self) -> None:
+        """Start the flush thread (idempotent)"""
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="processing-event-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Flush every queued row and stop the flush thread"""
+        with self._start_lock:
+            thread = self._thread
+            if not thread:
+                return
+            self._stop_event.set()
+            thread.join(timeout)
+            self._thread = None
+            atexit.unregister(self.stop)
+
+        # Rows enqueued while the thread was exiting
+        self._write_batch(self._drain(), final=True)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def log_event(self, episode_id: str, stage: str, status: str,
+                  duration: Optional[float] = None,
+                  error_message: Optional[str] = None) -> None:
+        """Queue a processing_log row"""
+        self._put((_INSERT_EVENT, (episode_id, stage, status, duration, error_message)))
+
+    def record_metric(self, episode_id: str, stage: str, metric_name: str, value: float) -> None:
+        """Queue a processing_metrics row"""
+        self._put((_INSERT_METRIC, (episode_id, stage, metric_name, float(value))))
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """
+        Wait until every row queued before the call is written
+
+        Returns:
+            bool: False if the rows were not written within timeout
+        """
+        if self.connection.holds_writer():
+            # The flush thread would wait for this thread's transaction
+            return False
+        if not self.is_running():
+            self._write_batch(self._drain())
+            return True
+
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def get_stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['queued'] = self._queue.qsize()
+        return stats
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def _put(self, item: _Row) -> None:
+        if self.connection.holds_writer():
+            # Inside a transaction: the flush thread cannot write until it
+            # ends, so write the row as part of it instead of waiting
+            self._write_direct([item])
+            return
+
+        self.start()
+        try:
+            self._queue.put_nowait(item)
+            return
+        except queue.Full:
+            self._count('backpressure_waits')
+
+        try:
+            self._queue.put(item, timeout=self.enqueue_timeout)
+        except queue.Full:
+            logger.warning("Processing event queue full, writing synchronously",
+                          queued=self._queue.qsize())
+            self._write_batch([item])
+
+    def _drain(self) -> List[_Row]:
+        rows = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return rows
+            if isinstance(item, threading.Event):
+                item.set()
+            else:
+                rows.append(item)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            batch: List[_Row] = []
+            flush_requests: List[threading.Event] = []
+            deadline = None
+
+            while len(batch) < self.batch_size and not self._stop_event.is_set():
+                timeout = 0.1 if deadline is None else deadline - time.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    continue
+                if isinstance(item, threading.Event):
+                    flush_requests.append(item)
+                    break
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.time() + self.flush_interval
+
+            self._write_batch(batch)
+            for done in flush_requests:
+                done.set()
+
+        self._write_batch(self._drain(), final=True)
+
+    def _write_batch(self, rows: List[_Row], final: bool = False) -> None:
+        if not rows:
+            return
+        try:
+            with self.connection.transaction() as conn:
+                self._insert_rows(conn, rows)
+            self._count('batches')
+            if final:
+                logger.debug("Flushed processing events on shutdown", rows=len(rows))
+        except Exception as e:
+            self._count('rows_dropped', len(rows))
+            logger.error("Failed to write processing events",
+                        rows=len(rows),
+                        error=str(e))
+
+    def _write_direct(self, rows: List[_Row]) -> None:
+        self._count('direct_writes', len(rows))
+        self._insert_rows(self.connection.get_connection(), rows)
+
+    def _insert_rows(self, conn: sqlite3.Connection, rows: List[_Row]) -> None:
+        """Insert rows grouped by statement, one by one if the batch is rejected"""
+        for statement in (_INSERT_EVENT, _INSERT_METRIC):
+            params = [p for s, p in rows if s == statement]
+            if not params:
+                continue
+            conn.execute("SAVEPOINT processing_events")
+            try:
+                conn.executemany(statement, params)
+                conn.execute("RELEASE processing_events")
+                self._count('rows_written', len(params))
+            except sqlite3.IntegrityError:
+                # e.g. an event for an episode deleted before the flush
+                conn.execute("ROLLBACK TO processing_events")
+                conn.execute("RELEASE processing_events")
+                for row in params:
+                    try:
+                        conn.execute(statement, row)
+                        self._count('rows_written')
+                    except sqlite3.IntegrityError as e:
+                        self._count('rows_dropped')
+                        logger.warning("Dropped processing event", episode_id=row[0], error=str(e))
@@ -18,6 +18,7 @@ from .config import PipelineConfig
 from .logging import get_logger
 from .models import EpisodeObject, EnrichmentResult
 from .exceptions import ProcessingError, TransientError
+from .model_server import get_model_server_client
 
 logger = get_logger('pipeline.intelligence_chain')
 
@@ -199,40 +200,54 @@ class IntelligenceChainOrchestrator:
             # Prepare output file
             segments_file = temp_path / "diarization_segments.json"
             
-            # Build command
-            cmd = [
-                "python", str(self.diarize_script),
-                "--audio", audio_path,
-                "--segments_out", str(segments_file),
-                "--device", self.config.models.diarization_device,
-                "--merge_gap", "2.0"
-            ]
-            
-            # Add HF token if available
-            if self.config.hf_token:
-                cmd.extend(["--hf_token", self.config.hf_token])
-            
-            # Add number of speakers if configured
-            if self.config.models.num_speakers > 0:
-                cmd.extend(["--num_speakers", str(self.config.models.num_speakers)])
-            
-            # Execute command
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0:
-                error_msg = stderr.decode() if stderr else "Diarization process failed"
-                return ChainStageResult(
-                    stage=stage,
-                    success=False,
-                    error=error_msg,
-                    duration=time.time() - start_time
+            # A running model server keeps the pyannote pipeline warm
+            client = get_model_server_client()
+            if client is not None:
+                diarization_data = await asyncio.to_thread(
+                    client.diarize,
+                    audio_path,
+                    hf_token=self.config.hf_token,
+                    device=self.config.models.diarization_device,
+                    num_speakers=self.config.models.num_speakers if self.config.models.num_speakers > 0 else None,
+                    merge_gap=2.0
+                )
+                with open(segments_file, 'w', encoding='utf-8') as f:
+                    json.dump(diarization_data, f, indent=2)
+            else:
+                # Build command
+                cmd = [
+                    "python", str(self.diarize_script),
+                    "--audio", audio_path,
+                    "--segments_out", str(segments_file),
+                    "--device", self.config.models.diarization_device,
+                    "--merge_gap", "2.0"
+                ]
+                
+                # Add HF token if available
+                if self.config.hf_token:
+                    cmd.extend(["--hf_token", self.config.hf_token])
+                
+                # Add number of speakers if configured
+                if self.config.models.num_speakers > 0:
+                    cmd.extend(["--num_speakers", str(self.config.models.num_speakers)])
+                
+                # Execute command
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
                 )
+                
+                stdout, stderr = await process.communicate()
+                
+                if process.returncode != 0:
+                    error_msg = stderr.decode() if stderr else "Diarization process failed"
+                    return ChainStageResult(
+                        stage=stage,
+                        success=False,
+                        error=error_msg,
+                        duration=time.time() - start_time
+                    )
             
             # Load and validate results
             if not segments_file.exists():
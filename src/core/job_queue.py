@@ -1,19 +1,26 @@
 """
-Simple in-memory job queue for async processing
+Job queue for async processing
 
 Provides a lightweight job queue system without requiring Redis/Celery.
-For production, consider migrating to Celery + Redis.
+JobQueue keeps jobs in memory for single-process use; PersistentJobQueue
+stores them in the pipeline database so queued and running jobs survive
+restarts and several API or CLI workers can drain the same queue.
 """
 
+import os
+import json
+import time
 import uuid
+import socket
 import asyncio
 from datetime import datetime
 from enum import Enum
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Awaitable, List, Union
 from dataclasses import dataclass, field
 from collections import deque
 import threading
 from .logging import get_logger
+from .resource_manager import Priority
 
 logger = get_logger('pipeline.job_queue')
 
@@ -43,6 +50,11 @@ class Job:
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     webhook_url: Optional[str] = None
+    priority: int = Priority.NORMAL.value
+    attempts: int = 0
+    max_attempts: int = 1
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[float] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert job to dictionary"""
@@ -59,7 +71,10 @@ class Job:
             'created_at': self.created_at.isoformat(),
             'started_at': self.started_at.isoformat() if self.started_at else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
-            'eta_seconds': self.estimate_remaining_time()
+            'eta_seconds': self.estimate_remaining_time(),
+            'priority': self.priority,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts
         }
     
     def estimate_remaining_time(self) -> Optional[float]:
@@ -163,7 +178,7 @@ class JobQueue:
                 job.message = message
                 logger.debug(f"Job {job_id} progress: {progress}% - {stage}")
     
-    def mark_job_running(self, job_id: str):
+    def mark_job_running(self, job_id: str) -> bool:
         """Mark job as running"""
         with self.lock:
             job = self.jobs.get(job_id)
@@ -172,6 +187,8 @@ class JobQueue:
                 job.started_at = datetime.now()
                 self.running_jobs[job_id] = job
                 logger.info(f"Job started: {job_id}")
+                return True
+        return False
     
     def mark_job_completed(
         self,
@@ -330,11 +347,544 @@ class JobQueue:
                 logger.info(f"Cleaned up {len(jobs_to_remove)} old jobs")
 
 
+class PersistentJobQueue:
+    """
+    SQLite-backed job queue stored in the pipeline database
+    
+    Jobs survive API restarts and can be drained by several processes at
+    once. Workers claim jobs atomically with ``UPDATE ... RETURNING``, hold
+    a lease they extend with heartbeats, and leases from crashed workers
+    are reclaimed once they expire. Failed jobs are retried with
+    exponential backoff until ``max_attempts`` is reached.
+    """
+    
+    _TERMINAL_STATUSES = (JobStatus.COMPLETED.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value)
+    
+    def __init__(self, db_manager, max_workers: int = 2,
+                 lease_seconds: float = 300.0,
+                 retry_base_delay: float = 30.0,
+                 worker_id: Optional[str] = None):
+        """
+        Initialize persistent job queue
+        
+        Args:
+            db_manager: Initialized DatabaseManager for the pipeline database
+            max_workers: Maximum number of jobs this worker runs concurrently
+            lease_seconds: How long a claim is valid without a heartbeat
+            retry_base_delay: Base delay for exponential retry backoff (seconds)
+            worker_id: Identifier recorded as lease owner (defaults to host:pid)
+        """
+        self.db_manager = db_manager
+        self.connection = db_manager.get_connection()
+        self.max_workers = max_workers
+        self.lease_seconds = lease_seconds
+        self.retry_base_delay = retry_base_delay
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        
+        logger.info(f"Persistent job queue initialized with {max_workers} workers",
+                   worker_id=self.worker_id,
+                   lease_seconds=lease_seconds)
+    
+    def submit_job(
+        self,
+        job_type: str,
+        parameters: Dict[str, Any],
+        webhook_url: Optional[str] = None,
+        priority: Union[Priority, int] = Priority.NORMAL,
+        max_attempts: int = 1,
+        delay_seconds: float = 0.0
+    ) -> str:
+        """
+        Submit a new job to the queue
+        
+        Args:
+            job_type: Type of job ('process_episode', 'render_clips', etc.)
+            parameters: Job parameters
+            webhook_url: Optional webhook URL for notifications
+            priority: Job priority (lower value is claimed first)
+            max_attempts: Attempts before the job is marked failed
+            delay_seconds: Delay before the job becomes claimable
+            
+        Returns:
+            str: Job ID
+        """
+        job_id = str(uuid.uuid4())
+        priority_value = priority.value if isinstance(priority, Priority) else int(priority)
+        
+        with self.connection.transaction() as conn:
+            conn.execute("""
+                INSERT INTO job_queue (
+                    job_id, job_type, parameters, status, priority,
+                    current_stage, message, webhook_url, max_attempts,
+                    available_at, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                job_id,
+                job_type,
+                json.dumps(parameters),
+                JobStatus.QUEUED.value,
+                priority_value,
+                "queued",
+                "Job queued",
+                webhook_url,
+                max(1, max_attempts),
+                time.time() + delay_seconds,
+                datetime.now().isoformat()
+            ))
+        
+        logger.info(f"Job submitted: {job_id} ({job_type})", priority=priority_value)
+        
+        return job_id
+    
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """Get job by ID"""
+        cursor = self.connection.execute_query(
+            "SELECT * FROM job_queue WHERE job_id = ?",
+            (job_id,)
+        )
+        row = cursor.fetchone()
+        return self._row_to_job(row) if row else None
+    
+    def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get job status as dictionary"""
+        job = self.get_job(job_id)
+        return job.to_dict() if job else None
+    
+    def update_job_progress(
+        self,
+        job_id: str,
+        progress: float,
+        stage: str,
+        message: str
+    ):
+        """Update job progress; also renews the lease held by this worker"""
+        now = time.time()
+        with self.connection.transaction() as conn:
+            conn.execute("""
+                UPDATE job_queue
+                SET progress = ?, current_stage = ?, message = ?,
+                    heartbeat_at = ?,
+                    lease_expires_at = CASE WHEN lease_owner = ? THEN ? ELSE lease_expires_at END
+                WHERE job_id = ?
+            """, (progress, stage, message, now, self.worker_id, now + self.lease_seconds, job_id))
+        logger.debug(f"Job {job_id} progress: {progress}% - {stage}")
+    
+    def heartbeat(self, job_id: str) -> bool:
+        """
+        Extend the lease on a running job
+        
+        Returns:
+            bool: False if this worker no longer owns the job (lease was
+            reclaimed or the job was cancelled)
+        """
+        now = time.time()
+        with self.connection.transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE job_queue
+                SET heartbeat_at = ?, lease_expires_at = ?
+                WHERE job_id = ? AND status = ? AND lease_owner = ?
+            """, (now, now + self.lease_seconds, job_id, JobStatus.RUNNING.value, self.worker_id))
+            return cursor.rowcount > 0
+    
+    def claim_next_job(self, job_types: Optional[List[str]] = None) -> Optional[Job]:
+        """
+        Atomically claim the highest-priority claimable job
+        
+        Expired leases are reclaimed in the same transaction, so jobs left
+        running by a crashed worker are picked up again.
+        
+        Args:
+            job_types: Restrict claiming to these job types
+            
+        Returns:
+            Claimed Job with this worker as lease owner, or None
+        """
+        now = time.time()
+        type_filter = ""
+        params: List[Any] = [JobStatus.QUEUED.value, now]
+        if job_types:
+            type_filter = f" AND job_type IN ({','.join('?' * len(job_types))})"
+            params.extend(job_types)
+        
+        with self.connection.transaction() as conn:
+            self._reclaim_expired_leases(conn, now)
+            
+            cursor = conn.execute(f"""
+                UPDATE job_queue
+                SET status = ?, lease_owner = ?, lease_expires_at = ?, heartbeat_at = ?,
+                    attempts = attempts + 1,
+                    started_at = COALESCE(started_at, ?)
+                WHERE job_id = (
+                    SELECT job_id FROM job_queue
+                    WHERE status = ? AND available_at <= ?{type_filter}
+                    ORDER BY priority, available_at
+                    LIMIT 1
+                )
+                RETURNING *
+            """, (
+                JobStatus.RUNNING.value, self.worker_id, now + self.lease_seconds, now,
+                datetime.now().isoformat(),
+                *params
+            ))
+            rows = cursor.fetchall()
+        
+        if not rows:
+            return None
+        
+        job = self._row_to_job(rows[0])
+        logger.info(f"Job claimed: {job.job_id} ({job.job_type})",
+                   worker_id=self.worker_id,
+                   attempt=job.attempts)
+        return job
+    
+    def mark_job_running(self, job_id: str) -> bool:
+        """
+        Claim a specific job for this worker
+        
+        Returns:
+            bool: True if this worker now owns the job, False if it was
+            already claimed elsewhere or is no longer queued
+        """
+        now = time.time()
+        with self.connection.transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE job_queue
+                SET status = ?, lease_owner = ?, lease_expires_at = ?, heartbeat_at = ?,
+                    attempts = CASE WHEN status = ? THEN attempts + 1 ELSE attempts END,
+                    started_at = COALESCE(started_at, ?)
+                WHERE job_id = ?
+                  AND (status = ? OR (status = ? AND lease_owner = ?))
+            """, (
+                JobStatus.RUNNING.value, self.worker_id, now + self.lease_seconds, now,
+                JobStatus.QUEUED.value,
+                datetime.now().isoformat(),
+                job_id,
+                JobStatus.QUEUED.value, JobStatus.RUNNING.value, self.worker_id
+            ))
+            claimed = cursor.rowcount > 0
+        
+        if claimed:
+            logger.info(f"Job started: {job_id}", worker_id=self.worker_id)
+        else:
+            logger.info(f"Job {job_id} not started: already claimed or no longer queued")
+        return claimed
+    
+    def mark_job_completed(
+        self,
+        job_id: str,
+        result: Dict[str, Any]
+    ) -> bool:
+        """
+        Mark job as completed
+        
+        Returns:
+            bool: False if this worker does not hold the job's lease (it was
+            reclaimed by another worker or the job already finished)
+        """
+        with self.connection.transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE job_queue
+                SET status = ?, progress = 100.0, result = ?, completed_at = ?,
+                    lease_owner = NULL, lease_expires_at = NULL
+                WHERE job_id = ? AND lease_owner = ?
+            """, (JobStatus.COMPLETED.value, json.dumps(result, default=str),
+                  datetime.now().isoformat(), job_id, self.worker_id))
+            completed = cursor.rowcount > 0
+        
+        if not completed:
+            logger.warning(f"Job {job_id} not marked completed: lease not held by this worker",
+                          worker_id=self.worker_id)
+            return False
+        
+        logger.info(f"Job completed: {job_id}")
+        
+        job = self.get_job(job_id)
+        if job and job.webhook_url:
+            self._trigger_webhook(job)
+        return True
+    
+    def mark_job_failed(
+        self,
+        job_id: str,
+        error: str
+    ) -> bool:
+        """
+        Mark job as failed, or requeue it with backoff if attempts remain
+        
+        Returns:
+            bool: False if this worker does not hold the job's lease (it was
+            reclaimed by another worker or the job already finished)
+        """
+        now = time.time()
+        with self.connection.transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM job_queue WHERE job_id = ? AND lease_owner = ?",
+                (job_id, self.worker_id)
+            ).fetchone()
+            if row:
+                attempts, max_attempts = row[0], row[1]
+                retrying = attempts < max_attempts
+                if retrying:
+                    delay = self.retry_base_delay * (2 ** max(0, attempts - 1))
+                    conn.execute("""
+                        UPDATE job_queue
+                        SET status = ?, error = ?, available_at = ?,
+                            current_stage = 'retry_wait', message = ?,
+                            lease_owner = NULL, lease_expires_at = NULL
+                        WHERE job_id = ? AND lease_owner = ?
+                    """, (JobStatus.QUEUED.value, error, now + delay,
+                          f"Retrying in {delay:.0f}s (attempt {attempts + 1}/{max_attempts})",
+                          job_id, self.worker_id))
+                else:
+                    conn.execute("""
+                        UPDATE job_queue
+                        SET status = ?, error = ?, completed_at = ?,
+                            lease_owner = NULL, lease_expires_at = NULL
+                        WHERE job_id = ? AND lease_owner = ?
+                    """, (JobStatus.FAILED.value, error, datetime.now().isoformat(),
+                          job_id, self.worker_id))
+        
+        if not row:
+            logger.warning(f"Job {job_id} not marked failed: lease not held by this worker",
+                          worker_id=self.worker_id, error=error)
+            return False
+        
+        if retrying:
+            logger.warning(f"Job failed, will retry: {job_id} - {error}",
+                          attempt=attempts, max_attempts=max_attempts, retry_in=delay)
+            return True
+        
+        logger.error(f"Job failed: {job_id} - {error}")
+        
+        job = self.get_job(job_id)
+        if job and job.webhook_url:
+            self._trigger_webhook(job)
+        return True
+    
+    def cancel_job(self, job_id: str) -> bool:
+        """Cancel a queued job"""
+        with self.connection.transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE job_queue SET status = ?, completed_at = ?
+                WHERE job_id = ? AND status = ?
+            """, (JobStatus.CANCELLED.value, datetime.now().isoformat(),
+                  job_id, JobStatus.QUEUED.value))
+            cancelled = cursor.rowcount > 0
+        
+        if cancelled:
+            logger.info(f"Job cancelled: {job_id}")
+        return cancelled
+    
+    def get_next_job(self) -> Optional[str]:
+        """Claim next job from queue if this worker has a free slot"""
+        if self._count_owned_running() >= self.max_workers:
+            return None
+        
+        job = self.claim_next_job()
+        return job.job_id if job else None
+    
+    def get_queue_stats(self) -> Dict[str, Any]:
+        """Get queue statistics"""
+        cursor = self.connection.execute_query(
+            "SELECT status, COUNT(*) FROM job_queue GROUP BY status"
+        )
+        counts = dict(cursor.fetchall())
+        
+        return {
+            'queued': counts.get(JobStatus.QUEUED.value, 0),
+            'running': counts.get(JobStatus.RUNNING.value, 0),
+            'completed': counts.get(JobStatus.COMPLETED.value, 0),
+            'failed': counts.get(JobStatus.FAILED.value, 0),
+            'total': sum(counts.values()),
+            'max_workers': self.max_workers,
+            'worker_id': self.worker_id
+        }
+    
+    def list_jobs(
+        self,
+        status: Optional[JobStatus] = None,
+        limit: int = 50
+    ) -> list[Dict[str, Any]]:
+        """List jobs with optional filtering"""
+        if status:
+            cursor = self.connection.execute_query(
+                "SELECT * FROM job_queue WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                (status.value, limit)
+            )
+        else:
+            cursor = self.connection.execute_query(
+                "SELECT * FROM job_queue ORDER BY created_at DESC LIMIT ?",
+                (limit,)
+            )
+        
+        return [self._row_to_job(row).to_dict() for row in cursor.fetchall()]
+    
+    def cleanup_old_jobs(self, max_age_hours: int = 24):
+        """Remove old completed/failed jobs"""
+        cutoff = datetime.fromtimestamp(time.time() - max_age_hours * 3600).isoformat()
+        
+        with self.connection.transaction() as conn:
+            cursor = conn.execute(f"""
+                DELETE FROM job_queue
+                WHERE completed_at < ?
+                  AND status IN ({','.join('?' * len(self._TERMINAL_STATUSES))})
+            """, (cutoff, *self._TERMINAL_STATUSES))
+            removed = cursor.rowcount
+        
+        if removed:
+            logger.info(f"Cleaned up {removed} old jobs")
+    
+    def _reclaim_expired_leases(self, conn, now: float) -> None:
+        """Requeue (or fail) running jobs whose lease has expired"""
+        conn.execute("""
+            UPDATE job_queue
+            SET status = CASE WHEN attempts < max_attempts THEN ? ELSE ? END,
+                completed_at = CASE WHEN attempts < max_attempts THEN NULL ELSE ? END,
+                error = COALESCE(error, 'Lease expired'),
+                message = 'Lease expired (owner: ' || COALESCE(lease_owner, 'unknown') || ')',
+                lease_owner = NULL,
+                lease_expires_at = NULL
+            WHERE status = ? AND lease_expires_at < ?
+        """, (JobStatus.QUEUED.value, JobStatus.FAILED.value, datetime.now().isoformat(),
+              JobStatus.RUNNING.value, now))
+    
+    def _count_owned_running(self) -> int:
+        """Count running jobs leased by this worker"""
+        cursor = self.connection.execute_query(
+            "SELECT COUNT(*) FROM job_queue WHERE status = ? AND lease_owner = ?",
+            (JobStatus.RUNNING.value, self.worker_id)
+        )
+        return cursor.fetchone()[0]
+    
+    def _row_to_job(self, row) -> Job:
+        """Convert database row to Job"""
+        def parse_time(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+        
+        return Job(
+            job_id=row['job_id'],
+            job_type=row['job_type'],
+            parameters=json.loads(row['parameters']) if row['parameters'] else {},
+            status=JobStatus(row['status']),
+            progress=row['progress'] or 0.0,
+            current_stage=row['current_stage'] or "queued",
+            message=row['message'] or "",
+            result=json.loads(row['result']) if row['result'] else None,
+            error=row['error'],
+            created_at=parse_time(row['created_at']) or datetime.now(),
+            started_at=parse_time(row['started_at']),
+            completed_at=parse_time(row['completed_at']),
+            webhook_url=row['webhook_url'],
+            priority=row['priority'],
+            attempts=row['attempts'],
+            max_attempts=row['max_attempts'],
+            lease_owner=row['lease_owner'],
+            lease_expires_at=row['lease_expires_at']
+        )
+    
+    _trigger_webhook = JobQueue._trigger_webhook
+
+
+class JobWorker:
+    """
+    Background worker that drains a PersistentJobQueue
+    
+    Claims jobs whose handler is registered, runs them on a private event
+    loop and heartbeats their lease while they run. Used to pick up jobs
+    that were requeued after a restart, a lease expiry or a retryable
+    failure.
+    """
+    
+    def __init__(self, job_queue: PersistentJobQueue,
+                 handlers: Dict[str, Callable[[Job], Awaitable[None]]],
+                 poll_interval: float = 2.0):
+        """
+        Initialize job worker
+        
+        Args:
+            job_queue: Queue to drain
+            handlers: Mapping of job_type to async handler taking the Job
+            poll_interval: Seconds between claim attempts when idle
+        """
+        self.job_queue = job_queue
+        self.handlers = handlers
+        self.poll_interval = poll_interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """Start draining the queue in a daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=lambda: asyncio.run(self.run()),
+            daemon=True,
+            name="JobWorker"
+        )
+        self._thread.start()
+        logger.info("Job worker started",
+                   worker_id=self.job_queue.worker_id,
+                   job_types=list(self.handlers))
+    
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop claiming new jobs and wait for the worker thread"""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        logger.info("Job worker stopped", worker_id=self.job_queue.worker_id)
+    
+    async def run(self) -> None:
+        """Claim and run jobs until stopped"""
+        running: set = set()
+        job_types = list(self.handlers)
+        
+        while not self._stop_event.is_set():
+            claimed = None
+            if len(running) < self.job_queue.max_workers:
+                try:
+                    claimed = await asyncio.to_thread(self.job_queue.claim_next_job, job_types)
+                except Exception as e:
+                    logger.error(f"Job worker failed to claim job: {e}")
+            
+            if claimed:
+                task = asyncio.create_task(self._run_job(claimed))
+                running.add(task)
+                task.add_done_callback(running.discard)
+                continue
+            
+            await asyncio.sleep(self.poll_interval)
+        
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+    
+    async def _run_job(self, job: Job) -> None:
+        """Run one claimed job, heartbeating its lease until it finishes"""
+        heartbeat_task = asyncio.create_task(self._heartbeat(job.job_id))
+        try:
+            await self.handlers[job.job_type](job)
+        except Exception as e:
+            logger.error(f"Job {job.job_id} handler raised", error=str(e))
+            await asyncio.to_thread(self.job_queue.mark_job_failed, job.job_id, str(e))
+        finally:
+            heartbeat_task.cancel()
+    
+    async def _heartbeat(self, job_id: str) -> None:
+        """Renew the lease at a third of its duration"""
+        interval = max(1.0, self.job_queue.lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            if not await asyncio.to_thread(self.job_queue.heartbeat, job_id):
+                logger.warning(f"Lost lease on job {job_id}")
+                return
+
+
 # Global job queue instance
-_job_queue: Optional[JobQueue] = None
+_job_queue: Optional[Union[JobQueue, PersistentJobQueue]] = None
 
 
-def get_job_queue(max_workers: int = 2) -> JobQueue:
+def get_job_queue(max_workers: int = 2) -> Union[JobQueue, PersistentJobQueue]:
     """Get or create global job queue instance"""
     global _job_queue
     
@@ -342,3 +892,11 @@ def get_job_queue(max_workers: int = 2) -> JobQueue:
         _job_queue = JobQueue(max_workers=max_workers)
     
     return _job_queue
+
+
+def configure_persistent_job_queue(db_manager, max_workers: int = 2, **kwargs) -> PersistentJobQueue:
+    """Replace the global job queue with one stored in the pipeline database"""
+    global _job_queue
+    
+    _job_queue = PersistentJobQueue(db_manager, max_workers=max_workers, **kwargs)
+    return _job_queue
@@ -19,6 +19,61 @@ from .logging import get_logger
 logger = get_logger('pipeline.metadata_manager')
 
 
+def _distinct_names(names: List[str]) -> List[str]:
+    """Strip names and drop blanks and case-insensitive duplicates, keeping order"""
+    seen = set()
+    distinct = []
+    for name in names:
+        if not isinstance(name, str):
+            continue
+        name = name.strip()
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            distinct.append(name)
+    return distinct
+
+
+def _suffixes(names: List[str]) -> List[str]:
+    """Every suffix of every name; a substring of a name is a prefix of one of them"""
+    return [name[start:] for name in names for start in range(len(name))]
+
+
+def _prefix_range(prefix: str) -> Tuple[str, str]:
+    """Bounds matching every string that starts with prefix, usable by an index"""
+    prefix = prefix.strip()
+    return prefix, prefix + '\U0010ffff'
+
+
+# Hit columns shared by full_text_search and faceted_search; the four
+# markup parameters are bound ahead of the query's own parameters
+_SEARCH_HIT_COLUMNS = """
+    jmi.episode_id, jmi.file_path, jmi.show_name, jmi.title, jmi.date,
+    jmi.duration_seconds, jmi.guest_names, jmi.topics,
+    episodes_search.rank AS score,
+    snippet(episodes_search, -1, ?, ?, '…', 16) AS snippet,
+    highlight(episodes_search, 1, ?, ?) AS title_highlight
+"""
+
+_SEARCH_MARKUP = ('<mark>', '</mark>', '<mark>', '</mark>')
+
+
+def _search_hit(row) -> Dict[str, Any]:
+    """Convert a row of _SEARCH_HIT_COLUMNS to a result dictionary"""
+    return {
+        'episode_id': row[0],
+        'file_path': row[1],
+        'show_name': row[2],
+        'title': row[3],
+        'date': row[4],
+        'duration_seconds': row[5],
+        'guest_names': json.loads(row[6]) if row[6] else [],
+        'topics': json.loads(row[7]) if row[7] else [],
+        'score': row[8],
+        'snippet': row[9],
+        'title_highlight': row[10]
+    }
+
+
 class MetadataManager:
     """
     Manage JSON metadata files with SQLite index
@@ -87,12 +142,26 @@ class MetadataManager:
             
             # Update index
             with self.db.transaction() as conn:
+                # Upsert keeps the row in place, so its guest, topic and search rows survive
                 conn.execute("""
-                    INSERT OR REPLACE INTO json_metadata_index 
+                    INSERT INTO json_metadata_index 
                     (episode_id, file_path, file_size, last_updated,
                      show_name, title, date, duration_seconds,
                      guest_names, topics, has_transcript, has_enrichment, has_editorial)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(episode_id) DO UPDATE SET
+                        file_path = excluded.file_path,
+                        file_size = excluded.file_size,
+                        last_updated = excluded.last_updated,
+                        show_name = excluded.show_name,
+                        title = excluded.title,
+                        date = excluded.date,
+                        duration_seconds = excluded.duration_seconds,
+                        guest_names = excluded.guest_names,
+                        topics = excluded.topics,
+                        has_transcript = excluded.has_transcript,
+                        has_enrichment = excluded.has_enrichment,
+                        has_editorial = excluded.has_editorial
                 """, (
                     episode.episode_id,
                     str(json_path),
@@ -109,18 +178,48 @@ class MetadataManager:
                     episode.editorial is not None
                 ))
                 
-                # Update FTS index
+                # Update guest and topic lookup tables
+                distinct_guests = _distinct_names(guest_names)
+                distinct_topics = _distinct_names(topics)
+                conn.execute("DELETE FROM episode_guests WHERE episode_id = ?", (episode.episode_id,))
+                conn.executemany(
+                    "INSERT INTO episode_guests (episode_id, guest_name) VALUES (?, ?)",
+                    [(episode.episode_id, name) for name in distinct_guests]
+                )
+                conn.execute("DELETE FROM episode_topics WHERE episode_id = ?", (episode.episode_id,))
+                conn.executemany(
+                    "INSERT INTO episode_topics (episode_id, topic) VALUES (?, ?)",
+                    [(episode.episode_id, topic) for topic in distinct_topics]
+                )
+                conn.execute("DELETE FROM episode_guest_suffixes WHERE episode_id = ?", (episode.episode_id,))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO episode_guest_suffixes (episode_id, suffix) VALUES (?, ?)",
+                    [(episode.episode_id, suffix) for suffix in _suffixes(distinct_guests)]
+                )
+                conn.execute("DELETE FROM episode_topic_suffixes WHERE episode_id = ?", (episode.episode_id,))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO episode_topic_suffixes (episode_id, suffix) VALUES (?, ?)",
+                    [(episode.episode_id, suffix) for suffix in _suffixes(distinct_topics)]
+                )
+                
+                # Update FTS content; triggers reindex the episode only if its text changed
                 conn.execute("""
-                    INSERT OR REPLACE INTO episodes_search
+                    INSERT INTO episode_search_content
                     (episode_id, title, summary, transcript_text, topics, guest_names)
                     VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(episode_id) DO UPDATE SET
+                        title = excluded.title,
+                        summary = excluded.summary,
+                        transcript_text = excluded.transcript_text,
+                        topics = excluded.topics,
+                        guest_names = excluded.guest_names
                 """, (
                     episode.episode_id,
                     episode.metadata.title or episode.metadata.topic or '',
                     summary or '',
                     transcript_text or '',
-                    ' '.join(topics) if topics else '',
-                    ' '.join(guest_names) if guest_names else ''
+                    ' '.join(distinct_topics),
+                    ' '.join(distinct_guests)
                 ))
             
             logger.info("Episode JSON saved and indexed",
@@ -226,13 +325,16 @@ class MetadataManager:
                 query += " AND date <= ?"
                 params.append(date_to)
             
+            # Partial matches: the term is a case-insensitive prefix of some suffix of a name
             if guest_name:
-                query += " AND guest_names LIKE ?"
-                params.append(f'%{guest_name}%')
+                query += """ AND episode_id IN (
+                    SELECT episode_id FROM episode_guest_suffixes WHERE suffix >= ? AND suffix < ?)"""
+                params.extend(_prefix_range(guest_name))
             
             if topic:
-                query += " AND topics LIKE ?"
-                params.append(f'%{topic}%')
+                query += """ AND episode_id IN (
+                    SELECT episode_id FROM episode_topic_suffixes WHERE suffix >= ? AND suffix < ?)"""
+                params.extend(_prefix_range(topic))
             
             if has_transcript is not None:
                 query += " AND has_transcript = ?"
@@ -293,42 +395,26 @@ class MetadataManager:
         Full-text search across titles, summaries, transcripts, topics, and guests
         
         Args:
-            query: Search query string
+            query: Search query string (FTS5 syntax)
             limit: Maximum number of results
             
         Returns:
-            List of matching episodes with metadata
+            List of matching episodes with metadata, best match first. Each
+            result carries a 'snippet' of the best matching column and the
+            'title_highlight', with matched terms wrapped in <mark> tags.
         """
         try:
-            cursor = self.db.execute_query("""
-                SELECT 
-                    es.episode_id,
-                    jmi.file_path,
-                    jmi.show_name,
-                    jmi.title,
-                    jmi.date,
-                    jmi.duration_seconds,
-                    jmi.guest_names,
-                    jmi.topics
-                FROM episodes_search es
-                JOIN json_metadata_index jmi ON es.episode_id = jmi.episode_id
+            cursor = self.db.execute_query(f"""
+                SELECT {_SEARCH_HIT_COLUMNS}
+                FROM episodes_search
+                JOIN episode_search_content esc ON esc.id = episodes_search.rowid
+                JOIN json_metadata_index jmi ON jmi.episode_id = esc.episode_id
                 WHERE episodes_search MATCH ?
-                ORDER BY rank
+                ORDER BY episodes_search.rank
                 LIMIT ?
-            """, (query, limit or 20))
+            """, (*_SEARCH_MARKUP, query, limit or 20))
             
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    'episode_id': row[0],
-                    'file_path': row[1],
-                    'show_name': row[2],
-                    'title': row[3],
-                    'date': row[4],
-                    'duration_seconds': row[5],
-                    'guest_names': json.loads(row[6]) if row[6] else [],
-                    'topics': json.loads(row[7]) if row[7] else []
-                })
+            results = [_search_hit(row) for row in cursor.fetchall()]
             
             logger.info("Full-text search completed",
                        query=query,
@@ -342,6 +428,120 @@ class MetadataManager:
                         error=str(e))
             raise DatabaseError(f"Full-text search failed: {e}")
     
+    def faceted_search(self,
+                       query: str,
+                       show_name: Optional[str] = None,
+                       year: Optional[str] = None,
+                       guest_name: Optional[str] = None,
+                       limit: Optional[int] = 20,
+                       facet_limit: int = 10) -> Dict[str, Any]:
+        """
+        Full-text search returning ranked hits and facet counts in one query
+        
+        Facets are counted over every episode matching the query and filters,
+        not only the returned page of hits.
+        
+        Args:
+            query: Search query string (FTS5 syntax)
+            show_name: Only count and return episodes of this show
+            year: Only count and return episodes dated in this year (YYYY)
+            guest_name: Only count and return episodes with this guest
+            limit: Maximum number of hits
+            facet_limit: Maximum number of values per facet
+            
+        Returns:
+            Dictionary with 'total', 'results' (as full_text_search) and
+            'facets' mapping show, year and guest to value/count lists
+        """
+        try:
+            filters = ""
+            params: List[Any] = [query]
+            if show_name:
+                filters += " AND jmi.show_name = ?"
+                params.append(show_name)
+            if year:
+                filters += " AND jmi.date >= ? AND jmi.date < ?"
+                params.extend((str(year), str(int(year) + 1)))
+            if guest_name:
+                filters += """ AND EXISTS (
+                    SELECT 1 FROM episode_guests eg
+                    WHERE eg.episode_id = jmi.episode_id AND eg.guest_name = ?)"""
+                params.append(guest_name.strip())
+            
+            # Rows are tagged by kind: one per hit, one per facet value, one total
+            cursor = self.db.execute_query(f"""
+                WITH matched AS (
+                    SELECT episodes_search.rowid AS id, episodes_search.rank AS score,
+                           jmi.episode_id, jmi.show_name, substr(jmi.date, 1, 4) AS year
+                    FROM episodes_search
+                    JOIN episode_search_content esc ON esc.id = episodes_search.rowid
+                    JOIN json_metadata_index jmi ON jmi.episode_id = esc.episode_id
+                    WHERE episodes_search MATCH ?{filters}
+                ),
+                top AS (
+                    SELECT id FROM matched ORDER BY score LIMIT ?
+                ),
+                -- Snippets only for the returned page, each probed by rowid
+                hits AS (
+                    SELECT {_SEARCH_HIT_COLUMNS}
+                    FROM top
+                    JOIN episodes_search ON episodes_search.rowid = top.id
+                    JOIN episode_search_content esc ON esc.id = top.id
+                    JOIN json_metadata_index jmi ON jmi.episode_id = esc.episode_id
+                    WHERE episodes_search MATCH ?
+                )
+                SELECT 'hit', hits.*, NULL FROM hits
+                UNION ALL
+                SELECT 'show', NULL, NULL, show_name, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, COUNT(*)
+                FROM matched WHERE show_name IS NOT NULL GROUP BY show_name
+                UNION ALL
+                SELECT 'year', NULL, NULL, NULL, NULL, year, NULL, NULL, NULL, NULL, NULL, NULL, COUNT(*)
+                FROM matched WHERE year IS NOT NULL AND year != '' GROUP BY year
+                UNION ALL
+                SELECT 'guest', NULL, NULL, guest_name, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, appearances
+                FROM (
+                    SELECT eg.guest_name, COUNT(*) AS appearances
+                    FROM matched JOIN episode_guests eg ON eg.episode_id = matched.episode_id
+                    GROUP BY eg.guest_name
+                    ORDER BY appearances DESC, eg.guest_name
+                    LIMIT ?
+                )
+                UNION ALL
+                SELECT 'total', NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, COUNT(*)
+                FROM matched
+            """, (*params, limit or 20, *_SEARCH_MARKUP, query, facet_limit))
+            
+            total = 0
+            results = []
+            facets: Dict[str, List[Dict[str, Any]]] = {'show': [], 'year': [], 'guest': []}
+            for row in cursor.fetchall():
+                kind = row[0]
+                if kind == 'hit':
+                    results.append(_search_hit(row[1:]))
+                elif kind == 'total':
+                    total = row[-1]
+                else:
+                    value = row[5] if kind == 'year' else row[3]
+                    facets[kind].append({'value': value, 'count': row[-1]})
+            
+            results.sort(key=lambda hit: hit['score'])
+            facets['show'] = sorted(facets['show'], key=lambda f: (-f['count'], f['value']))[:facet_limit]
+            facets['year'] = sorted(facets['year'], key=lambda f: f['value'], reverse=True)[:facet_limit]
+            facets['guest'].sort(key=lambda f: (-f['count'], f['value'].lower()))
+            
+            logger.info("Faceted search completed",
+                       query=query,
+                       total=total,
+                       results_count=len(results))
+            
+            return {'total': total, 'results': results, 'facets': facets}
+            
+        except Exception as e:
+            logger.error("Faceted search failed",
+                        query=query,
+                        error=str(e))
+            raise DatabaseError(f"Faceted search failed: {e}")
+    
     def get_shows(self) -> List[Dict[str, Any]]:
         """
         Get list of all shows with episode counts
@@ -391,39 +591,21 @@ class MetadataManager:
         """
         try:
             cursor = self.db.execute_query("""
-                SELECT episode_id, guest_names 
-                FROM json_metadata_index 
-                WHERE guest_names IS NOT NULL AND guest_names != '[]'
-            """)
-            
-            guest_counts = {}
-            guest_episodes = {}
-            
-            for row in cursor.fetchall():
-                episode_id = row[0]
-                guests = json.loads(row[1])
-                
-                for guest in guests:
-                    if guest not in guest_counts:
-                        guest_counts[guest] = 0
-                        guest_episodes[guest] = []
-                    guest_counts[guest] += 1
-                    guest_episodes[guest].append(episode_id)
-            
-            # Filter and format results
-            guests = []
-            for guest_name, count in guest_counts.items():
-                if count >= min_appearances:
-                    guests.append({
-                        'name': guest_name,
-                        'appearances': count,
-                        'episodes': guest_episodes[guest_name]
-                    })
-            
-            # Sort by appearances (descending)
-            guests.sort(key=lambda x: x['appearances'], reverse=True)
-            
-            return guests
+                SELECT guest_name, COUNT(*) AS appearances, json_group_array(episode_id)
+                FROM episode_guests
+                GROUP BY guest_name
+                HAVING COUNT(*) >= ?
+                ORDER BY appearances DESC, guest_name
+            """, (min_appearances,))
+            
+            return [
+                {
+                    'name': row[0],
+                    'appearances': row[1],
+                    'episodes': json.loads(row[2])
+                }
+                for row in cursor.fetchall()
+            ]
             
         except Exception as e:
             logger.error("Failed to get guests list", error=str(e))
@@ -441,39 +623,21 @@ class MetadataManager:
         """
         try:
             cursor = self.db.execute_query("""
-                SELECT episode_id, topics 
-                FROM json_metadata_index 
-                WHERE topics IS NOT NULL AND topics != '[]'
-            """)
-            
-            topic_counts = {}
-            topic_episodes = {}
-            
-            for row in cursor.fetchall():
-                episode_id = row[0]
-                topics = json.loads(row[1])
-                
-                for topic in topics:
-                    if topic not in topic_counts:
-                        topic_counts[topic] = 0
-                        topic_episodes[topic] = []
-                    topic_counts[topic] += 1
-                    topic_episodes[topic].append(episode_id)
-            
-            # Filter and format results
-            topics = []
-            for topic_name, count in topic_counts.items():
-                if count >= min_occurrences:
-                    topics.append({
-                        'topic': topic_name,
-                        'occurrences': count,
-                        'episodes': topic_episodes[topic_name]
-                    })
-            
-            # Sort by occurrences (descending)
-            topics.sort(key=lambda x: x['occurrences'], reverse=True)
-            
-            return topics
+                SELECT topic, COUNT(*) AS occurrences, json_group_array(episode_id)
+                FROM episode_topics
+                GROUP BY topic
+                HAVING COUNT(*) >= ?
+                ORDER BY occurrences DESC, topic
+            """, (min_occurrences,))
+            
+            return [
+                {
+                    'topic': row[0],
+                    'occurrences': row[1],
+                    'episodes': json.loads(row[2])
+                }
+                for row in cursor.fetchall()
+            ]
             
         except Exception as e:
             logger.error("Failed to get topics list", error=str(e))
@@ -0,0 +1,668 @@
+"""
+Persistent local model server
+
+A long-lived process that keeps Whisper, pyannote and sentence-transformers
+models warm and serves the pipeline over a Unix socket, so stage processors
+no longer pay model start-up per episode. Embedding requests arriving from
+concurrent episodes are coalesced into shared batches, and models are
+unloaded least-recently-used first when the memory budget is exceeded or
+when they sit idle.
+
+Wire format: each message is a 4-byte big-endian length followed by a JSON
+body. NumPy arrays travel as base64 with dtype and shape.
+
+Run the server with ``python src/cli.py model-server``; the pipeline uses it
+when ``model_server.enabled`` is set and the socket answers.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import psutil
+
+from .logging import get_logger
+from .exceptions import ProcessingError
+
+logger = get_logger('pipeline.model_server')
+
+_HEADER = struct.Struct('>I')
+
+# Model parameters that are credentials; only a digest of them enters model keys
+SECRET_PARAMS = frozenset({'hf_token'})
+
+
+# ---------------------------------------------------------------------------
+# Wire format
+# ---------------------------------------------------------------------------
+
+def _json_default(value: Any) -> Any:
+    """Serialize NumPy values found in model outputs"""
+    if isinstance(value, np.ndarray):
+        return {
+            '__ndarray__': base64.b64encode(np.ascontiguousarray(value).tobytes()).decode('ascii'),
+            'dtype': str(value.dtype),
+            'shape': list(value.shape)
+        }
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_object_hook(obj: Dict[str, Any]) -> Any:
+    if '__ndarray__' in obj:
+        data = base64.b64decode(obj['__ndarray__'])
+        return np.frombuffer(data, dtype=obj['dtype']).reshape(obj['shape'])
+    return obj
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Frame a message for the socket"""
+    body = json.dumps(message, default=_json_default).encode('utf-8')
+    return _HEADER.pack(len(body)) + body
+
+
+def decode_message(body: bytes) -> Dict[str, Any]:
+    """Decode a framed message body"""
+    return json.loads(body.decode('utf-8'), object_hook=_json_object_hook)
+
+
+# ---------------------------------------------------------------------------
+# Built-in model loaders and runners
+# ---------------------------------------------------------------------------
+
+def _load_whisper(params: Dict[str, Any]) -> Any:
+    import whisper
+    import torch
+
+    device = params.get('device') or ("cuda" if torch.cuda.is_available() else "cpu")
+    return whisper.load_model(params['name'], device=device)
+
+
+def _load_sentence_transformer(params: Dict[str, Any]) -> Any:
+    from sentence_transformers import SentenceTransformer
+    import torch
+
+    device = params.get('device') or ("cuda" if torch.cuda.is_available() else "cpu")
+    return SentenceTransformer(params['name'], device=device)
+
+
+def _load_pyannote(params: Dict[str, Any]) -> Any:
+    utils_path = Path(__file__).parent.parent.parent / "utils"
+    if str(utils_path) not in sys.path:
+        sys.path.insert(0, str(utils_path))
+    from diarize import load_diarization_pipeline
+
+    pipeline, device = load_diarization_pipeline(params.get('hf_token'), params.get('device', 'cuda'))
+    pipeline.device_used = device
+    return pipeline
+
+
+def _run_transcribe(model: Any, args: Dict[str, Any]) -> Dict[str, Any]:
+    import torch
+
+    audio = args.pop('audio')
+    if isinstance(audio, np.ndarray):
+        audio = audio.astype(np.float32, copy=False)
+    args['fp16'] = torch.cuda.is_available() and args.get('fp16', True)
+    return model.transcribe(audio, **args)
+
+
+def _run_diarize(model: Any, args: Dict[str, Any]) -> Dict[str, Any]:
+    from diarize import diarize_with_pipeline
+
+    return diarize_with_pipeline(
+        model,
+        args['audio_path'],
+        num_speakers=args.get('num_speakers'),
+        device=getattr(model, 'device_used', 'cpu'),
+        merge_gap=args.get('merge_gap', 2.0)
+    )
+
+
+DEFAULT_LOADERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    'whisper': _load_whisper,
+    'sentence_transformer': _load_sentence_transformer,
+    'pyannote': _load_pyannote
+}
+
+# Operation -> (model kind, runner); 'embed' is batched separately
+DEFAULT_RUNNERS: Dict[str, Tuple[str, Callable[[Any, Dict[str, Any]], Any]]] = {
+    'transcribe': ('whisper', _run_transcribe),
+    'diarize': ('pyannote', _run_diarize)
+}
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+@dataclass
+class LoadedModel:
+    """Model resident in the server"""
+    key: str
+    kind: str
+    model: Any
+    size_bytes: int
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    in_use: int = 0
+    requests: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class _EmbeddingBatcher:
+    """Coalesces embed requests for one model into shared encode calls"""
+
+    def __init__(self, server: 'ModelServer', params: Dict[str, Any]):
+        self.server = server
+        self.params = params
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._run())
+        self.batches = 0
+
+    async def embed(self, texts: List[str], normalize: bool) -> np.ndarray:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((texts, normalize, future))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            first = await self.queue.get()
+            pending = [first]
+            total = len(first[0])
+            deadline = time.monotonic() + self.server.batch_window_seconds
+
+            # Gather requests that share the normalization flag until the window closes
+            while total < self.server.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item[1] != first[1]:
+                    await self._encode([item])
+                    continue
+                pending.append(item)
+                total += len(item[0])
+
+            await self._encode(pending)
+
+    async def _encode(self, pending: List[Tuple[List[str], bool, asyncio.Future]]) -> None:
+        texts = [text for item in pending for text in item[0]]
+        normalize = pending[0][1]
+        try:
+            async with self.server.use_model('sentence_transformer', self.params) as model:
+                embeddings = await asyncio.to_thread(
+                    model.encode,
+                    texts,
+                    batch_size=self.server.max_batch_size,
+                    convert_to_numpy=True,
+                    normalize_embeddings=normalize,
+                    show_progress_bar=False
+                )
+            self.batches += 1
+        except Exception as e:
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for item_texts, _, future in pending:
+            if not future.done():
+                future.set_result(embeddings[offset:offset + len(item_texts)])
+            offset += len(item_texts)
+
+
+class ModelServer:
+    """
+    Keeps models warm and serves requests over a Unix socket
+
+    Models are keyed by kind and load parameters and kept in LRU order.
+    After each load the least recently used idle models are unloaded until
+    resident models fit in ``memory_budget_mb``; models unused for
+    ``idle_unload_seconds`` are unloaded by a background sweep.
+    """
+
+    def __init__(self, socket_path: str,
+                 memory_budget_mb: int = 12000,
+                 idle_unload_seconds: float = 900.0,
+                 batch_window_ms: float = 20.0,
+                 max_batch_size: int = 256,
+                 loaders: Optional[Dict[str, Callable[[Dict[str, Any]], Any]]] = None,
+                 runners: Optional[Dict[str, Tuple[str, Callable[[Any, Dict[str, Any]], Any]]]] = None):
+        """
+        Initialize model server
+
+        Args:
+            socket_path: Unix socket to listen on
+            memory_budget_mb: Resident model memory (RSS + CUDA) before LRU unloading
+            idle_unload_seconds: Unload models unused for this long (0 disables)
+            batch_window_ms: How long to wait for more embed requests to batch
+            max_batch_size: Maximum sentences per batched encode call
+            loaders: Model kind -> loader(params); defaults to Whisper, pyannote
+                and sentence-transformers
+            runners: Operation -> (model kind, runner(model, args))
+        """
+        self.socket_path = Path(socket_path)
+        self.memory_budget_bytes = memory_budget_mb * 1024 * 1024
+        self.idle_unload_seconds = idle_unload_seconds
+        self.batch_window_seconds = batch_window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.loaders = dict(DEFAULT_LOADERS if loaders is None else loaders)
+        self.runners = dict(DEFAULT_RUNNERS if runners is None else runners)
+
+        self._models: 'OrderedDict[str, LoadedModel]' = OrderedDict()
+        self._load_locks: Dict[str, asyncio.Lock] = {}
+        self._batchers: Dict[str, _EmbeddingBatcher] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._sweeper: Optional[asyncio.Task] = None
+        self._started_at = time.time()
+        self._requests = 0
+        self._evictions = 0
+
+    # -- lifecycle ----------------------------------------------------------
+
+    async def start(self) -> None:
+        """Bind the socket and start the idle sweeper"""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=str(self.socket_path))
+        # Only the owning user may send requests, whatever the process umask
+        os.chmod(self.socket_path, 0o600)
+        if self.idle_unload_seconds > 0:
+            self._sweeper = asyncio.create_task(self._sweep_idle())
+
+        logger.info("Model server listening",
+                   socket=str(self.socket_path),
+                   memory_budget_mb=self.memory_budget_bytes // (1024 * 1024),
+                   idle_unload_seconds=self.idle_unload_seconds)
+
+    async def serve_forever(self) -> None:
+        """Start and serve until cancelled"""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self) -> None:
+        """Close the socket and unload all models"""
+        if self._sweeper:
+            self._sweeper.cancel()
+        for batcher in self._batchers.values():
+            batcher.task.cancel()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for key in list(self._models):
+            self._unload(key, reason="shutdown")
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        logger.info("Model server stopped")
+
+    # -- model cache --------------------------------------------------------
+
+    @staticmethod
+    def _model_key(kind: str, params: Dict[str, Any]) -> str:
+        """Cache key for a model; secrets are replaced by a digest so keys are safe to log"""
+        public = {
+            name: (f"sha256:{hashlib.sha256(str(value).encode('utf-8')).hexdigest()[:12]}"
+                   if name in SECRET_PARAMS and value is not None else value)
+            for name, value in params.items()
+        }
+        return f"{kind}:{json.dumps(public, sort_keys=True)}"
+
+    def _measure_memory(self) -> int:
+        """Process RSS plus CUDA memory allocated by torch, in bytes"""
+        used = psutil.Process().memory_info().rss
+        torch = sys.modules.get('torch')
+        if torch is not None and torch.cuda.is_available():
+            used += torch.cuda.memory_allocated()
+        return used
+
+    def _resident_bytes(self) -> int:
+        return sum(m.size_bytes for m in self._models.values())
+
+    def _unload(self, key: str, reason: str) -> None:
+        loaded = self._models.pop(key, None)
+        if loaded is None:
+            return
+        del loaded.model
+        torch = sys.modules.get('torch')
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        logger.info("Model unloaded", model=key, reason=reason,
+                   size_mb=loaded.size_bytes // (1024 * 1024))
+
+    def _enforce_budget(self, keep: str) -> None:
+        """Unload idle models, least recently used first, until within budget"""
+        for key in list(self._models):
+            if self._resident_bytes() <= self.memory_budget_bytes:
+                return
+            if key == keep or self._models[key].in_use:
+                continue
+            self._unload(key, reason="memory_budget")
+            self._evictions += 1
+
+    async def _get_model(self, kind: str, params: Dict[str, Any]) -> LoadedModel:
+        key = self._model_key(kind, params)
+        loaded = self._models.get(key)
+        if loaded is None:
+            lock = self._load_locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                loaded = self._models.get(key)
+                if loaded is None:
+                    if kind not in self.loaders:
+                        raise ProcessingError(f"Unknown model kind: {kind}")
+
+                    started = time.time()
+                    before = self._measure_memory()
+                    model = await asyncio.to_thread(self.loaders[kind], dict(params))
+                    size = max(0, self._measure_memory() - before)
+
+                    loaded = LoadedModel(key=key, kind=kind, model=model, size_bytes=size)
+                    self._models[key] = loaded
+                    logger.info("Model loaded", model=key, size_mb=size // (1024 * 1024),
+                               load_seconds=round(time.time() - started, 2))
+                    self._enforce_budget(keep=key)
+
+        self._models.move_to_end(key)
+        return loaded
+
+    def use_model(self, kind: str, params: Dict[str, Any]):
+        """Async context manager yielding a loaded model, pinned while in use"""
+        server = self
+
+        class _Use:
+            async def __aenter__(self):
+                self.loaded = await server._get_model(kind, params)
+                self.loaded.in_use += 1
+                return self.loaded.model
+
+            async def __aexit__(self, *exc):
+                self.loaded.in_use -= 1
+                self.loaded.requests += 1
+                self.loaded.last_used = time.time()
+                return False
+
+        return _Use()
+
+    async def _sweep_idle(self) -> None:
+        interval = max(1.0, self.idle_unload_seconds / 4)
+        while True:
+            await asyncio.sleep(interval)
+            self.unload_idle()
+
+    def unload_idle(self) -> int:
+        """Unload models idle longer than idle_unload_seconds"""
+        cutoff = time.time() - self.idle_unload_seconds
+        idle = [key for key, m in self._models.items() if not m.in_use and m.last_used < cutoff]
+        for key in idle:
+            self._unload(key, reason="idle")
+        return len(idle)
+
+    # -- request handling ---------------------------------------------------
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(_HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                (length,) = _HEADER.unpack(header)
+                request = decode_message(await reader.readexactly(length))
+
+                try:
+                    result = await self.handle_request(request)
+                    response = {'ok': True, 'result': result}
+                except Exception as e:
+                    logger.error("Model server request failed", op=request.get('op'), error=str(e))
+                    response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+
+                writer.write(encode_message(response))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def handle_request(self, request: Dict[str, Any]) -> Any:
+        """Dispatch one decoded request"""
+        self._requests += 1
+        op = request.get('op')
+        params = request.get('model', {})
+        args = request.get('args', {})
+
+        if op == 'ping':
+            return {'pid': os.getpid()}
+        if op == 'stats':
+            return self.get_stats()
+        if op == 'load':
+            await self._get_model(request['kind'], params)
+            return {'loaded': self._model_key(request['kind'], params)}
+        if op == 'unload':
+            key = self._model_key(request['kind'], params)
+            self._unload(key, reason="requested")
+            return {'unloaded': key}
+        if op == 'embed':
+            key = self._model_key('sentence_transformer', params)
+            batcher = self._batchers.get(key)
+            if batcher is None:
+                batcher = self._batchers[key] = _EmbeddingBatcher(self, params)
+            return await batcher.embed(args['texts'], bool(args.get('normalize', False)))
+        if op in self.runners:
+            kind, runner = self.runners[op]
+            async with self.use_model(kind, params) as model:
+                loaded = self._models[self._model_key(kind, params)]
+                # One inference per model at a time; requests queue behind it
+                async with loaded.lock:
+                    return await asyncio.to_thread(runner, model, dict(args))
+
+        raise ProcessingError(f"Unknown model server operation: {op}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Resident models, memory and request counters"""
+        now = time.time()
+        return {
+            'uptime_seconds': now - self._started_at,
+            'requests': self._requests,
+            'evictions': self._evictions,
+            'resident_mb': self._resident_bytes() / (1024 * 1024),
+            'memory_budget_mb': self.memory_budget_bytes / (1024 * 1024),
+            'embedding_batches': {key: b.batches for key, b in self._batchers.items()},
+            'models': [
+                {
+                    'key': m.key,
+                    'kind': m.kind,
+                    'size_mb': m.size_bytes / (1024 * 1024),
+                    'requests': m.requests,
+                    'idle_seconds': now - m.last_used,
+                    'in_use': m.in_use
+                }
+                for m in self._models.values()
+            ]
+        }
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+class ModelServerClient:
+    """
+    Blocking client for the model server
+
+    Thread-safe; each thread keeps its own connection. Async callers should
+    wrap calls in ``asyncio.to_thread``.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 1800.0):
+        self.socket_path = str(socket_path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+        return sock
+
+    def _recv_exactly(self, sock: socket.socket, size: int) -> bytes:
+        chunks = []
+        while size:
+            chunk = sock.recv(min(size, 1 << 20))
+            if not chunk:
+                raise ConnectionError("Model server closed the connection")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b''.join(chunks)
+
+    def request(self, message: Dict[str, Any]) -> Any:
+        """Send one request and return its result"""
+        try:
+            sock = self._connection()
+            sock.sendall(encode_message(message))
+            (length,) = _HEADER.unpack(self._recv_exactly(sock, _HEADER.size))
+            response = decode_message(self._recv_exactly(sock, length))
+        except (OSError, ConnectionError) as e:
+            self.close()
+            raise ProcessingError(f"Model server unavailable at {self.socket_path}: {e}")
+
+        if not response.get('ok'):
+            raise ProcessingError(f"Model server error: {response.get('error')}")
+        return response['result']
+
+    def close(self) -> None:
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def ping(self) -> bool:
+        try:
+            self.request({'op': 'ping'})
+            return True
+        except ProcessingError:
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        return self.request({'op': 'stats'})
+
+    def load(self, kind: str, **params) -> None:
+        self.request({'op': 'load', 'kind': kind, 'model': params})
+
+    def embed(self, texts: List[str], model_name: str, normalize: bool = False) -> np.ndarray:
+        return self.request({
+            'op': 'embed',
+            'model': {'name': model_name},
+            'args': {'texts': list(texts), 'normalize': normalize}
+        })
+
+    def transcribe(self, audio: Any, model_name: str, **options) -> Dict[str, Any]:
+        """Transcribe a file path (as seen by the server) or a float32 waveform"""
+        if isinstance(audio, Path):
+            audio = str(audio)
+        return self.request({
+            'op': 'transcribe',
+            'model': {'name': model_name},
+            'args': dict(options, audio=audio)
+        })
+
+    def diarize(self, audio_path: str, hf_token: Optional[str] = None, device: str = 'cuda',
+                num_speakers: Optional[int] = None, merge_gap: float = 2.0) -> Dict[str, Any]:
+        return self.request({
+            'op': 'diarize',
+            'model': {'hf_token': hf_token, 'device': device},
+            'args': {'audio_path': str(audio_path), 'num_speakers': num_speakers, 'merge_gap': merge_gap}
+        })
+
+
+class RemoteWhisperModel:
+    """Stand-in for a loaded Whisper model that forwards to the server"""
+
+    def __init__(self, client: ModelServerClient, model_name: str):
+        self.client = client
+        self.model_name = model_name
+
+    def transcribe(self, audio: Any, **options) -> Dict[str, Any]:
+        return self.client.transcribe(audio, self.model_name, **options)
+
+
+class RemoteSentenceTransformer:
+    """Stand-in for a SentenceTransformer that forwards encode() to the server"""
+
+    def __init__(self, client: ModelServerClient, model_name: str):
+        self.client = client
+        self.model_name = model_name
+
+    def encode(self, sentences, convert_to_numpy: bool = True, normalize_embeddings: bool = False,
+               **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        embeddings = self.client.embed([sentences] if single else list(sentences),
+                                       self.model_name, normalize=normalize_embeddings)
+        return embeddings[0] if single else embeddings
+
+
+# ---------------------------------------------------------------------------
+# Process-wide client
+# ---------------------------------------------------------------------------
+
+_socket_path: Optional[str] = None
+_client: Optional[ModelServerClient] = None
+_client_checked_at: float = 0.0
+_RECHECK_SECONDS = 30.0
+
+
+def configure_model_server(socket_path: Optional[str]) -> None:
+    """Point the pipeline at a model server socket (None disables it)"""
+    global _socket_path, _client, _client_checked_at
+    _socket_path = socket_path
+    _client = None
+    _client_checked_at = 0.0
+
+
+def get_model_server_client() -> Optional[ModelServerClient]:
+    """
+    Client for the configured model server, or None to load models locally
+
+    An unreachable server is re-probed at most every 30 seconds.
+    """
+    global _client, _client_checked_at
+
+    if not _socket_path or not hasattr(socket, 'AF_UNIX'):
+        return None
+    if _client is not None:
+        return _client
+    if time.time() - _client_checked_at < _RECHECK_SECONDS:
+        return None
+
+    _client_checked_at = time.time()
+    client = ModelServerClient(_socket_path)
+    if client.ping():
+        logger.info("Using model server", socket=_socket_path)
+        _client = client
+        return client
+
+    logger.warning("Model server not reachable, loading models in-process", socket=_socket_path)
+    return None
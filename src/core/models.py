@@ -10,7 +10,7 @@ import json
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, Callable
 from dataclasses import dataclass, field, asdict
 import uuid
 
@@ -140,6 +140,7 @@ class TranscriptionResult:
     language: str = "en"
     model_used: str = "base"
     words: List[Dict[str, Any]] = field(default_factory=list)  # Word-level timestamps for clip generation
+    words_path: Optional[str] = None  # Columnar word timestamps (.npz) written by the transcription stage
     diarization: Optional[Dict[str, Any]] = None  # Speaker diarization data
     
     # Multilingual support fields
@@ -217,6 +218,32 @@ class EditorialContent:
         return cls(**data)
 
 
+class _LazyField:
+    """
+    Dataclass field that can be decoded on first access
+    
+    Defaults to None. ``EpisodeObject.defer`` registers a loader that runs
+    the first time the attribute is read; assigning the attribute discards
+    any pending loader.
+    """
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return None  # Field default for the dataclass
+        values = obj.__dict__
+        if self.name not in values:
+            loader = values.get('_deferred', {}).pop(self.name, None)
+            values[self.name] = loader() if loader else None
+        return values[self.name]
+    
+    def __set__(self, obj, value):
+        obj.__dict__.get('_deferred', {}).pop(self.name, None)
+        obj.__dict__[self.name] = value
+
+
 @dataclass
 class EpisodeObject:
     """Complete episode object with all processing data"""
@@ -226,19 +253,39 @@ class EpisodeObject:
     media: MediaInfo
     metadata: EpisodeMetadata
     processing_stage: ProcessingStage = ProcessingStage.DISCOVERED
-    transcription: Optional[TranscriptionResult] = None
-    enrichment: Optional[EnrichmentResult] = None
-    editorial: Optional[EditorialContent] = None
+    transcription: Optional[TranscriptionResult] = _LazyField()
+    enrichment: Optional[EnrichmentResult] = _LazyField()
+    editorial: Optional[EditorialContent] = _LazyField()
     errors: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
+    # Fields the registry may leave undecoded until they are read
+    LAZY_FIELDS = ('transcription', 'enrichment', 'editorial')
+    
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = datetime.now()
         if self.updated_at is None:
             self.updated_at = datetime.now()
     
+    def defer(self, field_name: str, loader: Callable[[], Any]) -> None:
+        """Decode a lazy field with loader when it is first accessed"""
+        if field_name not in self.LAZY_FIELDS:
+            raise ValueError(f"{field_name} cannot be loaded lazily")
+        self.__dict__.pop(field_name, None)
+        self.__dict__.setdefault('_deferred', {})[field_name] = loader
+    
+    def is_loaded(self, field_name: str) -> bool:
+        """Whether a lazy field has been decoded"""
+        return field_name not in self.__dict__.get('_deferred', {})
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Loaders hold database handles; decode everything before pickling or copying
+        for field_name in list(self.__dict__.get('_deferred', {})):
+            getattr(self, field_name)
+        return {k: v for k, v in self.__dict__.items() if k != '_deferred'}
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for database storage"""
         return {
@@ -367,6 +414,41 @@ class ProcessingEvent:
             self.timestamp = datetime.now()
 
 
+@dataclass
+class EpisodeSummary:
+    """Lightweight projection of an episode for listings (no transcript or enrichment payloads)"""
+    episode_id: str
+    stage: str
+    source_path: str
+    file_size: int = 0
+    duration_seconds: Optional[float] = None
+    metadata: Optional[EpisodeMetadata] = None
+    enrichment_show_name: Optional[str] = None
+    summary: Optional[str] = None
+    errors: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    def get_show_name(self) -> str:
+        """Show name with the same fallback chain as EpisodeObject.get_show_name"""
+        if self.metadata and self.metadata.show_name:
+            return self.metadata.show_name
+        return self.enrichment_show_name or 'Unknown'
+    
+    def get_title(self) -> str:
+        """Title from metadata, then the enrichment summary, then the episode ID"""
+        if self.metadata and self.metadata.title:
+            return self.metadata.title
+        return self.summary or self.episode_id
+
+
+@dataclass
+class EpisodePage:
+    """One page of an episode listing"""
+    items: List[EpisodeSummary]
+    next_cursor: Optional[str] = None  # Pass back to fetch the following page; None on the last page
+
+
 class ContentHasher:
     """Utility class for generating content hashes"""
     
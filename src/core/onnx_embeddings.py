@@ -0,0 +1,327 @@
+"""
+Quantized ONNX sentence embedding backend
+
+CPU backend for sentence embeddings that runs the same transformer as the
+sentence-transformers model through ONNX Runtime with int8 dynamically
+quantized weights. ``OnnxSentenceEncoder`` exposes the ``encode()`` call the
+segmentation engine uses, so it drops in for a ``SentenceTransformer``.
+
+The model is exported once from the PyTorch model, quantized, and checked
+against it on cosine agreement before it is used; exports that disagree
+are rejected. Later runs only need onnxruntime and the saved tokenizer.
+
+Batches are sized by tokenized sequence length: sentences are sorted by
+length and packed until the padded batch reaches a token budget, so short
+sentences run in large batches and long ones do not blow up padding.
+
+Layout:
+    {model_dir}/{model_slug}/model.int8.onnx         quantized model
+    {model_dir}/{model_slug}/embedding_config.json   pooling, normalization, agreement
+    {model_dir}/{model_slug}/tokenizer files
+"""
+
+import inspect
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .logging import get_logger
+from .exceptions import EmbeddingError
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+try:
+    from transformers import AutoTokenizer
+except ImportError:
+    AutoTokenizer = None
+
+logger = get_logger('clip_generation.onnx_embeddings')
+
+# Sentences used to check an export against the PyTorch model
+VALIDATION_SENTENCES = [
+    "Welcome back to the show, it's great to have you here.",
+    "The city council voted seven to two to approve the new budget.",
+    "I never expected the interview to go that way.",
+    "Inflation cooled for the third straight month, according to new data.",
+    "So what does this mean for families heading into the winter?",
+    "Yeah.",
+    "Researchers say the vaccine reduced hospitalizations by more than half.",
+    "Let's take a quick break and we'll be right back with more on that story.",
+]
+
+
+def plan_batches(lengths: Sequence[int], max_batch_tokens: int, max_batch_size: int) -> List[List[int]]:
+    """
+    Group sentences into batches by tokenized length
+
+    Args:
+        lengths: Token count of each sentence
+        max_batch_tokens: Budget for batch size x longest sequence in the batch
+        max_batch_size: Upper bound on sentences per batch
+
+    Returns:
+        Batches of sentence indices, shortest sentences first
+    """
+    order = np.argsort(np.asarray(lengths), kind='stable')
+    batches: List[List[int]] = []
+    current: List[int] = []
+    for index in order:
+        padded_tokens = (len(current) + 1) * lengths[index]
+        if current and (padded_tokens > max_batch_tokens or len(current) >= max_batch_size):
+            batches.append(current)
+            current = []
+        current.append(int(index))
+    if current:
+        batches.append(current)
+    return batches
+
+
+def pool_embeddings(token_embeddings: np.ndarray, attention_mask: np.ndarray, pooling: str) -> np.ndarray:
+    """Reduce token embeddings to sentence embeddings (mean or cls pooling)"""
+    if pooling == "cls":
+        return token_embeddings[:, 0]
+    mask = attention_mask[..., None].astype(token_embeddings.dtype)
+    return (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+
+def cosine_agreement(reference: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+    """Per-sentence cosine similarity summary between two embedding sets"""
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    candidate = candidate / np.linalg.norm(candidate, axis=1, keepdims=True)
+    cosines = np.einsum('ij,ij->i', reference, candidate)
+    return {'mean_cosine': float(cosines.mean()), 'min_cosine': float(cosines.min())}
+
+
+class OnnxSentenceEncoder:
+    """Stand-in for a SentenceTransformer backed by an int8 ONNX Runtime session"""
+
+    def __init__(self, model_path: Path, threads: int = 0,
+                 max_batch_tokens: int = 8192, max_batch_size: int = 128):
+        """
+        Load an exported model
+
+        Args:
+            model_path: Directory produced by ``export_quantized_model``
+            threads: ONNX Runtime intra-op threads (0 lets the runtime decide)
+            max_batch_tokens: Padded token budget per batch
+            max_batch_size: Upper bound on sentences per batch
+        """
+        if ort is None or AutoTokenizer is None:
+            raise ImportError("onnxruntime and transformers are required for the ONNX embedding backend. "
+                              "Install with: pip install onnxruntime transformers")
+
+        self.model_path = Path(model_path)
+        with open(self.model_path / "embedding_config.json", 'r', encoding='utf-8') as f:
+            self.config: Dict[str, Any] = json.load(f)
+
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_seq_length = self.config['max_seq_length']
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.model_path))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.inter_op_num_threads = 1
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            str(self.model_path / "model.int8.onnx"), options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, sentences, convert_to_numpy: bool = True, normalize_embeddings: bool = False,
+               show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        """Embed sentences; mirrors SentenceTransformer.encode"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.config['dim']), dtype=np.float32)
+
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_seq_length)
+        lengths = [len(ids) for ids in encoded['input_ids']]
+        embeddings = np.zeros((len(texts), self.config['dim']), dtype=np.float32)
+
+        for batch in plan_batches(lengths, self.max_batch_tokens, self.max_batch_size):
+            features = self.tokenizer.pad(
+                {name: [encoded[name][i] for i in batch] for name in encoded.keys()},
+                return_tensors="np"
+            )
+            inputs = {name: features[name].astype(np.int64)
+                      for name in features.keys() if name in self._input_names}
+            token_embeddings = self.session.run(None, inputs)[0]
+            embeddings[batch] = pool_embeddings(token_embeddings, features['attention_mask'],
+                                                self.config['pooling'])
+
+        if self.config.get('normalize') or normalize_embeddings:
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+
+        return embeddings[0] if single else embeddings
+
+
+def export_input_names(forward, available: Sequence[str]) -> List[str]:
+    """
+    Tokenizer outputs in the order the model's forward() declares them
+    
+    ONNX graph inputs follow the forward signature, not the tokenizer's
+    key order (BERT tokenizers emit token_type_ids before attention_mask).
+    """
+    parameters = list(inspect.signature(forward).parameters)
+    return [name for name in parameters if name in available]
+
+
+def model_slug(model_name: str) -> str:
+    """Directory name for an exported model"""
+    return re.sub(r'[^A-Za-z0-9_.-]+', '__', model_name)
+
+
+def export_quantized_model(model_name: str, output_dir: Path, min_cosine: float = 0.98,
+                           opset: int = 14) -> Path:
+    """
+    Export a sentence-transformers model to int8-quantized ONNX
+
+    The quantized model is validated against the PyTorch model on
+    ``VALIDATION_SENTENCES``; it is only kept if every sentence reaches
+    ``min_cosine``.
+
+    Args:
+        model_name: sentence-transformers model name
+        output_dir: Directory that receives the exported model
+        min_cosine: Minimum per-sentence cosine agreement with PyTorch
+        opset: ONNX opset version
+
+    Returns:
+        Path: Directory of the exported model
+
+    Raises:
+        EmbeddingError: If export fails or the quantized model disagrees with PyTorch
+    """
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError as e:
+        raise EmbeddingError(f"Exporting an ONNX embedding model requires torch, sentence-transformers "
+                             f"and onnxruntime: {e}", model_name=model_name)
+
+    reference = SentenceTransformer(model_name, device="cpu")
+    return export_sentence_transformer(reference, model_name, output_dir, min_cosine=min_cosine, opset=opset)
+
+
+def export_sentence_transformer(reference, model_name: str, output_dir: Path, min_cosine: float = 0.98,
+                                opset: int = 14) -> Path:
+    """
+    Export a loaded SentenceTransformer to int8-quantized ONNX
+
+    See ``export_quantized_model``; ``model_name`` is only recorded in the
+    exported config.
+
+    Returns:
+        Path: Directory of the exported model
+
+    Raises:
+        EmbeddingError: If export fails or the quantized model disagrees with PyTorch
+    """
+    try:
+        import torch
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+    except ImportError as e:
+        raise EmbeddingError(f"Exporting an ONNX embedding model requires torch, sentence-transformers "
+                             f"and onnxruntime: {e}", model_name=model_name)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    float_path = output_dir / "model.onnx"
+
+    logger.info("Exporting embedding model to ONNX", model_name=model_name, output_dir=str(output_dir))
+
+    transformer = reference[0]
+    pooling_module = reference[1]
+    pooling = "cls" if getattr(pooling_module, 'pooling_mode_cls_token', False) else "mean"
+    normalize = any(type(module).__name__ == 'Normalize' for module in reference)
+
+    auto_model = transformer.auto_model.eval()
+    sample = transformer.tokenizer(["Export sample sentence."], return_tensors="pt")
+    input_names = export_input_names(auto_model.forward, list(sample.keys()))
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['token_embeddings'] = {0: 'batch', 1: 'sequence'}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            auto_model,
+            # Keyword arguments, so each tensor binds to its own forward() parameter
+            ({name: sample[name] for name in input_names},),
+            str(float_path),
+            input_names=input_names,
+            output_names=['token_embeddings'],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset
+        )
+
+    quantize_dynamic(str(float_path), str(output_dir / "model.int8.onnx"), weight_type=QuantType.QInt8)
+    float_path.unlink()
+    transformer.tokenizer.save_pretrained(str(output_dir))
+
+    config = {
+        'model_name': model_name,
+        'pooling': pooling,
+        'normalize': normalize,
+        'max_seq_length': reference.get_max_seq_length() or 512,
+        'dim': reference.get_sentence_embedding_dimension()
+    }
+    with open(output_dir / "embedding_config.json", 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+
+    agreement = cosine_agreement(
+        reference.encode(VALIDATION_SENTENCES, convert_to_numpy=True, show_progress_bar=False),
+        OnnxSentenceEncoder(output_dir).encode(VALIDATION_SENTENCES)
+    )
+    config['agreement'] = agreement
+    with open(output_dir / "embedding_config.json", 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+
+    logger.info("ONNX embedding model validated against PyTorch", model_name=model_name, **agreement)
+
+    if agreement['min_cosine'] < min_cosine:
+        (output_dir / "embedding_config.json").unlink()
+        raise EmbeddingError(
+            f"Quantized ONNX model disagrees with PyTorch (min cosine {agreement['min_cosine']:.4f} "
+            f"< {min_cosine})", model_name=model_name
+        )
+
+    return output_dir
+
+
+def load_onnx_encoder(model_name: str, model_dir: Path, threads: int = 0,
+                      max_batch_tokens: int = 8192) -> OnnxSentenceEncoder:
+    """
+    Load the quantized ONNX encoder for a model, exporting it on first use
+
+    Args:
+        model_name: sentence-transformers model name
+        model_dir: Root directory of exported models
+        threads: ONNX Runtime intra-op threads (0 lets the runtime decide)
+        max_batch_tokens: Padded token budget per batch
+
+    Returns:
+        OnnxSentenceEncoder
+    """
+    if ort is None or AutoTokenizer is None:
+        raise ImportError("onnxruntime and transformers are required for the ONNX embedding backend. "
+                          "Install with: pip install onnxruntime transformers")
+
+    path = Path(model_dir) / model_slug(model_name)
+    if not (path / "embedding_config.json").exists():
+        export_quantized_model(model_name, path)
+
+    encoder = OnnxSentenceEncoder(path, threads=threads, max_batch_tokens=max_batch_tokens)
+    logger.info("Loaded ONNX embedding model",
+               model_name=model_name,
+               threads=threads,
+               max_batch_tokens=max_batch_tokens,
+               agreement=encoder.config.get('agreement'))
+    return encoder
@@ -0,0 +1,272 @@
+"""
+VAD-chunked parallel transcription for CPU workers
+
+Splits long audio at voice-activity silences into chunks of roughly equal
+length, transcribes the chunks in a process pool (one faster-whisper model
+per worker process) and stitches segments and word timestamps back into
+episode time. Used by TranscriptionEngine.transcribe_parallel.
+
+Planning and stitching work on plain floats and dicts so they can be tested
+without faster-whisper installed; the model is only imported in workers.
+"""
+
+import os
+import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .logging import get_logger
+
+logger = get_logger('pipeline.transcription.parallel')
+
+SAMPLE_RATE = 16000
+LANGUAGE_DETECTION_SECONDS = 30.0
+
+# CTranslate2 has no half-precision kernels on CPU; GPU compute types map to int8
+CPU_COMPUTE_TYPES = {
+    'float16': 'int8',
+    'bfloat16': 'int8',
+    'int8_float16': 'int8',
+    'int8_bfloat16': 'int8',
+}
+
+
+@dataclass
+class ChunkPlan:
+    """Slice of the episode transcribed by one worker"""
+    index: int
+    start: float  # seconds
+    end: float  # seconds
+    overlap: float = 0.0  # seconds shared with the previous chunk (forced cuts only)
+
+
+def plan_chunks(speech: Sequence[Tuple[float, float]], duration: float,
+                target_seconds: float = 300.0, search_fraction: float = 0.5,
+                overlap_seconds: float = 1.0) -> List[ChunkPlan]:
+    """
+    Plan chunk boundaries at silences between speech regions
+
+    Each cut is placed in the middle of the silence gap closest to
+    ``target_seconds`` after the previous cut, searching within
+    ``target_seconds * search_fraction`` either side. Where no gap exists
+    (continuous speech) the cut is forced at the target and the next chunk
+    starts ``overlap_seconds`` earlier so boundary words can be de-duplicated.
+
+    Args:
+        speech: Sorted (start, end) speech regions in seconds
+        duration: Total audio duration in seconds
+        target_seconds: Desired chunk length
+        search_fraction: Search window either side of the target, as a fraction of it
+        overlap_seconds: Overlap added after a forced cut
+
+    Returns:
+        Ordered list of ChunkPlan covering [0, duration]
+    """
+    gaps = [
+        (speech[i][1], speech[i + 1][0])
+        for i in range(len(speech) - 1)
+        if speech[i + 1][0] > speech[i][1]
+    ]
+
+    cuts: List[Tuple[float, float]] = []  # (cut time, overlap of the following chunk)
+    position = 0.0
+    while duration - position > target_seconds * (1 + search_fraction):
+        desired = position + target_seconds
+        low = position + target_seconds * (1 - search_fraction)
+        high = position + target_seconds * (1 + search_fraction)
+
+        candidates = [(a + b) / 2 for a, b in gaps if low <= (a + b) / 2 <= high]
+        if candidates:
+            cut = min(candidates, key=lambda mid: abs(mid - desired))
+            cuts.append((cut, 0.0))
+        else:
+            cut = desired
+            cuts.append((cut, overlap_seconds))
+        position = cut
+
+    plans = []
+    start, overlap = 0.0, 0.0
+    for index, (cut, next_overlap) in enumerate(cuts):
+        plans.append(ChunkPlan(index, max(0.0, start - overlap), cut, min(overlap, start)))
+        start, overlap = cut, next_overlap
+    plans.append(ChunkPlan(len(cuts), max(0.0, start - overlap), duration, min(overlap, start)))
+    return plans
+
+
+def _normalize_word(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def stitch_chunk_results(chunk_results: Sequence[Dict[str, Any]],
+                         repeat_window: float = 0.5) -> List[Dict[str, Any]]:
+    """
+    Merge per-chunk segments into one episode-time segment list
+
+    Chunk results carry chunk-relative timestamps and the chunk ``start``
+    offset. Words whose midpoint falls before the end of the last kept word
+    were already transcribed by the previous chunk and are dropped, as is a
+    repeat of the last kept word starting within ``repeat_window`` seconds.
+    Segments are rebuilt from their surviving words.
+
+    Args:
+        chunk_results: Dicts with 'index', 'start' and 'segments' (each
+            segment with 'start', 'end', 'text', 'avg_logprob' and 'words')
+
+    Returns:
+        Segment dicts in episode time with 'start', 'end', 'text',
+        'avg_logprob' and 'words'
+    """
+    stitched: List[Dict[str, Any]] = []
+    last_end = 0.0
+    last_word = ""
+
+    for chunk in sorted(chunk_results, key=lambda c: c['index']):
+        offset = chunk['start']
+
+        for segment in chunk['segments']:
+            kept_words = []
+            for word in segment.get('words') or []:
+                start, end = word['start'] + offset, word['end'] + offset
+                normalized = _normalize_word(word['word'])
+
+                if (start + end) / 2 < last_end:
+                    continue
+                if normalized and normalized == last_word and start < last_end + repeat_window:
+                    continue
+
+                kept_words.append(dict(word, start=start, end=end))
+                last_end = max(last_end, end)
+                last_word = normalized
+
+            if kept_words:
+                stitched.append({
+                    'start': kept_words[0]['start'],
+                    'end': kept_words[-1]['end'],
+                    'text': "".join(w['word'] for w in kept_words).strip(),
+                    'avg_logprob': segment.get('avg_logprob', 0.0),
+                    'words': kept_words
+                })
+            elif not segment.get('words'):
+                start, end = segment['start'] + offset, segment['end'] + offset
+                if (start + end) / 2 >= last_end and segment['text'].strip():
+                    stitched.append({
+                        'start': start,
+                        'end': end,
+                        'text': segment['text'].strip(),
+                        'avg_logprob': segment.get('avg_logprob', 0.0),
+                        'words': []
+                    })
+                    last_end = max(last_end, end)
+
+    return stitched
+
+
+def default_worker_count(cpu_threads_per_worker: int) -> int:
+    """Worker processes for this machine at the given threads per model"""
+    return max(1, (os.cpu_count() or 1) // max(1, cpu_threads_per_worker))
+
+
+def cpu_compute_type(compute_type: str) -> str:
+    """Compute type a CPU worker can load for the engine's compute type"""
+    return CPU_COMPUTE_TYPES.get(compute_type, compute_type)
+
+
+# Worker process state (one model per process)
+_worker_model = None
+
+
+def _init_worker(model_size: str, compute_type: str, cpu_threads: int) -> None:
+    """Load the faster-whisper model once per worker process"""
+    global _worker_model
+    from faster_whisper import WhisperModel
+
+    _worker_model = WhisperModel(
+        model_size,
+        device="cpu",
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=1
+    )
+
+
+def _detect_language(samples) -> str:
+    """Detect language on the opening seconds of the episode"""
+    # transcribe() detects the language eagerly; segments are decoded lazily
+    _, info = _worker_model.transcribe(samples, beam_size=1)
+    return info.language
+
+
+def _transcribe_chunk(index: int, start: float, samples, language: Optional[str],
+                      initial_prompt: Optional[str], beam_size: int) -> Dict[str, Any]:
+    """Transcribe one chunk with chunk-relative timestamps"""
+    segments_raw, info = _worker_model.transcribe(
+        samples,
+        language=language,
+        initial_prompt=initial_prompt,
+        vad_filter=True,
+        beam_size=beam_size,
+        word_timestamps=True
+    )
+
+    segments = []
+    for segment in segments_raw:
+        segments.append({
+            'start': segment.start,
+            'end': segment.end,
+            'text': segment.text,
+            'avg_logprob': segment.avg_logprob,
+            'words': [
+                {'start': w.start, 'end': w.end, 'word': w.word, 'probability': w.probability}
+                for w in (segment.words or [])
+            ]
+        })
+
+    return {'index': index, 'start': start, 'segments': segments, 'language': info.language}
+
+
+def transcribe_chunks_in_pool(audio, plans: Sequence[ChunkPlan], model_size: str,
+                              compute_type: str, language: Optional[str],
+                              initial_prompt: Optional[str], beam_size: int,
+                              max_workers: int, cpu_threads_per_worker: int) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    Transcribe planned chunks of a decoded 16 kHz waveform in a process pool
+
+    Returns:
+        Tuple of (chunk results in index order, language used)
+    """
+    workers = max(1, min(max_workers, len(plans)))
+    worker_compute_type = cpu_compute_type(compute_type)
+    if worker_compute_type != compute_type:
+        logger.info("Using CPU compute type for transcription workers",
+                    requested=compute_type, compute_type=worker_compute_type)
+
+    # spawn: forking a process that already runs CTranslate2 threads is unsafe
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(model_size, worker_compute_type, cpu_threads_per_worker)
+    ) as pool:
+        if language is None:
+            # Pin one language for every chunk so chunks do not disagree
+            language = pool.submit(
+                _detect_language, audio[:int(LANGUAGE_DETECTION_SECONDS * SAMPLE_RATE)]
+            ).result()
+
+        futures = [
+            pool.submit(
+                _transcribe_chunk,
+                plan.index,
+                plan.start,
+                audio[int(plan.start * SAMPLE_RATE):int(plan.end * SAMPLE_RATE)],
+                language,
+                initial_prompt,
+                beam_size
+            )
+            for plan in plans
+        ]
+        results = [future.result() for future in futures]
+
+    return results, language
@@ -11,8 +11,8 @@ import threading
 import hashlib
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Any, Callable
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Any, Callable, Tuple
+from dataclasses import dataclass, field
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
@@ -20,12 +20,24 @@ from .config import PipelineConfig, ConfigurationManager
 from .logging import get_logger, PipelineLogger
 from .database import DatabaseManager, create_database_manager
 from .registry import EpisodeRegistry, create_episode_registry
+from .model_server import configure_model_server
+from .stage_cache import StageCache
+from .discovery_manifest import DiscoveryManifest, ManifestEntry
+from .discovery_watcher import DiscoveryWatcher
+from .. import __version__ as PIPELINE_VERSION
 from .models import ProcessingStage
+from .stage_scheduler import (
+    StageScheduler,
+    get_current_scheduler,
+    set_current_scheduler,
+    reset_current_scheduler
+)
 from .exceptions import (
     PipelineError, 
     ProcessingError, 
     ConfigurationError,
-    TransientError
+    TransientError,
+    ValidationError
 )
 from .reliability_integration import (
     pipeline_reliability, 
@@ -58,6 +70,7 @@ class BatchProcessingStats:
     failed: int = 0
     start_time: float = 0.0
     end_time: float = 0.0
+    resource_pools: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     
     @property
     def duration(self) -> float:
@@ -68,6 +81,24 @@ class BatchProcessingStats:
         return self.processed / max(1, self.total_episodes)
 
 
+# Stages whose results go through the stage cache, with the result keys
+# that name the files each stage writes
+CACHED_STAGE_OUTPUTS: Dict[ProcessingStage, tuple] = {
+    ProcessingStage.PREPPED: ('audio_path',),
+    ProcessingStage.TRANSCRIBED: ('txt_path', 'vtt_path', 'words_path'),
+    ProcessingStage.ENRICHED: ('enriched_path',),
+    ProcessingStage.RENDERED: ('html_path', 'meta_path', 'transcript_txt', 'transcript_vtt'),
+}
+
+# Bump a stage's version when its output changes to invalidate cached results
+STAGE_CODE_VERSIONS: Dict[ProcessingStage, str] = {
+    ProcessingStage.PREPPED: "1",
+    ProcessingStage.TRANSCRIBED: "2",  # 2: columnar words file (words_path)
+    ProcessingStage.ENRICHED: "1",
+    ProcessingStage.RENDERED: "1",
+}
+
+
 class PipelineOrchestrator:
     """
     Main orchestrator for the video processing pipeline
@@ -95,6 +126,10 @@ class PipelineOrchestrator:
         self._processing_stats = BatchProcessingStats()
         self._shutdown_requested = False
         self._stage_data: Dict[str, Dict[str, Any]] = {}  # Store data between stages
+        self._stage_scheduler: Optional[StageScheduler] = None  # Scheduler of the latest batch
+        self._full_hash_task: Optional[asyncio.Task] = None  # Background hashing after a fast scan
+        self._full_hash_thread: Optional[threading.Thread] = None  # Same, after watcher registrations
+        self._discovery_watcher: Optional[DiscoveryWatcher] = None
         
         # Initialize database and registry
         self.db_manager: Optional[DatabaseManager] = None
@@ -112,6 +147,18 @@ class PipelineOrchestrator:
         )
         initialize_reliability(reliability_config)
         
+        # Content-addressed cache of stage results
+        self.stage_cache: Optional[StageCache] = None
+        if self.config.stage_cache.enabled:
+            self.stage_cache = StageCache(
+                Path(self.config.stage_cache.directory),
+                int(self.config.stage_cache.max_size_gb * 1024 ** 3)
+            )
+        
+        # Stage processors use warm models from the model server when it is up
+        if self.config.model_server.enabled:
+            configure_model_server(self.config.model_server.socket_path)
+        
         # Initialize stage processor registry
         self._register_stage_processors()
     
@@ -119,6 +166,14 @@ class PipelineOrchestrator:
         """Register processing functions for each stage"""
         # These will be implemented in subsequent tasks
         # For now, we define the interface
+        # Apply a stage result (fresh or restored from the stage cache) to
+        # the episode record and the data handed to the next stage
+        self._stage_result_handlers = {
+            ProcessingStage.PREPPED: self._apply_prep_result,
+            ProcessingStage.TRANSCRIBED: self._apply_transcription_result,
+            ProcessingStage.ENRICHED: self._apply_enrichment_result,
+            ProcessingStage.RENDERED: self._apply_rendering_result,
+        }
         self._stage_processors = {
             ProcessingStage.DISCOVERED: self._process_discovery_stage,
             ProcessingStage.PREPPED: self._process_prep_stage,
@@ -128,7 +183,7 @@ class PipelineOrchestrator:
             ProcessingStage.CLIPS_DISCOVERED: self._process_clips_discovery_stage
         }
     
-    async def process_episode(self, episode_id: str, target_stage: ProcessingStage = ProcessingStage.RENDERED, force_reprocess: bool = False, include_clip_discovery: bool = None) -> ProcessingResult:
+    async def process_episode(self, episode_id: str, target_stage: ProcessingStage = ProcessingStage.RENDERED, force_reprocess: bool = False, include_clip_discovery: bool = None, bypass_cache: bool = False) -> ProcessingResult:
         """
         Process a single episode through the pipeline stages
         
@@ -138,6 +193,8 @@ class PipelineOrchestrator:
             force_reprocess: If True, reprocess even if already at target stage
             include_clip_discovery: If True, include clip discovery after rendering. 
                                   If None, use config setting.
+            bypass_cache: If True, run every stage instead of restoring cached results
+                          (fresh results are still stored in the stage cache)
             
         Returns:
             ProcessingResult: Result of the processing operation
@@ -148,7 +205,8 @@ class PipelineOrchestrator:
             self.logger.info(f"Starting episode processing", 
                            episode_id=episode_id, 
                            target_stage=target_stage.value,
-                           force_reprocess=force_reprocess)
+                           force_reprocess=force_reprocess,
+                           bypass_cache=bypass_cache)
             
             # Get current stage for episode (or discover if not found)
             try:
@@ -195,7 +253,7 @@ class PipelineOrchestrator:
                                         stage=stage.value, episode_id=episode_id)
                 
                 self.logger.info(f"Processing stage: {stage.value}", episode_id=episode_id)
-                stage_result = await self._process_stage(episode_id, stage)
+                stage_result = await self._process_stage(episode_id, stage, bypass_cache)
                 self.logger.info(f"Stage completed: {stage.value}, success={stage_result.success}", 
                                episode_id=episode_id, duration=stage_result.duration)
                 
@@ -243,33 +301,51 @@ class PipelineOrchestrator:
         """
         Process multiple episodes concurrently
         
+        Each (episode, stage) pair is scheduled on the resource pool its stage
+        uses (transcription, ffmpeg, llm, disk_io), so one episode waiting on
+        Whisper does not hold up audio extraction or enrichment for another.
+        
         Args:
             episode_ids: List of episode IDs to process
             target_stage: Final stage to process to
-            max_concurrent: Maximum concurrent episodes (defaults to config value)
+            max_concurrent: Maximum episodes in flight (defaults to
+                processing.max_episodes_in_flight)
             
         Returns:
             BatchProcessingStats: Statistics for the batch operation
         """
         if max_concurrent is None:
-            max_concurrent = self.config.processing.max_concurrent_episodes
+            max_concurrent = self.config.processing.max_episodes_in_flight
         
         stats = BatchProcessingStats(
             total_episodes=len(episode_ids),
             start_time=time.time()
         )
+        self._processing_stats = stats
+        
+        scheduler = StageScheduler(self.config.processing.stage_pool_sizes)
+        self._stage_scheduler = scheduler
         
         self.logger.info(f"Starting batch processing", 
                         total_episodes=len(episode_ids),
-                        max_concurrent=max_concurrent,
+                        max_in_flight=max_concurrent,
                         target_stage=target_stage.value)
         
-        # Process episodes with concurrency limit
-        semaphore = asyncio.Semaphore(max_concurrent)
+        # Bound episodes in flight; stage concurrency is bounded by the pools
+        in_flight = asyncio.Semaphore(max_concurrent)
         
-        async def process_with_semaphore(episode_id: str) -> ProcessingResult:
-            async with semaphore:
-                result = await self.process_episode(episode_id, target_stage, include_clip_discovery=include_clip_discovery)
+        async def process_with_scheduler(episode_id: str) -> ProcessingResult:
+            async with in_flight:
+                token = set_current_scheduler(scheduler)
+                try:
+                    result = await self.process_episode(episode_id, target_stage, include_clip_discovery=include_clip_discovery)
+                finally:
+                    reset_current_scheduler(token)
+                
+                if result.success:
+                    stats.processed += 1
+                else:
+                    stats.failed += 1
                 
                 # Call progress callback if provided
                 if progress_callback:
@@ -278,29 +354,22 @@ class PipelineOrchestrator:
                 return result
         
         # Execute all tasks
-        tasks = [process_with_semaphore(episode_id) for episode_id in episode_ids]
+        tasks = [process_with_scheduler(episode_id) for episode_id in episode_ids]
         
         try:
             results = await asyncio.gather(*tasks, return_exceptions=True)
             
-            # Analyze results
             for result in results:
                 if isinstance(result, Exception):
                     stats.failed += 1
                     self.logger.error("Batch processing task failed", exception=result)
-                elif isinstance(result, ProcessingResult):
-                    if result.success:
-                        stats.processed += 1
-                    else:
-                        stats.failed += 1
-                else:
-                    stats.failed += 1
             
         except Exception as e:
             self.logger.error("Batch processing failed", exception=e)
             stats.failed = len(episode_ids) - stats.processed
         
         stats.end_time = time.time()
+        stats.resource_pools = scheduler.get_pool_stats()
         
         self.logger.info(f"Batch processing completed", 
                         **{
@@ -308,13 +377,15 @@ class PipelineOrchestrator:
                             'processed': stats.processed,
                             'failed': stats.failed,
                             'duration': stats.duration,
-                            'success_rate': stats.success_rate
+                            'success_rate': stats.success_rate,
+                            'resource_pools': stats.resource_pools
                         })
         
         return stats
     
-    async def _process_stage(self, episode_id: str, stage: ProcessingStage) -> ProcessingResult:
-        """Process a single stage for an episode"""
+    async def _process_stage(self, episode_id: str, stage: ProcessingStage,
+                             bypass_cache: bool = False) -> ProcessingResult:
+        """Process a single stage for an episode; bypass_cache skips stage cache lookups"""
         start_time = time.time()
         
         try:
@@ -330,8 +401,29 @@ class PipelineOrchestrator:
                     raise ProcessingError(f"No processor registered for stage {stage.value}",
                                         stage=stage.value, episode_id=episode_id)
                 
-                # Execute the stage processor
-                await processor(episode_id)
+                cache_key = await asyncio.to_thread(self._stage_cache_key, episode_id, stage)
+                cached = None
+                if cache_key and not bypass_cache:
+                    cached = await asyncio.to_thread(self.stage_cache.get, stage.value, cache_key)
+                
+                if cached is not None:
+                    self._stage_result_handlers[stage](episode_id, cached)
+                else:
+                    # Execute the stage processor, holding a slot in its resource
+                    # pool when running under a batch scheduler
+                    scheduler = get_current_scheduler()
+                    if scheduler:
+                        async with scheduler.slot(stage):
+                            stage_result = await processor(episode_id)
+                    else:
+                        stage_result = await processor(episode_id)
+                    
+                    if cache_key and isinstance(stage_result, dict) and stage_result.get('success'):
+                        output_files = [stage_result[k] for k in CACHED_STAGE_OUTPUTS[stage] if stage_result.get(k)]
+                        await asyncio.to_thread(
+                            self.stage_cache.put, stage.value, cache_key, stage_result,
+                            output_files, time.time() - start_time
+                        )
                 
                 # Update episode stage (placeholder - will be implemented in registry task)
                 await self._update_episode_stage(episode_id, stage)
@@ -344,7 +436,7 @@ class PipelineOrchestrator:
                     stage=stage.value,
                     decision="stage_completed",
                     reasoning=f"Successfully processed {stage.value} stage",
-                    metadata={"duration": duration}
+                    metadata={"duration": duration, "cache_hit": cached is not None}
                 )
                 
                 result = ProcessingResult(
@@ -355,6 +447,7 @@ class PipelineOrchestrator:
                 )
                 
                 self.logger.log_processing_event(episode_id, stage.value, "completed", duration)
+                self._record_stage_outcome(episode_id, stage, "completed", duration)
                 return result
             
         except Exception as e:
@@ -362,6 +455,7 @@ class PipelineOrchestrator:
             error_msg = str(e)
             
             self.logger.log_processing_event(episode_id, stage.value, "failed", duration, error_msg)
+            self._record_stage_outcome(episode_id, stage, "failed", duration, error_msg)
             
             return ProcessingResult(
                 success=False,
@@ -371,6 +465,54 @@ class PipelineOrchestrator:
                 error=error_msg
             )
     
+    def _stage_cache_config(self, stage: ProcessingStage) -> Dict[str, Any]:
+        """Configuration a stage's output depends on"""
+        from dataclasses import asdict
+        
+        if stage == ProcessingStage.PREPPED:
+            return {'extract_audio': not self.config.transcription.streaming}
+        if stage == ProcessingStage.TRANSCRIBED:
+            return {'whisper': self.config.models.whisper, 'transcription': asdict(self.config.transcription)}
+        if stage == ProcessingStage.ENRICHED:
+            return {
+                'models': asdict(self.config.models),
+                'thresholds': asdict(self.config.thresholds),
+                'ollama_url': self.config.ollama_url
+            }
+        return {}
+    
+    def _stage_cache_key(self, episode_id: str, stage: ProcessingStage) -> Optional[str]:
+        """
+        Stage cache key for an episode, or None if the stage is not cached
+        
+        Keys are chained from the source content hash through every earlier
+        cached stage, so upstream changes invalidate downstream results.
+        """
+        if self.stage_cache is None or stage not in CACHED_STAGE_OUTPUTS:
+            return None
+        
+        episode = self.get_registry().get_episode(episode_id)
+        if episode is None:
+            return None
+        
+        key = episode.content_hash
+        for upstream in ProcessingStage:
+            if upstream not in CACHED_STAGE_OUTPUTS:
+                continue
+            key = StageCache.compute_key(
+                key,
+                upstream.value,
+                StageCache.compute_config_hash(self._stage_cache_config(upstream)),
+                f"{PIPELINE_VERSION}:{STAGE_CODE_VERSIONS[upstream]}"
+            )
+            if upstream == stage:
+                return key
+        return None
+    
+    def get_stage_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Stage cache sizes and hit/miss metrics (None when the cache is disabled)"""
+        return self.stage_cache.get_stats() if self.stage_cache else None
+    
     def _get_stages_to_process(self, current_stage: ProcessingStage, 
                              target_stage: ProcessingStage) -> List[ProcessingStage]:
         """Determine which stages need to be processed"""
@@ -391,6 +533,11 @@ class PipelineOrchestrator:
         """Request graceful shutdown of processing"""
         self.logger.info("Shutdown requested")
         self._shutdown_requested = True
+        self.stop_discovery_watcher()
+        
+        # Write out queued processing events
+        if self.db_manager and self.db_manager.connection:
+            self.db_manager.get_event_writer().stop()
         
         # Shutdown reliability features
         shutdown_reliability()
@@ -406,7 +553,9 @@ class PipelineOrchestrator:
         return export_pipeline_metrics(format_type)
     
     def get_processing_stats(self) -> BatchProcessingStats:
-        """Get current processing statistics"""
+        """Get current processing statistics, including per-pool queue depth and utilisation"""
+        if self._stage_scheduler:
+            self._processing_stats.resource_pools = self._stage_scheduler.get_pool_stats()
         return self._processing_stats
     
     # Stage processors - implement actual processing logic
@@ -416,7 +565,7 @@ class PipelineOrchestrator:
         # Episode is already discovered and registered in database
         pass
     
-    async def _process_prep_stage(self, episode_id: str) -> None:
+    async def _process_prep_stage(self, episode_id: str) -> Dict[str, Any]:
         """Process media preparation stage - extract audio"""
         from ..stages.prep_stage import PrepStageProcessor
         
@@ -427,20 +576,22 @@ class PipelineOrchestrator:
         if not episode:
             raise ProcessingError(f"Episode not found: {episode_id}")
         
-        # Run prep processor
+        # Run prep processor; in streaming mode audio is decoded during transcription
         processor = PrepStageProcessor()
-        result = await processor.process(episode)
-        
-        # Update episode with audio path and media info
+        result = await processor.process(episode, extract_audio=not self.config.transcription.streaming)
+        self._apply_prep_result(episode_id, result)
+        return result
+    
+    def _apply_prep_result(self, episode_id: str, result: Dict[str, Any]) -> None:
+        """Record a prep stage result"""
         if result['success']:
             self.logger.info("Prep stage completed", 
                            episode_id=episode_id,
                            audio_path=result['audio_path'])
     
-    async def _process_transcription_stage(self, episode_id: str) -> None:
+    async def _process_transcription_stage(self, episode_id: str) -> Optional[Dict[str, Any]]:
         """Process transcription stage - run Whisper"""
         from ..stages.transcription_stage import TranscriptionStageProcessor
-        from ..core.models import TranscriptionResult
         
         self.logger.info("Processing transcription stage", episode_id=episode_id)
         
@@ -479,12 +630,32 @@ class PipelineOrchestrator:
             model_name=self.config.models.whisper,
             config=self.config.to_dict()  # Pass full config for multilingual settings
         )
-        result = await processor.process(episode, audio_path)
+        if self.config.transcription.streaming and not Path(audio_path).exists():
+            # Transcribe while ffmpeg is still decoding, without an intermediate WAV
+            from ..stages.prep_stage import PrepStageProcessor
+            chunks = PrepStageProcessor().stream_audio(
+                episode.source.get_absolute_path(),
+                chunk_seconds=self.config.transcription.stream_chunk_seconds,
+                max_buffered_chunks=self.config.transcription.stream_buffered_chunks,
+                silence_search_seconds=self.config.transcription.stream_silence_search_seconds
+            )
+            result = await processor.process_stream(episode, chunks)
+        else:
+            result = await processor.process(episode, audio_path)
+        
+        self._apply_transcription_result(episode_id, result)
+        return result
+    
+    def _apply_transcription_result(self, episode_id: str, result: Dict[str, Any]) -> None:
+        """Store a transcription result on the episode and for the next stage"""
+        from ..core.models import TranscriptionResult
         
         # Store transcript data for next stage
         self._stage_data[episode_id] = {'transcript': result}
         
         if result['success']:
+            episode = self.registry.get_episode(episode_id)
+            
             # Update episode with transcription results
             with open(result['vtt_path'], 'r', encoding='utf-8') as f:
                 vtt_content = f.read()
@@ -494,6 +665,7 @@ class PipelineOrchestrator:
                 vtt_content=vtt_content,
                 segments=result['segments'],
                 words=result.get('words', []),
+                words_path=result.get('words_path'),
                 language=result.get('language', 'en'),
                 model_used=self.config.models.whisper,
                 # Multilingual support fields
@@ -504,14 +676,14 @@ class PipelineOrchestrator:
             )
             
             # Save updated episode to database
-            self.registry.update_episode_data(episode)
+            self.registry.update_episode_data(episode, parts=['transcription'])
             
             self.logger.info("Transcription stage completed",
                            episode_id=episode_id,
                            word_count=result.get('word_count', 0),
                            word_timestamps=len(result.get('words', [])) > 0)
     
-    async def _process_enrichment_stage(self, episode_id: str) -> None:
+    async def _process_enrichment_stage(self, episode_id: str) -> Optional[Dict[str, Any]]:
         """Process enrichment stage - run intelligence chain"""
         from ..stages.enrichment_stage import EnrichmentStageProcessor
         
@@ -559,8 +731,18 @@ class PipelineOrchestrator:
             config=self.config,
             intelligence_chain_enabled=True  # Enable Phase 2 features
         )
-        result = await processor.process(episode, audio_path, transcript_data)
         
+        # Streaming mode skips the prep-stage WAV; diarization still needs one
+        if processor.diarization_enabled and not Path(audio_path).exists():
+            from ..stages.prep_stage import PrepStageProcessor
+            audio_path = str(await PrepStageProcessor().ensure_audio_file(episode))
+        
+        result = await processor.process(episode, audio_path, transcript_data)
+        self._apply_enrichment_result(episode_id, result)
+        return result
+    
+    def _apply_enrichment_result(self, episode_id: str, result: Dict[str, Any]) -> None:
+        """Store an enrichment result on the episode and for the next stage"""
         # Store enrichment data for next stage
         if episode_id not in self._stage_data:
             self._stage_data[episode_id] = {}
@@ -570,6 +752,8 @@ class PipelineOrchestrator:
             # Create EnrichmentResult object and save to episode
             from ..core.models import EnrichmentResult
             
+            episode = self.registry.get_episode(episode_id)
+            
             enrichment_data = result.get('enrichment_data', {})
             ai_analysis = enrichment_data.get('ai_analysis', {})
             summary_data = enrichment_data.get('summary', {})
@@ -655,14 +839,14 @@ class PipelineOrchestrator:
                     # episode_id = new_episode_id
             
             # Save enrichment data to database
-            self.registry.update_episode_data(episode)
+            self.registry.update_episode_data(episode, parts=['enrichment'])
             
             self.logger.info("Enrichment stage completed",
                            episode_id=episode_id,
                            show_name=enrichment_result.show_name,
                            host_name=enrichment_result.host_name)
     
-    async def _process_rendering_stage(self, episode_id: str) -> None:
+    async def _process_rendering_stage(self, episode_id: str) -> Dict[str, Any]:
         """Process rendering stage - generate web artifacts"""
         from ..stages.rendering_stage import RenderingStageProcessor
         
@@ -680,7 +864,11 @@ class PipelineOrchestrator:
         # Run rendering processor
         processor = RenderingStageProcessor()
         result = await processor.process(episode, transcript_data, enrichment_data)
-        
+        self._apply_rendering_result(episode_id, result)
+        return result
+    
+    def _apply_rendering_result(self, episode_id: str, result: Dict[str, Any]) -> None:
+        """Record a rendering result and release the episode's stage data"""
         # Clean up stage data
         if episode_id in self._stage_data:
             del self._stage_data[episode_id]
@@ -778,6 +966,17 @@ class PipelineOrchestrator:
         
         return episode.processing_stage
     
+    def _record_stage_outcome(self, episode_id: str, stage: ProcessingStage, status: str,
+                              duration: float, error_message: Optional[str] = None) -> None:
+        """Queue the stage's processing_log row and duration metric on the batched writer"""
+        try:
+            registry = self.get_registry()
+            registry.log_processing_event(episode_id, stage.value, status, duration, error_message)
+            registry.record_metric(episode_id, stage.value, 'duration_seconds', duration)
+        except Exception as e:
+            self.logger.warning("Could not record stage outcome",
+                              episode_id=episode_id, stage=stage.value, error=str(e))
+    
     async def _update_episode_stage(self, episode_id: str, stage: ProcessingStage) -> None:
         """Update processing stage for episode"""
         registry = self.get_registry()
@@ -819,19 +1018,23 @@ class PipelineOrchestrator:
             List of discovered Episode objects
         """
         from pathlib import Path
-        from .models import EpisodeObject, SourceInfo, MediaInfo, EpisodeMetadata
-        from datetime import datetime
         from .path_utils import normalize_path
-        import hashlib
-        import subprocess
-        import json
+        
+        # The watcher keeps the sources' episodes current; no need to walk them
+        if self._discovery_watcher and self._discovery_watcher.is_ready:
+            episodes = self._discovery_watcher.get_episodes()
+            self.logger.info(f"Discovery served by watcher: {len(episodes)} episodes")
+            return episodes
         
         self.logger.info("Starting episode discovery")
         
         # Initialize registry if needed
         registry = self.get_registry()
+        manifest = DiscoveryManifest(self.db_manager)
+        fast_hashing = self.config.discovery.hash_mode == 'fast'
         
         discovered_episodes = []
+        pending_episodes = []
         
         # Get enabled sources from config
         for source in self.config.sources:
@@ -851,170 +1054,294 @@ class PipelineOrchestrator:
             for pattern in source.include:
                 video_files.extend(source_path.glob(pattern))
             
+            # Skip excluded patterns
+            video_files = [
+                video_file for video_file in video_files
+                if not any(video_file.match(exclude) for exclude in source.exclude)
+            ]
+            
+            # Hash only new or changed files; unchanged ones come from the manifest
+            manifest_entries = await self._resolve_file_hashes(manifest, video_files, fast_hashing)
+            
             # Register each video
             for video_file in video_files:
-                # Skip excluded patterns
-                if any(video_file.match(exclude) for exclude in source.exclude):
-                    continue
-                
-                # Generate structured episode ID using NamingService
-                from .naming_service import get_naming_service
-                import re
-                
-                naming_service = get_naming_service()
-                filename = video_file.stem
-                
-                # Infer show name from folder structure
-                # Path structure: input_videos/TheNewsForum/ForumDailyNews/video.mp4
-                # or: data/temp/uploaded/video.mp4
-                parent_folder = video_file.parent.name
-                grandparent_folder = video_file.parent.parent.name if video_file.parent.parent else None
-                
-                # Try to map folder name to show name
-                show_name = None
-                if parent_folder and parent_folder != "uploaded":
-                    show_name = parent_folder
-                elif grandparent_folder and grandparent_folder != "temp":
-                    show_name = grandparent_folder
-                
-                # For uploaded files, try to extract show name from filename prefix
-                # Examples: FDW_09.24.25.mp4 → FDW, FD1314_10-27-25.mp4 → FD
-                if not show_name and parent_folder == "uploaded":
-                    prefix_match = re.match(r'^([A-Z]{2,4})[\d_-]', filename, re.IGNORECASE)
-                    if prefix_match:
-                        prefix = prefix_match.group(1).upper()
-                        # Map common prefixes to show names
-                        prefix_mapping = {
-                            'FD': 'Forum Daily News',
-                            'FDW': 'Forum Daily Week',
-                            'BB': 'Boom and Bust',
-                            'CP': 'Community Profile',
-                            'EP': 'Economic Pulse',
-                            'FF': 'Freedom Forum',
-                            'MG': 'My Generation',
-                            'CJ': 'Canadian Justice',
-                            'CI': 'Canadian Innovators',
-                            'LS': 'The LeDrew Show'
-                        }
-                        show_name = prefix_mapping.get(prefix, prefix)
-                        self.logger.info(f"Extracted show name from filename prefix: {prefix} -> {show_name}")
-                
-                # Try to extract episode number from filename
-                episode_number = None
-                match = re.search(r'(?:FD|EP|E)?(\d{3,4})', filename, re.IGNORECASE)
-                if match:
-                    episode_number = match.group(1)
-                
-                # Generate structured episode ID
-                episode_id = naming_service.generate_episode_id(
-                    show_name=show_name,
-                    episode_number=episode_number,
-                    date=datetime.fromtimestamp(video_file.stat().st_mtime),
-                    source_filename=filename
-                )
-                
-                # Calculate file hash for content-based deduplication
-                file_hash = self._calculate_file_hash(video_file)
-                file_size = video_file.stat().st_size
-                last_modified = datetime.fromtimestamp(video_file.stat().st_mtime)
-                
-                # Check if file with same hash already exists (duplicate content)
-                existing_by_hash = registry.get_episode_by_hash(file_hash)
-                if existing_by_hash:
-                    self.logger.info(f"Duplicate file detected: {video_file.name} matches {existing_by_hash.episode_id}")
-                    # Update source path if different
-                    if existing_by_hash.source.path != str(video_file):
-                        registry.update_episode_source_path(existing_by_hash.episode_id, str(video_file))
-                    discovered_episodes.append(existing_by_hash)
-                    continue
-                
-                # Check if episode ID already exists
-                existing = registry.get_episode(episode_id)
-                if existing:
-                    # Episode ID exists - check if it's the same file
-                    if existing.content_hash == file_hash:
-                        self.logger.debug(f"Episode already exists: {episode_id}")
-                        discovered_episodes.append(existing)
-                        continue
-                    else:
-                        # Same ID but different file - file was replaced
-                        self.logger.warning(f"File content changed for {episode_id}, updating hash")
-                        registry.update_episode_hash(episode_id, file_hash, file_size, last_modified)
-                        discovered_episodes.append(existing)
-                        continue
-                
-                # Extract video duration using ffprobe
-                duration = self._get_video_duration(video_file)
-                
-                # Store relative path from project root to make database portable
-                try:
-                    # Get project root (where pipeline.py is: src/core/pipeline.py -> 2 levels up)
-                    project_root = Path(__file__).parent.parent.parent.resolve()
-                    relative_path = video_file.relative_to(project_root)
-                    source_path = str(relative_path).replace('\\', '/')
-                except ValueError:
-                    # File is outside project root, store absolute path
-                    source_path = str(video_file).replace('\\', '/')
-                
-                # Create episode object
-                episode = EpisodeObject(
-                    episode_id=episode_id,
-                    content_hash=file_hash,
-                    processing_stage=ProcessingStage.DISCOVERED,
-                    source=SourceInfo(
-                        path=source_path,
-                        file_size=file_size,
-                        last_modified=last_modified
-                    ),
-                    media=MediaInfo(
-                        duration_seconds=duration
-                    ),
-                    metadata=EpisodeMetadata(
-                        show_name=show_name,
-                        show_slug=show_name.lower() if show_name else "uncategorized",
-                        title=filename
-                    )
-                )
-                
-                # Register in database
-                registry.register_episode(episode)
-                discovered_episodes.append(episode)
-                
-                self.logger.info(f"Discovered episode: {episode_id}")
+                discovered_episodes.append(self._register_video_file(
+                    registry, video_file, manifest_entries.get(video_file), pending_episodes
+                ))
+        
+        # New episodes go in with one transaction instead of one per file
+        discovered_episodes = self._register_pending_episodes(registry, discovered_episodes, pending_episodes)
+        
+        if fast_hashing:
+            self._start_full_hash_completion(manifest, registry)
         
         self.logger.info(f"Discovery complete: {len(discovered_episodes)} episodes")
         return discovered_episodes
     
-    def _calculate_file_hash(self, file_path: Path, algorithm: str = 'sha256') -> str:
+    async def _resolve_file_hashes(self, manifest: DiscoveryManifest, video_files: List[Path],
+                                   fast: bool) -> Dict[Path, ManifestEntry]:
+        """Look up or compute content hashes, hashing up to max_concurrent_scans files at once"""
+        semaphore = asyncio.Semaphore(self.config.discovery.max_concurrent_scans)
+        
+        async def resolve(video_file: Path):
+            async with semaphore:
+                try:
+                    return video_file, await asyncio.to_thread(manifest.resolve, video_file, fast)
+                except Exception as e:
+                    self.logger.error(f"Failed to calculate hash for {video_file}", error=str(e))
+                    return video_file, None
+        
+        return dict(await asyncio.gather(*(resolve(video_file) for video_file in video_files)))
+    
+    def _start_full_hash_completion(self, manifest: DiscoveryManifest, registry: EpisodeRegistry) -> None:
+        """Compute full hashes of fingerprinted files in the background"""
+        if self._full_hash_task and not self._full_hash_task.done():
+            return
+        self._full_hash_task = asyncio.create_task(
+            asyncio.to_thread(manifest.complete_full_hashes, registry)
+        )
+    
+    def _register_video_file(self, registry: EpisodeRegistry, video_file: Path,
+                             manifest_entry: Optional[ManifestEntry],
+                             pending: Optional[List] = None):
         """
-        Calculate hash of file content for deduplication
+        Register one discovered video file
         
-        Uses SHA256 by default for better collision resistance than MD5.
-        Reads file in chunks to handle large video files efficiently.
+        Returns the existing episode when the file (or its content) is
+        already registered, otherwise the new episode. With ``pending``, a
+        new episode is appended there for bulk registration instead of
+        being registered immediately.
+        """
+        from .models import EpisodeObject, SourceInfo, MediaInfo, EpisodeMetadata
+        from .naming_service import get_naming_service
+        import re
+        
+        # Generate structured episode ID using NamingService
+        
+        naming_service = get_naming_service()
+        filename = video_file.stem
+        
+        # Infer show name from folder structure
+        # Path structure: input_videos/TheNewsForum/ForumDailyNews/video.mp4
+        # or: data/temp/uploaded/video.mp4
+        parent_folder = video_file.parent.name
+        grandparent_folder = video_file.parent.parent.name if video_file.parent.parent else None
+        
+        # Try to map folder name to show name
+        show_name = None
+        if parent_folder and parent_folder != "uploaded":
+            show_name = parent_folder
+        elif grandparent_folder and grandparent_folder != "temp":
+            show_name = grandparent_folder
+        
+        # For uploaded files, try to extract show name from filename prefix
+        # Examples: FDW_09.24.25.mp4 → FDW, FD1314_10-27-25.mp4 → FD
+        if not show_name and parent_folder == "uploaded":
+            prefix_match = re.match(r'^([A-Z]{2,4})[\d_-]', filename, re.IGNORECASE)
+            if prefix_match:
+                prefix = prefix_match.group(1).upper()
+                # Map common prefixes to show names
+                prefix_mapping = {
+                    'FD': 'Forum Daily News',
+                    'FDW': 'Forum Daily Week',
+                    'BB': 'Boom and Bust',
+                    'CP': 'Community Profile',
+                    'EP': 'Economic Pulse',
+                    'FF': 'Freedom Forum',
+                    'MG': 'My Generation',
+                    'CJ': 'Canadian Justice',
+                    'CI': 'Canadian Innovators',
+                    'LS': 'The LeDrew Show'
+                }
+                show_name = prefix_mapping.get(prefix, prefix)
+                self.logger.info(f"Extracted show name from filename prefix: {prefix} -> {show_name}")
+        
+        # Try to extract episode number from filename
+        episode_number = None
+        match = re.search(r'(?:FD|EP|E)?(\d{3,4})', filename, re.IGNORECASE)
+        if match:
+            episode_number = match.group(1)
+        
+        # Generate structured episode ID
+        episode_id = naming_service.generate_episode_id(
+            show_name=show_name,
+            episode_number=episode_number,
+            date=datetime.fromtimestamp(video_file.stat().st_mtime),
+            source_filename=filename
+        )
+        
+        # Content hash for deduplication (fingerprint until the full hash is known)
+        if manifest_entry:
+            file_hash = manifest_entry.content_hash
+        else:
+            # Fallback to path-based hash if file can't be read
+            file_hash = hashlib.md5(str(video_file).encode()).hexdigest()
+        file_size = video_file.stat().st_size
+        last_modified = datetime.fromtimestamp(video_file.stat().st_mtime)
+        
+        # Check if file with same hash already exists (duplicate content)
+        existing_by_hash = registry.get_episode_by_hash(file_hash)
+        if not existing_by_hash and manifest_entry and manifest_entry.full_hash:
+            # Registered by a fast scan before the full hash was known
+            provisional = registry.get_episode_by_hash(manifest_entry.fingerprint)
+            if provisional:
+                registry.update_episode_hash(provisional.episode_id, file_hash, file_size, last_modified)
+                existing_by_hash = registry.get_episode(provisional.episode_id)
+        if existing_by_hash:
+            self.logger.info(f"Duplicate file detected: {video_file.name} matches {existing_by_hash.episode_id}")
+            # Update source path if different
+            if existing_by_hash.source.path != str(video_file):
+                registry.update_episode_source_path(existing_by_hash.episode_id, str(video_file))
+            return existing_by_hash
+        
+        # Check if episode ID already exists
+        existing = registry.get_episode(episode_id)
+        if existing:
+            # Episode ID exists - check if it's the same file
+            if existing.content_hash == file_hash:
+                self.logger.debug(f"Episode already exists: {episode_id}")
+                return existing
+            else:
+                # Same ID but different file - file was replaced
+                self.logger.warning(f"File content changed for {episode_id}, updating hash")
+                registry.update_episode_hash(episode_id, file_hash, file_size, last_modified)
+                return existing
+        
+        # Extract video duration using ffprobe
+        duration = self._get_video_duration(video_file)
+        
+        # Store relative path from project root to make database portable
+        try:
+            # Get project root (where pipeline.py is: src/core/pipeline.py -> 2 levels up)
+            project_root = Path(__file__).parent.parent.parent.resolve()
+            relative_path = video_file.relative_to(project_root)
+            source_path = str(relative_path).replace('\\', '/')
+        except ValueError:
+            # File is outside project root, store absolute path
+            source_path = str(video_file).replace('\\', '/')
+        
+        # Create episode object
+        episode = EpisodeObject(
+            episode_id=episode_id,
+            content_hash=file_hash,
+            processing_stage=ProcessingStage.DISCOVERED,
+            source=SourceInfo(
+                path=source_path,
+                file_size=file_size,
+                last_modified=last_modified
+            ),
+            media=MediaInfo(
+                duration_seconds=duration
+            ),
+            metadata=EpisodeMetadata(
+                show_name=show_name,
+                show_slug=show_name.lower() if show_name else "uncategorized",
+                title=filename
+            )
+        )
+        
+        if pending is not None:
+            # Registered in one transaction by the caller
+            pending.append(episode)
+            return episode
+        
+        # Register in database
+        registry.register_episode(episode)
+        
+        self.logger.info(f"Discovered episode: {episode_id}")
+        return episode
+    
+    def _register_pending_episodes(self, registry: EpisodeRegistry, episodes: List,
+                                   pending: List) -> List:
+        """
+        Bulk-register new episodes collected by _register_video_file
+        
+        Entries of episodes whose content turned out to be registered
+        already (e.g. the same video in two sources) are replaced by the
+        stored episode.
+        """
+        if not pending:
+            return episodes
+        
+        replacements = {}
+        for episode, registered in zip(pending, registry.register_episodes_bulk(pending)):
+            if registered:
+                self.logger.info(f"Discovered episode: {episode.episode_id}")
+            else:
+                replacements[id(episode)] = registry.get_episode_by_hash(episode.content_hash)
+        
+        return [replacements.get(id(episode)) or episode for episode in episodes]
+    
+    def register_video_files(self, video_files: List[Path]) -> List[Optional[Any]]:
+        """
+        Hash and register specific video files (used by the discovery watcher)
+        
+        Hashes go through the discovery manifest like a full scan: files it
+        holds unchanged are not read again, and with discovery.hash_mode
+        'fast' new files are fingerprinted and fully hashed on a background
+        thread.
         
-        Args:
-            file_path: Path to the file
-            algorithm: Hash algorithm ('md5', 'sha256', 'sha512')
-            
         Returns:
-            Hexadecimal hash string
+            The episode for each file, or None where registration failed
         """
-        hash_func = hashlib.new(algorithm)
+        registry = self.get_registry()
+        manifest = DiscoveryManifest(self.db_manager)
+        fast_hashing = self.config.discovery.hash_mode == 'fast'
+        
+        episodes = []
+        pending = []
+        for video_file in video_files:
+            try:
+                entry = manifest.resolve(video_file, fast_hashing)
+                episodes.append(self._register_video_file(registry, video_file, entry, pending))
+            except Exception as e:
+                self.logger.error(f"Failed to register {video_file}", error=str(e))
+                episodes.append(None)
         
         try:
-            with open(file_path, 'rb') as f:
-                # Read in 64KB chunks to handle large files
-                for chunk in iter(lambda: f.read(65536), b''):
-                    hash_func.update(chunk)
-            
-            file_hash = hash_func.hexdigest()
-            self.logger.debug(f"Calculated {algorithm} hash for {file_path.name}", hash=file_hash[:16])
-            return file_hash
-            
+            episodes = self._register_pending_episodes(registry, episodes, pending)
         except Exception as e:
-            self.logger.error(f"Failed to calculate hash for {file_path}", error=str(e))
-            # Fallback to path-based hash if file can't be read
-            return hashlib.md5(str(file_path).encode()).hexdigest()
+            self.logger.error("Failed to register discovered episodes", error=str(e))
+            pending_ids = {id(episode) for episode in pending}
+            episodes = [None if id(episode) in pending_ids else episode for episode in episodes]
+        
+        if fast_hashing:
+            self._start_full_hash_thread(manifest, registry)
+        return episodes
+    
+    def _start_full_hash_thread(self, manifest: DiscoveryManifest, registry: EpisodeRegistry) -> None:
+        """Compute full hashes of fingerprinted files on a background thread"""
+        if self._full_hash_thread and self._full_hash_thread.is_alive():
+            return
+        self._full_hash_thread = threading.Thread(
+            target=manifest.complete_full_hashes,
+            args=(registry,),
+            name="discovery-full-hash",
+            daemon=True
+        )
+        self._full_hash_thread.start()
+    
+    def start_discovery_watcher(self) -> DiscoveryWatcher:
+        """Start watching the enabled sources and registering stable new files"""
+        if self._discovery_watcher and self._discovery_watcher.is_running:
+            return self._discovery_watcher
+        
+        discovery = self.config.discovery
+        self._discovery_watcher = DiscoveryWatcher(
+            sources=self.config.sources,
+            register=self.register_video_files,
+            stability_seconds=discovery.stability_minutes * 60,
+            backend=discovery.watch_backend,
+            poll_interval_seconds=discovery.scan_interval_seconds
+        )
+        self._discovery_watcher.start()
+        return self._discovery_watcher
+    
+    def stop_discovery_watcher(self) -> None:
+        """Stop the discovery watcher if it is running"""
+        if self._discovery_watcher:
+            self._discovery_watcher.stop()
+            self._discovery_watcher = None
     
     def _get_video_duration(self, file_path: Path) -> Optional[float]:
         """
@@ -1070,63 +1397,61 @@ class PipelineOrchestrator:
     
     def list_episodes(self, stage_filter: Optional[ProcessingStage] = None, limit: int = 20) -> List[Dict[str, Any]]:
         """List episodes with optional filtering"""
+        episodes, _next_cursor = self.list_episodes_page(stage_filter=stage_filter, limit=limit)
+        return episodes
+    
+    def list_episodes_page(self, stage_filter: Optional[ProcessingStage] = None, limit: int = 20,
+                           show: Optional[str] = None, created_after: Optional[datetime] = None,
+                           created_before: Optional[datetime] = None, order_by: str = 'updated_at',
+                           descending: bool = True,
+                           cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        List one page of episodes, filtered and ordered in the database
+        
+        Returns:
+            The episodes as API dicts and the cursor of the next page (None on the last page)
+        """
         try:
             registry = self.get_registry()
-            
-            # Get all episodes from registry
-            all_episodes = registry.list_episodes()
-            
-            # Filter by stage if specified
-            if stage_filter:
-                all_episodes = [ep for ep in all_episodes if ep.processing_stage == stage_filter]
-            
-            # Limit results
-            episodes = all_episodes[:limit]
-            
-            # Convert to dict format for API response
-            result = []
-            for ep in episodes:
-                # Get show_name from metadata first, then fall back to enrichment
-                show_name = None
-                if ep.metadata and ep.metadata.show_name:
-                    show_name = ep.metadata.show_name
-                elif ep.enrichment and ep.enrichment.show_name:
-                    show_name = ep.enrichment.show_name
-                else:
-                    show_name = 'Unknown'
-                
-                # Get title from metadata or enrichment
-                title = None
-                if ep.metadata and ep.metadata.title:
-                    title = ep.metadata.title
-                elif ep.enrichment and hasattr(ep.enrichment, 'summary'):
-                    title = ep.enrichment.summary
-                else:
-                    title = ep.episode_id
-                
-                episode_dict = {
-                    'episode_id': ep.episode_id,
-                    'stage': ep.processing_stage.value if ep.processing_stage else 'unknown',
-                    'source_path': ep.source.path if ep.source else '',
-                    'file_size': ep.source.file_size if ep.source else 0,
-                    'show_name': show_name,
-                    'title': title,
-                    'show': show_name,  # Use same show_name for 'show' field
-                    'duration': ep.media.duration_seconds if ep.media else 0,
-                    'created_at': ep.created_at.isoformat() if ep.created_at else None,
-                    'updated_at': ep.updated_at.isoformat() if ep.updated_at else None,
-                    'errors': ep.errors,
-                    'metadata': ep.metadata.to_dict() if ep.metadata else None,
-                    'enrichment': ep.enrichment.to_dict() if ep.enrichment else None,
-                    'transcription': ep.transcription.to_dict() if ep.transcription else None
-                }
-                result.append(episode_dict)
-            
-            return result
-            
+            page = registry.query_episodes(
+                stage=stage_filter,
+                show=show,
+                created_after=created_after,
+                created_before=created_before,
+                order_by=order_by,
+                descending=descending,
+                limit=limit,
+                cursor=cursor
+            )
+        except ValidationError:
+            raise
         except Exception as e:
             self.logger.error(f"Error listing episodes", error=str(e))
-            return []
+            return [], None
+        
+        # Convert to dict format for API response
+        result = []
+        for ep in page.items:
+            show_name = ep.get_show_name()
+            result.append({
+                'episode_id': ep.episode_id,
+                'stage': ep.stage,
+                'source_path': ep.source_path,
+                'file_size': ep.file_size,
+                'show_name': show_name,
+                'title': ep.get_title(),
+                'show': show_name,  # Use same show_name for 'show' field
+                'duration': ep.duration_seconds or 0,
+                'created_at': ep.created_at.isoformat() if ep.created_at else None,
+                'updated_at': ep.updated_at.isoformat() if ep.updated_at else None,
+                'errors': ep.errors,
+                'metadata': ep.metadata.to_dict() if ep.metadata else None,
+                # Listings carry only the enrichment summary; fetch the episode for full payloads
+                'enrichment': {'summary': ep.summary} if ep.summary else None,
+                'transcription': None
+            })
+        
+        return result, page.next_cursor
     
     def _start_backup_scheduler(self) -> None:
         """Start automatic database backup scheduler"""
@@ -1173,30 +1498,60 @@ class PipelineOrchestrator:
                        backup_path=backup_path,
                        next_backup=self._last_backup_time + timedelta(hours=self.config.database.backup_interval_hours))
             
-            # Clean up old backups (keep last 7 days)
+            # Clean up old backups (by age, then by total size)
             self._cleanup_old_backups()
             
         except Exception as e:
             logger.error("Database backup failed", error=str(e))
     
-    def _cleanup_old_backups(self, keep_days: int = 7) -> None:
-        """Clean up old backup files"""
+    def _cleanup_old_backups(self, keep_days: Optional[int] = None,
+                             max_total_mb: Optional[int] = None) -> None:
+        """
+        Clean up old backup files
+        
+        Backups older than keep_days are deleted, then the oldest remaining
+        ones until the total fits max_total_mb. The newest backup is always
+        kept.
+        
+        Args:
+            keep_days: Age limit (defaults to database.backup_retention_days)
+            max_total_mb: Size budget, 0 for none (defaults to database.backup_max_total_mb)
+        """
         try:
             from pathlib import Path
             
+            keep_days = self.config.database.backup_retention_days if keep_days is None else keep_days
+            max_total_mb = self.config.database.backup_max_total_mb if max_total_mb is None else max_total_mb
+            
             backup_dir = Path(self.config.database.path).parent
             cutoff_time = datetime.now() - timedelta(days=keep_days)
             
-            # Find and delete old backups
+            backups = sorted(
+                ((f, f.stat()) for pattern in ("*_backup_*.db", "*_backup_*.db.gz") for f in backup_dir.glob(pattern)),
+                key=lambda item: item[1].st_mtime,
+                reverse=True
+            )
+            
+            # Oldest first; the newest backup is never deleted
             deleted_count = 0
-            for backup_file in backup_dir.glob("*_backup_*.db"):
-                if backup_file.stat().st_mtime < cutoff_time.timestamp():
+            deleted_bytes = 0
+            total_bytes = sum(stat.st_size for _, stat in backups)
+            for backup_file, stat in reversed(backups[1:]):
+                too_old = stat.st_mtime < cutoff_time.timestamp()
+                over_budget = max_total_mb > 0 and total_bytes > max_total_mb * 1024 * 1024
+                if too_old or over_budget:
                     backup_file.unlink()
+                    total_bytes -= stat.st_size
                     deleted_count += 1
-                    logger.debug("Deleted old backup", backup_file=str(backup_file))
+                    deleted_bytes += stat.st_size
+                    logger.debug("Deleted old backup", backup_file=str(backup_file),
+                                reason="age" if too_old else "size")
             
             if deleted_count > 0:
-                logger.info("Cleaned up old backups", deleted_count=deleted_count)
+                logger.info("Cleaned up old backups",
+                           deleted_count=deleted_count,
+                           freed_mb=round(deleted_bytes / (1024 * 1024), 1),
+                           remaining_mb=round(total_bytes / (1024 * 1024), 1))
                 
         except Exception as e:
             logger.warning("Failed to cleanup old backups", error=str(e))
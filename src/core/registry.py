@@ -5,24 +5,47 @@ Manages episode registration, deduplication, and processing stage tracking
 using SQLite database with atomic operations and referential integrity.
 """
 
+import base64
 import json
 import sqlite3
 import time
 from datetime import datetime
-from typing import Dict, List, Optional, Set, Any, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Any, Tuple
 from pathlib import Path
 
 from .database import DatabaseManager, DatabaseConnection
 from .models import (
     EpisodeObject, ProcessingStage, ProcessingEvent, 
     SourceInfo, MediaInfo, EpisodeMetadata,
-    TranscriptionResult, EnrichmentResult, EditorialContent
+    TranscriptionResult, EnrichmentResult, EditorialContent,
+    EpisodeSummary, EpisodePage
 )
 from .exceptions import DatabaseError, ValidationError, ProcessingError
 from .logging import get_logger
 
 logger = get_logger('pipeline.registry')
 
+# Marks a lazy field that was not selected with the episode row
+_FETCH_ON_ACCESS = object()
+
+_LAZY_DECODERS = {
+    'transcription': TranscriptionResult.from_dict,
+    'enrichment': EnrichmentResult.from_dict,
+    'editorial': EditorialContent.from_dict
+}
+
+# Episode parts stored in episode_content rather than in the episodes.metadata blob
+_CONTENT_PARTS = EpisodeObject.LAZY_FIELDS + ('media',)
+
+# Writes a part and bumps its version
+_UPSERT_CONTENT = """
+    INSERT INTO episode_content (episode_id, part, data) VALUES (?, ?, ?)
+    ON CONFLICT (episode_id, part) DO UPDATE SET
+        data = excluded.data,
+        version = version + 1,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
 
 class EpisodeRegistry:
     """
@@ -36,6 +59,11 @@ class EpisodeRegistry:
         self.db_manager = db_manager
         self.connection = db_manager.get_connection()
     
+    @property
+    def event_writer(self):
+        """Batched writer shared by all registries on this database"""
+        return self.db_manager.get_event_writer()
+    
     def register_episode(self, episode: EpisodeObject) -> bool:
         """
         Register a new episode with deduplication check
@@ -74,7 +102,7 @@ class EpisodeRegistry:
             # Register episode in database
             with self.connection.transaction() as conn:
                 # Insert episode record
-                metadata_json = json.dumps(episode.to_dict())
+                metadata_json = self._core_metadata_json(episode)
                 
                 conn.execute("""
                     INSERT INTO episodes (
@@ -95,6 +123,8 @@ class EpisodeRegistry:
                     episode.updated_at.isoformat()
                 ))
                 
+                conn.executemany(_UPSERT_CONTENT, self._content_rows(episode, _CONTENT_PARTS, include_empty=False))
+                
                 # Log registration event
                 self._log_processing_event(
                     conn, episode.episode_id, "registration", "completed"
@@ -122,6 +152,132 @@ class EpisodeRegistry:
                         error=str(e))
             raise DatabaseError(f"Failed to register episode: {e}")
     
+    def register_episodes_bulk(self, episodes: List[EpisodeObject]) -> List[bool]:
+        """
+        Register many episodes in a single transaction
+        
+        Existing IDs and hashes are loaded once, so deduplication and ID
+        collision handling happen in memory instead of with per-episode
+        queries. Episode and processing_log rows are inserted with
+        executemany. Colliding IDs are rewritten on the episode objects, as
+        with register_episode.
+        
+        Args:
+            episodes: Episode objects to register
+            
+        Returns:
+            List[bool]: For each episode, True if registered, False if its
+            content hash was already registered (or repeated in the batch)
+            
+        Raises:
+            DatabaseError: If database operation fails
+            ValidationError: If any episode is invalid (nothing is registered)
+        """
+        for episode in episodes:
+            self._validate_episode(episode)
+        
+        if not episodes:
+            return []
+        
+        start_time = time.time()
+        registered = [False] * len(episodes)
+        
+        try:
+            with self.connection.transaction() as conn:
+                existing_ids: Set[str] = set()
+                existing_hashes: Set[str] = set()
+                for episode_id, content_hash in conn.execute("SELECT id, hash FROM episodes"):
+                    existing_ids.add(episode_id)
+                    existing_hashes.add(content_hash)
+                
+                episode_rows = []
+                content_rows = []
+                for index, episode in enumerate(episodes):
+                    if episode.content_hash in existing_hashes:
+                        logger.debug("Duplicate episode skipped in bulk registration",
+                                    episode_id=episode.episode_id,
+                                    content_hash=episode.content_hash)
+                        continue
+                    
+                    if episode.episode_id in existing_ids:
+                        original_id = episode.episode_id
+                        episode.episode_id = self._generate_unique_episode_id(original_id, existing_ids)
+                        logger.info("Episode ID collision resolved",
+                                   original_id=original_id,
+                                   unique_id=episode.episode_id)
+                    
+                    existing_ids.add(episode.episode_id)
+                    existing_hashes.add(episode.content_hash)
+                    registered[index] = True
+                    
+                    episode_rows.append((
+                        episode.episode_id,
+                        episode.content_hash,
+                        episode.processing_stage.value,
+                        episode.source.path,
+                        self._core_metadata_json(episode),
+                        episode.source.file_size,
+                        episode.media.duration_seconds,
+                        episode.source.last_modified.isoformat(),
+                        episode.created_at.isoformat(),
+                        episode.updated_at.isoformat()
+                    ))
+                    content_rows.extend(self._content_rows(episode, _CONTENT_PARTS, include_empty=False))
+                
+                conn.executemany("""
+                    INSERT INTO episodes (
+                        id, hash, stage, source_path, metadata, 
+                        file_size, duration_seconds, last_modified,
+                        created_at, updated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, episode_rows)
+                
+                conn.executemany(_UPSERT_CONTENT, content_rows)
+                
+                conn.executemany("""
+                    INSERT INTO processing_log 
+                    (episode_id, stage, status, duration_seconds, error_message)
+                    VALUES (?, 'registration', 'completed', NULL, NULL)
+                """, [(row[0],) for row in episode_rows])
+            
+            logger.info("Episodes registered in bulk",
+                       submitted=len(episodes),
+                       registered=len(episode_rows),
+                       duplicates=len(episodes) - len(episode_rows),
+                       duration=time.time() - start_time)
+            
+            return registered
+            
+        except Exception as e:
+            logger.error("Bulk episode registration failed",
+                        episodes=len(episodes),
+                        error=str(e))
+            raise DatabaseError(f"Failed to register episodes: {e}")
+    
+    # Episode columns other than the metadata blob
+    _EPISODE_COLUMNS = (
+        "id, hash, stage, source_path, errors, created_at, updated_at, "
+        "file_size, duration_seconds, last_modified, lease_owner, lease_expires_at, claim_attempts"
+    )
+    
+    def _episode_select(self, include: Iterable[str] = EpisodeObject.LAZY_FIELDS) -> str:
+        """
+        SELECT clause for episode rows
+        
+        Media info is always read from episode_content. Transcription,
+        enrichment and editorial parts named in include come back as raw
+        JSON columns and are decoded on first access; the others are only
+        read from the database if the episode's attribute is accessed.
+        """
+        columns = [self._EPISODE_COLUMNS, "metadata"]
+        for name in ('media', *include):
+            if name not in _CONTENT_PARTS:
+                raise ValidationError(f"Unknown episode field: {name}")
+            columns.append(
+                f"(SELECT data FROM episode_content WHERE episode_id = episodes.id AND part = '{name}') AS {name}_json"
+            )
+        return "SELECT " + ", ".join(columns)
+    
     def get_episode(self, episode_id: str) -> Optional[EpisodeObject]:
         """
         Retrieve episode by ID
@@ -134,7 +290,7 @@ class EpisodeRegistry:
         """
         try:
             cursor = self.connection.execute_query(
-                "SELECT * FROM episodes WHERE id = ?",
+                f"{self._episode_select()} FROM episodes WHERE id = ?",
                 (episode_id,)
             )
             
@@ -162,7 +318,7 @@ class EpisodeRegistry:
         """
         try:
             cursor = self.connection.execute_query(
-                "SELECT * FROM episodes WHERE hash = ?",
+                f"{self._episode_select()} FROM episodes WHERE hash = ?",
                 (content_hash,)
             )
             
@@ -228,12 +384,21 @@ class EpisodeRegistry:
                         error=str(e))
             raise DatabaseError(f"Failed to update episode stage: {e}")
     
-    def update_episode_data(self, episode: EpisodeObject) -> None:
+    def update_episode_data(self, episode: EpisodeObject,
+                            parts: Optional[Iterable[str]] = None) -> None:
         """
-        Update complete episode data
+        Update episode data
+        
+        The episode row (stage, metadata, errors, file info) is always
+        written. Content parts are written to episode_content, each bumping
+        its own version; parts that were never decoded on this episode object
+        cannot have changed and are left alone.
         
         Args:
             episode: Updated episode object
+            parts: Content parts to write (any of 'transcription',
+                'enrichment', 'editorial', 'media'); defaults to every
+                loaded part
             
         Raises:
             DatabaseError: If update fails
@@ -241,8 +406,17 @@ class EpisodeRegistry:
         try:
             self._validate_episode(episode)
             
+            if parts is None:
+                parts = [part for part in _CONTENT_PARTS
+                         if part == 'media' or episode.is_loaded(part)]
+            else:
+                parts = list(parts)
+                for part in parts:
+                    if part not in _CONTENT_PARTS:
+                        raise ValidationError(f"Unknown episode part: {part}")
+            
             with self.connection.transaction() as conn:
-                metadata_json = json.dumps(episode.to_dict())
+                metadata_json = self._core_metadata_json(episode)
                 
                 cursor = conn.execute("""
                     UPDATE episodes SET
@@ -266,10 +440,13 @@ class EpisodeRegistry:
                 
                 if cursor.rowcount == 0:
                     raise ValidationError(f"Episode not found: {episode.episode_id}")
+                
+                conn.executemany(_UPSERT_CONTENT, self._content_rows(episode, parts))
             
             logger.info("Episode data updated",
                        episode_id=episode.episode_id,
-                       stage=episode.processing_stage.value)
+                       stage=episode.processing_stage.value,
+                       parts=parts)
             
         except Exception as e:
             logger.error("Failed to update episode data",
@@ -431,19 +608,22 @@ class EpisodeRegistry:
                         error=str(e))
             raise DatabaseError(f"Failed to delete episode: {e}")
     
-    def get_episodes_by_stage(self, stage: ProcessingStage) -> List[EpisodeObject]:
+    def get_episodes_by_stage(self, stage: ProcessingStage,
+                              include: Iterable[str] = ()) -> List[EpisodeObject]:
         """
         Get all episodes at a specific processing stage
         
         Args:
             stage: Processing stage to filter by
+            include: Lazy fields (e.g. 'enrichment') to read with the scan
+                rather than one episode at a time on access
             
         Returns:
             List of episodes at the specified stage
         """
         try:
             cursor = self.connection.execute_query(
-                "SELECT * FROM episodes WHERE stage = ? ORDER BY created_at",
+                f"{self._episode_select(include)} FROM episodes WHERE stage = ? ORDER BY created_at",
                 (stage.value,)
             )
             
@@ -459,12 +639,14 @@ class EpisodeRegistry:
                         error=str(e))
             raise DatabaseError(f"Failed to retrieve episodes by stage: {e}")
     
-    def get_episodes_needing_processing(self, target_stage: ProcessingStage) -> List[EpisodeObject]:
+    def get_episodes_needing_processing(self, target_stage: ProcessingStage,
+                                        include: Iterable[str] = ()) -> List[EpisodeObject]:
         """
         Get episodes that need processing to reach target stage
         
         Args:
             target_stage: Target processing stage
+            include: Lazy fields to read with the scan (see get_episodes_by_stage)
             
         Returns:
             List of episodes needing processing
@@ -482,7 +664,7 @@ class EpisodeRegistry:
             placeholders = ','.join('?' * len(stage_values))
             
             cursor = self.connection.execute_query(
-                f"SELECT * FROM episodes WHERE stage IN ({placeholders}) ORDER BY created_at",
+                f"{self._episode_select(include)} FROM episodes WHERE stage IN ({placeholders}) ORDER BY created_at",
                 tuple(stage_values)
             )
             
@@ -497,7 +679,124 @@ class EpisodeRegistry:
                         target_stage=target_stage.value,
                         error=str(e))
             raise DatabaseError(f"Failed to retrieve episodes needing processing: {e}")
-    
+
+    def claim_next_episode(self, worker_id: str, target_stage: ProcessingStage,
+                           lease_seconds: float, max_attempts: int) -> Optional[EpisodeObject]:
+        """
+        Atomically lease the oldest episode that still needs processing
+
+        Episodes are claimable when they are below the target stage, not
+        leased (or the lease has expired), past the retry backoff of their
+        last failure and have been claimed fewer than max_attempts times
+        without completing.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+            target_stage: Stage the worker processes episodes to
+            lease_seconds: Lease duration before other workers may reclaim
+            max_attempts: Claims allowed before an episode is left for recovery
+
+        Returns:
+            Leased episode, or None if nothing is claimable
+        """
+        all_stages = list(ProcessingStage)
+        stage_values = [stage.value for stage in all_stages[:all_stages.index(target_stage)]]
+        if not stage_values:
+            return None
+
+        placeholders = ','.join('?' * len(stage_values))
+        now = time.time()
+
+        try:
+            with self.connection.transaction() as conn:
+                cursor = conn.execute(f"""
+                    UPDATE episodes
+                    SET lease_owner = ?, lease_expires_at = ?,
+                        claim_attempts = claim_attempts + 1
+                    WHERE id = (
+                        SELECT id FROM episodes
+                        WHERE stage IN ({placeholders})
+                          AND (lease_expires_at IS NULL OR lease_expires_at < ?)
+                          AND (retry_after IS NULL OR retry_after <= ?)
+                          AND claim_attempts < ?
+                        ORDER BY created_at
+                        LIMIT 1
+                    )
+                    RETURNING *
+                """, (worker_id, now + lease_seconds, *stage_values, now, now, max_attempts))
+                rows = cursor.fetchall()
+
+            if not rows:
+                return None
+
+            episode = self._row_to_episode(rows[0])
+            logger.info("Episode leased",
+                       episode_id=episode.episode_id,
+                       worker_id=worker_id,
+                       stage=episode.processing_stage.value,
+                       attempt=rows[0]['claim_attempts'])
+            return episode
+
+        except Exception as e:
+            logger.error("Failed to claim episode",
+                        worker_id=worker_id,
+                        error=str(e))
+            raise DatabaseError(f"Failed to claim episode: {e}")
+
+    def renew_episode_lease(self, episode_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """
+        Extend a lease held by worker_id
+
+        Returns:
+            bool: False if the lease was lost to another worker
+        """
+        with self.connection.transaction() as conn:
+            cursor = conn.execute("""
+                UPDATE episodes SET lease_expires_at = ?
+                WHERE id = ? AND lease_owner = ?
+            """, (time.time() + lease_seconds, episode_id, worker_id))
+            return cursor.rowcount > 0
+
+    def release_episode_lease(self, episode_id: str, worker_id: str,
+                              error: Optional[str] = None, retry_delay: float = 0.0) -> bool:
+        """
+        Release a lease held by worker_id
+
+        On success the claim counter is reset; on failure it is kept and the
+        error is recorded so the episode stops being claimed after
+        max_attempts failures. A failed episode is not claimable again for
+        retry_delay seconds, doubling with each failed attempt.
+
+        Returns:
+            bool: False if the lease was no longer held by worker_id
+        """
+        with self.connection.transaction() as conn:
+            if error is None:
+                cursor = conn.execute("""
+                    UPDATE episodes
+                    SET lease_owner = NULL, lease_expires_at = NULL, claim_attempts = 0,
+                        retry_after = NULL
+                    WHERE id = ? AND lease_owner = ?
+                """, (episode_id, worker_id))
+            else:
+                cursor = conn.execute("""
+                    UPDATE episodes
+                    SET lease_owner = NULL, lease_expires_at = NULL, errors = ?,
+                        retry_after = ? + ? * (1 << max(claim_attempts - 1, 0)),
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ? AND lease_owner = ?
+                """, (error, time.time(), retry_delay, episode_id, worker_id))
+            return cursor.rowcount > 0
+
+    def reset_episode_claims(self, episode_id: str) -> None:
+        """Clear errors, claim attempts and retry backoff so workers pick the episode up again"""
+        with self.connection.transaction() as conn:
+            conn.execute("""
+                UPDATE episodes
+                SET errors = NULL, claim_attempts = 0, retry_after = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (episode_id,))
+
     def is_duplicate(self, content_hash: str) -> bool:
         """
         Check if content hash already exists
@@ -546,16 +845,23 @@ class EpisodeRegistry:
                         error=str(e))
             raise DatabaseError(f"Failed to check episode existence: {e}")
     
-    def list_episodes(self) -> List[EpisodeObject]:
+    def list_episodes(self, include: Iterable[str] = ()) -> List[EpisodeObject]:
         """
         List all episodes in the registry
         
+        Transcription, enrichment and editorial content are not read unless
+        accessed, so registry-wide scans stay small.
+        
+        Args:
+            include: Lazy fields to read with the scan rather than one
+                episode at a time on access
+        
         Returns:
             List of all episode objects ordered by most recently updated
         """
         try:
             cursor = self.connection.execute_query(
-                "SELECT * FROM episodes ORDER BY updated_at DESC"
+                f"{self._episode_select(include)} FROM episodes ORDER BY updated_at DESC"
             )
             
             episodes = []
@@ -577,6 +883,144 @@ class EpisodeRegistry:
             logger.error("Failed to list episodes", error=str(e), exc_info=True)
             raise DatabaseError(f"Failed to list episodes: {e}")
     
+    # Columns for listings; only small fields are pulled out of the JSON documents
+    _SUMMARY_COLUMNS = """
+        id, stage, source_path, file_size, duration_seconds, errors, created_at, updated_at,
+        json_extract(metadata, '$.metadata') AS episode_metadata,
+        (SELECT json_extract(data, '$.show_name') FROM episode_content
+         WHERE episode_id = episodes.id AND part = 'enrichment') AS enrichment_show_name,
+        (SELECT json_extract(data, '$.summary') FROM episode_content
+         WHERE episode_id = episodes.id AND part = 'enrichment') AS summary
+    """
+    
+    _ORDER_COLUMNS = ('updated_at', 'created_at')
+    
+    def query_episodes(self, stage: Optional[ProcessingStage] = None,
+                       show: Optional[str] = None,
+                       created_after: Optional[datetime] = None,
+                       created_before: Optional[datetime] = None,
+                       updated_after: Optional[datetime] = None,
+                       order_by: str = 'updated_at',
+                       descending: bool = True,
+                       limit: int = 20,
+                       cursor: Optional[str] = None) -> EpisodePage:
+        """
+        List episode summaries with filtering, ordering and keyset pagination in SQL
+        
+        Only the requested page is read, and transcript and enrichment
+        payloads are never parsed, so the cost of a page does not grow with
+        the number of episodes.
+        
+        Args:
+            stage: Only episodes at this stage
+            show: Only episodes whose metadata show name matches exactly
+            created_after: Only episodes created at or after this time
+            created_before: Only episodes created before this time
+            updated_after: Only episodes updated at or after this time
+            order_by: 'updated_at' or 'created_at' (ties broken by episode ID)
+            descending: Newest first
+            limit: Page size
+            cursor: next_cursor of the previous page
+            
+        Returns:
+            EpisodePage with the summaries and the cursor of the next page
+            
+        Raises:
+            ValidationError: If order_by, limit or cursor is invalid
+            DatabaseError: If the query fails
+        """
+        if order_by not in self._ORDER_COLUMNS:
+            raise ValidationError(f"Cannot order episodes by {order_by}")
+        if limit < 1:
+            raise ValidationError("limit must be positive")
+        
+        conditions = []
+        params: List[Any] = []
+        
+        if stage is not None:
+            conditions.append("stage = ?")
+            params.append(stage.value)
+        if show is not None:
+            conditions.append("json_extract(metadata, '$.metadata.show_name') = ?")
+            params.append(show)
+        if created_after is not None:
+            conditions.append("created_at >= ?")
+            params.append(created_after.isoformat())
+        if created_before is not None:
+            conditions.append("created_at < ?")
+            params.append(created_before.isoformat())
+        if updated_after is not None:
+            conditions.append("updated_at >= ?")
+            params.append(updated_after.isoformat())
+        if cursor is not None:
+            conditions.append(f"({order_by}, id) {'<' if descending else '>'} (?, ?)")
+            params.extend(self._decode_cursor(cursor))
+        
+        direction = "DESC" if descending else "ASC"
+        sql = f"SELECT {self._SUMMARY_COLUMNS} FROM episodes"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {order_by} {direction}, id {direction} LIMIT ?"
+        params.append(limit + 1)  # One extra row tells whether another page exists
+        
+        try:
+            rows = self.connection.execute_query(sql, tuple(params)).fetchall()
+        except Exception as e:
+            logger.error("Failed to query episodes", error=str(e))
+            raise DatabaseError(f"Failed to query episodes: {e}")
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = self._encode_cursor(last[order_by], last['id'])
+        
+        return EpisodePage(items=[self._row_to_summary(row) for row in rows], next_cursor=next_cursor)
+    
+    @staticmethod
+    def _encode_cursor(sort_value: Any, episode_id: str) -> str:
+        return base64.urlsafe_b64encode(json.dumps([sort_value, episode_id]).encode()).decode()
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[Any, str]:
+        try:
+            sort_value, episode_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return sort_value, episode_id
+        except (ValueError, TypeError) as e:
+            raise ValidationError(f"Invalid episode cursor: {cursor}") from e
+    
+    @staticmethod
+    def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    
+    def _row_to_summary(self, row: sqlite3.Row) -> EpisodeSummary:
+        """Convert a _SUMMARY_COLUMNS row to EpisodeSummary"""
+        metadata = None
+        if row['episode_metadata']:
+            try:
+                metadata = EpisodeMetadata.from_dict(json.loads(row['episode_metadata']))
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Failed to parse metadata for {row['id']}: {e}")
+        
+        return EpisodeSummary(
+            episode_id=row['id'],
+            stage=row['stage'],
+            source_path=row['source_path'],
+            file_size=row['file_size'] or 0,
+            duration_seconds=row['duration_seconds'],
+            metadata=metadata,
+            enrichment_show_name=row['enrichment_show_name'],
+            summary=row['summary'],
+            errors=row['errors'],
+            created_at=self._parse_timestamp(row['created_at']),
+            updated_at=self._parse_timestamp(row['updated_at'])
+        )
+    
     def get_all_episode_ids(self) -> Set[str]:
         """
         Get set of all existing episode IDs for uniqueness validation
@@ -605,7 +1049,7 @@ class EpisodeRegistry:
         try:
             # Search for episodes where source_path contains the filename
             cursor = self.connection.execute_query(
-                "SELECT * FROM episodes WHERE source_path LIKE ?",
+                f"{self._episode_select()} FROM episodes WHERE source_path LIKE ?",
                 (f"%{filename}%",)
             )
             
@@ -625,13 +1069,42 @@ class EpisodeRegistry:
                         filename=filename,
                         error=str(e))
             raise DatabaseError(f"Failed to find episode by filename: {e}")
-    
+
+    def get_content_versions(self, episode_id: str) -> Dict[str, int]:
+        """
+        Version of each stored content part of an episode
+
+        A part's version is incremented every time it is written, so callers
+        can tell whether a transcript or enrichment changed without reading it.
+
+        Args:
+            episode_id: Episode identifier
+
+        Returns:
+            Mapping of part name to version (parts never produced are absent)
+        """
+        try:
+            cursor = self.connection.execute_query(
+                "SELECT part, version FROM episode_content WHERE episode_id = ?",
+                (episode_id,)
+            )
+            return {row['part']: row['version'] for row in cursor.fetchall()}
+
+        except Exception as e:
+            logger.error("Failed to retrieve content versions",
+                        episode_id=episode_id,
+                        error=str(e))
+            raise DatabaseError(f"Failed to retrieve content versions: {e}")
+
     def log_processing_event(self, episode_id: str, stage: str, status: str, 
                            duration: Optional[float] = None, 
                            error_message: Optional[str] = None) -> None:
         """
         Log a processing event
         
+        The row is queued on the batched event writer rather than written in
+        its own transaction; reads through the registry flush it first.
+        
         Args:
             episode_id: Episode being processed
             stage: Processing stage
@@ -640,10 +1113,7 @@ class EpisodeRegistry:
             error_message: Error message if status is 'failed'
         """
         try:
-            with self.connection.transaction() as conn:
-                self._log_processing_event(
-                    conn, episode_id, stage, status, duration, error_message
-                )
+            self.event_writer.log_event(episode_id, stage, status, duration, error_message)
             
         except Exception as e:
             logger.error("Failed to log processing event",
@@ -653,6 +1123,26 @@ class EpisodeRegistry:
                         error=str(e))
             # Don't raise exception for logging failures
     
+    def record_metric(self, episode_id: str, stage: str, metric_name: str, value: float) -> None:
+        """
+        Record a processing metric (queued on the batched event writer)
+        
+        Args:
+            episode_id: Episode being processed
+            stage: Processing stage
+            metric_name: Metric name, e.g. 'duration_seconds'
+            value: Metric value
+        """
+        try:
+            self.event_writer.record_metric(episode_id, stage, metric_name, value)
+            
+        except Exception as e:
+            logger.error("Failed to record processing metric",
+                        episode_id=episode_id,
+                        stage=stage,
+                        metric=metric_name,
+                        error=str(e))
+    
     def get_processing_history(self, episode_id: str) -> List[ProcessingEvent]:
         """
         Get processing history for an episode
@@ -664,6 +1154,7 @@ class EpisodeRegistry:
             List of processing events
         """
         try:
+            self.event_writer.flush()
             cursor = self.connection.execute_query("""
                 SELECT episode_id, stage, status, duration_seconds, 
                        error_message, timestamp
@@ -700,6 +1191,7 @@ class EpisodeRegistry:
         """
         try:
             stats = {}
+            self.event_writer.flush()
             
             # Total episodes
             cursor = self.connection.execute_query("SELECT COUNT(*) FROM episodes")
@@ -755,9 +1247,11 @@ class EpisodeRegistry:
         if not episode.metadata.show_name:
             raise ValidationError("Show name is required")
     
-    def _generate_unique_episode_id(self, base_id: str) -> str:
+    def _generate_unique_episode_id(self, base_id: str,
+                                    existing_ids: Optional[Set[str]] = None) -> str:
         """Generate unique episode ID by appending suffix"""
-        existing_ids = self.get_all_episode_ids()
+        if existing_ids is None:
+            existing_ids = self.get_all_episode_ids()
         
         counter = 1
         while True:
@@ -773,13 +1267,15 @@ class EpisodeRegistry:
     def _row_to_episode(self, row: sqlite3.Row) -> EpisodeObject:
         """Convert database row to EpisodeObject"""
         try:
-            from .models import SourceInfo, MediaInfo, EpisodeMetadata, EnrichmentResult, TranscriptionResult
+            from .models import SourceInfo, MediaInfo, EpisodeMetadata
             
             episode_id = row['id']
             logger.debug(f"Parsing episode {episode_id}")
             
-            # Parse metadata JSON
-            metadata_dict = json.loads(row['metadata']) if row['metadata'] else {}
+            # Parse metadata JSON (content parts are stored in episode_content)
+            keys = row.keys()
+            metadata_json = row['metadata']
+            metadata_dict = json.loads(metadata_json) if metadata_json else {}
             logger.debug(f"Metadata parsed for {episode_id}")
             
             # Create SourceInfo
@@ -803,14 +1299,20 @@ class EpisodeRegistry:
             elif 'duration_seconds' in row.keys() and row['duration_seconds']:
                 duration_seconds = row['duration_seconds']
                 
-            media = MediaInfo(
-                duration_seconds=duration_seconds,
-                video_codec=metadata_dict.get('video_codec') or metadata_dict.get('codec'),
-                audio_codec=metadata_dict.get('audio_codec'),
-                resolution=metadata_dict.get('resolution'),
-                bitrate=metadata_dict.get('bitrate'),
-                frame_rate=metadata_dict.get('frame_rate') or metadata_dict.get('framerate')
-            )
+            media_data = row['media_json'] if 'media_json' in keys else self._fetch_content(episode_id, 'media')
+            if media_data:
+                media = MediaInfo.from_dict(json.loads(media_data))
+                if media.duration_seconds is None:
+                    media.duration_seconds = duration_seconds
+            else:
+                media = MediaInfo(
+                    duration_seconds=duration_seconds,
+                    video_codec=metadata_dict.get('video_codec') or metadata_dict.get('codec'),
+                    audio_codec=metadata_dict.get('audio_codec'),
+                    resolution=metadata_dict.get('resolution'),
+                    bitrate=metadata_dict.get('bitrate'),
+                    frame_rate=metadata_dict.get('frame_rate') or metadata_dict.get('framerate')
+                )
             
             # Create EpisodeMetadata
             title = row['id']
@@ -837,34 +1339,6 @@ class EpisodeRegistry:
                 description=metadata_dict.get('description')
             )
             
-            # Parse enrichment if exists
-            enrichment = None
-            if 'enrichment' in row.keys() and row['enrichment']:
-                try:
-                    enrichment_dict = json.loads(row['enrichment']) if isinstance(row['enrichment'], str) else row['enrichment']
-                    enrichment = EnrichmentResult.from_dict(enrichment_dict)
-                except Exception as e:
-                    logger.warning(f"Failed to parse enrichment for {row['id']}: {e}")
-            elif metadata_dict.get('enrichment'):
-                try:
-                    enrichment = EnrichmentResult.from_dict(metadata_dict['enrichment'])
-                except Exception as e:
-                    logger.warning(f"Failed to parse enrichment from metadata for {row['id']}: {e}")
-            
-            # Parse transcription if exists
-            transcription = None
-            if 'transcription' in row.keys() and row['transcription']:
-                try:
-                    trans_dict = json.loads(row['transcription']) if isinstance(row['transcription'], str) else row['transcription']
-                    transcription = TranscriptionResult.from_dict(trans_dict)
-                except Exception as e:
-                    logger.warning(f"Failed to parse transcription for {row['id']}: {e}")
-            elif metadata_dict.get('transcription'):
-                try:
-                    transcription = TranscriptionResult.from_dict(metadata_dict['transcription'])
-                except Exception as e:
-                    logger.warning(f"Failed to parse transcription from metadata for {row['id']}: {e}")
-            
             # Create EpisodeObject
             episode = EpisodeObject(
                 episode_id=row['id'],
@@ -873,13 +1347,21 @@ class EpisodeRegistry:
                 media=media,
                 metadata=episode_metadata,
                 processing_stage=ProcessingStage(row['stage']),
-                transcription=transcription,
-                enrichment=enrichment,
                 errors=row['errors'],
                 created_at=datetime.fromisoformat(row['created_at']) if row['created_at'] else None,
                 updated_at=datetime.fromisoformat(row['updated_at']) if row['updated_at'] else None
             )
             
+            # Transcription, enrichment and editorial content are decoded on first access
+            for name in EpisodeObject.LAZY_FIELDS:
+                if name in keys and row[name]:
+                    field_source = row[name]  # Legacy column
+                elif f"{name}_json" in keys:
+                    field_source = row[f"{name}_json"]
+                else:
+                    field_source = _FETCH_ON_ACCESS
+                episode.defer(name, self._lazy_loader(episode_id, name, field_source))
+            
             return episode
             
         except Exception as e:
@@ -889,6 +1371,63 @@ class EpisodeRegistry:
                         episode_id=row['id'] if 'id' in row.keys() else 'unknown')
             raise DatabaseError(f"Failed to parse episode data: {type(e).__name__}: {e}")
     
+    def _lazy_loader(self, episode_id: str, name: str, source: Any):
+        """
+        Loader for a lazy episode field
+        
+        source is the raw JSON string or decoded dict read with the episode,
+        or _FETCH_ON_ACCESS to read the field from the database when needed.
+        """
+        def load():
+            data = source
+            if data is _FETCH_ON_ACCESS:
+                data = self._fetch_content(episode_id, name)
+            if not data:
+                return None
+            try:
+                if isinstance(data, str):
+                    data = json.loads(data)
+                return _LAZY_DECODERS[name](data)
+            except Exception as e:
+                logger.warning(f"Failed to parse {name} for {episode_id}: {e}")
+                return None
+        
+        return load
+    
+    def _fetch_content(self, episode_id: str, part: str) -> Optional[str]:
+        """Raw JSON of one content part, or None if it was never produced"""
+        row = self.connection.execute_query(
+            "SELECT data FROM episode_content WHERE episode_id = ? AND part = ?",
+            (episode_id, part)
+        ).fetchone()
+        return row[0] if row else None
+    
+    @staticmethod
+    def _core_metadata_json(episode: EpisodeObject) -> str:
+        """episodes.metadata document: the episode dict without its content parts"""
+        return json.dumps({
+            'episode_id': episode.episode_id,
+            'content_hash': episode.content_hash,
+            'source': episode.source.to_dict(),
+            'metadata': episode.metadata.to_dict(),
+            'processing_stage': episode.processing_stage.value,
+            'errors': episode.errors,
+            'created_at': episode.created_at.isoformat() if episode.created_at else None,
+            'updated_at': episode.updated_at.isoformat() if episode.updated_at else None
+        })
+    
+    @staticmethod
+    def _content_rows(episode: EpisodeObject, parts: Iterable[str],
+                      include_empty: bool = True) -> List[Tuple[str, str, Optional[str]]]:
+        """(episode_id, part, data) rows for _UPSERT_CONTENT"""
+        rows = []
+        for part in parts:
+            value = getattr(episode, part)
+            if value is None and not include_empty:
+                continue
+            rows.append((episode.episode_id, part, json.dumps(value.to_dict()) if value is not None else None))
+        return rows
+    
     def _log_processing_event(self, conn: sqlite3.Connection, episode_id: str, 
                             stage: str, status: str, 
                             duration: Optional[float] = None,
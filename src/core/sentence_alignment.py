@@ -9,6 +9,9 @@ boundaries and configurable timing gaps for natural speech flow.
 import re
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
+
+import numpy as np
+
 from .logging import get_logger
 
 logger = get_logger('clip_generation.sentence_alignment')
@@ -34,6 +37,95 @@ class Sentence:
     confidence: float = 0.0
 
 
+class SpeakerIndex:
+    """
+    Interval index over validated diarization segments
+
+    Segment starts, ends and speaker IDs are held in NumPy arrays sorted by
+    start. A running maximum of segment ends makes the segments that can
+    overlap a time range a contiguous slice found with two binary searches,
+    and segment centres are kept sorted for nearest-segment lookups.
+    """
+
+    def __init__(self, speaker_segments: List[Dict[str, Any]]):
+        """
+        Build index
+
+        Args:
+            speaker_segments: Validated speaker segments sorted by start
+        """
+        self.labels: List[Any] = []
+        label_ids: Dict[Any, int] = {}
+        speaker_ids = []
+        for segment in speaker_segments:
+            label = segment['speaker']
+            if label not in label_ids:
+                label_ids[label] = len(self.labels)
+                self.labels.append(label)
+            speaker_ids.append(label_ids[label])
+
+        self.starts = np.array([segment['start'] for segment in speaker_segments], dtype=np.float64)
+        self.ends = np.array([segment['end'] for segment in speaker_segments], dtype=np.float64)
+        self.speaker_ids = np.array(speaker_ids, dtype=np.int32)
+        self.max_ends = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+
+        centers = (self.starts + self.ends) / 2
+        self._center_order = np.argsort(centers, kind='stable')
+        self._sorted_centers = centers[self._center_order]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def speaker(self, position: int) -> Any:
+        """Speaker label of the segment at a position"""
+        return self.labels[self.speaker_ids[position]]
+
+    def candidate_ranges(self, starts_s: np.ndarray, ends_s: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Slices of segments that may overlap each time range
+
+        Segments outside ``[lo, hi)`` either start at or after the range end
+        or end (like every segment before them) at or before the range start.
+
+        Returns:
+            Tuple of (lo, hi) position arrays
+        """
+        lo = np.searchsorted(self.max_ends, starts_s, side='right')
+        hi = np.searchsorted(self.starts, ends_s, side='left')
+        return lo, hi
+
+    def nearest(self, center_s: float) -> Tuple[Optional[int], float]:
+        """
+        Segment whose centre is closest to a time, earliest segment on ties
+
+        Returns:
+            Tuple of (segment position or None, distance in seconds)
+        """
+        if not len(self):
+            return None, float('inf')
+
+        centers = self._sorted_centers
+        split = int(np.searchsorted(centers, center_s, side='left'))
+        left, right = split - 1, split
+        best_distance = min(
+            abs(center_s - centers[left]) if left >= 0 else float('inf'),
+            abs(center_s - centers[right]) if right < len(centers) else float('inf')
+        )
+
+        # Distances grow monotonically away from the split, so ties are contiguous runs
+        best_position = None
+        while left >= 0 and abs(center_s - centers[left]) == best_distance:
+            position = int(self._center_order[left])
+            best_position = position if best_position is None else min(best_position, position)
+            left -= 1
+        while right < len(centers) and abs(center_s - centers[right]) == best_distance:
+            position = int(self._center_order[right])
+            best_position = position if best_position is None else min(best_position, position)
+            right += 1
+
+        return best_position, float(best_distance)
+
+
 class SentenceAlignmentEngine:
     """
     Converts word-level timestamps to sentence-level with speaker labels
@@ -67,7 +159,8 @@ class SentenceAlignmentEngine:
         Convert transcription segments or words with timestamps to sentences
         
         Args:
-            words: List of word dictionaries with timing data (from database)
+            words: List of word dictionaries with timing data (from database),
+                or a ColumnarTranscript
             transcription_segments: Whisper segments with word-level data (legacy)
             
         Returns:
@@ -75,7 +168,11 @@ class SentenceAlignmentEngine:
         """
         try:
             # Handle both word lists and segment lists
-            if words is not None:
+            if hasattr(words, 'to_words'):
+                # Columnar transcript
+                logger.info("Starting sentence alignment from columnar transcript", words=len(words))
+                word_objects = words.to_words()
+            elif words is not None:
                 # Words provided directly (from database)
                 logger.info("Starting sentence alignment from words", words=len(words))
                 word_objects = [
@@ -142,15 +239,19 @@ class SentenceAlignmentEngine:
                 logger.warning("No speaker segments in diarization data")
                 return sentences
             
-            # Validate and sort speaker segments
+            # Validate and sort speaker segments, then index them
             speaker_segments = self._validate_speaker_segments(speaker_segments)
+            speaker_index = SpeakerIndex(speaker_segments)
             
-            # Attach speakers using temporal overlap with edge case handling
+            # Attach speakers using temporal overlap with edge case handling;
+            # candidate segments for every sentence come from one vectorized lookup
+            starts_s = np.array([s.start_ms for s in sentences], dtype=np.float64) / 1000.0
+            ends_s = np.array([s.end_ms for s in sentences], dtype=np.float64) / 1000.0
+            lo, hi = speaker_index.candidate_ranges(starts_s, ends_s)
             unassigned_count = 0
-            multi_speaker_count = 0
             
-            for sentence in sentences:
-                speaker = self._find_speaker_for_sentence(sentence, speaker_segments)
+            for sentence, first, last in zip(sentences, lo.tolist(), hi.tolist()):
+                speaker = self._find_speaker_for_sentence(sentence, speaker_index, range(first, last))
                 sentence.speaker = speaker
                 
                 if speaker is None:
@@ -227,12 +328,17 @@ class SentenceAlignmentEngine:
             sentences: List of sentences (modified in place)
             speaker_segments: Validated speaker segments
         """
+        # Sentences in start order let the nearby-speaker vote scan a window
+        sentence_starts = np.array([s.start_ms for s in sentences])
+        if not (sentence_starts.dtype.kind == 'i' and np.all(sentence_starts[1:] >= sentence_starts[:-1])):
+            sentence_starts = None
+        
         for i, sentence in enumerate(sentences):
             if sentence.speaker is not None:
                 continue
             
             # Try context-based assignment
-            context_speaker = self._infer_speaker_from_context(sentences, i)
+            context_speaker = self._infer_speaker_from_context(sentences, i, sentence_starts)
             if context_speaker:
                 sentence.speaker = context_speaker
                 logger.debug("Assigned speaker from context",
@@ -240,13 +346,15 @@ class SentenceAlignmentEngine:
                            speaker=context_speaker,
                            sentence_text=sentence.text[:30])
     
-    def _infer_speaker_from_context(self, sentences: List[Sentence], index: int) -> Optional[str]:
+    def _infer_speaker_from_context(self, sentences: List[Sentence], index: int,
+                                    sentence_starts: Optional[np.ndarray] = None) -> Optional[str]:
         """
         Infer speaker from neighboring sentences
         
         Args:
             sentences: All sentences
             index: Index of sentence to infer speaker for
+            sentence_starts: Sorted integer sentence start times, if sentences are in start order
             
         Returns:
             Inferred speaker or None
@@ -273,7 +381,13 @@ class SentenceAlignmentEngine:
         nearby_speakers = {}
         sentence_time = sentences[index].start_ms
         
-        for other_sentence in sentences:
+        nearby = sentences
+        if sentence_starts is not None:
+            first = int(np.searchsorted(sentence_starts, sentence_time - 10000, side='right'))
+            last = int(np.searchsorted(sentence_starts, sentence_time + 10000, side='left'))
+            nearby = sentences[first:last]
+        
+        for other_sentence in nearby:
             if other_sentence.speaker and abs(other_sentence.start_ms - sentence_time) < 10000:
                 speaker = other_sentence.speaker
                 nearby_speakers[speaker] = nearby_speakers.get(speaker, 0) + 1
@@ -450,7 +564,8 @@ class SentenceAlignmentEngine:
             confidence=confidence
         )
     
-    def _find_speaker_for_sentence(self, sentence: Sentence, speaker_segments: List[Dict[str, Any]]) -> Optional[str]:
+    def _find_speaker_for_sentence(self, sentence: Sentence, speaker_index: SpeakerIndex,
+                                   candidates: Optional[range] = None) -> Optional[str]:
         """
         Find speaker for sentence using temporal overlap with edge case handling
         
@@ -459,7 +574,9 @@ class SentenceAlignmentEngine:
         
         Args:
             sentence: Sentence to find speaker for
-            speaker_segments: Diarization speaker segments
+            speaker_index: Index of diarization speaker segments
+            candidates: Positions of segments that may overlap the sentence
+                (looked up in the index when not given)
             
         Returns:
             Speaker label or None
@@ -474,73 +591,78 @@ class SentenceAlignmentEngine:
                           end_ms=sentence.end_ms)
             return None
         
+        if candidates is None:
+            lo, hi = speaker_index.candidate_ranges(np.array([sentence_start_s]), np.array([sentence_end_s]))
+            candidates = range(int(lo[0]), int(hi[0]))
+        
+        # (position, overlap duration, sentence overlap ratio, weighted score)
         speaker_overlaps = []
+        best = None
+        starts, ends = speaker_index.starts, speaker_index.ends
         
-        for segment in speaker_segments:
-            speaker = segment.get('speaker', 'unknown')
-            seg_start = segment.get('start', 0.0)
-            seg_end = segment.get('end', 0.0)
+        for position in candidates:
+            seg_start = float(starts[position])
+            seg_end = float(ends[position])
             
             # Calculate overlap
-            overlap_start = max(sentence_start_s, seg_start)
-            overlap_end = min(sentence_end_s, seg_end)
-            overlap_duration = max(0, overlap_end - overlap_start)
+            overlap_duration = min(sentence_end_s, seg_end) - max(sentence_start_s, seg_start)
             
             if overlap_duration > 0:
-                # Calculate multiple overlap metrics
+                # Weighted score considering both the sentence and segment perspectives
                 sentence_overlap_ratio = overlap_duration / sentence_duration
-                segment_duration = seg_end - seg_start
-                segment_overlap_ratio = overlap_duration / segment_duration if segment_duration > 0 else 0
-                
-                # Weighted score considering both perspectives
+                segment_overlap_ratio = overlap_duration / (seg_end - seg_start)
                 weighted_score = (sentence_overlap_ratio * 0.7) + (segment_overlap_ratio * 0.3)
                 
-                speaker_overlaps.append({
-                    'speaker': speaker,
-                    'overlap_duration': overlap_duration,
-                    'sentence_overlap_ratio': sentence_overlap_ratio,
-                    'segment_overlap_ratio': segment_overlap_ratio,
-                    'weighted_score': weighted_score,
-                    'segment_start': seg_start,
-                    'segment_end': seg_end
-                })
+                overlap = (position, overlap_duration, sentence_overlap_ratio, weighted_score)
+                speaker_overlaps.append(overlap)
+                
+                # Highest weighted score, earliest segment on ties
+                if best is None or weighted_score > best[3]:
+                    best = overlap
         
         if not speaker_overlaps:
             # No overlapping segments - try nearest neighbor fallback
-            return self._find_nearest_speaker(sentence, speaker_segments)
+            return self._find_nearest_speaker(sentence, speaker_index)
         
-        # Sort by weighted score
-        speaker_overlaps.sort(key=lambda x: x['weighted_score'], reverse=True)
-        best_match = speaker_overlaps[0]
+        best_speaker = speaker_index.speaker(best[0])
         
         # Apply confidence thresholds
-        if best_match['sentence_overlap_ratio'] >= 0.5:
+        if best[2] >= 0.5:
             # Strong confidence: >50% of sentence covered
-            return best_match['speaker']
-        elif best_match['sentence_overlap_ratio'] >= 0.3 and best_match['weighted_score'] >= 0.4:
+            return best_speaker
+        elif best[2] >= 0.3 and best[3] >= 0.4:
             # Medium confidence: reasonable overlap with good weighted score
-            return best_match['speaker']
-        elif len(speaker_overlaps) == 1 and best_match['sentence_overlap_ratio'] >= 0.1:
+            return best_speaker
+        elif len(speaker_overlaps) == 1 and best[2] >= 0.1:
             # Weak confidence: only one candidate with minimal overlap
             logger.debug("Weak speaker assignment", 
                         sentence_text=sentence.text[:50],
-                        overlap_ratio=best_match['sentence_overlap_ratio'],
-                        speaker=best_match['speaker'])
-            return best_match['speaker']
+                        overlap_ratio=best[2],
+                        speaker=best_speaker)
+            return best_speaker
         
         # Handle edge case: sentence spans multiple speakers
         if len(speaker_overlaps) > 1:
-            return self._resolve_multi_speaker_sentence(sentence, speaker_overlaps)
+            speaker_overlaps.sort(key=lambda x: x[3], reverse=True)
+            return self._resolve_multi_speaker_sentence(sentence, [
+                {
+                    'speaker': speaker_index.speaker(position),
+                    'overlap_duration': overlap_duration,
+                    'sentence_overlap_ratio': sentence_overlap_ratio,
+                    'weighted_score': weighted_score
+                }
+                for position, overlap_duration, sentence_overlap_ratio, weighted_score in speaker_overlaps
+            ])
         
         return None
     
-    def _find_nearest_speaker(self, sentence: Sentence, speaker_segments: List[Dict[str, Any]]) -> Optional[str]:
+    def _find_nearest_speaker(self, sentence: Sentence, speaker_index: SpeakerIndex) -> Optional[str]:
         """
         Fallback: find nearest speaker when no temporal overlap exists
         
         Args:
             sentence: Sentence to find speaker for
-            speaker_segments: Diarization speaker segments
+            speaker_index: Index of diarization speaker segments
             
         Returns:
             Nearest speaker label or None
@@ -549,24 +671,12 @@ class SentenceAlignmentEngine:
         sentence_end_s = sentence.end_ms / 1000.0
         sentence_center = (sentence_start_s + sentence_end_s) / 2
         
-        nearest_speaker = None
-        min_distance = float('inf')
-        
-        for segment in speaker_segments:
-            speaker = segment.get('speaker', 'unknown')
-            seg_start = segment.get('start', 0.0)
-            seg_end = segment.get('end', 0.0)
-            seg_center = (seg_start + seg_end) / 2
-            
-            # Calculate distance from sentence center to segment center
-            distance = abs(sentence_center - seg_center)
-            
-            if distance < min_distance:
-                min_distance = distance
-                nearest_speaker = speaker
+        # Distance from sentence center to the closest segment center
+        position, min_distance = speaker_index.nearest(sentence_center)
         
         # Only use nearest speaker if reasonably close (within 5 seconds)
-        if min_distance <= 5.0:
+        if position is not None and min_distance <= 5.0:
+            nearest_speaker = speaker_index.speaker(position)
             logger.debug("Using nearest speaker fallback",
                         sentence_text=sentence.text[:50],
                         distance_s=min_distance,
@@ -0,0 +1,323 @@
+"""
+Content-addressed result cache for pipeline stages
+
+Generalises the IntelligenceCache idea to every pipeline stage. An entry is
+keyed by (input content hash, stage name, stage config hash, code version)
+and holds the stage's result dict together with copies of the files it
+produced, so a rerun after ``force_reprocess`` or a registry reset restores
+outputs instead of recomputing them.
+
+Stage keys are chained: the input hash of a stage is the key of the stage
+before it, rooted at the episode's source content hash. Changing the video,
+an upstream stage's config or its code version therefore invalidates every
+downstream entry.
+
+Layout:
+    {cache_dir}/index.db                       entry index (size, access time, hits)
+    {cache_dir}/{stage}/{key}/result.json      stage result and file manifest
+    {cache_dir}/{stage}/{key}/files/...        copies of output files
+"""
+
+import hashlib
+import json
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .logging import get_logger
+
+logger = get_logger('pipeline.stage_cache')
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize NumPy values and other stray objects in stage results"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if hasattr(value, 'to_dict'):
+        return value.to_dict()
+    return str(value)
+
+
+@dataclass
+class StageCacheMetrics:
+    """Hit/miss counters for one stage"""
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    saved_seconds: float = 0.0  # Original compute time of the entries that were hit
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate,
+            'saved_seconds': self.saved_seconds
+        }
+
+
+class StageCache:
+    """
+    Size-bounded, content-addressed cache of stage results
+
+    Entries are evicted least recently used first once the total size of
+    cached files exceeds ``max_size_bytes``. The index is a small SQLite
+    database so several worker processes can share one cache directory.
+    """
+
+    def __init__(self, cache_dir: Path, max_size_bytes: int):
+        """
+        Initialize stage cache
+
+        Args:
+            cache_dir: Root directory of the cache
+            max_size_bytes: Total size of cached entries before LRU eviction
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = max_size_bytes
+        self.metrics: Dict[str, StageCacheMetrics] = {}
+        self._lock = threading.Lock()
+        self._index_path = self.cache_dir / "index.db"
+
+        with self._index() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    cache_key TEXT PRIMARY KEY,
+                    stage TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    duration_seconds REAL NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_accessed ON entries(last_accessed)")
+
+    @contextmanager
+    def _index(self):
+        """Autocommit connection to the entry index"""
+        conn = sqlite3.connect(str(self._index_path), timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def _metrics(self, stage: str) -> StageCacheMetrics:
+        return self.metrics.setdefault(stage, StageCacheMetrics())
+
+    @staticmethod
+    def compute_config_hash(config: Dict[str, Any]) -> str:
+        """Hash of the configuration a stage depends on"""
+        return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def compute_key(input_hash: str, stage: str, config_hash: str, code_version: str) -> str:
+        """Cache key for a stage run on the given input"""
+        key_str = f"{input_hash}:{stage}:{config_hash}:{code_version}"
+        return hashlib.sha256(key_str.encode()).hexdigest()
+
+    def _entry_dir(self, stage: str, cache_key: str) -> Path:
+        return self.cache_dir / stage / cache_key
+
+    def get(self, stage: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Restore a cached stage result
+
+        Output files recorded with the entry are copied back to their
+        original paths before the result is returned.
+
+        Returns:
+            The stage result dict, or None on a miss
+        """
+        metrics = self._metrics(stage)
+        entry_dir = self._entry_dir(stage, cache_key)
+
+        with self._index() as conn:
+            row = conn.execute(
+                "SELECT duration_seconds FROM entries WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+
+        if row is None or not (entry_dir / "result.json").exists():
+            with self._lock:
+                metrics.misses += 1
+            return None
+
+        try:
+            with open(entry_dir / "result.json", 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+
+            for original, stored in entry['files'].items():
+                destination = Path(original)
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(entry_dir / "files" / stored, destination)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Discarding unreadable stage cache entry",
+                          stage=stage, cache_key=cache_key[:16], error=str(e))
+            self._remove(cache_key, stage)
+            with self._lock:
+                metrics.misses += 1
+            return None
+
+        with self._index() as conn:
+            conn.execute(
+                "UPDATE entries SET last_accessed = ?, hit_count = hit_count + 1 WHERE cache_key = ?",
+                (time.time(), cache_key)
+            )
+
+        with self._lock:
+            metrics.hits += 1
+            metrics.saved_seconds += row[0]
+
+        logger.info("Stage cache hit", stage=stage, cache_key=cache_key[:16], files=len(entry['files']))
+        return entry['result']
+
+    def put(self, stage: str, cache_key: str, result: Dict[str, Any],
+            output_files: List[str], duration_seconds: float = 0.0) -> bool:
+        """
+        Store a stage result and copies of its output files
+
+        Args:
+            stage: Stage name
+            cache_key: Key from compute_key
+            result: JSON-serializable stage result
+            output_files: Paths of files produced by the stage
+            duration_seconds: Time the stage took (reported as saved on hits)
+
+        Returns:
+            bool: True if the entry was stored
+        """
+        entry_dir = self._entry_dir(stage, cache_key)
+        staging_dir = entry_dir.parent / f".{cache_key}.{uuid.uuid4().hex[:8]}"
+
+        try:
+            files: Dict[str, str] = {}
+            (staging_dir / "files").mkdir(parents=True)
+            for index, path in enumerate(output_files):
+                source = Path(path)
+                if not source.is_file():
+                    continue
+                stored = f"{index}_{source.name}"
+                shutil.copy2(source, staging_dir / "files" / stored)
+                files[str(path)] = stored
+
+            with open(staging_dir / "result.json", 'w', encoding='utf-8') as f:
+                json.dump({'stage': stage, 'result': result, 'files': files}, f, default=_json_default)
+
+            size = sum(p.stat().st_size for p in staging_dir.rglob('*') if p.is_file())
+            if size > self.max_size_bytes:
+                logger.info("Stage result larger than cache, not storing",
+                           stage=stage, size_bytes=size, max_size_bytes=self.max_size_bytes)
+                return False
+
+            if entry_dir.exists():
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            staging_dir.rename(entry_dir)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Failed to store stage cache entry",
+                          stage=stage, cache_key=cache_key[:16], error=str(e))
+            return False
+        finally:
+            if staging_dir.exists():
+                shutil.rmtree(staging_dir, ignore_errors=True)
+
+        now = time.time()
+        with self._index() as conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO entries
+                   (cache_key, stage, size_bytes, duration_seconds, created_at, last_accessed, hit_count)
+                   VALUES (?, ?, ?, ?, ?, ?, 0)""",
+                (cache_key, stage, size, duration_seconds, now, now)
+            )
+
+        with self._lock:
+            self._metrics(stage).stores += 1
+
+        logger.debug("Stored stage cache entry", stage=stage, cache_key=cache_key[:16], size_bytes=size)
+        self.evict(keep=cache_key)
+        return True
+
+    def _remove(self, cache_key: str, stage: str) -> None:
+        shutil.rmtree(self._entry_dir(stage, cache_key), ignore_errors=True)
+        with self._index() as conn:
+            conn.execute("DELETE FROM entries WHERE cache_key = ?", (cache_key,))
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Remove least recently used entries until the cache fits its size bound
+
+        Args:
+            keep: Key that must not be evicted (the entry just stored)
+
+        Returns:
+            int: Number of entries evicted
+        """
+        with self._index() as conn:
+            total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM entries").fetchone()[0]
+            if total <= self.max_size_bytes:
+                return 0
+            candidates = conn.execute(
+                "SELECT cache_key, stage, size_bytes FROM entries ORDER BY last_accessed"
+            ).fetchall()
+
+        evicted = 0
+        for cache_key, stage, size in candidates:
+            if total <= self.max_size_bytes:
+                break
+            if cache_key == keep:
+                continue
+            self._remove(cache_key, stage)
+            total -= size
+            evicted += 1
+            with self._lock:
+                self._metrics(stage).evictions += 1
+
+        if evicted:
+            logger.info("Evicted stage cache entries", evicted=evicted, size_bytes=total)
+        return evicted
+
+    def clear(self, stage: Optional[str] = None) -> int:
+        """Remove all entries, or all entries of one stage"""
+        with self._index() as conn:
+            if stage:
+                rows = conn.execute("SELECT cache_key, stage FROM entries WHERE stage = ?", (stage,)).fetchall()
+            else:
+                rows = conn.execute("SELECT cache_key, stage FROM entries").fetchall()
+        for cache_key, entry_stage in rows:
+            self._remove(cache_key, entry_stage)
+        return len(rows)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry counts and sizes per stage with this process's hit/miss metrics"""
+        with self._index() as conn:
+            rows = conn.execute(
+                "SELECT stage, COUNT(*), SUM(size_bytes), SUM(hit_count) FROM entries GROUP BY stage"
+            ).fetchall()
+
+        stages: Dict[str, Dict[str, Any]] = {
+            stage: {'entries': count, 'size_bytes': size, 'total_hits': hits}
+            for stage, count, size, hits in rows
+        }
+        with self._lock:
+            for stage, metrics in self.metrics.items():
+                stages.setdefault(stage, {'entries': 0, 'size_bytes': 0, 'total_hits': 0}).update(metrics.to_dict())
+
+        return {
+            'size_bytes': sum(s['size_bytes'] for s in stages.values()),
+            'max_size_bytes': self.max_size_bytes,
+            'stages': stages
+        }
@@ -0,0 +1,170 @@
+"""
+Stage-level resource scheduling for the Video Processing Pipeline
+
+Treats each (episode, stage) pair as a unit of work and gates it on the
+resource class that stage actually consumes (transcription model, ffmpeg/CPU,
+LLM, disk I/O). Stages from different episodes can therefore overlap like a
+pipeline instead of one episode holding a slot for its whole lifetime.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Dict, Any, Optional, AsyncIterator
+
+from .logging import get_logger
+from .models import ProcessingStage
+
+logger = get_logger('pipeline.stage_scheduler')
+
+
+class ResourceClass(Enum):
+    """Resource classes that stages compete for"""
+    TRANSCRIPTION = "transcription"
+    FFMPEG = "ffmpeg"
+    LLM = "llm"
+    DISK_IO = "disk_io"
+
+
+# Which resource each stage spends most of its time on
+STAGE_RESOURCE_CLASSES: Dict[ProcessingStage, ResourceClass] = {
+    ProcessingStage.DISCOVERED: ResourceClass.DISK_IO,
+    ProcessingStage.PREPPED: ResourceClass.FFMPEG,
+    ProcessingStage.TRANSCRIBED: ResourceClass.TRANSCRIPTION,
+    ProcessingStage.ENRICHED: ResourceClass.LLM,
+    ProcessingStage.RENDERED: ResourceClass.DISK_IO,
+    ProcessingStage.CLIPS_DISCOVERED: ResourceClass.LLM,
+}
+
+DEFAULT_POOL_SIZES: Dict[str, int] = {
+    ResourceClass.TRANSCRIPTION.value: 1,
+    ResourceClass.FFMPEG.value: 2,
+    ResourceClass.LLM.value: 1,
+    ResourceClass.DISK_IO.value: 4,
+}
+
+
+class ResourcePool:
+    """
+    Bounded concurrency pool for a single resource class
+
+    Tracks queue depth, active tasks and busy time so utilisation can be
+    reported alongside the batch statistics.
+    """
+
+    def __init__(self, resource_class: ResourceClass, capacity: int):
+        if capacity < 1:
+            raise ValueError(f"Pool capacity must be at least 1, got {capacity} for {resource_class.value}")
+
+        self.resource_class = resource_class
+        self.capacity = capacity
+        self._semaphore = asyncio.Semaphore(capacity)
+        self._created_at = time.monotonic()
+
+        self.waiting = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.peak_queue_depth = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Hold one slot of this pool for the duration of the block"""
+        self.waiting += 1
+        self.peak_queue_depth = max(self.peak_queue_depth, self.waiting)
+        queued_at = time.monotonic()
+
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        started_at = time.monotonic()
+        self.wait_seconds += started_at - queued_at
+        self.active += 1
+
+        try:
+            yield
+            self.completed += 1
+        except BaseException:
+            self.failed += 1
+            raise
+        finally:
+            self.active -= 1
+            self.busy_seconds += time.monotonic() - started_at
+            self._semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        elapsed = max(time.monotonic() - self._created_at, 1e-9)
+        return {
+            'capacity': self.capacity,
+            'active': self.active,
+            'queue_depth': self.waiting,
+            'peak_queue_depth': self.peak_queue_depth,
+            'completed': self.completed,
+            'failed': self.failed,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'avg_wait_seconds': round(self.wait_seconds / max(1, self.completed + self.failed), 3),
+            'utilisation': round(min(1.0, self.busy_seconds / (self.capacity * elapsed)), 4),
+        }
+
+
+class StageScheduler:
+    """
+    Per-resource-class scheduler for pipeline stages
+
+    A scheduler is bound to the event loop it is first used on, so one is
+    created per batch rather than shared across the API's worker threads.
+    """
+
+    def __init__(self, pool_sizes: Optional[Dict[str, int]] = None):
+        sizes = dict(DEFAULT_POOL_SIZES)
+        if pool_sizes:
+            sizes.update(pool_sizes)
+
+        self.pools: Dict[ResourceClass, ResourcePool] = {}
+        for resource_class in ResourceClass:
+            self.pools[resource_class] = ResourcePool(resource_class, int(sizes[resource_class.value]))
+
+        logger.info("Stage scheduler initialized",
+                   pool_sizes={rc.value: pool.capacity for rc, pool in self.pools.items()})
+
+    def resource_class_for(self, stage: ProcessingStage) -> ResourceClass:
+        """Resolve the resource class a stage is scheduled on"""
+        return STAGE_RESOURCE_CLASSES.get(stage, ResourceClass.DISK_IO)
+
+    @asynccontextmanager
+    async def slot(self, stage: ProcessingStage) -> AsyncIterator[ResourceClass]:
+        """Wait for and hold a slot in the pool that serves ``stage``"""
+        resource_class = self.resource_class_for(stage)
+        async with self.pools[resource_class].acquire():
+            yield resource_class
+
+    def get_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get queue depth and utilisation for every pool"""
+        return {rc.value: pool.get_stats() for rc, pool in self.pools.items()}
+
+
+# Scheduler governing stages in the current task context. process_batch sets
+# it so that each episode task inherits it without threading it through calls.
+_current_scheduler: ContextVar[Optional[StageScheduler]] = ContextVar('stage_scheduler', default=None)
+
+
+def get_current_scheduler() -> Optional[StageScheduler]:
+    """Get the scheduler active in the current task context, if any"""
+    return _current_scheduler.get()
+
+
+def set_current_scheduler(scheduler: Optional[StageScheduler]):
+    """Set the scheduler for the current task context; returns a reset token"""
+    return _current_scheduler.set(scheduler)
+
+
+def reset_current_scheduler(token) -> None:
+    """Restore the scheduler that was active before ``set_current_scheduler``"""
+    _current_scheduler.reset(token)
@@ -2,13 +2,11 @@
 Topic Segmentation Engine
 
 Creates coherent story segments using sentence embeddings and boundary detection.
-Uses local embedding models with caching and the ruptures library for topic
-boundary detection to identify natural story segments in episodes.
+Uses local embedding models with caching and kernel change-point detection
+(or the ruptures library) to identify natural story segments in episodes.
 """
 
 import os
-import pickle
-import hashlib
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
@@ -26,6 +24,9 @@ except ImportError:
     rpt = None
 
 from .sentence_alignment import Sentence
+from .boundary_detection import BoundaryResult, detect_kernel_boundaries
+from .embedding_store import get_embedding_store
+from .onnx_embeddings import OnnxSentenceEncoder, load_onnx_encoder
 from .logging import get_logger
 from .exceptions import EmbeddingError, SegmentationError
 from .clip_resource_manager import with_clip_resource_management
@@ -89,15 +90,24 @@ class TopicSegmentationEngine:
     Creates coherent story segments using embeddings and boundary detection
     
     Uses local embedding models (bge-small-en or all-MiniLM-L6-v2) with filesystem
-    caching and the ruptures library PELT algorithm for boundary detection.
+    caching and kernel change-point detection (or the ruptures library PELT
+    algorithm) for boundary detection.
     """
     
+    BOUNDARY_ENGINES = ("kernel", "ruptures")
+    EMBEDDING_BACKENDS = ("torch", "onnx")
+    
     def __init__(self, 
                  model_name: str = "bge-small-en",
                  min_duration_ms: int = 20000,
                  max_duration_ms: int = 120000,
                  embedding_batch_size: int = 32,
-                 cache_dir: Optional[str] = None):
+                 cache_dir: Optional[str] = None,
+                 boundary_engine: str = "kernel",
+                 embedding_backend: str = "torch",
+                 embedding_threads: int = 0,
+                 onnx_model_dir: Optional[str] = None,
+                 onnx_max_batch_tokens: int = 8192):
         """
         Initialize topic segmentation engine
         
@@ -106,25 +116,43 @@ class TopicSegmentationEngine:
             min_duration_ms: Minimum segment duration (20 seconds default)
             max_duration_ms: Maximum segment duration (120 seconds default)
             embedding_batch_size: Batch size for embedding generation
-            cache_dir: Directory for embedding cache (defaults to data/cache/embeddings)
+            cache_dir: Directory of the sentence embedding store (defaults to data/cache/embeddings)
+            boundary_engine: Boundary detection engine (kernel or ruptures)
+            embedding_backend: Embedding backend (torch, or onnx for int8-quantized ONNX Runtime on CPU)
+            embedding_threads: CPU threads for embedding inference (0 = library default)
+            onnx_model_dir: Directory of exported ONNX models (defaults to data/models/onnx)
+            onnx_max_batch_tokens: Padded token budget per ONNX batch
         """
+        if boundary_engine not in self.BOUNDARY_ENGINES:
+            raise ValueError(f"Unknown boundary engine: {boundary_engine}")
+        if embedding_backend not in self.EMBEDDING_BACKENDS:
+            raise ValueError(f"Unknown embedding backend: {embedding_backend}")
+        
         self.model_name = model_name
         self.min_duration_ms = min_duration_ms
         self.max_duration_ms = max_duration_ms
         self.embedding_batch_size = embedding_batch_size
+        self.embedding_backend = embedding_backend
+        self.embedding_threads = embedding_threads
+        self.onnx_model_dir = Path(onnx_model_dir or os.path.join("data", "models", "onnx"))
+        self.onnx_max_batch_tokens = onnx_max_batch_tokens
         
         # Set up cache directory
         if cache_dir is None:
             cache_dir = os.path.join("data", "cache", "embeddings")
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.embedding_store = get_embedding_store(self.cache_dir)
         
         # Initialize embedding model
         self.embedding_model = None
         self._initialize_embedding_model()
         
+        self.boundary_engine = boundary_engine
+        self.last_boundary_result: Optional[BoundaryResult] = None
+        
         # Validate ruptures availability
-        if rpt is None:
+        if boundary_engine == "ruptures" and rpt is None:
             raise ImportError("ruptures library is required for topic segmentation. Install with: pip install ruptures")
         
         logger.info("TopicSegmentationEngine initialized",
@@ -132,10 +160,72 @@ class TopicSegmentationEngine:
                    min_duration_ms=min_duration_ms,
                    max_duration_ms=max_duration_ms,
                    batch_size=embedding_batch_size,
-                   cache_dir=str(self.cache_dir))
+                   cache_dir=str(self.cache_dir),
+                   boundary_engine=boundary_engine,
+                   embedding_backend=embedding_backend)
+    
+    def _initialize_remote_model(self) -> bool:
+        """Use a warm embedding model from the model server, if one is running"""
+        from .model_server import get_model_server_client, RemoteSentenceTransformer
+        
+        client = get_model_server_client()
+        if client is None:
+            return False
+        
+        for model_name in dict.fromkeys([self.model_name, "all-MiniLM-L6-v2"]):
+            try:
+                client.load('sentence_transformer', name=model_name)
+            except Exception as e:
+                logger.warning("Model server could not load embedding model",
+                             model_name=model_name, error=str(e))
+                continue
+            
+            self.embedding_model = RemoteSentenceTransformer(client, model_name)
+            self.model_name = model_name
+            logger.info("Using embedding model from model server", model_name=model_name)
+            return True
+        
+        return False
+    
+    def _initialize_onnx_model(self) -> bool:
+        """Load the int8-quantized ONNX model, exporting and validating it on first use"""
+        for model_name in dict.fromkeys([self.model_name, "all-MiniLM-L6-v2"]):
+            try:
+                self.embedding_model = load_onnx_encoder(
+                    model_name,
+                    self.onnx_model_dir,
+                    threads=self.embedding_threads,
+                    max_batch_tokens=self.onnx_max_batch_tokens
+                )
+            except Exception as e:
+                logger.warning("Could not load ONNX embedding model",
+                             model_name=model_name, error=str(e))
+                continue
+            
+            self.model_name = model_name
+            return True
+        
+        logger.warning("ONNX embedding backend unavailable, falling back to PyTorch")
+        return False
+    
+    @property
+    def embedding_model_key(self) -> str:
+        """Model identity used to key stored embeddings (backends differ slightly)"""
+        if isinstance(self.embedding_model, OnnxSentenceEncoder):
+            return f"{self.model_name}@onnx-int8"
+        return self.model_name
     
     def _initialize_embedding_model(self) -> None:
         """Initialize the sentence embedding model with fallback mechanisms"""
+        if self.embedding_backend == "onnx" and self._initialize_onnx_model():
+            return
+        
+        if self._initialize_remote_model():
+            return
+        
+        if self.embedding_threads > 0:
+            torch.set_num_threads(self.embedding_threads)
+        
         if SentenceTransformer is None:
             logger.warning("SentenceTransformer not available, using fallback mode")
             self.embedding_model = None
@@ -204,9 +294,12 @@ class TopicSegmentationEngine:
         """
         Generate sentence embeddings with caching and batch processing
         
+        Embeddings are cached per sentence in the shared embedding store, so
+        a transcript correction only re-embeds the sentences that changed.
+        
         Args:
             sentences: List of sentences to embed
-            episode_id: Episode ID for cache key generation
+            episode_id: Episode ID (used for logging)
             
         Returns:
             Array of sentence embeddings (n_sentences, embedding_dim)
@@ -224,49 +317,14 @@ class TopicSegmentationEngine:
             # Return random embeddings with consistent dimensions
             return np.random.rand(len(sentences), 384).astype(np.float32)
         
-        # Generate cache key based on sentences and model
-        cache_key = self._generate_cache_key(sentences, episode_id)
-        cache_file = self.cache_dir / f"{cache_key}.pkl"
-        
-        # Try to load from cache
-        if cache_file.exists():
-            try:
-                logger.info("Loading embeddings from cache", cache_file=str(cache_file))
-                with open(cache_file, 'rb') as f:
-                    cached_data = pickle.load(f)
-                
-                # Validate cache data
-                if self._validate_cached_embeddings(cached_data, sentences):
-                    logger.info("Using cached embeddings", sentences=len(sentences))
-                    return cached_data['embeddings']
-                else:
-                    logger.warning("Cache validation failed, regenerating embeddings")
-            except Exception as e:
-                logger.warning("Failed to load cached embeddings", error=str(e))
-        
-        # Try to generate embeddings with the model
+        # Resolve embeddings through the sentence store; only unseen sentences are encoded
         try:
-            logger.info("Generating new embeddings", sentences=len(sentences), model=self.model_name)
-            embeddings = self._generate_embeddings_batch(sentences)
-            
-            # Cache the results
-            try:
-                cache_data = {
-                    'embeddings': embeddings,
-                    'model_name': self.model_name,
-                    'sentence_count': len(sentences),
-                    'sentence_texts': [s.text for s in sentences],
-                    'generated_at': np.datetime64('now').astype(str)
-                }
-                
-                with open(cache_file, 'wb') as f:
-                    pickle.dump(cache_data, f)
-                
-                logger.info("Embeddings cached successfully", cache_file=str(cache_file))
-            except Exception as e:
-                logger.warning("Failed to cache embeddings", error=str(e))
-            
-            return embeddings
+            logger.info("Resolving embeddings", episode_id=episode_id, sentences=len(sentences), model=self.model_name)
+            return self.embedding_store.embed(
+                self.embedding_model_key,
+                [s.text for s in sentences],
+                self._generate_embeddings_batch
+            )
             
         except Exception as e:
             logger.error("Embedding generation failed, attempting fallback", error=str(e))
@@ -286,78 +344,12 @@ class TopicSegmentationEngine:
                            fallback_error=str(fallback_error))
                 raise EmbeddingError(error_msg, model_name=self.model_name)
     
-    def _generate_cache_key(self, sentences: List[Sentence], episode_id: str) -> str:
-        """
-        Generate cache key based on sentences content and model
-        
-        Args:
-            sentences: List of sentences
-            episode_id: Episode identifier
-            
-        Returns:
-            Cache key string
-        """
-        # Create hash from sentence texts, model name, and episode ID
-        content = f"{episode_id}:{self.model_name}:"
-        content += ":".join(s.text for s in sentences)
-        
-        hash_obj = hashlib.sha256(content.encode('utf-8'))
-        return f"{episode_id}_{hash_obj.hexdigest()[:16]}"
-    
-    def _validate_cached_embeddings(self, cached_data: Dict[str, Any], sentences: List[Sentence]) -> bool:
-        """
-        Validate cached embedding data matches current sentences
-        
-        Args:
-            cached_data: Cached embedding data
-            sentences: Current sentences
-            
-        Returns:
-            True if cache is valid
-        """
-        try:
-            # Check model name
-            if cached_data.get('model_name') != self.model_name:
-                logger.debug("Cache model mismatch", 
-                           cached=cached_data.get('model_name'),
-                           current=self.model_name)
-                return False
-            
-            # Check sentence count
-            if cached_data.get('sentence_count') != len(sentences):
-                logger.debug("Cache sentence count mismatch",
-                           cached=cached_data.get('sentence_count'),
-                           current=len(sentences))
-                return False
-            
-            # Check sentence texts (sample first few for performance)
-            cached_texts = cached_data.get('sentence_texts', [])
-            current_texts = [s.text for s in sentences]
-            
-            sample_size = min(10, len(sentences))
-            for i in range(sample_size):
-                if i >= len(cached_texts) or cached_texts[i] != current_texts[i]:
-                    logger.debug("Cache sentence text mismatch", index=i)
-                    return False
-            
-            # Check embeddings shape
-            embeddings = cached_data.get('embeddings')
-            if embeddings is None or embeddings.shape[0] != len(sentences):
-                logger.debug("Cache embeddings shape mismatch")
-                return False
-            
-            return True
-            
-        except Exception as e:
-            logger.debug("Cache validation error", error=str(e))
-            return False
-    
-    def _generate_embeddings_batch(self, sentences: List[Sentence]) -> np.ndarray:
+    def _generate_embeddings_batch(self, sentence_texts: List[str]) -> np.ndarray:
         """
         Generate embeddings using batch processing for efficiency
         
         Args:
-            sentences: List of sentences to embed
+            sentence_texts: Sentence texts to embed
             
         Returns:
             Array of embeddings
@@ -365,14 +357,16 @@ class TopicSegmentationEngine:
         if self.embedding_model is None:
             raise RuntimeError("Embedding model not initialized")
         
-        sentence_texts = [s.text for s in sentences]
-        
         try:
-            # Process in batches for memory efficiency
+            # Process in batches for memory efficiency; the ONNX backend sizes
+            # its own batches by sequence length, so it gets every text at once
             all_embeddings = []
+            batch_size = self.embedding_batch_size
+            if isinstance(self.embedding_model, OnnxSentenceEncoder):
+                batch_size = max(len(sentence_texts), 1)
             
-            for i in range(0, len(sentence_texts), self.embedding_batch_size):
-                batch_texts = sentence_texts[i:i + self.embedding_batch_size]
+            for i in range(0, len(sentence_texts), batch_size):
+                batch_texts = sentence_texts[i:i + batch_size]
                 
                 logger.debug("Processing embedding batch",
                            batch_start=i,
@@ -391,7 +385,7 @@ class TopicSegmentationEngine:
             embeddings = np.vstack(all_embeddings)
             
             logger.info("Embeddings generated successfully",
-                       sentences=len(sentences),
+                       sentences=len(sentence_texts),
                        embedding_dim=embeddings.shape[1])
             
             return embeddings
@@ -402,10 +396,14 @@ class TopicSegmentationEngine:
     
     def detect_boundaries(self, embeddings: np.ndarray, target_segments: int = 12) -> List[int]:
         """
-        Use ruptures PELT algorithm to find topic boundaries
+        Find topic boundaries with the configured boundary engine
         
-        Uses cosine similarity for topic boundary detection with PELT algorithm.
-        Configures penalty parameter to produce 6-20 segments for typical episodes.
+        The default ``kernel`` engine runs cosine-kernel change-point detection
+        directly on the embeddings with memory linear in sentence count and a
+        single solution-path search over penalties. The ``ruptures`` engine
+        keeps the original PELT detection over a pairwise distance matrix.
+        The engine that produced the result (including the ``uniform`` and
+        ``time_based`` fallbacks) is recorded in ``last_boundary_result``.
         
         Args:
             embeddings: Sentence embeddings array
@@ -416,61 +414,96 @@ class TopicSegmentationEngine:
         """
         if embeddings.shape[0] < 2:
             logger.warning("Not enough sentences for boundary detection", sentences=embeddings.shape[0])
-            return [embeddings.shape[0] - 1] if embeddings.shape[0] > 0 else []
+            boundaries = [embeddings.shape[0] - 1] if embeddings.shape[0] > 0 else []
+            self.last_boundary_result = BoundaryResult(boundaries=boundaries, engine="none")
+            return boundaries
         
         # Fallback mode: use simple time-based segmentation if ruptures not available
-        if rpt is None:
+        if self.boundary_engine == "ruptures" and rpt is None:
             logger.warning("Ruptures library not available, using time-based segmentation fallback")
-            return self._fallback_time_based_segmentation(embeddings.shape[0], target_segments)
+            boundaries = self._fallback_time_based_segmentation(embeddings.shape[0], target_segments)
+            self.last_boundary_result = BoundaryResult(boundaries=boundaries, engine="time_based")
+            return boundaries
         
         try:
-            logger.info("Detecting topic boundaries with PELT algorithm",
+            logger.info("Detecting topic boundaries",
+                       engine=self.boundary_engine,
                        sentences=embeddings.shape[0],
                        target_segments=target_segments)
             
-            # Use cosine distance for semantic similarity
-            from sklearn.metrics.pairwise import cosine_distances
-            
-            # Calculate pairwise cosine distances for semantic change detection
-            distance_matrix = cosine_distances(embeddings)
-            
-            # Use PELT algorithm with RBF kernel for change point detection
-            # RBF kernel works well with cosine distance matrices
-            algo = rpt.Pelt(model="rbf", jump=1, min_size=2)
-            algo.fit(distance_matrix)
-            
-            # Try multiple penalty values to get target segment count
-            best_change_points = self._find_optimal_penalty(algo, embeddings.shape[0], target_segments)
-            
-            # Remove the last point (which is always n_samples)
-            if best_change_points and best_change_points[-1] == embeddings.shape[0]:
-                best_change_points = best_change_points[:-1]
-            
-            # Validate segment count is within acceptable range (6-20)
-            segment_count = len(best_change_points) + 1
-            if segment_count < 6 or segment_count > 20:
-                logger.warning("Segment count outside target range",
-                             actual_segments=segment_count,
-                             target_range="6-20")
-                
-                # If too few segments, try lower penalty
-                if segment_count < 6:
-                    best_change_points = self._force_more_segments(algo, embeddings.shape[0], 6)
-                # If too many segments, try higher penalty  
-                elif segment_count > 20:
-                    best_change_points = self._force_fewer_segments(algo, embeddings.shape[0], 20)
-            
-            logger.info("Boundary detection completed",
-                       boundaries=len(best_change_points),
-                       segments=len(best_change_points) + 1,
-                       boundary_indices=best_change_points)
-            
-            return best_change_points
+            if self.boundary_engine == "kernel":
+                result = detect_kernel_boundaries(embeddings, target_segments,
+                                                  min_segments=6, max_segments=20, min_size=2)
+            else:
+                result = BoundaryResult(boundaries=self._detect_boundaries_ruptures(embeddings, target_segments),
+                                        engine="ruptures")
             
         except Exception as e:
-            logger.error("Boundary detection failed", error=str(e))
+            logger.error("Boundary detection failed", engine=self.boundary_engine, error=str(e))
             # Fallback: create uniform segments
-            return self._create_uniform_boundaries(embeddings.shape[0], target_segments)
+            result = BoundaryResult(boundaries=self._create_uniform_boundaries(embeddings.shape[0], target_segments),
+                                    engine="uniform")
+        
+        self.last_boundary_result = result
+        
+        logger.info("Boundary detection completed",
+                   engine=result.engine,
+                   penalty=result.penalty,
+                   boundaries=len(result.boundaries),
+                   segments=result.segment_count,
+                   boundary_indices=result.boundaries)
+        
+        return result.boundaries
+    
+    def _detect_boundaries_ruptures(self, embeddings: np.ndarray, target_segments: int) -> List[int]:
+        """
+        Use ruptures PELT algorithm to find topic boundaries
+        
+        Uses cosine similarity for topic boundary detection with PELT algorithm.
+        Configures penalty parameter to produce 6-20 segments for typical episodes.
+        Builds a dense pairwise distance matrix, so memory is quadratic in
+        sentence count.
+        
+        Args:
+            embeddings: Sentence embeddings array
+            target_segments: Target number of segments (6-20 for typical episodes)
+            
+        Returns:
+            List of boundary indices (sentence indices where segments end)
+        """
+        # Use cosine distance for semantic similarity
+        from sklearn.metrics.pairwise import cosine_distances
+        
+        # Calculate pairwise cosine distances for semantic change detection
+        distance_matrix = cosine_distances(embeddings)
+        
+        # Use PELT algorithm with RBF kernel for change point detection
+        # RBF kernel works well with cosine distance matrices
+        algo = rpt.Pelt(model="rbf", jump=1, min_size=2)
+        algo.fit(distance_matrix)
+        
+        # Try multiple penalty values to get target segment count
+        best_change_points = self._find_optimal_penalty(algo, embeddings.shape[0], target_segments)
+        
+        # Remove the last point (which is always n_samples)
+        if best_change_points and best_change_points[-1] == embeddings.shape[0]:
+            best_change_points = best_change_points[:-1]
+        
+        # Validate segment count is within acceptable range (6-20)
+        segment_count = len(best_change_points) + 1
+        if segment_count < 6 or segment_count > 20:
+            logger.warning("Segment count outside target range",
+                         actual_segments=segment_count,
+                         target_range="6-20")
+            
+            # If too few segments, try lower penalty
+            if segment_count < 6:
+                best_change_points = self._force_more_segments(algo, embeddings.shape[0], 6)
+            # If too many segments, try higher penalty  
+            elif segment_count > 20:
+                best_change_points = self._force_fewer_segments(algo, embeddings.shape[0], 20)
+        
+        return best_change_points
     
     def _find_optimal_penalty(self, algo, n_sentences: int, target_segments: int) -> List[int]:
         """
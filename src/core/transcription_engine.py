@@ -2,14 +2,17 @@
 Faster-Whisper transcription engine with concurrency control
 
 Provides GPU-safe transcription with automatic device management and
-VRAM concurrency guards to prevent OOM errors.
+VRAM concurrency guards to prevent OOM errors. On CPU-only hosts,
+transcribe_parallel splits long audio at silences and transcribes the
+chunks in a process pool.
 """
 
 import asyncio
 import threading
+import time
 from pathlib import Path
 from typing import Optional, List, Tuple, Literal
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from contextlib import asynccontextmanager
 
 from faster_whisper import WhisperModel
@@ -21,6 +24,15 @@ from .exceptions import TranscriptionError
 logger = get_logger('pipeline.transcription')
 
 
+@dataclass
+class TranscriptionWord:
+    """Single word with timestamps"""
+    start: float
+    end: float
+    word: str
+    probability: float = 0.0
+
+
 @dataclass
 class TranscriptionSegment:
     """Single transcription segment"""
@@ -28,6 +40,7 @@ class TranscriptionSegment:
     end: float
     text: str
     confidence: float
+    words: List[TranscriptionWord] = field(default_factory=list)
     
     def to_vtt_timestamp(self, seconds: float) -> str:
         """Convert seconds to VTT timestamp format"""
@@ -62,6 +75,11 @@ class TranscriptionResult:
     def to_plain_text(self) -> str:
         """Export as plain text"""
         return self.text
+    
+    @property
+    def words(self) -> List[TranscriptionWord]:
+        """Word timestamps across all segments (empty unless requested)"""
+        return [word for segment in self.segments for word in segment.words]
 
 
 class TranscriptionEngine:
@@ -84,7 +102,8 @@ class TranscriptionEngine:
         model_size: str = "large-v3",
         device: Literal["auto", "cuda", "cpu"] = "auto",
         compute_type: str = "float16",
-        max_gpu_concurrent: int = 1
+        max_gpu_concurrent: int = 1,
+        cpu_threads_per_worker: int = 2
     ):
         """
         Initialize transcription engine
@@ -94,11 +113,13 @@ class TranscriptionEngine:
             device: Device to use (auto, cuda, cpu)
             compute_type: Compute precision (int8, int8_float16, float16, float32)
             max_gpu_concurrent: Max concurrent GPU transcriptions (prevents OOM)
+            cpu_threads_per_worker: Threads per model process in transcribe_parallel
         """
         self.model_size = model_size
         self.device = self._resolve_device(device)
         self.compute_type = compute_type
         self.max_gpu_concurrent = max_gpu_concurrent
+        self.cpu_threads_per_worker = cpu_threads_per_worker
         
         # Initialize GPU semaphore if needed
         if self.device == "cuda":
@@ -210,7 +231,7 @@ class TranscriptionEngine:
             # Acquire GPU slot if needed
             async with self._gpu_lock():
                 # Load model in thread pool to avoid blocking
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 model = await loop.run_in_executor(None, self._load_model)
                 
                 # Run transcription in thread pool
@@ -264,6 +285,114 @@ class TranscriptionEngine:
             )
             raise TranscriptionError(f"Transcription failed: {e}")
     
+    async def transcribe_parallel(
+        self,
+        audio_path: Path,
+        language: Optional[str] = None,
+        initial_prompt: Optional[str] = None,
+        chunk_seconds: float = 300.0,
+        max_workers: Optional[int] = None,
+        beam_size: int = 5
+    ) -> TranscriptionResult:
+        """
+        Transcribe audio file in VAD-split chunks on a CPU process pool
+        
+        The audio is cut at silences into roughly chunk_seconds pieces, each
+        worker process loads its own model, and segments and word timestamps
+        are stitched back into episode time. Falls back to transcribe() on
+        CUDA, where a single model already saturates the device.
+        
+        Args:
+            audio_path: Path to audio file
+            language: Language code (None to detect once on the opening audio)
+            initial_prompt: Initial prompt passed to every chunk
+            chunk_seconds: Target chunk length in seconds
+            max_workers: Worker processes (defaults to cores / cpu_threads_per_worker)
+            beam_size: Beam search size
+            
+        Returns:
+            TranscriptionResult with word timestamps
+            
+        Raises:
+            TranscriptionError: If transcription fails
+        """
+        if self.device == "cuda":
+            logger.info("Parallel chunked transcription is CPU-only, using single model")
+            return await self.transcribe(audio_path, language, initial_prompt, beam_size=beam_size)
+        
+        if not audio_path.exists():
+            raise TranscriptionError(f"Audio file not found: {audio_path}")
+        
+        from . import parallel_transcription as parallel
+        
+        workers = max_workers or parallel.default_worker_count(self.cpu_threads_per_worker)
+        
+        def run() -> TranscriptionResult:
+            from faster_whisper import decode_audio
+            from faster_whisper.vad import get_speech_timestamps, VadOptions
+            
+            started = time.time()
+            audio = decode_audio(str(audio_path), sampling_rate=parallel.SAMPLE_RATE)
+            duration = len(audio) / parallel.SAMPLE_RATE
+            
+            speech = [
+                (ts['start'] / parallel.SAMPLE_RATE, ts['end'] / parallel.SAMPLE_RATE)
+                for ts in get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=500))
+            ]
+            plans = parallel.plan_chunks(speech, duration, target_seconds=chunk_seconds)
+            
+            logger.info(
+                "Starting parallel transcription",
+                file=str(audio_path),
+                duration=duration,
+                chunks=len(plans),
+                workers=min(workers, len(plans))
+            )
+            
+            chunk_results, detected_language = parallel.transcribe_chunks_in_pool(
+                audio, plans, self.model_size, self.compute_type, language,
+                initial_prompt, beam_size, workers, self.cpu_threads_per_worker
+            )
+            stitched = parallel.stitch_chunk_results(chunk_results)
+            
+            segments = [
+                TranscriptionSegment(
+                    start=segment['start'],
+                    end=segment['end'],
+                    text=segment['text'],
+                    confidence=segment['avg_logprob'],
+                    words=[TranscriptionWord(**word) for word in segment['words']]
+                )
+                for segment in stitched
+            ]
+            
+            logger.info(
+                "Parallel transcription completed",
+                file=str(audio_path),
+                language=detected_language,
+                segments=len(segments),
+                wall_seconds=time.time() - started,
+                realtime_factor=duration / max(time.time() - started, 1e-6)
+            )
+            
+            return TranscriptionResult(
+                text=" ".join(segment.text for segment in segments),
+                segments=segments,
+                language=detected_language,
+                duration=duration
+            )
+        
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, run)
+        except Exception as e:
+            logger.error(
+                "Parallel transcription failed",
+                file=str(audio_path),
+                error=str(e)
+            )
+            raise TranscriptionError(f"Parallel transcription failed: {e}")
+    
     def unload_model(self) -> None:
         """Unload model to free memory"""
         with self._model_lock:
@@ -278,12 +407,14 @@ def create_transcription_engine(
     model_size: str = "large-v3",
     device: str = "auto",
     compute_type: str = "float16",
-    max_gpu_concurrent: int = 1
+    max_gpu_concurrent: int = 1,
+    cpu_threads_per_worker: int = 2
 ) -> TranscriptionEngine:
     """Create transcription engine with settings"""
     return TranscriptionEngine(
         model_size=model_size,
         device=device,
         compute_type=compute_type,
-        max_gpu_concurrent=max_gpu_concurrent
+        max_gpu_concurrent=max_gpu_concurrent,
+        cpu_threads_per_worker=cpu_threads_per_worker
     )
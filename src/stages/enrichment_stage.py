@@ -372,16 +372,21 @@ class EnrichmentStageProcessor:
             
             # Run diarization with timeout (15 minutes max)
             import asyncio
+            from ..core.model_server import get_model_server_client
+            client = get_model_server_client()
+            # Reuse the warm pyannote pipeline in the model server when one is running
+            diarize = client.diarize if client is not None else diarize_audio
+            extra = {} if client is not None else {'output_path': None}
             try:
                 result = await asyncio.wait_for(
                     asyncio.to_thread(
-                        diarize_audio,
+                        diarize,
                         audio_path=audio_path,
-                        output_path=None,
                         hf_token=self.hf_token,
                         num_speakers=self.num_speakers if self.num_speakers > 0 else None,
                         device=self.diarization_device,
-                        merge_gap=2.0
+                        merge_gap=2.0,
+                        **extra
                     ),
                     timeout=900  # 15 minutes
                 )
@@ -3,21 +3,68 @@ Media Preparation Stage Processor
 
 Extracts audio from video files and validates media properties.
 Creates: data/audio/{episode_id}.wav
+
+In streaming mode no WAV is written during prep; ffmpeg decodes 16 kHz mono
+PCM into a pipe that transcription consumes chunk by chunk, and the WAV is
+only extracted on demand (e.g. for diarization).
 """
 
 import subprocess
 import asyncio
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator, List
 from fractions import Fraction
 import json
 
+import numpy as np
+
 from ..core.logging import get_logger
 from ..core.exceptions import ProcessingError
 from ..core.models import EpisodeObject
 
 logger = get_logger('pipeline.prep_stage')
 
+SAMPLE_RATE = 16000  # Whisper input rate
+_BYTES_PER_SAMPLE = 2  # pcm_s16le
+
+
+@dataclass
+class AudioChunk:
+    """Decoded mono audio chunk with its position in the episode"""
+    offset_seconds: float
+    samples: np.ndarray  # float32 in [-1, 1] at SAMPLE_RATE
+    
+    @property
+    def duration_seconds(self) -> float:
+        return len(self.samples) / SAMPLE_RATE
+
+
+def find_silence_cut(samples: np.ndarray, search_samples: int, frame_samples: int = SAMPLE_RATE // 50) -> int:
+    """
+    Position of the quietest frame in the last search_samples of a buffer
+    
+    Streaming chunks are cut here rather than at a fixed length so that
+    words are not split across chunks.
+    
+    Args:
+        samples: Decoded audio ending at the nominal chunk boundary
+        search_samples: Length of the window searched before the boundary
+        frame_samples: Frame length over which energy is measured (20 ms)
+        
+    Returns:
+        Sample index to cut at (middle of the quietest frame)
+    """
+    search_samples = min(search_samples, len(samples))
+    frames = search_samples // frame_samples
+    if frames == 0:
+        return len(samples)
+    window_start = len(samples) - frames * frame_samples
+    energy = np.square(samples[window_start:].reshape(frames, frame_samples)).mean(axis=1)
+    # Latest of equally quiet frames keeps chunks close to their nominal length
+    quietest = frames - 1 - int(np.argmin(energy[::-1]))
+    return window_start + quietest * frame_samples + frame_samples // 2
+
 
 class PrepStageProcessor:
     """Processes media preparation stage - audio extraction and validation"""
@@ -26,15 +73,17 @@ class PrepStageProcessor:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
-    async def process(self, episode: EpisodeObject) -> Dict[str, Any]:
+    async def process(self, episode: EpisodeObject, extract_audio: bool = True) -> Dict[str, Any]:
         """
         Extract audio from video and validate media properties
         
         Args:
             episode: Episode object with source video path
+            extract_audio: Write the WAV now; False in streaming mode, where
+                transcription decodes audio itself via stream_audio()
             
         Returns:
-            Dict with audio_path and media info
+            Dict with audio_path (None when not extracted) and media info
         """
         try:
             logger.info("Starting media preparation", episode_id=episode.episode_id)
@@ -50,6 +99,14 @@ class PrepStageProcessor:
                        duration=media_info.get('duration'),
                        resolution=media_info.get('resolution'))
             
+            if not extract_audio:
+                logger.info("Streaming mode, deferring audio extraction", episode_id=episode.episode_id)
+                return {
+                    'audio_path': None,
+                    'media_info': media_info,
+                    'success': True
+                }
+            
             # Extract audio to WAV
             audio_path = self.output_dir / f"{episode.episode_id}.wav"
             await self._extract_audio(source_path, audio_path)
@@ -70,6 +127,118 @@ class PrepStageProcessor:
                         error=str(e))
             raise ProcessingError(f"Prep stage failed: {e}")
     
+    async def ensure_audio_file(self, episode: EpisodeObject) -> Path:
+        """Return the episode WAV, extracting it first if streaming mode skipped it"""
+        audio_path = self.output_dir / f"{episode.episode_id}.wav"
+        if not audio_path.exists():
+            logger.info("Extracting audio on demand", episode_id=episode.episode_id)
+            await self._extract_audio(episode.source.get_absolute_path(), audio_path)
+        return audio_path
+    
+    async def stream_audio(self, video_path: Path, chunk_seconds: float = 300.0,
+                           max_buffered_chunks: int = 2,
+                           silence_search_seconds: float = 10.0) -> AsyncIterator[AudioChunk]:
+        """
+        Decode audio through an ffmpeg pipe and yield it in chunks cut at silences
+        
+        A reader task keeps decoding while the consumer works on earlier
+        chunks; the bounded queue caps memory at max_buffered_chunks chunks
+        and applies back-pressure to ffmpeg. Each chunk ends at the quietest
+        20 ms frame within silence_search_seconds before chunk_seconds, and
+        the audio after the cut starts the next chunk.
+        
+        Args:
+            video_path: Source media file
+            chunk_seconds: Nominal chunk length in seconds (chunks are at most this long)
+            max_buffered_chunks: Decoded chunks held ahead of the consumer
+            silence_search_seconds: Window before the nominal boundary searched for a cut
+            
+        Yields:
+            AudioChunk objects in order
+        """
+        chunk_samples = int(chunk_seconds * SAMPLE_RATE)
+        search_samples = min(int(silence_search_seconds * SAMPLE_RATE), chunk_samples // 2)
+        cmd = self._ffmpeg_audio_cmd(video_path, 'pipe:1', output_format='s16le')
+        
+        logger.debug("Running ffmpeg (streaming)", command=' '.join(cmd))
+        
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered_chunks)
+        stderr_lines: List[bytes] = []
+        
+        async def drain_stderr():
+            async for line in process.stderr:
+                stderr_lines.append(line)
+        
+        async def read_chunks():
+            offset_samples = 0
+            pending = np.zeros(0, dtype=np.float32)
+            try:
+                while True:
+                    read_bytes = (chunk_samples - len(pending)) * _BYTES_PER_SAMPLE
+                    try:
+                        data = await process.stdout.readexactly(read_bytes)
+                    except asyncio.IncompleteReadError as e:
+                        data = e.partial
+                    samples = np.concatenate([
+                        pending, np.frombuffer(data, dtype=np.int16).astype(np.float32) / 32768.0
+                    ])
+                    if len(data) < read_bytes:
+                        if len(samples):
+                            await queue.put(AudioChunk(offset_samples / SAMPLE_RATE, samples))
+                        break
+                    cut = find_silence_cut(samples, search_samples)
+                    await queue.put(AudioChunk(offset_samples / SAMPLE_RATE, samples[:cut]))
+                    offset_samples += cut
+                    pending = samples[cut:]
+                await queue.put(None)
+            except Exception as e:
+                await queue.put(e)
+        
+        stderr_task = asyncio.create_task(drain_stderr())
+        reader_task = asyncio.create_task(read_chunks())
+        
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise ProcessingError(f"Audio streaming failed: {item}")
+                yield item
+            
+            returncode = await process.wait()
+            await stderr_task
+            if returncode != 0:
+                raise ProcessingError(f"ffmpeg failed: {b''.join(stderr_lines).decode(errors='replace')}")
+        finally:
+            reader_task.cancel()
+            stderr_task.cancel()
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+    
+    def _ffmpeg_audio_cmd(self, video_path: Path, output: str, output_format: Optional[str] = None) -> List[str]:
+        """ffmpeg command decoding 16 kHz mono 16-bit PCM (WAV file or raw pipe)"""
+        cmd = [
+            'ffmpeg',
+            '-nostdin',
+            '-loglevel', 'error',
+            '-i', str(video_path),
+            '-vn',  # No video
+            '-acodec', 'pcm_s16le',  # 16-bit PCM
+            '-ar', str(SAMPLE_RATE),  # 16kHz sample rate (good for speech)
+            '-ac', '1',  # Mono
+        ]
+        if output_format:
+            cmd += ['-f', output_format]
+        cmd += ['-y', output]  # Overwrite output
+        return cmd
+    
     async def _get_media_info(self, video_path: Path) -> Dict[str, Any]:
         """Extract media information using ffprobe"""
         try:
@@ -129,16 +298,7 @@ class PrepStageProcessor:
     async def _extract_audio(self, video_path: Path, audio_path: Path) -> None:
         """Extract audio to WAV format using ffmpeg"""
         try:
-            cmd = [
-                'ffmpeg',
-                '-i', str(video_path),
-                '-vn',  # No video
-                '-acodec', 'pcm_s16le',  # 16-bit PCM
-                '-ar', '16000',  # 16kHz sample rate (good for speech)
-                '-ac', '1',  # Mono
-                '-y',  # Overwrite output
-                str(audio_path)
-            ]
+            cmd = self._ffmpeg_audio_cmd(video_path, str(audio_path))
             
             logger.debug("Running ffmpeg", command=' '.join(cmd))
             
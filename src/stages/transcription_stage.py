@@ -5,16 +5,23 @@ Uses Whisper to generate transcripts and VTT captions.
 Creates:
 - data/transcripts/txt/{episode_id}.txt
 - data/transcripts/vtt/{episode_id}.vtt
+- data/transcripts/words/{episode_id}.npz (columnar word timestamps)
+
+Audio comes either from the prep-stage WAV (process) or from an ffmpeg PCM
+stream (process_stream), which lets transcription start while decoding is
+still running. With transcription.parallel on a host without CUDA, the WAV
+is split at silences and transcribed on a faster-whisper process pool.
 """
 
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, List, Optional
 import asyncio
 import torch
 
 from ..core.logging import get_logger
 from ..core.exceptions import ProcessingError
 from ..core.models import EpisodeObject
+from ..core.columnar_transcript import ColumnarTranscript
 
 logger = get_logger('pipeline.transcription_stage')
 
@@ -27,6 +34,7 @@ class TranscriptionStageProcessor:
         self.output_dir = Path(output_dir)
         self.txt_dir = self.output_dir / "txt"
         self.vtt_dir = self.output_dir / "vtt"
+        self.words_dir = self.output_dir / "words"
         
         # Multilingual configuration
         self.config = config or {}
@@ -36,10 +44,24 @@ class TranscriptionStageProcessor:
         self.task = self.transcription_config.get('task', 'transcribe')
         self.supported_languages = self.transcription_config.get('supported_languages', ['en'])
         self.fallback_language = self.transcription_config.get('fallback_language', 'en')
+        self.stream_prompt_chars = self.transcription_config.get('stream_prompt_chars', 200)
+        self.parallel = self.transcription_config.get('parallel', False)
+        self.parallel_chunk_seconds = self.transcription_config.get('parallel_chunk_seconds', 300.0)
+        self.parallel_workers = self.transcription_config.get('parallel_workers', 0)
+        self.parallel_cpu_threads = self.transcription_config.get('parallel_cpu_threads', 2)
         
         # Create output directories
         self.txt_dir.mkdir(parents=True, exist_ok=True)
         self.vtt_dir.mkdir(parents=True, exist_ok=True)
+        self.words_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Use the warm model in the model server when one is running
+        from ..core.model_server import get_model_server_client, RemoteWhisperModel
+        client = get_model_server_client()
+        if client is not None:
+            logger.info(f"Using Whisper model {model_name} from model server")
+            self.model = RemoteWhisperModel(client, model_name)
+            return
         
         # Load Whisper model (lazy import)
         try:
@@ -85,6 +107,21 @@ class TranscriptionStageProcessor:
             whisper_language = None if self.language == 'auto' else self.language
             whisper_task = 'translate' if self.translate_to_english else 'transcribe'
             
+            # Chunked CPU pool transcription; translation and GPUs use the single model
+            if self.parallel and whisper_task == 'transcribe' and not torch.cuda.is_available():
+                logger.info("Running parallel Whisper transcription on CPU workers",
+                           language=whisper_language or 'auto-detect',
+                           chunk_seconds=self.parallel_chunk_seconds)
+                
+                engine = self._parallel_engine()
+                transcription = await engine.transcribe_parallel(
+                    audio_file,
+                    language=whisper_language,
+                    chunk_seconds=self.parallel_chunk_seconds,
+                    max_workers=self.parallel_workers or None
+                )
+                return self._build_result(episode, self._whisper_result(transcription), whisper_task)
+            
             logger.info(f"Running Whisper transcription on {'GPU' if torch.cuda.is_available() else 'CPU'}...",
                        language=whisper_language or 'auto-detect',
                        task=whisper_task,
@@ -104,70 +141,202 @@ class TranscriptionStageProcessor:
                 fp16=fp16  # Use FP16 on GPU for faster processing
             )
             
-            # Get detected language
-            detected_language = result.get('language', self.fallback_language)
-            
-            # Validate detected language is supported
-            if detected_language not in self.supported_languages:
-                logger.warning(f"Detected language '{detected_language}' not in supported list, using fallback",
-                             detected=detected_language,
-                             supported=self.supported_languages,
-                             fallback=self.fallback_language)
-                detected_language = self.fallback_language
+            return self._build_result(episode, result, whisper_task)
             
-            # Save plain text transcript
-            txt_path = self.txt_dir / f"{episode.episode_id}.txt"
-            with open(txt_path, 'w', encoding='utf-8') as f:
-                f.write(result['text'])
+        except Exception as e:
+            logger.error("Transcription failed",
+                        episode_id=episode.episode_id,
+                        error=str(e))
+            raise ProcessingError(f"Transcription stage failed: {e}")
+    
+    async def process_stream(self, episode: EpisodeObject, chunks: AsyncIterator) -> Dict[str, Any]:
+        """
+        Transcribe audio chunks as they are decoded
+        
+        Each chunk is transcribed on its own and its timestamps are shifted
+        by the chunk offset. The language detected on the first chunk is
+        kept for the rest of the episode, and the tail of the previous
+        chunk's text is passed as the prompt to keep wording consistent
+        across chunk boundaries.
+        
+        Args:
+            episode: Episode object
+            chunks: Async iterator of prep_stage.AudioChunk
             
-            logger.info("Text transcript saved", path=str(txt_path))
+        Returns:
+            Dict with transcript paths and metadata (same shape as process)
+        """
+        try:
+            whisper_language = None if self.language == 'auto' else self.language
+            whisper_task = 'translate' if self.translate_to_english else 'transcribe'
+            fp16 = torch.cuda.is_available()
             
-            # Generate VTT captions
-            vtt_path = self.vtt_dir / f"{episode.episode_id}.vtt"
-            self._save_vtt(result['segments'], vtt_path)
+            logger.info("Starting streaming transcription",
+                       episode_id=episode.episode_id,
+                       language=whisper_language or 'auto-detect',
+                       task=whisper_task)
             
-            logger.info("VTT captions saved", path=str(vtt_path))
+            texts: List[str] = []
+            segments: List[Dict[str, Any]] = []
+            detected: Optional[str] = None
+            chunk_count = 0
             
-            # Extract word-level timestamps for clip generation
-            words = []
-            for segment in result['segments']:
-                if 'words' in segment:
-                    words.extend(segment['words'])
+            async for chunk in chunks:
+                prompt = texts[-1][-self.stream_prompt_chars:] if texts else None
+                chunk_result = await asyncio.to_thread(
+                    self.model.transcribe,
+                    chunk.samples,
+                    language=whisper_language or detected,
+                    task=whisper_task,
+                    verbose=False,
+                    word_timestamps=True,
+                    fp16=fp16,
+                    initial_prompt=prompt
+                )
+                
+                if detected is None:
+                    detected = chunk_result.get('language')
+                
+                texts.append(chunk_result['text'].strip())
+                segments.extend(self._offset_segments(chunk_result['segments'], chunk.offset_seconds, len(segments)))
+                chunk_count += 1
+                
+                logger.debug("Transcribed audio chunk",
+                            episode_id=episode.episode_id,
+                            chunk=chunk_count,
+                            offset=chunk.offset_seconds,
+                            duration=chunk.duration_seconds)
             
-            # Calculate statistics
-            segment_count = len(result['segments'])
-            word_count = len(words) if words else len(result['text'].split())
+            if chunk_count == 0:
+                raise ProcessingError("Audio stream contained no samples")
             
-            logger.info("Transcription completed",
-                       episode_id=episode.episode_id,
-                       segments=segment_count,
-                       words=word_count,
-                       word_timestamps=len(words) > 0,
-                       detected_language=detected_language,
-                       task_performed=whisper_task)
-            
-            return {
-                'txt_path': str(txt_path),
-                'vtt_path': str(vtt_path),
-                'text': result['text'],
-                'segments': result['segments'],
-                'words': words,  # Word-level timestamps for clip generation
-                'language': detected_language,  # Use validated detected language
-                'detected_language': detected_language,  # Explicit field for detected language
-                'original_language': result.get('language', detected_language),  # Raw Whisper detection
-                'task_performed': whisper_task,  # Track if transcribed or translated
-                'translated_to_english': whisper_task == 'translate',
-                'segment_count': segment_count,
-                'word_count': word_count,
-                'success': True
+            result = {
+                'text': ' '.join(t for t in texts if t),
+                'segments': segments,
+                'language': detected or self.fallback_language
             }
+            return self._build_result(episode, result, whisper_task)
             
         except Exception as e:
-            logger.error("Transcription failed",
+            logger.error("Streaming transcription failed",
                         episode_id=episode.episode_id,
                         error=str(e))
             raise ProcessingError(f"Transcription stage failed: {e}")
     
+    def _parallel_engine(self):
+        """faster-whisper engine whose worker processes each load the configured model"""
+        from ..core.transcription_engine import TranscriptionEngine
+        return TranscriptionEngine(
+            model_size=self.model_name,
+            device="cpu",
+            compute_type="int8",
+            cpu_threads_per_worker=self.parallel_cpu_threads
+        )
+    
+    @staticmethod
+    def _whisper_result(transcription) -> Dict[str, Any]:
+        """Convert a faster-whisper TranscriptionResult to the openai-whisper result layout"""
+        segments = []
+        for index, segment in enumerate(transcription.segments):
+            segments.append({
+                'id': index,
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text,
+                'avg_logprob': segment.confidence,
+                'words': [
+                    {'word': w.word, 'start': w.start, 'end': w.end, 'probability': w.probability}
+                    for w in segment.words
+                ]
+            })
+        return {'text': transcription.text, 'language': transcription.language, 'segments': segments}
+    
+    @staticmethod
+    def _offset_segments(segments: List[Dict[str, Any]], offset: float, first_id: int) -> List[Dict[str, Any]]:
+        """Shift chunk-relative segment and word timestamps to episode time"""
+        shifted = []
+        for i, segment in enumerate(segments):
+            segment = dict(segment, id=first_id + i,
+                           start=segment['start'] + offset,
+                           end=segment['end'] + offset)
+            if 'words' in segment:
+                segment['words'] = [
+                    dict(word, start=word['start'] + offset, end=word['end'] + offset)
+                    for word in segment['words']
+                ]
+            shifted.append(segment)
+        return shifted
+    
+    def _build_result(self, episode: EpisodeObject, result: Dict[str, Any], whisper_task: str) -> Dict[str, Any]:
+        """Validate language, write TXT/VTT outputs and build the stage result"""
+        # Get detected language
+        detected_language = result.get('language', self.fallback_language)
+        
+        # Validate detected language is supported
+        if detected_language not in self.supported_languages:
+            logger.warning(f"Detected language '{detected_language}' not in supported list, using fallback",
+                         detected=detected_language,
+                         supported=self.supported_languages,
+                         fallback=self.fallback_language)
+            detected_language = self.fallback_language
+        
+        # Save plain text transcript
+        txt_path = self.txt_dir / f"{episode.episode_id}.txt"
+        with open(txt_path, 'w', encoding='utf-8') as f:
+            f.write(result['text'])
+        
+        logger.info("Text transcript saved", path=str(txt_path))
+        
+        # Generate VTT captions
+        vtt_path = self.vtt_dir / f"{episode.episode_id}.vtt"
+        self._save_vtt(result['segments'], vtt_path)
+        
+        logger.info("VTT captions saved", path=str(vtt_path))
+        
+        # Extract word-level timestamps for clip generation
+        words = []
+        for segment in result['segments']:
+            if 'words' in segment:
+                words.extend(segment['words'])
+        
+        # Save compact columnar word timestamps alongside the transcript
+        words_path = None
+        if words:
+            try:
+                words_path = str(ColumnarTranscript.from_words(words).save(
+                    self.words_dir / f"{episode.episode_id}.npz"))
+            except (OSError, ValueError) as e:
+                logger.warning("Failed to save columnar word timestamps", error=str(e))
+        
+        # Calculate statistics
+        segment_count = len(result['segments'])
+        word_count = len(words) if words else len(result['text'].split())
+        
+        logger.info("Transcription completed",
+                   episode_id=episode.episode_id,
+                   segments=segment_count,
+                   words=word_count,
+                   word_timestamps=len(words) > 0,
+                   detected_language=detected_language,
+                   task_performed=whisper_task)
+        
+        return {
+            'txt_path': str(txt_path),
+            'vtt_path': str(vtt_path),
+            'words_path': words_path,  # Columnar word timestamps (.npz)
+            'text': result['text'],
+            'segments': result['segments'],
+            'words': words,  # Word-level timestamps for clip generation
+            'language': detected_language,  # Use validated detected language
+            'detected_language': detected_language,  # Explicit field for detected language
+            'original_language': result.get('language', detected_language),  # Raw Whisper detection
+            'task_performed': whisper_task,  # Track if transcribed or translated
+            'translated_to_english': whisper_task == 'translate',
+            'segment_count': segment_count,
+            'word_count': word_count,
+            'success': True
+        }
+    
     def _save_vtt(self, segments: list, vtt_path: Path) -> None:
         """Convert Whisper segments to VTT format"""
         try:
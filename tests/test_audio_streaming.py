@@ -0,0 +1,187 @@
+"""
+Tests for streaming transcription
+
+Tests silence-snapped chunking of the ffmpeg PCM stream (with a Python
+process standing in for ffmpeg) and chunk-by-chunk transcription with a
+stub Whisper model.
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# The stage processors import torch; src.stages pulls in httpx via the Ollama client
+pytest.importorskip("torch")
+pytest.importorskip("httpx")
+
+from src.core import model_server
+from src.core.exceptions import ProcessingError
+from src.stages.prep_stage import PrepStageProcessor, AudioChunk, SAMPLE_RATE, find_silence_cut
+from src.stages.transcription_stage import TranscriptionStageProcessor
+
+_CAT_SCRIPT = "import shutil, sys; shutil.copyfileobj(open(sys.argv[1], 'rb'), sys.stdout.buffer)"
+
+
+def speech_with_pauses(duration_s, pauses):
+    """Continuous tone standing in for speech, silent during the given (start, end) pauses"""
+    t = np.arange(int(duration_s * SAMPLE_RATE)) / SAMPLE_RATE
+    samples = 0.5 * np.sin(2 * np.pi * 220 * t)
+    for start, end in pauses:
+        samples[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)] = 0.0
+    return samples
+
+
+class TestSilenceCut:
+    """Test choosing chunk cut points"""
+
+    def test_cut_lands_in_quietest_frame(self):
+        """Test that the cut is placed inside the pause"""
+        samples = speech_with_pauses(10.0, [(8.3, 8.5)])
+
+        cut = find_silence_cut(samples, search_samples=3 * SAMPLE_RATE)
+
+        assert 8.3 * SAMPLE_RATE <= cut <= 8.5 * SAMPLE_RATE
+
+    def test_cut_without_pause_stays_in_window(self):
+        """Test that continuous audio is still cut within the search window"""
+        samples = speech_with_pauses(10.0, [])
+
+        cut = find_silence_cut(samples, search_samples=2 * SAMPLE_RATE)
+
+        assert 8 * SAMPLE_RATE <= cut <= len(samples)
+        assert find_silence_cut(samples[:100], search_samples=SAMPLE_RATE) == 100
+
+
+class TestStreamAudio:
+    """Test decoding the PCM pipe into chunks"""
+
+    def setup_method(self):
+        """Setup output directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.prep = PrepStageProcessor(output_dir=str(self.temp_dir / "audio"))
+
+    def teardown_method(self):
+        """Cleanup output directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    async def stream(self, samples, **kwargs):
+        pcm_path = self.temp_dir / "audio.pcm"
+        pcm_path.write_bytes((samples * 32767).astype(np.int16).tobytes())
+        self.prep._ffmpeg_audio_cmd = lambda *args, **kw: [sys.executable, "-c", _CAT_SCRIPT, str(pcm_path)]
+        return [chunk async for chunk in self.prep.stream_audio(Path("episode.mp4"), **kwargs)]
+
+    @pytest.mark.asyncio
+    async def test_chunks_are_cut_at_pauses(self):
+        """Test that chunk boundaries fall in pauses and no audio is lost"""
+        samples = speech_with_pauses(25.0, [(8.3, 8.5), (17.0, 17.2)])
+
+        chunks = await self.stream(samples, chunk_seconds=10.0, silence_search_seconds=3.0)
+
+        assert len(chunks) == 3
+        boundaries = [chunk.offset_seconds for chunk in chunks[1:]]
+        assert 8.3 <= boundaries[0] <= 8.5
+        assert 17.0 <= boundaries[1] <= 17.2
+        for previous, chunk in zip(chunks, chunks[1:]):
+            assert chunk.offset_seconds == pytest.approx(previous.offset_seconds + previous.duration_seconds)
+        assert all(chunk.duration_seconds <= 10.0 for chunk in chunks)
+        decoded = np.concatenate([chunk.samples for chunk in chunks])
+        np.testing.assert_allclose(decoded, samples, atol=1e-4)
+
+    @pytest.mark.asyncio
+    async def test_short_audio_is_one_chunk(self):
+        """Test that audio shorter than a chunk is yielded whole"""
+        chunks = await self.stream(speech_with_pauses(4.0, []), chunk_seconds=10.0)
+
+        assert [(chunk.offset_seconds, chunk.duration_seconds) for chunk in chunks] == [(0.0, 4.0)]
+
+
+class FakeWhisper:
+    """Whisper stand-in returning one two-word segment per chunk"""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, samples, language=None, initial_prompt=None, **kwargs):
+        index = len(self.calls)
+        self.calls.append({'duration': len(samples) / SAMPLE_RATE, 'language': language, 'prompt': initial_prompt})
+        words = [
+            {'word': f" chunk{index}", 'start': 0.5, 'end': 1.0, 'probability': 0.9},
+            {'word': " done.", 'start': 1.0, 'end': 1.5, 'probability': 0.8},
+        ]
+        return {
+            'text': f" chunk{index} done.",
+            'language': 'en' if index == 0 else 'de',
+            'segments': [{'id': 0, 'start': 0.5, 'end': 1.5, 'text': f" chunk{index} done.", 'words': words}]
+        }
+
+
+class TestStreamingTranscription:
+    """Test chunk-by-chunk transcription and timestamp offsets"""
+
+    def setup_method(self):
+        """Setup stage processor with a stub Whisper model"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def teardown_method(self):
+        """Cleanup output directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_processor(self, monkeypatch):
+        self.model = FakeWhisper()
+        monkeypatch.setattr(model_server, "get_model_server_client", lambda: object())
+        monkeypatch.setattr(model_server, "RemoteWhisperModel", lambda client, name: self.model)
+        return TranscriptionStageProcessor(
+            output_dir=str(self.temp_dir),
+            config={'transcription': {'supported_languages': ['en'], 'stream_prompt_chars': 6}}
+        )
+
+    def test_offset_segments(self):
+        """Test that segment ids continue and times shift by the chunk offset"""
+        segments = [
+            {'id': 0, 'start': 0.0, 'end': 2.0, 'text': " a", 'words': [{'word': " a", 'start': 0.5, 'end': 1.0}]},
+            {'id': 1, 'start': 2.0, 'end': 3.0, 'text': " b"},
+        ]
+
+        shifted = TranscriptionStageProcessor._offset_segments(segments, 300.0, 7)
+
+        assert [(s['id'], s['start'], s['end']) for s in shifted] == [(7, 300.0, 302.0), (8, 302.0, 303.0)]
+        assert shifted[0]['words'] == [{'word': " a", 'start': 300.5, 'end': 301.0}]
+        assert 'words' not in shifted[1]
+        assert segments[0]['start'] == 0.0 and segments[0]['words'][0]['start'] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_process_stream(self, monkeypatch):
+        """Test transcription of streamed chunks into one episode-time result"""
+        processor = self.make_processor(monkeypatch)
+
+        async def chunks():
+            for offset, seconds in [(0.0, 8.4), (8.4, 8.6), (17.0, 8.0)]:
+                yield AudioChunk(offset, np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32))
+
+        result = await processor.process_stream(SimpleNamespace(episode_id="ep-1"), chunks())
+
+        assert [s['id'] for s in result['segments']] == [0, 1, 2]
+        assert [w['start'] for w in result['words']] == [0.5, 1.0, 8.9, 9.4, 17.5, 18.0]
+        assert result['text'] == "chunk0 done. chunk1 done. chunk2 done."
+        assert result['language'] == 'en'
+        assert [call['language'] for call in self.model.calls] == [None, 'en', 'en']
+        assert [call['prompt'] for call in self.model.calls] == [None, " done.", " done."]
+        assert Path(result['vtt_path']).read_text(encoding='utf-8').count("-->") == 3
+        assert Path(result['words_path']).exists()
+
+    @pytest.mark.asyncio
+    async def test_empty_stream_fails(self, monkeypatch):
+        """Test that a stream without audio is an error"""
+        processor = self.make_processor(monkeypatch)
+
+        async def chunks():
+            return
+            yield
+
+        with pytest.raises(ProcessingError, match="no samples"):
+            await processor.process_stream(SimpleNamespace(episode_id="ep-1"), chunks())
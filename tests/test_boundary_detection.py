@@ -0,0 +1,92 @@
+"""
+Tests for topic boundary detection
+
+Tests the cosine-kernel change-point detector used by topic segmentation.
+"""
+
+import numpy as np
+import pytest
+
+from src.core.boundary_detection import (
+    KernelChangePointDetector, BoundaryResult, detect_kernel_boundaries
+)
+
+
+def planted_topics(boundaries, n_sentences, dim=64, noise=0.3, seed=0):
+    """Embeddings drawn around one random topic direction per segment"""
+    rng = np.random.default_rng(seed)
+    edges = [0] + list(boundaries) + [n_sentences]
+    rows = []
+    for start, end in zip(edges, edges[1:]):
+        topic = rng.normal(size=dim)
+        rows.append(topic + noise * np.linalg.norm(topic) / np.sqrt(dim) * rng.normal(size=(end - start, dim)))
+    return np.vstack(rows).astype(np.float32)
+
+
+class TestKernelChangePointDetector:
+    """Test the kernel change-point detector and its solution path"""
+
+    def test_cost_matches_direct_scatter(self):
+        """Test that cached cost sums equal the within-segment cosine scatter"""
+        embeddings = planted_topics([10], 30, seed=1)
+        detector = KernelChangePointDetector().fit(embeddings)
+
+        unit = embeddings.astype(np.float64)
+        unit /= np.linalg.norm(unit, axis=1, keepdims=True)
+        for start, end in [(0, 30), (3, 17), (10, 11)]:
+            segment = unit[start:end]
+            expected = ((segment - segment.mean(axis=0)) ** 2).sum()
+            assert detector.cost(start, end) == pytest.approx(expected, abs=1e-9)
+
+    def test_recovers_planted_boundaries(self):
+        """Test that planted topic changes are found exactly"""
+        planted = [40, 95, 130, 210, 260, 330]
+        detector = KernelChangePointDetector().fit(planted_topics(planted, 400))
+
+        assert detector.predict(len(planted) + 1) == planted
+
+    def test_solution_path_is_nested(self):
+        """Test that one path search serves every segment count"""
+        detector = KernelChangePointDetector(refine_passes=0).fit(planted_topics([50, 120, 170], 240, seed=2))
+        penalties = detector.penalty_path()
+
+        assert len(penalties) == len(set(index for index, _ in detector._path))
+        for k in range(2, 10):
+            assert set(detector.predict(k)) <= set(detector.predict(k + 1))
+        assert min(penalties[:3]) > 10 * max(penalties[3:])
+        assert detector.penalty_for(4) == penalties[2]
+
+    def test_min_size_is_respected(self):
+        """Test that no segment is shorter than min_size"""
+        detector = KernelChangePointDetector(min_size=5).fit(planted_topics([20, 40], 60, seed=3))
+        edges = [0] + detector.predict(12) + [60]
+
+        assert {20, 40} <= set(edges)
+        assert min(b - a for a, b in zip(edges, edges[1:])) >= 5
+        assert len(KernelChangePointDetector(min_size=5).fit(planted_topics([], 9)).predict(3)) == 0
+
+
+class TestDetectKernelBoundaries:
+    """Test segment-count selection and engine reporting"""
+
+    def test_segment_count_clamped_and_engine_reported(self):
+        """Test that the segment count follows the target within 6-20"""
+        embeddings = planted_topics([100, 200, 300], 800, seed=4)
+
+        result = detect_kernel_boundaries(embeddings, target_segments=12)
+        assert isinstance(result, BoundaryResult)
+        assert result.engine == "kernel"
+        assert result.segment_count == 12
+        assert result.penalty > 0
+        assert {100, 200, 300} <= set(result.boundaries)
+
+        assert detect_kernel_boundaries(embeddings, target_segments=2).segment_count == 6
+        assert detect_kernel_boundaries(embeddings, target_segments=50).segment_count == 20
+
+    def test_long_episode(self):
+        """Test a 3-hour episode worth of sentences without a pairwise matrix"""
+        planted = list(range(250, 4000, 250))
+        embeddings = planted_topics(planted, 4000, dim=384, seed=5)
+
+        result = detect_kernel_boundaries(embeddings, target_segments=16)
+        assert result.boundaries == planted
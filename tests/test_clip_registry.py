@@ -0,0 +1,143 @@
+"""
+Tests for the clip registry
+
+Tests bulk clip and asset registration, including re-discovery and
+re-rendering of existing clips.
+"""
+
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.core.database import DatabaseManager, DatabaseConfig
+from src.core.registry import EpisodeRegistry
+from src.core.clip_registry import ClipRegistry
+from src.core.models import (
+    EpisodeObject, SourceInfo, MediaInfo, EpisodeMetadata,
+    ClipObject, ClipAsset, ClipStatus
+)
+from src.core.exceptions import ValidationError
+
+
+class TestBulkRegistration:
+    """Test register_clips_bulk and register_assets_bulk"""
+
+    def setup_method(self):
+        """Setup database with one registered episode"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(DatabaseConfig(
+            path=str(self.temp_dir / "test.db"),
+            backup_enabled=False
+        ))
+        self.db_manager.initialize()
+        self.registry = EpisodeRegistry(self.db_manager)
+        self.clip_registry = ClipRegistry(self.db_manager)
+        self.registry.register_episode(EpisodeObject(
+            episode_id="ep-1",
+            content_hash="a" * 64,
+            source=SourceInfo(path="/test/ep-1.mp4", file_size=1000, last_modified=datetime.now()),
+            media=MediaInfo(duration_seconds=600.0),
+            metadata=EpisodeMetadata(show_name="Test Show", show_slug="test-show")
+        ))
+
+    def teardown_method(self):
+        """Cleanup test environment"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def clip(self, clip_id, start_ms=0, end_ms=30000, episode_id="ep-1", title="Clip"):
+        return ClipObject(
+            id=clip_id, episode_id=episode_id, start_ms=start_ms, end_ms=end_ms,
+            duration_ms=end_ms - start_ms, score=0.8, title=title, hashtags=["news"]
+        )
+
+    def asset(self, asset_id, clip_id="clip-1", variant="clean", aspect_ratio="9x16", path=None):
+        return ClipAsset(
+            id=asset_id, clip_id=clip_id, variant=variant, aspect_ratio=aspect_ratio,
+            path=path or f"/out/{clip_id}/{aspect_ratio}_{variant}.mp4", size_bytes=100
+        )
+
+    def test_register_clips_bulk(self):
+        """Test that new clips are inserted in one call"""
+        clips = [self.clip(f"clip-{i}", start_ms=i * 60000, end_ms=i * 60000 + 30000) for i in range(50)]
+
+        assert self.clip_registry.register_clips_bulk(clips) == [True] * 50
+        stored = self.clip_registry.get_clips_for_episode("ep-1")
+        assert [c.id for c in stored] == [c.id for c in clips]
+        assert stored[0].hashtags == ["news"]
+
+    def test_rediscovery_updates_clips(self):
+        """Test upsert semantics: metadata updates keep status, timing changes reset it"""
+        self.clip_registry.register_clips_bulk([self.clip("clip-1"), self.clip("clip-2")])
+        self.clip_registry.update_clip_status("clip-1", ClipStatus.RENDERED)
+        self.clip_registry.update_clip_status("clip-2", ClipStatus.RENDERED)
+
+        result = self.clip_registry.register_clips_bulk([
+            self.clip("clip-1", title="Better title"),
+            self.clip("clip-2", start_ms=1000),
+            self.clip("clip-3")
+        ])
+
+        assert result == [False, False, True]
+        clip_1 = self.clip_registry.get_clip("clip-1")
+        assert clip_1.title == "Better title"
+        assert clip_1.status == ClipStatus.RENDERED
+        clip_2 = self.clip_registry.get_clip("clip-2")
+        assert clip_2.start_ms == 1000
+        assert clip_2.status == ClipStatus.PENDING
+
+    def test_invalid_clip_batch_registers_nothing(self):
+        """Test that validation failures leave the registry unchanged"""
+        with pytest.raises(ValidationError):
+            self.clip_registry.register_clips_bulk([self.clip("clip-1"), self.clip("clip-2", episode_id="missing")])
+        with pytest.raises(ValidationError):
+            self.clip_registry.register_clips_bulk([self.clip("clip-1"), self.clip("clip-1")])
+
+        assert self.clip_registry.get_clips_for_episode("ep-1") == []
+
+    def test_register_assets_bulk_replaces_rerendered_variants(self):
+        """Test that re-rendering a variant replaces its asset instead of duplicating it"""
+        self.clip_registry.register_clips_bulk([self.clip("clip-1")])
+        first = [
+            self.asset(f"asset-{variant}-{ratio}", variant=variant, aspect_ratio=ratio)
+            for variant in ("clean", "subtitled") for ratio in ("9x16", "16x9", "1x1")
+        ]
+        assert self.clip_registry.register_assets_bulk(first) == [True] * 6
+
+        rerendered = [
+            self.asset("asset-new", variant="clean", aspect_ratio="9x16", path="/out/new.mp4"),
+            first[1]
+        ]
+        assert self.clip_registry.register_assets_bulk(rerendered) == [False, False]
+
+        assets = self.clip_registry.get_assets_for_clip("clip-1")
+        assert len(assets) == 6
+        assert self.clip_registry.get_asset("asset-clean-9x16") is None
+        assert self.clip_registry.get_asset("asset-new").path == "/out/new.mp4"
+
+    def test_register_asset_replaces_rerendered_variant(self):
+        """Test that single-asset registration upserts by variant like the bulk path"""
+        self.clip_registry.register_clips_bulk([self.clip("clip-1")])
+        self.clip_registry.register_asset(self.asset("asset-1"))
+        self.clip_registry.register_asset(self.asset("asset-2", path="/out/rerendered.mp4"))
+
+        assets = self.clip_registry.get_assets_for_clip("clip-1")
+        assert [(a.id, a.path) for a in assets] == [("asset-2", "/out/rerendered.mp4")]
+
+    def test_invalid_asset_batch_registers_nothing(self):
+        """Test asset validation against clips and existing asset IDs"""
+        self.clip_registry.register_clips_bulk([self.clip("clip-1"), self.clip("clip-2")])
+        self.clip_registry.register_assets_bulk([self.asset("asset-1")])
+
+        with pytest.raises(ValidationError):
+            self.clip_registry.register_assets_bulk([self.asset("asset-2"), self.asset("asset-3", clip_id="missing")])
+        with pytest.raises(ValidationError):
+            self.clip_registry.register_assets_bulk([self.asset("asset-1", clip_id="clip-2")])
+        with pytest.raises(ValidationError):
+            self.clip_registry.register_assets_bulk([self.asset("asset-2"), self.asset("asset-3")])
+
+        assert [a.id for a in self.clip_registry.get_assets_for_clip("clip-1")] == ["asset-1"]
+        assert self.clip_registry.get_assets_for_clip("clip-2") == []
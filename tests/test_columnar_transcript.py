@@ -0,0 +1,134 @@
+"""
+Tests for the columnar transcript container
+
+Tests construction from Whisper words, zero-copy time slicing, the .npz
+format and the Sentence adapters.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.core.columnar_transcript import ColumnarTranscript
+from src.core.sentence_alignment import SentenceAlignmentEngine
+
+
+def whisper_segments(n_words=600, seed=0):
+    """Whisper-style segments with leading-space words and word probabilities"""
+    rng = np.random.default_rng(seed)
+    vocabulary = [" the", " show", " today", " we", " talk", " about", " housing.", " Yes.", " and", " café"]
+    segments, t = [], 0.0
+    for first in range(0, n_words, 20):
+        words = []
+        for _ in range(min(20, n_words - first)):
+            duration = float(rng.uniform(0.1, 0.6))
+            words.append({'word': vocabulary[int(rng.integers(len(vocabulary)))], 'start': round(t, 3),
+                          'end': round(t + duration, 3), 'probability': float(rng.uniform(0.5, 1.0))})
+            t += duration + float(rng.uniform(0, 0.2))
+        segments.append({'start': words[0]['start'], 'end': words[-1]['end'], 'words': words})
+    return segments
+
+
+class TestColumnarTranscript:
+    """Test columnar storage, slicing and adapters"""
+
+    def setup_method(self):
+        """Setup transcript and output directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.segments = whisper_segments()
+        self.words = [w for s in self.segments for w in s['words']]
+        self.transcript = ColumnarTranscript.from_segments(self.segments)
+
+    def teardown_method(self):
+        """Cleanup output directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_round_trip_to_word_dicts(self):
+        """Test that word dicts survive the columnar representation"""
+        assert len(self.transcript) == 600
+        assert len(self.transcript.vocabulary) == 10
+
+        restored = self.transcript.to_word_dicts()
+        assert [w['word'] for w in restored] == [w['word'] for w in self.words]
+        assert [w['start'] for w in restored] == [w['start'] for w in self.words]
+        np.testing.assert_allclose([w['probability'] for w in restored],
+                                   [w['probability'] for w in self.words], rtol=1e-6)
+        assert self.transcript.word_text(3) == self.words[3]['word']
+
+    def test_slice_time_is_a_view(self):
+        """Test that time slices share memory with the transcript"""
+        start, end = self.words[100]['start'], self.words[200]['start']
+        view = self.transcript.slice_time(start, end)
+
+        assert len(view) == 100
+        assert np.shares_memory(view.starts, self.transcript.starts)
+        assert view.vocab_buffer is self.transcript.vocab_buffer
+        assert view.texts() == [w['word'] for w in self.words[100:200]]
+        assert len(self.transcript.slice_time(end, start)) == 0
+
+    def test_unordered_words_are_sorted(self):
+        """Test that slicing works when chunked transcription emits words out of order"""
+        words = self.words[300:] + self.words[:300]
+        transcript = ColumnarTranscript.from_words(words)
+
+        assert np.all(np.diff(transcript.starts) >= 0)
+        assert transcript.texts() == [w['word'] for w in self.words]
+
+    def test_npz_round_trip(self):
+        """Test the on-disk format, including speakers and sentence spans"""
+        sentences = SentenceAlignmentEngine().align_sentences(words=self.transcript)
+        sentences[0].speaker = "SPEAKER_00"
+        transcript = ColumnarTranscript.from_sentences(sentences)
+
+        path = transcript.save(self.temp_dir / "words" / "ep-1.npz")
+        loaded = ColumnarTranscript.load(path)
+
+        assert loaded.speakers == ["SPEAKER_00"]
+        assert loaded.sentence_count == len(sentences)
+        assert loaded.texts() == transcript.texts()
+        np.testing.assert_array_equal(loaded.ends, transcript.ends)
+        assert path.stat().st_size < 600 * 20
+
+    def test_sentence_adapters(self):
+        """Test that sentences built from the container match direct alignment"""
+        engine = SentenceAlignmentEngine()
+        expected = engine.align_sentences(words=self.words)
+        aligned = engine.align_sentences(words=self.transcript)
+        assert [(s.text, s.start_ms, s.end_ms) for s in aligned] == \
+               [(s.text, s.start_ms, s.end_ms) for s in expected]
+
+        expected[1].speaker = "SPEAKER_01"
+        transcript = ColumnarTranscript.from_sentences(expected)
+        restored = transcript.to_sentences()
+        assert [(s.text, s.start_ms, s.end_ms, s.speaker) for s in restored] == \
+               [(s.text, s.start_ms, s.end_ms, s.speaker) for s in expected]
+        assert restored[0].confidence == pytest.approx(expected[0].confidence, rel=1e-6)
+
+        start_s = expected[3].start_ms / 1000
+        view = transcript.slice_time(start_s, expected[6].start_ms / 1000)
+        assert [s.text for s in view.to_sentences()] == [s.text for s in expected[3:6]]
+
+    def test_sentences_require_spans(self):
+        """Test that sentence conversion needs sentence spans"""
+        with pytest.raises(ValueError):
+            self.transcript.to_sentences()
+
+    def test_clip_discovery_reads_words_file(self):
+        """Test that clip discovery aligns from the stage's .npz and falls back to word dicts"""
+        pytest.importorskip("torch")
+        from src.core.clip_discovery import ClipDiscoveryEngine
+
+        path = self.transcript.save(self.temp_dir / "ep-1.npz")
+        episode = SimpleNamespace(episode_id="ep-1",
+                                  transcription=SimpleNamespace(words=self.words, words_path=str(path)))
+
+        loaded = ClipDiscoveryEngine._load_words(episode)
+        assert isinstance(loaded, ColumnarTranscript)
+        assert loaded.texts() == self.transcript.texts()
+
+        path.unlink()
+        assert ClipDiscoveryEngine._load_words(episode) is self.words
@@ -0,0 +1,410 @@
+"""
+Performance benchmarks and query-plan regression tests for the database
+
+The query-plan tests run on every test run and fail when a hot query stops
+using its index. The benchmarks build synthetic registries and time the
+registry, metadata search and clip operations on them; they are skipped
+unless selected with -m benchmark or DB_BENCH_SIZES is set.
+
+Environment variables:
+    DB_BENCH_SIZES: Comma-separated registry sizes (default "1000"), e.g.
+        "1000,10000,100000"; setting it enables the benchmarks
+    DB_BENCH_TRANSCRIPT_WORDS: Words per synthetic transcript (default 1500)
+    DB_BENCH_OUTPUT: Where to write the results JSON (default
+        output/benchmarks/database-<commit>.json)
+    DB_BENCH_BASELINE: Results JSON of an earlier commit; an operation
+        fails if its median is more than DB_BENCH_TOLERANCE (default 1.5)
+        times slower at the same size
+
+Run only the benchmarks with: pytest -m benchmark tests/test_database_performance.py
+"""
+
+import itertools
+import json
+import os
+import random
+import sqlite3
+import statistics
+import subprocess
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.core.database import DatabaseManager, DatabaseConfig
+from src.core.registry import EpisodeRegistry
+from src.core.metadata_manager import MetadataManager
+from src.core.clip_registry import ClipRegistry
+from src.core.models import (
+    EpisodeObject, ProcessingStage, SourceInfo, MediaInfo, EpisodeMetadata,
+    TranscriptionResult, EnrichmentResult, EditorialContent, ClipObject, ClipStatus
+)
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SIZES = [int(size) for size in os.getenv("DB_BENCH_SIZES", "1000").split(",") if size.strip()]
+TRANSCRIPT_WORDS = int(os.getenv("DB_BENCH_TRANSCRIPT_WORDS", "1500"))
+TOLERANCE = float(os.getenv("DB_BENCH_TOLERANCE", "1.5"))
+
+SHOWS = ["Newsroom", "Forum", "Boom and Bust", "Canadian Justice", "Economic Pulse"]
+GUESTS = [f"Guest {first} {last}" for first in "ABCDEFGHIJ" for last in "KLMNOPQRST"]
+TOPICS = ["climate", "housing", "inflation", "healthcare", "immigration", "energy",
+          "education", "trade", "justice", "technology", "elections", "labour"]
+VOCABULARY = [f"term{i}" for i in range(5000)] + TOPICS
+
+# Zipf-like weights over VOCABULARY
+_CUMULATIVE_WEIGHTS = []
+_total = 0.0
+for _rank in range(len(VOCABULARY)):
+    _total += 1.0 / (_rank + 1)
+    _CUMULATIVE_WEIGHTS.append(_total)
+
+# Per-size results, written to JSON when the module finishes
+_RESULTS = {}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _time_operation(operation, runs: int) -> dict:
+    """Run operation repeatedly and summarize wall-clock times in milliseconds"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'runs': runs,
+        'median_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        'min_ms': round(samples[0], 3)
+    }
+
+
+class SyntheticRegistry:
+    """Registry, metadata index and clips populated with synthetic episodes"""
+
+    def __init__(self, root: Path, size: int, transcript_words: int = TRANSCRIPT_WORDS, seed: int = 42):
+        self.root = root
+        self.size = size
+        self.rng = random.Random(seed)
+        self.transcript_words = transcript_words
+        self.db_manager = DatabaseManager(DatabaseConfig(path=str(root / "bench.db"), backup_enabled=False))
+        self.db_manager.initialize()
+        self.connection = self.db_manager.get_connection()
+        self.registry = EpisodeRegistry(self.db_manager)
+        self.metadata = MetadataManager(self.connection, root / "json")
+        self.clips = ClipRegistry(self.db_manager)
+        self.created = 0
+        self.episode_ids = []
+
+    def close(self):
+        self.db_manager.close()
+
+    def _transcript(self) -> str:
+        # Skewed word frequencies, so common and rare terms both exist
+        return " ".join(self.rng.choices(VOCABULARY, k=self.transcript_words,
+                                         cum_weights=_CUMULATIVE_WEIGHTS))
+
+    def make_episode(self, stage: ProcessingStage = None) -> EpisodeObject:
+        """Create an episode with realistically sized transcription, enrichment and editorial"""
+        index = self.created
+        self.created += 1
+        show = SHOWS[index % len(SHOWS)]
+        guests = self.rng.sample(GUESTS, 2)
+        topics = self.rng.sample(TOPICS, 3)
+        transcript = self._transcript()
+        words = transcript.split()
+        aired = datetime(2015, 1, 1) + timedelta(days=index % 3650)
+        return EpisodeObject(
+            episode_id=f"bench-{index:07d}",
+            content_hash=f"{index:064x}",
+            processing_stage=stage or self.rng.choice(list(ProcessingStage)),
+            source=SourceInfo(path=f"/videos/{show}/bench-{index:07d}.mp4",
+                              file_size=500_000_000 + index, last_modified=aired),
+            media=MediaInfo(duration_seconds=1800.0 + index % 1800, video_codec="h264",
+                            audio_codec="aac", resolution="1920x1080", bitrate=5_000_000),
+            metadata=EpisodeMetadata(show_name=show, show_slug=show.lower().replace(' ', '-'),
+                                     title=f"{show} {' '.join(topics)}", date=aired.date().isoformat()),
+            transcription=TranscriptionResult(
+                text=transcript,
+                vtt_content="WEBVTT\n\n" + "\n".join(
+                    f"00:{i // 60:02d}:{i % 60:02d}.000 --> 00:{i // 60:02d}:{i % 60:02d}.900\n{word}"
+                    for i, word in enumerate(words[:200])
+                ),
+                segments=[{'start': i * 10.0, 'end': i * 10.0 + 9.5, 'text': " ".join(words[i * 25:(i + 1) * 25])}
+                          for i in range(len(words) // 25)],
+                confidence=0.92
+            ),
+            enrichment=EnrichmentResult(
+                summary=" ".join(words[:80]),
+                proficiency_scores={'scored_people': [
+                    {'name': name, 'credibility_score': 0.8, 'expertise_areas': topics} for name in guests
+                ]},
+                show_name=show
+            ),
+            editorial=EditorialContent(key_takeaway=" ".join(words[80:110]),
+                                       summary=" ".join(words[:120]), topic_tags=topics),
+            created_at=aired,
+            updated_at=aired + timedelta(hours=index % 48)
+        )
+
+    def populate(self, batch_size: int = 1000, clip_every: int = 10, clips_per_episode: int = 10):
+        """Register the episodes in bulk, then index them and add clips"""
+        for offset in range(0, self.size, batch_size):
+            batch = [self.make_episode() for _ in range(min(batch_size, self.size - offset))]
+            self.registry.register_episodes_bulk(batch)
+            clips = []
+            for episode in batch:
+                self.metadata.save_episode_json(episode)
+                self.episode_ids.append(episode.episode_id)
+                if len(self.episode_ids) % clip_every == 0:
+                    clips.extend(
+                        ClipObject(id=f"{episode.episode_id}-clip-{n}", episode_id=episode.episode_id,
+                                   start_ms=n * 60_000, end_ms=n * 60_000 + 45_000, duration_ms=45_000,
+                                   score=self.rng.random(), title=f"Clip {n}", hashtags=["news"],
+                                   status=self.rng.choice(list(ClipStatus)))
+                        for n in range(clips_per_episode)
+                    )
+            self.clips.register_clips_bulk(clips)
+        self.registry.event_writer.flush()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def write_results():
+    """Write the benchmark results collected by this module as JSON"""
+    yield
+    if not _RESULTS:
+        return
+    commit = _git_commit()
+    output = Path(os.getenv("DB_BENCH_OUTPUT", PROJECT_ROOT / "output" / "benchmarks" / f"database-{commit}.json"))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(),
+        'sqlite_version': sqlite3.sqlite_version,
+        'transcript_words': TRANSCRIPT_WORDS,
+        'sizes': {str(size): results for size, results in sorted(_RESULTS.items())}
+    }, indent=2))
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    """Results of an earlier run to compare against, if configured"""
+    path = os.getenv("DB_BENCH_BASELINE")
+    if not path:
+        return {}
+    return json.loads(Path(path).read_text()).get('sizes', {})
+
+
+def _benchmarks_requested(config) -> bool:
+    """Benchmarks run when selected by marker or sized through the environment"""
+    return "benchmark" in (config.getoption("markexpr") or "") or bool(os.getenv("DB_BENCH_SIZES"))
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda size: f"{size}-episodes")
+def bench(request, tmp_path_factory):
+    """Synthetic registry of the parametrized size"""
+    if not _benchmarks_requested(request.config):
+        pytest.skip("database benchmarks run with -m benchmark or DB_BENCH_SIZES")
+    registry = SyntheticRegistry(tmp_path_factory.mktemp(f"bench-{request.param}"), request.param)
+    start = time.perf_counter()
+    registry.populate()
+    _RESULTS.setdefault(request.param, {})['populate'] = {
+        'runs': 1, 'median_ms': round((time.perf_counter() - start) * 1000, 3)
+    }
+    yield registry
+    registry.close()
+
+
+def _register_episode(bench):
+    return lambda: bench.registry.register_episode(bench.make_episode(ProcessingStage.DISCOVERED))
+
+
+def _update_episode_data(bench):
+    ids = iter(bench.rng.sample(bench.episode_ids, min(len(bench.episode_ids), 50)))
+
+    def update():
+        episode = bench.registry.get_episode(next(ids))
+        episode.editorial.summary = "Updated summary " + episode.editorial.summary[:200]
+        bench.registry.update_episode_data(episode, parts=('editorial',))
+    return update
+
+
+def _list_episodes(bench):
+    return lambda: bench.registry.list_episodes()
+
+
+def _query_episodes_page(bench):
+    return lambda: bench.registry.query_episodes(stage=ProcessingStage.ENRICHED, show="Forum", limit=50)
+
+
+def _get_episodes_needing_processing(bench):
+    return lambda: bench.registry.get_episodes_needing_processing(ProcessingStage.ENRICHED)
+
+
+def _search_episodes(bench):
+    return lambda: bench.metadata.search_episodes(guest_name="Guest C", topic="housing", limit=50)
+
+
+def _full_text_search(bench):
+    return lambda: bench.metadata.full_text_search("housing AND inflation", limit=20)
+
+
+def _faceted_search(bench):
+    return lambda: bench.metadata.faceted_search("climate", limit=20)
+
+
+def _get_clips_for_episode(bench):
+    episode_ids = itertools.cycle(bench.episode_ids[9::10])
+    return lambda: bench.clips.get_clips_for_episode(next(episode_ids))
+
+
+def _get_clips_by_status(bench):
+    return lambda: bench.clips.get_clips_by_status(ClipStatus.PENDING)
+
+
+# name -> (operation factory, runs)
+OPERATIONS = {
+    'register_episode': (_register_episode, 50),
+    'update_episode_data': (_update_episode_data, 50),
+    'list_episodes': (_list_episodes, 3),
+    'query_episodes_page': (_query_episodes_page, 20),
+    'get_episodes_needing_processing': (_get_episodes_needing_processing, 3),
+    'search_episodes': (_search_episodes, 20),
+    'full_text_search': (_full_text_search, 20),
+    'faceted_search': (_faceted_search, 20),
+    'get_clips_for_episode': (_get_clips_for_episode, 50),
+    'get_clips_by_status': (_get_clips_by_status, 5),
+}
+
+
+@pytest.mark.benchmark
+@pytest.mark.slow
+@pytest.mark.parametrize("operation", list(OPERATIONS))
+def test_benchmark(bench, baseline, operation):
+    """Time a hot operation and compare it with the baseline, if any"""
+    factory, runs = OPERATIONS[operation]
+    result = _time_operation(factory(bench), runs)
+    _RESULTS.setdefault(bench.size, {})[operation] = result
+
+    previous = baseline.get(str(bench.size), {}).get(operation)
+    if previous:
+        # 1 ms of slack keeps sub-millisecond operations from flapping
+        limit = previous['median_ms'] * TOLERANCE + 1.0
+        assert result['median_ms'] <= limit, (
+            f"{operation} at {bench.size} episodes regressed: "
+            f"{result['median_ms']} ms vs {previous['median_ms']} ms baseline"
+        )
+
+
+class TestQueryPlans:
+    """Test that hot queries are answered from indexes rather than table scans"""
+
+    # (name, SQL as issued by the registry and managers, parameters,
+    #  index name or search term the plan must contain)
+    QUERIES = [
+        ("episode by hash", "SELECT id FROM episodes WHERE hash = ?", ("0" * 64,), "(hash=?)"),
+        ("episodes by stage",
+         "SELECT id FROM episodes WHERE stage = ? ORDER BY created_at", ("discovered",),
+         "idx_episodes_stage_created_id"),
+        ("episodes needing processing",
+         "SELECT id FROM episodes WHERE stage IN (?, ?, ?) ORDER BY created_at",
+         ("discovered", "prepped", "transcribed"), "idx_episodes_stage"),
+        ("episode page by update time",
+         "SELECT id FROM episodes WHERE (updated_at, id) < (?, ?) ORDER BY updated_at DESC, id DESC LIMIT 21",
+         ("2024-01-01", "x"), "idx_episodes_updated_id"),
+        ("episode page by show",
+         "SELECT id FROM episodes WHERE json_extract(metadata, '$.metadata.show_name') = ? "
+         "ORDER BY updated_at DESC, id DESC LIMIT 21", ("Forum",), "idx_episodes_show_name"),
+        ("claimable episode",
+         "SELECT id FROM episodes WHERE stage IN (?, ?) AND (lease_expires_at IS NULL OR lease_expires_at < ?) "
+         "ORDER BY created_at LIMIT 1", ("discovered", "prepped", 0), "idx_episodes_stage"),
+        ("episode content part",
+         "SELECT data FROM episode_content WHERE episode_id = ? AND part = 'transcription'", ("x",),
+         "sqlite_autoindex_episode_content_1"),
+        ("processing history",
+         "SELECT * FROM processing_log WHERE episode_id = ? ORDER BY timestamp", ("x",),
+         "idx_processing_log_episode_id"),
+        ("metadata by show and date",
+         "SELECT episode_id FROM json_metadata_index WHERE show_name = ? ORDER BY date DESC", ("Forum",),
+         "idx_json_show_name"),
+        ("metadata by guest",
+         "SELECT episode_id FROM json_metadata_index WHERE episode_id IN "
+         "(SELECT episode_id FROM episode_guest_suffixes WHERE suffix >= ? AND suffix < ?)",
+         ("guest", "guest\U0010ffff"), "idx_episode_guest_suffixes"),
+        ("metadata by topic",
+         "SELECT episode_id FROM json_metadata_index WHERE episode_id IN "
+         "(SELECT episode_id FROM episode_topic_suffixes WHERE suffix >= ? AND suffix < ?)",
+         ("climate", "climate\U0010ffff"), "idx_episode_topic_suffixes"),
+        ("clips for episode",
+         "SELECT * FROM clips WHERE episode_id = ? ORDER BY start_ms", ("x",), "idx_clips_episode_id"),
+        ("clips by status",
+         "SELECT * FROM clips WHERE status = ? ORDER BY score DESC", ("pending",), "idx_clips_status"),
+        ("assets for clip",
+         "SELECT * FROM clip_assets WHERE clip_id = ? ORDER BY variant, aspect_ratio", ("x",),
+         "idx_clip_assets_variant"),
+        ("claimable job",
+         "SELECT job_id FROM job_queue WHERE status = 'queued' AND available_at <= ? "
+         "ORDER BY priority, available_at LIMIT 1", (0,), "idx_job_queue_claim"),
+    ]
+
+    @classmethod
+    def setup_class(cls):
+        """Build a small synthetic registry; plans are checked without ANALYZE statistics"""
+        import tempfile
+        cls.temp_dir = Path(tempfile.mkdtemp())
+        cls.bench = SyntheticRegistry(cls.temp_dir, 200, transcript_words=50)
+        cls.bench.populate(batch_size=100)
+
+    @classmethod
+    def teardown_class(cls):
+        import shutil
+        cls.bench.close()
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+
+    def plan(self, sql, params):
+        rows = self.bench.connection.execute_query(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        return [row[-1] for row in rows]
+
+    @pytest.mark.parametrize("name,sql,params,expected", QUERIES, ids=[query[0] for query in QUERIES])
+    def test_query_uses_index(self, name, sql, params, expected):
+        """Test that the query searches its index and does not scan its table"""
+        details = self.plan(sql, params)
+
+        assert any(detail.startswith("SEARCH") and expected in detail for detail in details), f"{name}: {details}"
+        assert not any(detail.startswith("SCAN") and "USING" not in detail and "VIRTUAL TABLE" not in detail
+                       for detail in details), f"{name}: {details}"
+
+    def test_full_text_search_is_driven_by_fts_index(self):
+        """Test that full-text search starts from the FTS index and probes rows by key"""
+        details = self.plan("""
+            SELECT jmi.episode_id
+            FROM episodes_search
+            JOIN episode_search_content esc ON esc.id = episodes_search.rowid
+            JOIN json_metadata_index jmi ON jmi.episode_id = esc.episode_id
+            WHERE episodes_search MATCH ?
+            ORDER BY episodes_search.rank LIMIT 20
+        """, ("climate",))
+
+        assert "VIRTUAL TABLE" in details[0]
+        assert any("esc USING INTEGER PRIMARY KEY" in detail for detail in details)
+        assert any(detail.startswith("SEARCH jmi USING") for detail in details)
+
+    def test_full_text_search_returns_synthetic_matches(self):
+        """Test that the synthetic registry is searchable end to end"""
+        results = self.bench.metadata.full_text_search("climate", limit=5)
+        facets = self.bench.metadata.faceted_search("climate", limit=5)
+
+        assert results
+        assert facets['total'] >= len(results)
+        assert {facet['value'] for facet in facets['facets']['show']} <= set(SHOWS)
@@ -4,6 +4,7 @@ Tests for database and registry functionality
 Tests the core database operations, episode registry, and deduplication system.
 """
 
+import json
 import pytest
 import tempfile
 import os
@@ -14,7 +15,7 @@ from src.core.database import DatabaseManager, DatabaseConfig
 from src.core.registry import EpisodeRegistry
 from src.core.models import (
     EpisodeObject, ProcessingStage, SourceInfo, MediaInfo, EpisodeMetadata,
-    ContentHasher, create_episode_from_file
+    ContentHasher, create_episode_from_file, TranscriptionResult, EnrichmentResult
 )
 from src.core.exceptions import DatabaseError, ValidationError
 
@@ -259,6 +260,422 @@ class TestEpisodeRegistry:
         assert stats['episodes_by_stage']['discovered'] == 1
         assert stats['episodes_by_stage']['prepped'] == 1
 
+    
+    def test_bulk_registration(self):
+        """Test bulk registration with in-batch duplicates and ID collisions"""
+        existing = self.create_test_episode("show-ep1")
+        self.registry.register_episode(existing)
+        
+        colliding = self.create_test_episode("show-ep1")
+        colliding.content_hash = "b" * 64
+        fresh = self.create_test_episode("show-ep2")
+        fresh.content_hash = "c" * 64
+        repeated = self.create_test_episode("show-ep3")
+        repeated.content_hash = fresh.content_hash
+        
+        results = self.registry.register_episodes_bulk([colliding, fresh, repeated, existing])
+        
+        assert results == [True, True, False, False]
+        assert colliding.episode_id == "show-ep1-1"
+        assert self.registry.get_episode("show-ep1-1").content_hash == "b" * 64
+        assert self.registry.get_episode("show-ep3") is None
+        
+        events = self.registry.get_processing_history("show-ep2")
+        assert [(e.stage, e.status) for e in events] == [("registration", "completed")]
+    
+    def test_bulk_registration_rejects_invalid_batch(self):
+        """Test that an invalid episode prevents the whole batch"""
+        valid = self.create_test_episode("valid")
+        invalid = self.create_test_episode("invalid")
+        invalid.content_hash = "d" * 64
+        invalid.metadata.show_name = ""
+        
+        with pytest.raises(ValidationError):
+            self.registry.register_episodes_bulk([valid, invalid])
+        
+        assert self.registry.get_episode("valid") is None
+
+class TestEpisodeQuery:
+    """Test SQL-side episode listing"""
+    
+    def setup_method(self):
+        """Setup registry with episodes across two shows and stages"""
+        self.temp_dir = tempfile.mkdtemp()
+        config = DatabaseConfig(path=os.path.join(self.temp_dir, "test.db"), backup_enabled=False)
+        self.db_manager = DatabaseManager(config)
+        self.db_manager.initialize()
+        self.registry = EpisodeRegistry(self.db_manager)
+        
+        episodes = []
+        for i in range(7):
+            show = "Show A" if i % 2 == 0 else "Show B"
+            episode = EpisodeObject(
+                episode_id=f"ep-{i}",
+                content_hash=f"{i:064d}",
+                processing_stage=ProcessingStage.TRANSCRIBED if i < 3 else ProcessingStage.DISCOVERED,
+                source=SourceInfo(path=f"/test/ep-{i}.mp4", file_size=1000 + i, last_modified=datetime.now()),
+                media=MediaInfo(duration_seconds=60.0 * i),
+                metadata=EpisodeMetadata(show_name=show, show_slug=show.lower().replace(' ', '-'), title=f"Episode {i}"),
+                transcription=TranscriptionResult(text="word " * 1000, vtt_content="WEBVTT"),
+                enrichment=EnrichmentResult(summary=f"Summary {i}"),
+                created_at=datetime(2024, 1, 1 + i),
+                updated_at=datetime(2024, 2, 1 + (i * 3) % 7)  # Not in creation order
+            )
+            episodes.append(episode)
+        self.registry.register_episodes_bulk(episodes)
+    
+    def teardown_method(self):
+        """Cleanup test registry"""
+        self.db_manager.close()
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_cursor_pages_cover_every_episode_once(self):
+        """Test keyset pagination walks the listing in order without gaps"""
+        seen = []
+        cursor = None
+        while True:
+            page = self.registry.query_episodes(limit=3, cursor=cursor)
+            seen.extend(page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        
+        updated = [summary.updated_at for summary in seen]
+        assert len(seen) == 7
+        assert len({summary.episode_id for summary in seen}) == 7
+        assert updated == sorted(updated, reverse=True)
+    
+    def test_filters_are_combined(self):
+        """Test stage, show and creation date filters"""
+        page = self.registry.query_episodes(
+            stage=ProcessingStage.DISCOVERED,
+            show="Show A",
+            created_after=datetime(2024, 1, 5),
+            order_by='created_at',
+            descending=False
+        )
+        
+        assert [summary.episode_id for summary in page.items] == ["ep-4", "ep-6"]
+        assert page.next_cursor is None
+    
+    def test_summary_is_a_projection(self):
+        """Test that summaries carry metadata and the enrichment summary only"""
+        summary = self.registry.query_episodes(show="Show B", limit=1).items[0]
+        
+        assert summary.get_show_name() == "Show B"
+        assert summary.get_title() == summary.metadata.title
+        assert summary.summary.startswith("Summary")
+        assert not hasattr(summary, 'transcription')
+    
+    def test_show_filter_uses_index(self):
+        """Test that the show filter is answered from an index"""
+        conn = self.db_manager.get_connection().get_connection()
+        plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM episodes "
+            "WHERE json_extract(metadata, '$.metadata.show_name') = ?", ("Show A",)
+        ))
+        
+        assert "idx_episodes_show_name" in plan
+    
+    def test_scans_defer_large_fields(self):
+        """Test that listed episodes decode transcription only on access"""
+        episodes = self.registry.list_episodes()
+        episode = next(e for e in episodes if e.episode_id == "ep-2")
+        
+        assert not episode.is_loaded('transcription')
+        assert episode.processing_stage == ProcessingStage.TRANSCRIBED
+        assert episode.transcription.text.startswith("word word")
+        assert episode.is_loaded('transcription')
+        assert episode.enrichment.summary == "Summary 2"
+    
+    def test_included_fields_are_read_with_the_scan(self):
+        """Test that requested fields come from the scan query, not per-episode queries"""
+        episodes = self.registry.get_episodes_by_stage(ProcessingStage.TRANSCRIBED, include=['enrichment'])
+        
+        # Later changes are not visible to fields read with the scan
+        updated = self.registry.get_episode("ep-0")
+        updated.enrichment.summary = "Changed"
+        updated.transcription.text = "changed"
+        self.registry.update_episode_data(updated)
+        
+        episode = next(e for e in episodes if e.episode_id == "ep-0")
+        assert episode.enrichment.summary == "Summary 0"
+        assert episode.transcription.text == "changed"
+    
+    def test_update_keeps_unloaded_fields(self):
+        """Test that saving an episode whose fields were never read keeps them"""
+        episode = self.registry.get_episodes_by_stage(ProcessingStage.TRANSCRIBED)[0]
+        episode.errors = "retry"
+        self.registry.update_episode_data(episode)
+        
+        stored = self.registry.get_episode(episode.episode_id)
+        assert stored.errors == "retry"
+        assert stored.transcription.vtt_content == "WEBVTT"
+    
+    def test_invalid_cursor_is_rejected(self):
+        """Test that a malformed cursor raises ValidationError"""
+        with pytest.raises(ValidationError):
+            self.registry.query_episodes(cursor="not-a-cursor")
+
+
+class TestEpisodeContent:
+    """Test content parts stored apart from the episode row"""
+
+    def setup_method(self):
+        """Setup database path"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = DatabaseConfig(path=os.path.join(self.temp_dir, "test.db"), backup_enabled=False)
+        self.db_manager = None
+
+    def teardown_method(self):
+        """Cleanup test database"""
+        if self.db_manager:
+            self.db_manager.close()
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_registry(self):
+        self.db_manager = DatabaseManager(self.config)
+        self.db_manager.initialize()
+        return EpisodeRegistry(self.db_manager)
+
+    def make_episode(self):
+        return EpisodeObject(
+            episode_id="ep-1",
+            content_hash="a" * 64,
+            source=SourceInfo(path="/test/ep-1.mp4", file_size=1000, last_modified=datetime.now()),
+            media=MediaInfo(duration_seconds=60.0, video_codec="h264"),
+            metadata=EpisodeMetadata(show_name="Test Show", show_slug="test-show"),
+            transcription=TranscriptionResult(text="hello", vtt_content="WEBVTT")
+        )
+
+    def test_stage_writes_only_its_part(self):
+        """Test that a partial update bumps only the written part's version"""
+        registry = self.create_registry()
+        registry.register_episode(self.make_episode())
+        assert registry.get_content_versions("ep-1") == {'transcription': 1, 'media': 1}
+
+        episode = registry.get_episode("ep-1")
+        episode.enrichment = EnrichmentResult(summary="Summary")
+        episode.update_stage(ProcessingStage.ENRICHED)
+        registry.update_episode_data(episode, parts=['enrichment'])
+
+        assert registry.get_content_versions("ep-1") == {'transcription': 1, 'media': 1, 'enrichment': 1}
+        stored = registry.get_episode("ep-1")
+        assert stored.processing_stage == ProcessingStage.ENRICHED
+        assert stored.enrichment.summary == "Summary"
+        assert stored.transcription.text == "hello"
+        assert stored.media.video_codec == "h264"
+
+        row = registry.connection.execute_query("SELECT metadata FROM episodes WHERE id = 'ep-1'").fetchone()
+        assert 'transcription' not in json.loads(row[0])
+
+    def test_migration_moves_existing_blobs(self):
+        """Test that rows written before the split keep their content and timestamps"""
+        from src.core.database import DatabaseConnection, DatabaseMigration
+
+        connection = DatabaseConnection(self.config.path, self.config)
+        DatabaseMigration(connection).migrate(target_version=9)
+        episode = self.make_episode()
+        episode.enrichment = EnrichmentResult(summary="Legacy summary")
+        with connection.transaction() as conn:
+            conn.execute("""
+                INSERT INTO episodes (id, hash, stage, source_path, metadata, file_size,
+                                      duration_seconds, last_modified, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, ("ep-1", episode.content_hash, "transcribed", episode.source.path,
+                  json.dumps(episode.to_dict()), 1000, 60.0, datetime.now().isoformat(),
+                  "2024-01-01T00:00:00", "2024-01-02T00:00:00"))
+        connection.close_connection()
+
+        registry = self.create_registry()
+
+        stored = registry.get_episode("ep-1")
+        assert stored.transcription.text == "hello"
+        assert stored.media.video_codec == "h264"
+        assert stored.updated_at == datetime(2024, 1, 2)
+        assert registry.query_episodes().items[0].summary == "Legacy summary"
+        row = registry.connection.execute_query("SELECT metadata FROM episodes WHERE id = 'ep-1'").fetchone()
+        assert set(json.loads(row[0])) & set(EpisodeObject.LAZY_FIELDS + ('media',)) == set()
+
+
+class TestConnectionPool:
+    """Test the writer/reader connection pool"""
+
+    def setup_method(self):
+        """Setup database with a small reader pool"""
+        self.temp_dir = tempfile.mkdtemp()
+        config = DatabaseConfig(
+            path=os.path.join(self.temp_dir, "test.db"),
+            backup_enabled=False,
+            max_connections=3,
+            connection_timeout=1,
+            idle_timeout_seconds=0.2
+        )
+        self.db_manager = DatabaseManager(config)
+        self.db_manager.initialize()
+        self.connection = self.db_manager.get_connection()
+
+    def teardown_method(self):
+        """Cleanup test database"""
+        self.db_manager.close()
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def count_log_rows(self):
+        return self.connection.execute_query("SELECT COUNT(*) FROM backup_log").fetchone()[0]
+
+    def test_reads_do_not_wait_for_open_transaction(self):
+        """Test that other threads read the last committed state while a write is open"""
+        import threading
+
+        counts = []
+        with self.connection.transaction() as conn:
+            conn.execute("INSERT INTO backup_log (backup_path, backup_size) VALUES ('a', 1)")
+            assert self.count_log_rows() == 1  # The writing thread sees its own changes
+
+            reader = threading.Thread(target=lambda: counts.append(self.count_log_rows()))
+            reader.start()
+            reader.join(timeout=5)
+
+        assert counts == [0]
+        assert self.count_log_rows() == 1
+
+    def test_thread_churn_reuses_readers(self):
+        """Test that short-lived threads return readers instead of exhausting the pool"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        for _ in range(5):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda _: self.count_log_rows(), range(40)))
+
+        stats = self.connection.get_pool_stats()
+        assert stats['readers_open'] <= stats['max_readers'] == 2
+        assert stats['readers_in_use'] == 0
+        assert stats['reader_checkouts'] >= 200
+
+    def test_exhausted_pool_times_out(self):
+        """Test that checkout waits for a reader and then gives up"""
+        with self.connection.reader(), self.connection.reader():
+            with pytest.raises(DatabaseError):
+                with self.connection.reader():
+                    pass
+
+        assert self.connection.get_pool_stats()['reader_timeouts'] == 1
+
+    def test_idle_readers_are_closed(self):
+        """Test that readers unused past the idle timeout are closed"""
+        import time
+
+        with self.connection.reader(), self.connection.reader():
+            pass
+        assert self.connection.get_pool_stats()['readers_open'] == 2
+
+        time.sleep(0.3)
+        self.count_log_rows()
+
+        stats = self.connection.get_pool_stats()
+        assert stats['readers_open'] == 1
+        assert stats['readers_closed_idle'] == 1
+
+
+class TestDatabaseBackup:
+    """Test online paged backups, verification and retention"""
+
+    def setup_method(self):
+        """Setup database with some log rows"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "test.db")
+        self.config = DatabaseConfig(
+            path=self.db_path,
+            backup_enabled=False,
+            backup_pages_per_step=2,
+            backup_step_sleep_ms=1
+        )
+        self.db_manager = DatabaseManager(self.config)
+        self.db_manager.initialize()
+        self.connection = self.db_manager.get_connection()
+        self.connection.execute_many(
+            "INSERT INTO backup_log (backup_path, backup_size) VALUES (?, ?)",
+            [(f"row-{i}" * 50, i) for i in range(500)]
+        )
+
+    def teardown_method(self):
+        """Cleanup test database"""
+        self.db_manager.close()
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_writes_proceed_during_backup(self):
+        """Test that a paged backup lets writes through between steps"""
+        import sqlite3
+        import threading
+
+        written = []
+
+        def progress(remaining, total):
+            # Runs between steps while the writer is free
+            if not written:
+                thread = threading.Thread(target=lambda: written.append(self.connection.execute_query(
+                    "INSERT INTO backup_log (backup_path, backup_size) VALUES ('during', 1)"
+                ).lastrowid))
+                thread.start()
+                thread.join(timeout=5)
+
+        target = sqlite3.connect(os.path.join(self.temp_dir, "copy.db"))
+        self.connection.backup(target, pages=2, step_sleep=0.001, progress=progress)
+
+        assert len(written) == 1
+        # The write went through the backup's connection, so the copy includes it
+        assert target.execute("SELECT COUNT(*) FROM backup_log WHERE backup_path = 'during'").fetchone()[0] == 1
+        target.close()
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_backup_is_verified_and_restorable(self, compress):
+        """Test that backups record page checksums and restore, compressed or not"""
+        backup_path = self.db_manager.backup_database(os.path.join(self.temp_dir, "b_backup_1.db"), compress=compress)
+
+        assert backup_path.endswith(".db.gz" if compress else ".db")
+        assert self.db_manager.verify_backup(backup_path)
+
+        self.connection.execute_query("DELETE FROM backup_log WHERE backup_size < 100")
+        self.db_manager.restore_database(backup_path)
+
+        count = self.db_manager.get_connection().execute_query(
+            "SELECT COUNT(*) FROM backup_log WHERE backup_size < 100"
+        ).fetchone()[0]
+        assert count == 100
+
+    def test_corrupted_backup_fails_verification(self):
+        """Test that a changed page is detected"""
+        backup_path = self.db_manager.backup_database(os.path.join(self.temp_dir, "b_backup_1.db"))
+
+        with open(backup_path, "r+b") as f:
+            f.seek(4096 * 3 + 100)
+            f.write(b"corrupt")
+
+        assert not self.db_manager.verify_backup(backup_path)
+
+    def test_retention_is_size_aware(self):
+        """Test that the oldest backups are deleted to fit the size budget"""
+        import time
+        from unittest.mock import MagicMock
+        from src.core.pipeline import PipelineOrchestrator
+
+        paths = []
+        for i in range(4):
+            path = Path(self.temp_dir) / f"test_backup_{i}.db"
+            path.write_bytes(b"x" * 400 * 1024)
+            os.utime(path, (time.time() - 3600 * (4 - i),) * 2)
+            paths.append(path)
+
+        orchestrator = MagicMock()
+        orchestrator.config.database.path = self.db_path
+        PipelineOrchestrator._cleanup_old_backups(orchestrator, keep_days=7, max_total_mb=1)
+
+        assert [p.exists() for p in paths] == [False, False, True, True]
+
 
 class TestHashCollisionDetection:
     """Test hash collision detection and resolution"""
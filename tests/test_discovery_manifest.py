@@ -0,0 +1,172 @@
+"""
+Tests for the discovery manifest
+
+Tests that unchanged files are not rehashed and that fast-mode fingerprints
+are replaced by full hashes.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.core.database import DatabaseManager, DatabaseConfig
+from src.core.registry import EpisodeRegistry
+from src.core.discovery_manifest import DiscoveryManifest, compute_fingerprint
+from src.core.models import EpisodeObject, SourceInfo, MediaInfo, EpisodeMetadata
+
+
+class TestDiscoveryManifest:
+    """Test manifest hashing decisions"""
+
+    def setup_method(self):
+        """Setup database and a video file"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(DatabaseConfig(
+            path=str(self.temp_dir / "test.db"),
+            backup_enabled=False
+        ))
+        self.db_manager.initialize()
+        self.manifest = DiscoveryManifest(self.db_manager)
+        self.registry = EpisodeRegistry(self.db_manager)
+
+        self.video = self.temp_dir / "episode.mp4"
+        self.video.write_bytes(os.urandom(4096))
+
+    def teardown_method(self):
+        """Cleanup database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_unchanged_file_is_not_rehashed(self):
+        """Test that a second scan reuses the stored hash"""
+        first = self.manifest.resolve(self.video)
+
+        with patch('src.core.discovery_manifest.compute_full_hash') as full_hash:
+            second = self.manifest.resolve(self.video)
+
+        full_hash.assert_not_called()
+        assert second.content_hash == first.content_hash
+        assert first.full_hash == hashlib.sha256(self.video.read_bytes()).hexdigest()
+
+    def test_changed_file_is_rehashed(self):
+        """Test that a modified file gets a new hash"""
+        first = self.manifest.resolve(self.video)
+
+        self.video.write_bytes(os.urandom(8192))
+        second = self.manifest.resolve(self.video)
+
+        assert second.content_hash != first.content_hash
+        assert second.file_size == 8192
+
+    def test_fast_mode_records_fingerprint_only(self):
+        """Test that fast mode defers the full hash"""
+        entry = self.manifest.resolve(self.video, fast=True)
+
+        assert entry.full_hash is None
+        assert entry.content_hash == compute_fingerprint(self.video)
+        assert [e.path for e in self.manifest.pending_full_hashes()] == [entry.path]
+
+    def test_background_completion_moves_episode_to_full_hash(self):
+        """Test that completing full hashes updates episodes registered by fingerprint"""
+        entry = self.manifest.resolve(self.video, fast=True)
+        self.registry.register_episode(EpisodeObject(
+            episode_id="ep-1",
+            content_hash=entry.content_hash,
+            source=SourceInfo(path=str(self.video), file_size=4096, last_modified=datetime.now()),
+            media=MediaInfo(duration_seconds=60.0),
+            metadata=EpisodeMetadata(show_name="Test Show", show_slug="test-show")
+        ))
+
+        assert self.manifest.complete_full_hashes(self.registry) == 1
+
+        full_hash = hashlib.sha256(self.video.read_bytes()).hexdigest()
+        assert self.registry.get_episode("ep-1").content_hash == full_hash
+        assert self.manifest.pending_full_hashes() == []
+
+    def test_deleted_file_is_dropped_from_pending(self):
+        """Test that files removed before completion are forgotten"""
+        self.manifest.resolve(self.video, fast=True)
+        self.video.unlink()
+
+        assert self.manifest.complete_full_hashes(self.registry) == 0
+        assert self.manifest.get(self.video) is None
+
+
+class TestOrchestratorDiscovery:
+    """Test discovery through the orchestrator"""
+
+    def setup_method(self):
+        """Setup orchestrator with one source directory"""
+        from src.core.pipeline import PipelineOrchestrator
+        from src.core.config import PipelineConfig, SourceConfig
+
+        self.temp_dir = Path(tempfile.mkdtemp())
+        source_dir = self.temp_dir / "videos" / "TestShow"
+        source_dir.mkdir(parents=True)
+        for i in range(3):
+            (source_dir / f"EP{100 + i}.mp4").write_bytes(os.urandom(2048))
+
+        config = PipelineConfig(sources=[SourceConfig(path=str(source_dir), include=["*.mp4"])])
+        config.database.path = str(self.temp_dir / "pipeline.db")
+        config.database.backup_enabled = False
+        self.orchestrator = PipelineOrchestrator(config=config)
+
+    def teardown_method(self):
+        """Cleanup"""
+        if self.orchestrator.db_manager:
+            self.orchestrator.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @pytest.mark.asyncio
+    async def test_rediscovery_hashes_nothing(self):
+        """Test that a rescan of an unchanged archive reads no file contents"""
+        with patch.object(self.orchestrator, '_get_video_duration', return_value=60.0):
+            first = await self.orchestrator.discover_episodes()
+
+            with patch('src.core.discovery_manifest.compute_full_hash') as full_hash, \
+                 patch('src.core.discovery_manifest.compute_fingerprint') as fingerprint:
+                second = await self.orchestrator.discover_episodes()
+
+        assert len(first) == 3
+        assert sorted(e.episode_id for e in second) == sorted(e.episode_id for e in first)
+        full_hash.assert_not_called()
+        fingerprint.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_fast_mode_upgrades_to_full_hash(self):
+        """Test that fast discovery registers fingerprints and later full hashes"""
+        self.orchestrator.config.discovery.hash_mode = 'fast'
+
+        with patch.object(self.orchestrator, '_get_video_duration', return_value=60.0):
+            episodes = await self.orchestrator.discover_episodes()
+        await self.orchestrator._full_hash_task
+
+        registry = self.orchestrator.get_registry()
+        for episode in episodes:
+            path = Path(episode.source.path)
+            if not path.is_absolute():
+                path = Path(__file__).parent.parent / path
+            stored = registry.get_episode(episode.episode_id)
+            assert stored.content_hash == hashlib.sha256(path.read_bytes()).hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_new_files_are_registered_in_one_transaction(self):
+        """Test that discovery bulk-registers new files and folds duplicate content"""
+        source_dir = Path(self.orchestrator.config.sources[0].path)
+        shutil.copy(source_dir / "EP100.mp4", source_dir / "EP100-copy.mp4")
+        registry = self.orchestrator.get_registry()
+
+        with patch.object(self.orchestrator, '_get_video_duration', return_value=60.0), \
+             patch.object(registry, 'register_episode') as register_one:
+            episodes = await self.orchestrator.discover_episodes()
+
+        register_one.assert_not_called()
+        assert len(episodes) == 4
+        assert len({e.episode_id for e in episodes}) == 3
+        assert registry.get_registry_stats()['total_episodes'] == 3
@@ -0,0 +1,239 @@
+"""
+Tests for the incremental discovery watcher
+
+Tests change detection with both backends, stability gating and serving
+discovery from the watcher's in-memory view.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.core.config import SourceConfig
+from src.core.discovery_watcher import DiscoveryWatcher, PollingBackend, InotifyBackend
+
+
+def wait_until(predicate, timeout=5.0):
+    """Poll predicate until it is true or the timeout passes"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+def age(path: Path, seconds: float = 3600) -> None:
+    """Backdate a file's mtime so it counts as stable"""
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+
+
+class FakeEpisode:
+    def __init__(self, path):
+        self.episode_id = path.stem
+        self.path = path
+
+
+class TestPollingBackend:
+    """Test the stat-diff polling fallback"""
+
+    def setup_method(self):
+        """Create source directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def teardown_method(self):
+        """Cleanup source directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_reports_new_changed_and_removed_files(self):
+        """Test that a rescan diffs sizes and mtimes against the last snapshot"""
+        kept = self.temp_dir / "kept.mp4"
+        changed = self.temp_dir / "sub" / "changed.mp4"
+        removed = self.temp_dir / "removed.mp4"
+        changed.parent.mkdir()
+        for path in (kept, changed, removed):
+            path.write_bytes(b"x")
+
+        backend = PollingBackend([str(self.temp_dir)], interval_seconds=0)
+        assert sorted(backend.start()) == sorted(str(p) for p in (kept, changed, removed))
+
+        changed.write_bytes(b"xx")
+        removed.unlink()
+        added = self.temp_dir / "added.mp4"
+        added.write_bytes(b"x")
+
+        assert backend.poll(0) == ({str(changed), str(added)}, {str(removed)})
+
+
+class TestDiscoveryWatcher:
+    """Test registration of stable files"""
+
+    def setup_method(self):
+        """Create source directory with one old video"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.existing = self.temp_dir / "EP100.mp4"
+        self.existing.write_bytes(b"old")
+        age(self.existing)
+        (self.temp_dir / "notes.txt").write_bytes(b"ignored")
+        self.registered = []
+        self.watcher = None
+
+    def teardown_method(self):
+        """Stop watcher and cleanup"""
+        if self.watcher:
+            self.watcher.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def register(self, paths):
+        self.registered.extend(paths)
+        return [FakeEpisode(path) for path in paths]
+
+    def start(self, backend, stability_seconds=0.3):
+        self.watcher = DiscoveryWatcher(
+            sources=[SourceConfig(path=str(self.temp_dir), include=["*.mp4"])],
+            register=self.register,
+            stability_seconds=stability_seconds,
+            backend=backend,
+            poll_interval_seconds=0.05,
+            tick_seconds=0.05
+        )
+        self.watcher.start()
+        assert self.watcher.wait_ready(5)
+
+    def episode_ids(self):
+        return sorted(e.episode_id for e in self.watcher.get_episodes())
+
+    def test_existing_stable_files_are_registered_on_start(self):
+        """Test that the initial scan registers old matching files only"""
+        self.start("poll")
+
+        assert self.episode_ids() == ["EP100"]
+        assert self.registered == [self.existing]
+
+    @pytest.mark.parametrize("backend", ["poll", "inotify"])
+    def test_new_file_is_registered_once_stable(self, backend):
+        """Test that a new file is registered after the stability window"""
+        if backend == "inotify" and not sys.platform.startswith("linux"):
+            pytest.skip("inotify is Linux only")
+        self.start(backend)
+
+        new_dir = self.temp_dir / "incoming"
+        new_dir.mkdir()
+        (new_dir / "EP101.mp4").write_bytes(b"new")
+
+        assert wait_until(lambda: self.episode_ids() == ["EP100", "EP101"])
+        assert self.registered.count(new_dir / "EP101.mp4") == 1
+
+    @pytest.mark.parametrize("backend", ["poll", "inotify"])
+    def test_deleted_file_leaves_view(self, backend):
+        """Test that deleting a registered file removes it from the view"""
+        if backend == "inotify" and not sys.platform.startswith("linux"):
+            pytest.skip("inotify is Linux only")
+        self.start(backend)
+
+        self.existing.unlink()
+
+        assert wait_until(lambda: self.episode_ids() == [])
+
+    def test_file_still_changing_is_not_registered(self):
+        """Test that a recently modified file waits for the stability window"""
+        self.start("poll", stability_seconds=60)
+
+        (self.temp_dir / "EP102.mp4").write_bytes(b"copying")
+        time.sleep(0.3)
+
+        assert self.episode_ids() == ["EP100"]
+        assert self.watcher.get_stats()['pending'] == 1
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+    def test_inotify_watches_new_subdirectories(self):
+        """Test that directories created after start are watched"""
+        self.start("inotify")
+        backend = self.watcher._backends[0]
+        assert isinstance(backend, InotifyBackend)
+
+        (self.temp_dir / "a" / "b").mkdir(parents=True)
+
+        assert wait_until(lambda: backend.watch_count == 3)
+
+
+class TestOrchestratorWatcher:
+    """Test discovery served by the orchestrator's watcher"""
+
+    def setup_method(self):
+        """Setup orchestrator with one source directory"""
+        from src.core.pipeline import PipelineOrchestrator
+        from src.core.config import PipelineConfig
+
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source_dir = self.temp_dir / "videos" / "TestShow"
+        self.source_dir.mkdir(parents=True)
+        for i in range(2):
+            video = self.source_dir / f"EP{100 + i}.mp4"
+            video.write_bytes(os.urandom(2048))
+            age(video)
+
+        config = PipelineConfig(sources=[SourceConfig(path=str(self.source_dir), include=["*.mp4"])])
+        config.database.path = str(self.temp_dir / "pipeline.db")
+        config.database.backup_enabled = False
+        config.discovery.watch_backend = "poll"
+        self.orchestrator = PipelineOrchestrator(config=config)
+
+    def teardown_method(self):
+        """Cleanup"""
+        self.orchestrator.stop_discovery_watcher()
+        if self.orchestrator.db_manager:
+            self.orchestrator.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @pytest.mark.asyncio
+    async def test_discover_returns_watcher_view_without_scanning(self):
+        """Test that discovery answers from the watcher instead of walking sources"""
+        with patch.object(self.orchestrator, '_get_video_duration', return_value=60.0):
+            watcher = self.orchestrator.start_discovery_watcher()
+            assert watcher.wait_ready(10)
+
+            with patch.object(self.orchestrator, '_resolve_file_hashes') as resolve:
+                episodes = await self.orchestrator.discover_episodes()
+
+        resolve.assert_not_called()
+        assert len(episodes) == 2
+        registry = self.orchestrator.get_registry()
+        for episode in episodes:
+            assert registry.get_episode(episode.episode_id) is not None
+
+    def test_fast_mode_watcher_fingerprints_new_files(self):
+        """Test that watcher registrations honour hash_mode 'fast'"""
+        self.orchestrator.config.discovery.hash_mode = 'fast'
+
+        with patch.object(self.orchestrator, '_get_video_duration', return_value=60.0), \
+             patch.object(self.orchestrator, '_start_full_hash_thread') as start_full_hash, \
+             patch('src.core.discovery_manifest.compute_full_hash') as full_hash:
+            watcher = self.orchestrator.start_discovery_watcher()
+            assert watcher.wait_ready(10)
+
+        full_hash.assert_not_called()
+        start_full_hash.assert_called()
+        assert len(watcher.get_episodes()) == 2
+
+    @pytest.mark.asyncio
+    async def test_watcher_start_skips_files_in_manifest(self):
+        """Test that seeding the watcher reads no file already hashed by a scan"""
+        with patch.object(self.orchestrator, '_get_video_duration', return_value=60.0):
+            scanned = await self.orchestrator.discover_episodes()
+
+            with patch('src.core.discovery_manifest.compute_full_hash') as full_hash, \
+                 patch('src.core.discovery_manifest.compute_fingerprint') as fingerprint:
+                watcher = self.orchestrator.start_discovery_watcher()
+                assert watcher.wait_ready(10)
+
+        full_hash.assert_not_called()
+        fingerprint.assert_not_called()
+        assert sorted(e.episode_id for e in watcher.get_episodes()) == sorted(e.episode_id for e in scanned)
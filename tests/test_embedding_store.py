@@ -0,0 +1,100 @@
+"""
+Tests for the content-addressed sentence embedding store
+
+Tests key normalization, incremental embedding, shard roll-over and sharing
+one store directory between store instances.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.core.embedding_store import EmbeddingStore, get_embedding_store
+
+
+class CountingEncoder:
+    """Deterministic fake encoder that records what it was asked to embed"""
+
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return np.array([
+            np.random.default_rng(sum(map(ord, text))).normal(size=self.dim) for text in texts
+        ], dtype=np.float32)
+
+
+class TestEmbeddingStore:
+    """Test embedding lookups and appends"""
+
+    def setup_method(self):
+        """Setup store directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.store = EmbeddingStore(self.temp_dir / "embeddings", shard_rows=4)
+        self.encode = CountingEncoder()
+
+    def teardown_method(self):
+        """Cleanup store directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_key_normalizes_text_and_includes_model(self):
+        """Test that whitespace and Unicode form do not change the key but the model does"""
+        key = EmbeddingStore.compute_key("bge-small-en", "Café  opens\n today ")
+
+        assert EmbeddingStore.compute_key("bge-small-en", "Café opens today") == key
+        assert EmbeddingStore.compute_key("all-MiniLM-L6-v2", "Café opens today") != key
+
+    def test_only_unseen_sentences_are_encoded(self):
+        """Test that a transcript correction re-embeds only the changed sentence"""
+        original = ["Welcome back.", "Our guest is here.", "Yeah.", "Yeah.", "Let's begin."]
+        first = self.store.embed("model", original, self.encode)
+
+        corrected = list(original)
+        corrected[1] = "Our guests are here."
+        second = self.store.embed("model", corrected, self.encode)
+
+        assert self.encode.calls == [
+            ["Welcome back.", "Our guest is here.", "Yeah.", "Let's begin."],
+            ["Our guests are here."]
+        ]
+        assert first.dtype == np.float32 and first.shape == (5, 8)
+        assert np.array_equal(first[2], first[3])
+        assert np.array_equal(np.delete(first, 1, axis=0), np.delete(second, 1, axis=0))
+        np.testing.assert_allclose(second[1], self.encode(["Our guests are here."])[0], rtol=1e-3, atol=1e-3)
+
+    def test_vectors_span_shards(self):
+        """Test that appends roll over into new fixed-size shards"""
+        texts = [f"Sentence number {i}." for i in range(10)]
+        expected = self.store.embed("model", texts, self.encode)
+        self.store.embed("other-model", texts[:3], CountingEncoder(dim=16))
+
+        vectors, hits = self.store.get_many("model", list(reversed(texts)))
+        assert hits == 10
+        assert all(v.dtype == np.float16 for v in vectors)
+        np.testing.assert_array_equal(np.vstack(vectors[::-1]).astype(np.float32), expected)
+
+        stats = self.store.get_stats()
+        assert stats["model"] == {'dim': 8, 'shards': 3, 'vectors': 10, 'size_bytes': 3 * 4 * 8 * 2}
+        assert stats["other-model"]["vectors"] == 3
+        assert len(list((self.temp_dir / "embeddings" / "shards").glob("*.npy"))) == 4
+
+    def test_store_shared_between_instances(self):
+        """Test that a second process-level instance sees vectors stored by the first"""
+        self.store.embed("model", ["Shared sentence."], self.encode)
+
+        other = EmbeddingStore(self.temp_dir / "embeddings", shard_rows=4)
+        other.embed("model", ["Shared sentence.", "New sentence."], self.encode)
+
+        assert self.encode.calls == [["Shared sentence."], ["New sentence."]]
+        assert other.put_many("model", ["Shared sentence."], np.ones((1, 8))) == 0
+        assert get_embedding_store(self.temp_dir / "embeddings") is get_embedding_store(self.temp_dir / "embeddings")
+
+    def test_put_many_rejects_mismatched_vectors(self):
+        """Test that vectors must line up with texts"""
+        with pytest.raises(ValueError):
+            self.store.put_many("model", ["One.", "Two."], np.ones((1, 8)))
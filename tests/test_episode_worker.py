@@ -0,0 +1,240 @@
+"""
+Tests for multi-node episode workers
+
+Tests registry leases and several worker processes draining one database.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import pytest
+
+from src.core.database import DatabaseManager, DatabaseConfig
+from src.core.registry import EpisodeRegistry
+from src.core.models import (
+    EpisodeObject, ProcessingStage, SourceInfo, MediaInfo, EpisodeMetadata, ContentHasher
+)
+
+
+def create_test_episode(episode_id: str) -> EpisodeObject:
+    """Create a test episode object"""
+    source = SourceInfo(
+        path=f"/test/{episode_id}.mp4",
+        file_size=1000000,
+        last_modified=datetime.now()
+    )
+    media = MediaInfo(duration_seconds=3600.0)
+    metadata = EpisodeMetadata(show_name="Test Show", show_slug="test-show")
+
+    return EpisodeObject(
+        episode_id=episode_id,
+        content_hash=ContentHasher.calculate_metadata_hash(source, media),
+        source=source,
+        media=media,
+        metadata=metadata
+    )
+
+
+def build_orchestrator(db_path: str, fail_episode: str = None):
+    """Orchestrator on db_path with fast fake stage processors"""
+    from src.core.pipeline import PipelineOrchestrator
+    from src.core.config import PipelineConfig
+
+    config = PipelineConfig()
+    config.database.path = db_path
+    config.database.backup_enabled = False
+    config.clip_generation.enabled = False
+    config.processing.worker_poll_interval_seconds = 0.01
+    orchestrator = PipelineOrchestrator(config=config)
+
+    async def fake_stage(episode_id):
+        if episode_id == fail_episode:
+            raise RuntimeError("stage exploded")
+        await asyncio.sleep(0.01)
+
+    orchestrator._stage_processors = {stage: fake_stage for stage in ProcessingStage}
+    return orchestrator
+
+
+def run_worker_node(db_path: str, worker_id: str) -> None:
+    """Entry point of a simulated worker node"""
+    from src.core.episode_worker import EpisodeWorker
+
+    orchestrator = build_orchestrator(db_path)
+    worker = EpisodeWorker(orchestrator, ProcessingStage.ENRICHED, worker_id=worker_id, concurrency=2)
+    asyncio.run(worker.run(exit_when_idle=True))
+
+
+class TestEpisodeLeases:
+    """Test registry lease operations"""
+
+    def setup_method(self):
+        """Setup test database"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(DatabaseConfig(
+            path=os.path.join(self.temp_dir, "test.db"),
+            backup_enabled=False,
+            connection_timeout=5
+        ))
+        self.db_manager.initialize()
+        self.registry = EpisodeRegistry(self.db_manager)
+
+    def teardown_method(self):
+        """Cleanup test database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_claimed_episode_is_not_claimed_again(self):
+        """Test that a live lease excludes the episode from other claims"""
+        self.registry.register_episode(create_test_episode("ep-1"))
+
+        claimed = self.registry.claim_next_episode("node-a", ProcessingStage.RENDERED, 60, 3)
+
+        assert claimed.episode_id == "ep-1"
+        assert self.registry.claim_next_episode("node-b", ProcessingStage.RENDERED, 60, 3) is None
+
+    def test_episode_at_target_is_not_claimed(self):
+        """Test that finished episodes are not claimable"""
+        self.registry.register_episode(create_test_episode("ep-1"))
+        self.registry.update_episode_stage("ep-1", ProcessingStage.RENDERED)
+
+        assert self.registry.claim_next_episode("node-a", ProcessingStage.RENDERED, 60, 3) is None
+
+    def test_stale_lease_is_reclaimed(self):
+        """Test that an expired lease from a crashed node can be reclaimed"""
+        self.registry.register_episode(create_test_episode("ep-1"))
+        self.registry.claim_next_episode("crashed", ProcessingStage.RENDERED, 0.01, 3)
+
+        time.sleep(0.05)
+        claimed = self.registry.claim_next_episode("node-b", ProcessingStage.RENDERED, 60, 3)
+
+        assert claimed.episode_id == "ep-1"
+        assert self.registry.renew_episode_lease("ep-1", "crashed", 60) is False
+        assert self.registry.renew_episode_lease("ep-1", "node-b", 60) is True
+
+    def test_failed_episode_stops_being_claimed(self):
+        """Test that max_attempts failed claims park the episode until reset"""
+        self.registry.register_episode(create_test_episode("ep-1"))
+
+        for _ in range(2):
+            assert self.registry.claim_next_episode("node-a", ProcessingStage.RENDERED, 60, 2)
+            assert self.registry.release_episode_lease("ep-1", "node-a", error="boom")
+
+        assert self.registry.claim_next_episode("node-a", ProcessingStage.RENDERED, 60, 2) is None
+        assert self.registry.get_episode("ep-1").errors == "boom"
+
+        self.registry.reset_episode_claims("ep-1")
+        assert self.registry.claim_next_episode("node-a", ProcessingStage.RENDERED, 60, 2) is not None
+
+    def test_failed_episode_backs_off_before_reclaim(self):
+        """Test that a failure delays the next claim, doubling with each attempt"""
+        self.registry.register_episode(create_test_episode("ep-1"))
+
+        self.registry.claim_next_episode("node-a", ProcessingStage.RENDERED, 60, 3)
+        assert self.registry.release_episode_lease("ep-1", "node-a", error="boom", retry_delay=0.1)
+        assert self.registry.claim_next_episode("node-b", ProcessingStage.RENDERED, 60, 3) is None
+
+        time.sleep(0.15)
+        assert self.registry.claim_next_episode("node-b", ProcessingStage.RENDERED, 60, 3) is not None
+        assert self.registry.release_episode_lease("ep-1", "node-b", error="boom", retry_delay=0.1)
+
+        time.sleep(0.15)
+        assert self.registry.claim_next_episode("node-b", ProcessingStage.RENDERED, 60, 3) is None
+        time.sleep(0.1)
+        assert self.registry.claim_next_episode("node-b", ProcessingStage.RENDERED, 60, 3) is not None
+
+    def test_successful_release_resets_attempts(self):
+        """Test that a successful release clears the claim counter"""
+        self.registry.register_episode(create_test_episode("ep-1"))
+
+        self.registry.claim_next_episode("node-a", ProcessingStage.RENDERED, 60, 1)
+        assert self.registry.release_episode_lease("ep-1", "node-a")
+
+        assert self.registry.claim_next_episode("node-a", ProcessingStage.RENDERED, 60, 1) is not None
+
+    def test_lease_updates_do_not_touch_updated_at(self):
+        """Test that claims and heartbeats are not treated as content changes"""
+        self.registry.register_episode(create_test_episode("ep-1"))
+        before = self.registry.get_episode("ep-1").updated_at
+
+        time.sleep(1.1)
+        self.registry.claim_next_episode("node-a", ProcessingStage.RENDERED, 60, 3)
+        self.registry.renew_episode_lease("ep-1", "node-a", 60)
+
+        assert self.registry.get_episode("ep-1").updated_at == before
+
+
+class TestEpisodeWorker:
+    """Test workers draining a shared registry"""
+
+    def setup_method(self):
+        """Setup shared database with episodes"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "pipeline.db")
+        self.db_manager = DatabaseManager(DatabaseConfig(path=self.db_path, backup_enabled=False))
+        self.db_manager.initialize()
+        self.registry = EpisodeRegistry(self.db_manager)
+
+    def teardown_method(self):
+        """Cleanup shared database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def stage_events(self):
+        """(episode_id, stage) pairs logged as started"""
+        cursor = self.db_manager.get_connection().execute_query(
+            "SELECT episode_id, stage FROM processing_log WHERE status = 'started'"
+        )
+        return [tuple(row) for row in cursor.fetchall()]
+
+    @pytest.mark.asyncio
+    async def test_failed_episode_is_released_with_error(self):
+        """Test that processing failures release the lease and record the error"""
+        from src.core.episode_worker import EpisodeWorker
+
+        self.registry.register_episode(create_test_episode("ep-ok"))
+        self.registry.register_episode(create_test_episode("ep-bad"))
+        orchestrator = build_orchestrator(self.db_path, fail_episode="ep-bad")
+        orchestrator.config.processing.max_retry_attempts = 1
+
+        worker = EpisodeWorker(orchestrator, ProcessingStage.ENRICHED, worker_id="node-a", concurrency=1)
+        stats = await worker.run(exit_when_idle=True)
+
+        assert stats.processed == 1
+        assert stats.failed == 1
+        assert self.registry.get_episode("ep-ok").processing_stage == ProcessingStage.ENRICHED
+        assert self.registry.get_episode("ep-bad").errors == "stage exploded"
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(),
+        reason="simulated nodes need the fork start method"
+    )
+    def test_nodes_process_each_stage_once(self):
+        """Test that several worker processes split episodes without overlap"""
+        episode_ids = [f"ep-{i}" for i in range(12)]
+        for episode_id in episode_ids:
+            self.registry.register_episode(create_test_episode(episode_id))
+
+        context = multiprocessing.get_context("fork")
+        nodes = [
+            context.Process(target=run_worker_node, args=(self.db_path, f"node-{n}"))
+            for n in range(3)
+        ]
+        for node in nodes:
+            node.start()
+        for node in nodes:
+            node.join(timeout=60)
+
+        assert all(node.exitcode == 0 for node in nodes)
+
+        events = self.stage_events()
+        assert len(events) == len(set(events))
+        for episode_id in episode_ids:
+            episode = self.registry.get_episode(episode_id)
+            assert episode.processing_stage == ProcessingStage.ENRICHED
+            assert episode.errors is None
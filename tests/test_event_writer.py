@@ -0,0 +1,177 @@
+"""
+Tests for the batched processing event writer
+
+Tests batching, backpressure, flush-on-stop and rows written inside an open
+transaction.
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from src.core.database import DatabaseManager, DatabaseConfig
+from src.core.event_writer import ProcessingEventWriter
+from src.core.registry import EpisodeRegistry
+from src.core.models import EpisodeObject, SourceInfo, MediaInfo, EpisodeMetadata
+
+
+def wait_until(predicate, timeout=5.0):
+    """Poll predicate until it is true or the timeout passes"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+class TestProcessingEventWriter:
+    """Test buffering and flushing of processing_log and processing_metrics rows"""
+
+    def setup_method(self):
+        """Setup database with one registered episode"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(DatabaseConfig(
+            path=str(self.temp_dir / "test.db"),
+            backup_enabled=False
+        ))
+        self.db_manager.initialize()
+        self.connection = self.db_manager.get_connection()
+        EpisodeRegistry(self.db_manager).register_episode(EpisodeObject(
+            episode_id="ep-1",
+            content_hash="a" * 64,
+            source=SourceInfo(path="/test/ep-1.mp4", file_size=1000, last_modified=datetime.now()),
+            media=MediaInfo(duration_seconds=60.0),
+            metadata=EpisodeMetadata(show_name="Test Show", show_slug="test-show")
+        ))
+        self.writer = None
+
+    def teardown_method(self):
+        """Stop writer and cleanup"""
+        if self.writer:
+            self.writer.stop()
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def count(self, table):
+        return self.connection.execute_query(
+            f"SELECT COUNT(*) FROM {table} WHERE episode_id = 'ep-1' AND stage = 'transcribed'"
+        ).fetchone()[0]
+
+    def test_rows_are_written_in_few_transactions(self):
+        """Test that a burst of events and metrics is flushed as one batch"""
+        self.writer = ProcessingEventWriter(self.connection, flush_interval_ms=100)
+
+        for i in range(50):
+            self.writer.log_event("ep-1", "transcribed", "completed", duration=float(i))
+            self.writer.record_metric("ep-1", "transcribed", "duration_seconds", i)
+        assert self.writer.flush()
+
+        assert self.count("processing_log") == 50
+        assert self.count("processing_metrics") == 50
+        assert self.writer.get_stats()['batches'] <= 2
+
+    def test_full_batch_is_written_before_interval(self):
+        """Test that batch_size rows are written without waiting for the interval"""
+        self.writer = ProcessingEventWriter(self.connection, flush_interval_ms=60000, batch_size=10)
+
+        for _ in range(10):
+            self.writer.log_event("ep-1", "transcribed", "started")
+
+        assert wait_until(lambda: self.count("processing_log") == 10)
+
+    def test_stop_flushes_queued_rows(self):
+        """Test that rows still buffered are written on shutdown"""
+        self.writer = ProcessingEventWriter(self.connection, flush_interval_ms=60000)
+        for _ in range(5):
+            self.writer.log_event("ep-1", "transcribed", "started")
+
+        self.writer.stop()
+
+        assert self.count("processing_log") == 5
+        assert not self.writer.is_running()
+
+    def test_full_queue_blocks_producers(self):
+        """Test that producers wait for the flush thread when the queue is full"""
+        self.writer = ProcessingEventWriter(self.connection, flush_interval_ms=10,
+                                            batch_size=1, max_queue_size=2)
+        release = threading.Event()
+
+        def hold_writer():
+            with self.connection.writer():
+                release.wait(5)
+
+        holder = threading.Thread(target=hold_writer)
+        holder.start()
+        timer = threading.Timer(0.3, release.set)
+        timer.start()
+        try:
+            for _ in range(10):
+                self.writer.log_event("ep-1", "transcribed", "started")
+        finally:
+            release.set()
+            holder.join()
+
+        assert self.writer.flush()
+        assert self.count("processing_log") == 10
+        assert self.writer.get_stats()['backpressure_waits'] > 0
+
+    def test_stats_match_rows_from_concurrent_producers(self):
+        """Test that counters updated by producers and the flush thread add up"""
+        self.writer = ProcessingEventWriter(self.connection, flush_interval_ms=5,
+                                            batch_size=7, max_queue_size=4)
+
+        def produce():
+            for i in range(100):
+                self.writer.log_event("ep-1", "transcribed", "started")
+                self.writer.record_metric("ep-1", "transcribed", "duration_seconds", i)
+
+        producers = [threading.Thread(target=produce) for _ in range(6)]
+        for producer in producers:
+            producer.start()
+        for producer in producers:
+            producer.join()
+        assert self.writer.flush()
+
+        stats = self.writer.get_stats()
+        assert self.count("processing_log") == self.count("processing_metrics") == 600
+        assert stats['rows_written'] == 1200
+        assert stats['rows_dropped'] == 0
+        assert stats['backpressure_waits'] > 0
+
+    def test_rows_logged_inside_transaction_join_it(self):
+        """Test that a row logged while holding the writer is written with that transaction"""
+        self.writer = ProcessingEventWriter(self.connection)
+
+        with self.connection.transaction():
+            self.writer.log_event("ep-1", "transcribed", "started")
+
+        assert self.count("processing_log") == 1
+        assert self.writer.get_stats()['direct_writes'] == 1
+        assert not self.writer.is_running()
+
+    def test_rows_for_missing_episodes_are_dropped(self):
+        """Test that one rejected row does not lose the rest of its batch"""
+        self.writer = ProcessingEventWriter(self.connection)
+
+        self.writer.log_event("ep-1", "transcribed", "started")
+        self.writer.log_event("deleted-episode", "transcribed", "started")
+        self.writer.log_event("ep-1", "transcribed", "completed")
+        self.writer.flush()
+
+        assert self.count("processing_log") == 2
+        assert self.writer.get_stats()['rows_dropped'] == 1
+
+    def test_registry_reads_see_queued_events(self):
+        """Test that registry history flushes the shared writer first"""
+        registry = EpisodeRegistry(self.db_manager)
+
+        registry.log_processing_event("ep-1", "transcribed", "completed", duration=1.5)
+        registry.record_metric("ep-1", "transcribed", "duration_seconds", 1.5)
+
+        history = registry.get_processing_history("ep-1")
+        assert [(e.stage, e.status) for e in history][-1] == ("transcribed", "completed")
+        assert self.count("processing_metrics") == 1
@@ -0,0 +1,239 @@
+"""
+Tests for the persistent job queue
+
+Tests durable job storage, atomic claiming, leases, retries and the job worker.
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+import pytest
+
+from src.core.database import DatabaseManager, DatabaseConfig
+from src.core.job_queue import PersistentJobQueue, JobWorker, JobStatus
+from src.core.resource_manager import Priority
+
+
+class TestPersistentJobQueue:
+    """Test SQLite-backed job queue"""
+
+    def setup_method(self):
+        """Setup test database and queue"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(DatabaseConfig(
+            path=os.path.join(self.temp_dir, "test.db"),
+            backup_enabled=False,
+            connection_timeout=5
+        ))
+        self.db_manager.initialize()
+        self.queue = PersistentJobQueue(self.db_manager, worker_id="worker-a", retry_base_delay=0)
+
+    def teardown_method(self):
+        """Cleanup test database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_jobs_survive_new_queue_instance(self):
+        """Test that queued jobs are visible to a fresh queue on the same database"""
+        job_id = self.queue.submit_job("process_episode", {'episode_id': 'ep-1'})
+
+        restarted = PersistentJobQueue(self.db_manager, worker_id="worker-b")
+        job = restarted.get_job(job_id)
+
+        assert job is not None
+        assert job.status == JobStatus.QUEUED
+        assert job.parameters == {'episode_id': 'ep-1'}
+
+    def test_claim_respects_priority(self):
+        """Test that higher-priority jobs are claimed first"""
+        low = self.queue.submit_job("process_episode", {}, priority=Priority.LOW)
+        high = self.queue.submit_job("process_episode", {}, priority=Priority.HIGH)
+
+        assert self.queue.claim_next_job().job_id == high
+        assert self.queue.claim_next_job().job_id == low
+        assert self.queue.claim_next_job() is None
+
+    def test_claim_filters_job_types(self):
+        """Test that workers only claim job types they handle"""
+        self.queue.submit_job("render_clips", {})
+
+        assert self.queue.claim_next_job(["process_episode"]) is None
+        assert self.queue.claim_next_job(["render_clips"]) is not None
+
+    def test_delayed_job_is_not_claimable_yet(self):
+        """Test that delayed jobs wait for their available time"""
+        self.queue.submit_job("process_episode", {}, delay_seconds=60)
+
+        assert self.queue.claim_next_job() is None
+
+    def test_job_is_claimed_once(self):
+        """Test that two workers never claim the same job"""
+        other = PersistentJobQueue(self.db_manager, worker_id="worker-b")
+        job_id = self.queue.submit_job("process_episode", {})
+
+        assert self.queue.mark_job_running(job_id) is True
+        assert other.mark_job_running(job_id) is False
+        assert other.claim_next_job() is None
+        assert self.queue.get_job(job_id).lease_owner == "worker-a"
+
+    def test_expired_lease_is_reclaimed(self):
+        """Test that jobs from a crashed worker are requeued after lease expiry"""
+        crashed = PersistentJobQueue(self.db_manager, worker_id="crashed", lease_seconds=0.01)
+        job_id = crashed.submit_job("process_episode", {}, max_attempts=2)
+        assert crashed.claim_next_job().job_id == job_id
+
+        time.sleep(0.05)
+        job = self.queue.claim_next_job()
+
+        assert job.job_id == job_id
+        assert job.lease_owner == "worker-a"
+        assert job.attempts == 2
+
+    def test_expired_lease_without_attempts_left_fails(self):
+        """Test that lease expiry on the last attempt marks the job failed"""
+        crashed = PersistentJobQueue(self.db_manager, worker_id="crashed", lease_seconds=0.01)
+        job_id = crashed.submit_job("process_episode", {})
+        crashed.claim_next_job()
+
+        time.sleep(0.05)
+        assert self.queue.claim_next_job() is None
+        assert self.queue.get_job(job_id).status == JobStatus.FAILED
+
+    def test_heartbeat_extends_lease(self):
+        """Test that only the lease owner can heartbeat"""
+        job_id = self.queue.submit_job("process_episode", {})
+        job = self.queue.claim_next_job()
+
+        time.sleep(0.01)
+        assert self.queue.heartbeat(job_id) is True
+        assert self.queue.get_job(job_id).lease_expires_at > job.lease_expires_at
+        assert PersistentJobQueue(self.db_manager, worker_id="worker-b").heartbeat(job_id) is False
+
+    def test_failed_job_is_retried_until_max_attempts(self):
+        """Test retry with backoff and final failure"""
+        job_id = self.queue.submit_job("process_episode", {}, max_attempts=2)
+
+        self.queue.claim_next_job()
+        self.queue.mark_job_failed(job_id, "first failure")
+        assert self.queue.get_job(job_id).status == JobStatus.QUEUED
+
+        self.queue.claim_next_job()
+        self.queue.mark_job_failed(job_id, "second failure")
+        job = self.queue.get_job(job_id)
+
+        assert job.status == JobStatus.FAILED
+        assert job.error == "second failure"
+        assert job.attempts == 2
+
+    def test_retry_backoff_delays_next_claim(self):
+        """Test that retry backoff postpones availability"""
+        queue = PersistentJobQueue(self.db_manager, worker_id="worker-c", retry_base_delay=60)
+        job_id = queue.submit_job("process_episode", {}, max_attempts=3)
+
+        queue.claim_next_job()
+        queue.mark_job_failed(job_id, "transient")
+
+        assert queue.claim_next_job() is None
+
+    def test_only_lease_owner_finishes_job(self):
+        """Test that a worker whose lease was reclaimed cannot complete or fail the job"""
+        crashed = PersistentJobQueue(self.db_manager, worker_id="crashed", lease_seconds=0.01)
+        job_id = crashed.submit_job("process_episode", {}, max_attempts=3)
+        crashed.claim_next_job()
+
+        time.sleep(0.05)
+        assert self.queue.claim_next_job().job_id == job_id
+
+        assert crashed.mark_job_completed(job_id, {'stage': 'rendered'}) is False
+        assert crashed.mark_job_failed(job_id, "late failure") is False
+        job = self.queue.get_job(job_id)
+        assert (job.status, job.lease_owner) == (JobStatus.RUNNING, "worker-a")
+        assert job.error != "late failure"
+
+        assert self.queue.mark_job_completed(job_id, {'stage': 'rendered'}) is True
+        assert self.queue.mark_job_completed(job_id, {'stage': 'rendered'}) is False
+
+    def test_complete_and_stats(self):
+        """Test completion result and queue statistics"""
+        job_id = self.queue.submit_job("process_episode", {})
+        self.queue.submit_job("process_episode", {})
+        self.queue.claim_next_job()
+        self.queue.mark_job_completed(job_id, {'stage': 'rendered'})
+
+        job = self.queue.get_job(job_id)
+        stats = self.queue.get_queue_stats()
+
+        assert job.status == JobStatus.COMPLETED
+        assert job.result == {'stage': 'rendered'}
+        assert stats['total'] == 2
+        assert stats['completed'] == 1
+        assert stats['queued'] == 1
+
+    def test_cancel_only_queued_jobs(self):
+        """Test that running jobs cannot be cancelled"""
+        queued = self.queue.submit_job("process_episode", {})
+        running = self.queue.submit_job("process_episode", {})
+        self.queue.mark_job_running(running)
+
+        assert self.queue.cancel_job(queued) is True
+        assert self.queue.cancel_job(running) is False
+        assert self.queue.claim_next_job() is None
+
+    def test_cleanup_old_jobs(self):
+        """Test that only old terminal jobs are removed"""
+        done = self.queue.submit_job("process_episode", {})
+        pending = self.queue.submit_job("process_episode", {})
+        self.queue.cancel_job(done)
+
+        self.queue.cleanup_old_jobs(max_age_hours=-1)
+
+        assert self.queue.get_job(done) is None
+        assert self.queue.get_job(pending) is not None
+
+
+class TestJobWorker:
+    """Test background draining of the persistent queue"""
+
+    def setup_method(self):
+        """Setup test database and queue"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(DatabaseConfig(
+            path=os.path.join(self.temp_dir, "test.db"),
+            backup_enabled=False,
+            connection_timeout=5
+        ))
+        self.db_manager.initialize()
+        self.queue = PersistentJobQueue(self.db_manager, worker_id="worker-a", retry_base_delay=0)
+
+    def teardown_method(self):
+        """Cleanup test database"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @pytest.mark.asyncio
+    async def test_worker_runs_and_retries_jobs(self):
+        """Test that the worker completes jobs and retries raising handlers"""
+        calls = []
+
+        async def handler(job):
+            calls.append(job.attempts)
+            if job.attempts == 1:
+                raise RuntimeError("transient")
+            self.queue.mark_job_completed(job.job_id, {'ok': True})
+
+        job_id = self.queue.submit_job("process_episode", {}, max_attempts=2)
+        worker = JobWorker(self.queue, {'process_episode': handler}, poll_interval=0.01)
+
+        run_task = asyncio.create_task(worker.run())
+        for _ in range(200):
+            if self.queue.get_job(job_id).status == JobStatus.COMPLETED:
+                break
+            await asyncio.sleep(0.01)
+        worker._stop_event.set()
+        await asyncio.wait_for(run_task, timeout=1.0)
+
+        assert calls == [1, 2]
+        assert self.queue.get_job(job_id).result == {'ok': True}
@@ -0,0 +1,229 @@
+"""
+Tests for the JSON metadata index
+
+Tests guest and topic lookups answered from the episode_guests and
+episode_topics tables.
+"""
+
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from src.core.database import DatabaseManager, DatabaseConfig
+from src.core.metadata_manager import MetadataManager
+from src.core.registry import EpisodeRegistry
+from src.core.models import (
+    EpisodeObject, SourceInfo, MediaInfo, EpisodeMetadata,
+    TranscriptionResult, EnrichmentResult, EditorialContent
+)
+
+
+class TestGuestTopicIndex:
+    """Test guest and topic filters and facets"""
+
+    def setup_method(self):
+        """Setup database, registry and metadata manager"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(DatabaseConfig(
+            path=str(self.temp_dir / "test.db"),
+            backup_enabled=False
+        ))
+        self.db_manager.initialize()
+        self.connection = self.db_manager.get_connection()
+        self.registry = EpisodeRegistry(self.db_manager)
+        self.manager = MetadataManager(self.connection, self.temp_dir / "json")
+
+    def teardown_method(self):
+        """Cleanup test environment"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def save(self, episode_id, guests, topics, date="2024-01-01"):
+        episode = EpisodeObject(
+            episode_id=episode_id,
+            content_hash=episode_id.ljust(64, "0"),
+            source=SourceInfo(path=f"/test/{episode_id}.mp4", file_size=1000, last_modified=datetime.now()),
+            media=MediaInfo(duration_seconds=60.0),
+            metadata=EpisodeMetadata(show_name="Test Show", show_slug="test-show", date=date),
+            enrichment=EnrichmentResult(proficiency_scores={
+                'scored_people': [{'name': name} for name in guests]
+            }),
+            editorial=EditorialContent(topic_tags=topics)
+        )
+        if not self.registry.get_episode(episode_id):
+            self.registry.register_episode(episode)
+        self.manager.save_episode_json(episode)
+        return episode
+
+    def test_search_by_guest_and_topic(self):
+        """Test case-insensitive partial-match filters on guests and topics"""
+        self.save("ep-1", ["Jane Doe", "John Smith"], ["Climate", "Energy"], date="2024-01-01")
+        self.save("ep-2", ["Jane Doe"], ["Economy"], date="2024-02-01")
+        self.save("ep-3", ["Alex Roe"], ["Climate Policy"], date="2024-03-01")
+
+        assert [r['episode_id'] for r in self.manager.search_episodes(guest_name="jane")] == ["ep-2", "ep-1"]
+        assert [r['episode_id'] for r in self.manager.search_episodes(topic="CLIMATE")] == ["ep-3", "ep-1"]
+        assert [r['episode_id'] for r in self.manager.search_episodes(
+            guest_name="Jane Doe", topic="climate")] == ["ep-1"]
+        assert [r['episode_id'] for r in self.manager.search_episodes(guest_name="Doe")] == ["ep-2", "ep-1"]
+        assert [r['episode_id'] for r in self.manager.search_episodes(guest_name="smi")] == ["ep-1"]
+        assert [r['episode_id'] for r in self.manager.search_episodes(topic="policy")] == ["ep-3"]
+        assert self.manager.search_episodes(guest_name="Doe Jane") == []
+
+        result = self.manager.search_episodes(guest_name="john")[0]
+        assert result['guest_names'] == ["Jane Doe", "John Smith"]
+
+    def test_resaving_replaces_guests_and_topics(self):
+        """Test that save_episode_json rewrites the lookup rows of an episode"""
+        self.save("ep-1", ["Jane Doe", "jane doe ", ""], ["Climate"])
+        self.save("ep-1", ["Alex Roe"], [])
+
+        guests = self.connection.execute_query(
+            "SELECT guest_name FROM episode_guests WHERE episode_id = 'ep-1'"
+        ).fetchall()
+        topics = self.connection.execute_query(
+            "SELECT COUNT(*) FROM episode_topics WHERE episode_id = 'ep-1'"
+        ).fetchone()[0]
+
+        assert [row[0] for row in guests] == ["Alex Roe"]
+        assert topics == 0
+        assert self.manager.search_episodes(guest_name="jane") == []
+        assert self.connection.execute_query(
+            "SELECT COUNT(*) FROM episode_guest_suffixes WHERE episode_id = 'ep-1'"
+        ).fetchone()[0] == len("Alex Roe")
+
+    def test_facets_count_appearances(self):
+        """Test guest and topic facets with minimum counts"""
+        self.save("ep-1", ["Jane Doe", "John Smith"], ["Climate", "Energy"])
+        self.save("ep-2", ["jane doe"], ["climate"])
+        self.save("ep-3", ["Jane Doe"], ["Economy"])
+
+        guests = self.manager.get_guests(min_appearances=2)
+        assert len(guests) == 1
+        assert guests[0]['name'].lower() == "jane doe"
+        assert guests[0]['appearances'] == 3
+        assert sorted(guests[0]['episodes']) == ["ep-1", "ep-2", "ep-3"]
+
+        topics = self.manager.get_topics(min_occurrences=1)
+        assert [(t['topic'].lower(), t['occurrences']) for t in topics] == [
+            ("climate", 2), ("economy", 1), ("energy", 1)
+        ]
+
+    def test_filters_use_indexes(self):
+        """Test that guest and topic filters search the lookup indexes"""
+        plan = self.connection.execute_query("""
+            EXPLAIN QUERY PLAN
+            SELECT episode_id FROM json_metadata_index
+            WHERE episode_id IN (
+                SELECT episode_id FROM episode_guest_suffixes WHERE suffix >= ? AND suffix < ?)
+        """, ("doe", "doe\U0010ffff")).fetchall()
+        details = " ".join(row[-1] for row in plan)
+
+        assert "idx_episode_guest_suffixes" in details
+        assert "SCAN episode_guest_suffixes" not in details
+
+
+class TestFullTextSearch:
+    """Test incremental FTS maintenance and faceted search"""
+
+    def setup_method(self):
+        """Setup database, registry and metadata manager"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(DatabaseConfig(
+            path=str(self.temp_dir / "test.db"),
+            backup_enabled=False
+        ))
+        self.db_manager.initialize()
+        self.connection = self.db_manager.get_connection()
+        self.registry = EpisodeRegistry(self.db_manager)
+        self.manager = MetadataManager(self.connection, self.temp_dir / "json")
+
+    def teardown_method(self):
+        """Cleanup test environment"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def save(self, episode_id, transcript, show="Test Show", date="2024-01-01",
+             guests=(), title=None, summary=None):
+        episode = EpisodeObject(
+            episode_id=episode_id,
+            content_hash=episode_id.ljust(64, "0"),
+            source=SourceInfo(path=f"/test/{episode_id}.mp4", file_size=1000, last_modified=datetime.now()),
+            media=MediaInfo(duration_seconds=60.0),
+            metadata=EpisodeMetadata(show_name=show, show_slug="test-show", date=date,
+                                     title=title or f"Episode {episode_id}"),
+            transcription=TranscriptionResult(text=transcript, vtt_content=""),
+            enrichment=EnrichmentResult(proficiency_scores={
+                'scored_people': [{'name': name} for name in guests]
+            }),
+            editorial=EditorialContent(summary=summary)
+        )
+        if not self.registry.get_episode(episode_id):
+            self.registry.register_episode(episode)
+        self.manager.save_episode_json(episode)
+        return episode
+
+    def fts_rows(self, term):
+        return self.connection.execute_query(
+            "SELECT COUNT(*) FROM episodes_search WHERE episodes_search MATCH ?", (term,)
+        ).fetchone()[0]
+
+    def test_resave_updates_index_incrementally(self):
+        """Test that re-saving replaces an episode's terms instead of adding rows"""
+        self.save("ep-1", "the glacier is melting")
+        self.save("ep-1", "the reservoir is full")
+
+        assert self.fts_rows("glacier") == 0
+        assert self.fts_rows("reservoir") == 1
+        # Raises if the index disagrees with episode_search_content
+        self.connection.execute_query(
+            "INSERT INTO episodes_search (episodes_search, rank) VALUES ('integrity-check', 1)"
+        )
+
+    def test_deleting_index_row_removes_search_row(self):
+        """Test that removing an episode from the index removes it from FTS"""
+        self.save("ep-1", "carbon pricing debate")
+        self.connection.execute_query("DELETE FROM json_metadata_index WHERE episode_id = 'ep-1'")
+
+        assert self.fts_rows("carbon") == 0
+        assert self.manager.full_text_search("carbon") == []
+
+    def test_full_text_search_returns_snippet_and_highlight(self):
+        """Test ranked hits with snippet and title highlight"""
+        self.save("ep-1", "we talked about housing and rent control for an hour",
+                  title="Housing crisis")
+        self.save("ep-2", "sports results", title="Weekend roundup")
+
+        results = self.manager.full_text_search("housing")
+
+        assert [r['episode_id'] for r in results] == ["ep-1"]
+        assert "<mark>housing</mark>" in results[0]['snippet'].lower()
+        assert results[0]['title_highlight'] == "<mark>Housing</mark> crisis"
+
+    def test_faceted_search(self):
+        """Test facet counts over all matches and filtered drill-down"""
+        self.save("ep-1", "budget talk", show="Newsroom", date="2023-05-01", guests=["Jane Doe"])
+        self.save("ep-2", "budget deficit", show="Newsroom", date="2024-02-01", guests=["Jane Doe", "Alex Roe"])
+        self.save("ep-3", "budget vote", show="Forum", date="2024-03-01", guests=["Alex Roe"])
+        self.save("ep-4", "weather", show="Forum", date="2024-04-01", guests=["Jane Doe"])
+
+        search = self.manager.faceted_search("budget", limit=2)
+
+        assert search['total'] == 3
+        assert len(search['results']) == 2
+        assert all(r['snippet'] for r in search['results'])
+        assert search['facets']['show'] == [
+            {'value': "Newsroom", 'count': 2}, {'value': "Forum", 'count': 1}
+        ]
+        assert search['facets']['year'] == [
+            {'value': "2024", 'count': 2}, {'value': "2023", 'count': 1}
+        ]
+        assert search['facets']['guest'] == [
+            {'value': "Alex Roe", 'count': 2}, {'value': "Jane Doe", 'count': 2}
+        ]
+
+        drilled = self.manager.faceted_search("budget", year="2024", guest_name="jane doe")
+        assert drilled['total'] == 1
+        assert [r['episode_id'] for r in drilled['results']] == ["ep-2"]
+        assert drilled['facets']['show'] == [{'value': "Newsroom", 'count': 1}]
@@ -0,0 +1,217 @@
+"""
+Tests for the persistent model server
+
+Tests the socket protocol, embedding batching and model unloading with fake
+models, so no ML libraries are needed.
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pytest
+
+from src.core.exceptions import ProcessingError
+from src.core.model_server import (
+    ModelServer, ModelServerClient, RemoteSentenceTransformer, RemoteWhisperModel,
+    configure_model_server, get_model_server_client, encode_message, decode_message
+)
+
+
+class FakeEncoder:
+    """Sentence encoder returning the text length as a one-dim embedding"""
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        return np.array([[float(len(t))] for t in texts], dtype=np.float32)
+
+
+class FakeWhisper:
+    def __init__(self, name):
+        self.name = name
+
+
+def fake_transcribe(model, args):
+    if args['audio'] == "broken.wav":
+        raise RuntimeError("decoder failed")
+    return {'text': f"{model.name}:{args['audio']}", 'segments': [], 'language': args.get('language')}
+
+
+class TestModelServer:
+    """Test the model server over a real Unix socket"""
+
+    def setup_method(self):
+        """Create server with fake loaders"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.temp_dir, "models.sock")
+        self.loads = []
+
+        def load(kind, cls):
+            def loader(params):
+                self.loads.append((kind, params['name']))
+                return cls(params['name'])
+            return loader
+
+        self.server = ModelServer(
+            self.socket_path,
+            memory_budget_mb=250,
+            idle_unload_seconds=0,
+            batch_window_ms=50,
+            loaders={
+                'whisper': load('whisper', FakeWhisper),
+                'sentence_transformer': load('sentence_transformer', FakeEncoder)
+            },
+            runners={'transcribe': ('whisper', fake_transcribe)}
+        )
+
+        # Every load appears to grow the process by 100 MB
+        self.fake_rss = 0
+
+        def measure():
+            return self.fake_rss
+
+        def grow(loader):
+            def wrapped(params):
+                self.fake_rss += 100 * 1024 * 1024
+                return loader(params)
+            return wrapped
+
+        self.server._measure_memory = measure
+        self.server.loaders = {kind: grow(loader) for kind, loader in self.server.loaders.items()}
+        self.client = ModelServerClient(self.socket_path, timeout=10)
+
+    def teardown_method(self):
+        """Cleanup socket directory"""
+        self.client.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @pytest.mark.asyncio
+    async def test_transcribe_roundtrip_keeps_model_warm(self):
+        """Test that repeated requests reuse one loaded model"""
+        await self.server.start()
+        try:
+            whisper = RemoteWhisperModel(self.client, "base")
+            first = await asyncio.to_thread(whisper.transcribe, "a.wav", language="en")
+            second = await asyncio.to_thread(whisper.transcribe, "b.wav")
+        finally:
+            await self.server.stop()
+
+        assert first == {'text': "base:a.wav", 'segments': [], 'language': "en"}
+        assert second['text'] == "base:b.wav"
+        assert self.loads == [('whisper', "base")]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_embed_requests_are_batched(self):
+        """Test that embed requests from concurrent episodes share encode calls"""
+        await self.server.start()
+        try:
+            clients = [ModelServerClient(self.socket_path, timeout=10) for _ in range(4)]
+            encoders = [RemoteSentenceTransformer(c, "bge-small-en") for c in clients]
+            batches = [[f"episode {i} sentence {j}" for j in range(i + 1)] for i in range(4)]
+
+            results = await asyncio.gather(*(
+                asyncio.to_thread(encoder.encode, texts) for encoder, texts in zip(encoders, batches)
+            ))
+            model = next(iter(self.server._models.values())).model
+            for c in clients:
+                c.close()
+        finally:
+            await self.server.stop()
+
+        for texts, embeddings in zip(batches, results):
+            assert embeddings.shape == (len(texts), 1)
+            assert embeddings[:, 0].tolist() == [float(len(t)) for t in texts]
+        assert len(model.calls) < len(batches)
+        assert sum(len(call) for call in model.calls) == sum(len(b) for b in batches)
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_model_is_unloaded_over_budget(self):
+        """Test LRU unloading when resident models exceed the memory budget"""
+        await self.server.handle_request({'op': 'load', 'kind': 'whisper', 'model': {'name': "small"}})
+        await self.server.handle_request({'op': 'load', 'kind': 'whisper', 'model': {'name': "base"}})
+        await self.server.handle_request({'op': 'transcribe', 'model': {'name': "small"}, 'args': {'audio': "x.wav"}})
+        await self.server.handle_request({'op': 'load', 'kind': 'whisper', 'model': {'name': "medium"}})
+
+        stats = self.server.get_stats()
+        resident = [m['key'] for m in stats['models']]
+
+        assert len(resident) == 2
+        assert not any('"base"' in key for key in resident)
+        assert stats['evictions'] == 1
+
+    @pytest.mark.asyncio
+    async def test_idle_models_are_unloaded(self):
+        """Test the idle sweep unloads models not used recently"""
+        self.server.idle_unload_seconds = 0.05
+        await self.server.handle_request({'op': 'load', 'kind': 'whisper', 'model': {'name': "base"}})
+
+        time.sleep(0.1)
+        await self.server.handle_request({'op': 'load', 'kind': 'whisper', 'model': {'name': "small"}})
+        self.server._models[next(reversed(self.server._models))].last_used = time.time()
+
+        assert self.server.unload_idle() == 1
+        assert [m['key'] for m in self.server.get_stats()['models']] == ['whisper:{"name": "small"}']
+
+    @pytest.mark.asyncio
+    async def test_secrets_stay_out_of_model_keys(self):
+        """Test that tokens are digested in keys and the socket is owner-only"""
+        self.server.loaders['diarization'] = lambda params: FakeWhisper("pyannote")
+        await self.server.start()
+        try:
+            mode = os.stat(self.socket_path).st_mode & 0o777
+            for token in ("hf_secret_one", "hf_secret_two"):
+                await self.server.handle_request({'op': 'load', 'kind': 'diarization',
+                                                  'model': {'hf_token': token, 'device': 'cpu'}})
+        finally:
+            keys = [m['key'] for m in self.server.get_stats()['models']]
+            await self.server.stop()
+
+        assert mode == 0o600
+        assert len(keys) == 2
+        assert not any('hf_secret' in key for key in keys)
+        assert all('"hf_token": "sha256:' in key for key in keys)
+
+    @pytest.mark.asyncio
+    async def test_errors_are_returned_to_client(self):
+        """Test that a failing request raises in the client and the connection survives"""
+        await self.server.start()
+        try:
+            with pytest.raises(ProcessingError, match="decoder failed"):
+                await asyncio.to_thread(self.client.transcribe, "broken.wav", "base")
+            assert await asyncio.to_thread(self.client.ping)
+        finally:
+            await self.server.stop()
+
+
+class TestModelServerClient:
+    """Test client-side behavior without a server"""
+
+    def teardown_method(self):
+        configure_model_server(None)
+
+    def test_arrays_survive_encoding(self):
+        """Test NumPy arrays in messages keep dtype and shape"""
+        samples = np.linspace(-1, 1, 12, dtype=np.float32).reshape(3, 4)
+
+        message = decode_message(encode_message({'audio': samples, 'n': np.int64(3)})[4:])
+
+        assert message['n'] == 3
+        assert message['audio'].dtype == np.float32
+        np.testing.assert_array_equal(message['audio'], samples)
+
+    def test_unreachable_server_falls_back_to_local_models(self):
+        """Test that no client is returned when the socket does not answer"""
+        configure_model_server(os.path.join(tempfile.gettempdir(), "missing-model-server.sock"))
+
+        assert get_model_server_client() is None
+
+    def test_unconfigured_server_returns_no_client(self):
+        """Test that the model server is unused unless configured"""
+        assert get_model_server_client() is None
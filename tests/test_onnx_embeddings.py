@@ -0,0 +1,160 @@
+"""
+Tests for the quantized ONNX sentence embedding backend
+
+Tests length-based batch planning and pooling, and - when onnxruntime and
+sentence-transformers are installed - agreement with the PyTorch backend.
+"""
+
+import importlib.util
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.core.onnx_embeddings import (
+    plan_batches, pool_embeddings, cosine_agreement, model_slug, export_input_names, VALIDATION_SENTENCES
+)
+
+HAS_ONNX_EXPORT = all(
+    importlib.util.find_spec(name) is not None
+    for name in ("onnxruntime", "sentence_transformers", "transformers", "torch")
+)
+
+
+class TestBatchPlanning:
+    """Test dynamic batch sizing by sequence length"""
+
+    def test_batches_respect_token_budget(self):
+        """Test that padded batch size stays within the token budget"""
+        rng = np.random.default_rng(0)
+        lengths = list(rng.integers(3, 120, size=500))
+
+        batches = plan_batches(lengths, max_batch_tokens=1024, max_batch_size=64)
+
+        assert sorted(i for batch in batches for i in batch) == list(range(500))
+        for batch in batches:
+            assert len(batch) <= 64
+            assert len(batch) * max(lengths[i] for i in batch) <= 1024
+
+    def test_short_sentences_share_large_batches(self):
+        """Test that short sentences are packed together and long ones run alone"""
+        lengths = [4] * 100 + [400, 300]
+
+        batches = plan_batches(lengths, max_batch_tokens=512, max_batch_size=128)
+
+        assert batches[0] == list(range(100))
+        assert batches[1:] == [[101], [100]]
+
+    def test_oversized_sentence_still_runs(self):
+        """Test that a sentence longer than the budget gets its own batch"""
+        assert plan_batches([10, 2000], max_batch_tokens=512, max_batch_size=8) == [[0], [1]]
+
+
+class TestPooling:
+    """Test sentence pooling and agreement helpers"""
+
+    def test_mean_pooling_ignores_padding(self):
+        """Test that padded positions do not affect mean pooling"""
+        tokens = np.array([[[1.0, 1.0], [3.0, 3.0], [100.0, 100.0]]])
+        mask = np.array([[1, 1, 0]])
+
+        np.testing.assert_allclose(pool_embeddings(tokens, mask, "mean"), [[2.0, 2.0]])
+        np.testing.assert_allclose(pool_embeddings(tokens, mask, "cls"), [[1.0, 1.0]])
+
+    def test_cosine_agreement(self):
+        """Test agreement summary for identical and perturbed embeddings"""
+        reference = np.random.default_rng(1).normal(size=(8, 16))
+        perturbed = reference + 0.01 * np.random.default_rng(2).normal(size=(8, 16))
+
+        assert cosine_agreement(reference, 3 * reference)['min_cosine'] == pytest.approx(1.0)
+        assert 0.99 < cosine_agreement(reference, perturbed)['min_cosine'] < 1.0
+
+    def test_export_inputs_follow_forward_signature(self):
+        """Test that exported inputs are ordered like forward(), not like the tokenizer output"""
+        def forward(input_ids=None, attention_mask=None, token_type_ids=None, position_ids=None):
+            pass
+
+        tokenizer_keys = ["input_ids", "token_type_ids", "attention_mask"]
+
+        assert export_input_names(forward, tokenizer_keys) == ["input_ids", "attention_mask", "token_type_ids"]
+        assert export_input_names(forward, ["input_ids", "attention_mask"]) == ["input_ids", "attention_mask"]
+
+    def test_model_slug(self):
+        """Test that model names map to safe directory names"""
+        assert model_slug("sentence-transformers/all-MiniLM-L6-v2") == "sentence-transformers__all-MiniLM-L6-v2"
+
+
+@pytest.mark.skipif(not HAS_ONNX_EXPORT, reason="onnxruntime, torch and sentence-transformers are required")
+class TestTinyModelExport:
+    """Test the export on a tiny randomly initialised BERT, without downloads"""
+
+    def setup_method(self):
+        """Setup model directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def teardown_method(self):
+        """Cleanup model directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def tiny_sentence_transformer(self):
+        import torch
+        from transformers import BertConfig, BertModel, BertTokenizerFast
+        from sentence_transformers import SentenceTransformer, models
+
+        words = sorted({w.strip(".,?'").lower() for s in VALIDATION_SENTENCES for w in s.split()} - {""})
+        vocab_path = self.temp_dir / "vocab.txt"
+        vocab_path.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", ".", ",", "?", "'"] + words))
+
+        torch.manual_seed(0)
+        bert_dir = self.temp_dir / "tiny-bert"
+        BertModel(BertConfig(vocab_size=len(vocab_path.read_text().split()), hidden_size=32,
+                             num_hidden_layers=2, num_attention_heads=2, intermediate_size=64,
+                             type_vocab_size=2)).save_pretrained(str(bert_dir))
+        BertTokenizerFast(vocab_file=str(vocab_path)).save_pretrained(str(bert_dir))
+
+        transformer = models.Transformer(str(bert_dir), max_seq_length=64)
+        pooling = models.Pooling(transformer.get_word_embedding_dimension(), pooling_mode="mean")
+        return SentenceTransformer(modules=[transformer, pooling], device="cpu")
+
+    def test_quantized_tiny_model_agrees_with_pytorch(self):
+        """Test that attention mask and token types reach the right graph inputs"""
+        from src.core.onnx_embeddings import export_sentence_transformer, OnnxSentenceEncoder
+
+        reference = self.tiny_sentence_transformer()
+        path = export_sentence_transformer(reference, "tiny-bert", self.temp_dir / "onnx")
+        encoder = OnnxSentenceEncoder(path, threads=1)
+
+        assert [i.name for i in encoder.session.get_inputs()] == ["input_ids", "attention_mask", "token_type_ids"]
+        # Padding in mixed-length batches only agrees if the mask is bound to attention_mask
+        texts = VALIDATION_SENTENCES * 3
+        agreement = cosine_agreement(reference.encode(texts), encoder.encode(texts))
+        assert agreement['min_cosine'] > 0.98
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not HAS_ONNX_EXPORT, reason="onnxruntime, torch and sentence-transformers are required")
+class TestOnnxAgreement:
+    """Test the int8 ONNX export against the PyTorch model"""
+
+    def setup_method(self):
+        """Setup model directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def teardown_method(self):
+        """Cleanup model directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_quantized_model_agrees_with_pytorch(self):
+        """Test cosine agreement between ONNX int8 and PyTorch embeddings"""
+        from sentence_transformers import SentenceTransformer
+        from src.core.onnx_embeddings import load_onnx_encoder
+
+        encoder = load_onnx_encoder("all-MiniLM-L6-v2", self.temp_dir, threads=2, max_batch_tokens=256)
+        reference = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
+        texts = VALIDATION_SENTENCES * 5
+
+        agreement = cosine_agreement(reference.encode(texts), encoder.encode(texts))
+        assert agreement['min_cosine'] > 0.98
+        assert encoder.config['agreement']['min_cosine'] > 0.98
@@ -0,0 +1,211 @@
+"""
+Tests for VAD-chunked parallel transcription
+
+Tests chunk planning at silences, stitching of chunk results and routing
+of the transcription stage to the CPU pool.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.parallel_transcription import (
+    plan_chunks, stitch_chunk_results, default_worker_count, cpu_compute_type
+)
+
+
+def word(start, end, text):
+    return {'start': start, 'end': end, 'word': text, 'probability': 0.9}
+
+
+def segment(words, avg_logprob=-0.2):
+    return {
+        'start': words[0]['start'],
+        'end': words[-1]['end'],
+        'text': "".join(w['word'] for w in words),
+        'avg_logprob': avg_logprob,
+        'words': words
+    }
+
+
+class TestPlanChunks:
+    """Test chunk boundary planning"""
+
+    def test_short_audio_is_one_chunk(self):
+        """Test that audio shorter than the target is not split"""
+        plans = plan_chunks([(0.0, 100.0)], duration=120.0, target_seconds=300.0)
+
+        assert len(plans) == 1
+        assert (plans[0].start, plans[0].end, plans[0].overlap) == (0.0, 120.0, 0.0)
+
+    def test_cuts_land_in_silences_near_target(self):
+        """Test that cuts are placed mid-gap close to the target length"""
+        speech = [(0.0, 280.0), (284.0, 590.0), (594.0, 900.0)]
+
+        plans = plan_chunks(speech, duration=900.0, target_seconds=300.0)
+
+        assert [p.end for p in plans[:-1]] == [282.0, 592.0]
+        assert all(p.overlap == 0.0 for p in plans)
+        assert plans[-1].end == 900.0
+
+    def test_continuous_speech_forces_overlapping_cut(self):
+        """Test forced cuts when no silence falls within the search window"""
+        plans = plan_chunks([(0.0, 700.0)], duration=700.0, target_seconds=300.0, overlap_seconds=1.0)
+
+        assert plans[0].end == 300.0
+        assert plans[1].start == 299.0
+        assert plans[1].overlap == 1.0
+
+    def test_chunks_cover_whole_duration(self):
+        """Test that chunks are contiguous from zero to the end"""
+        speech = [(i * 60.0, i * 60.0 + 58.0) for i in range(60)]
+
+        plans = plan_chunks(speech, duration=3600.0, target_seconds=300.0)
+
+        assert plans[0].start == 0.0
+        assert plans[-1].end == 3600.0
+        for previous, current in zip(plans, plans[1:]):
+            assert current.start + current.overlap == previous.end
+        assert all(150.0 <= p.end - p.start <= 450.0 for p in plans[:-1])
+
+
+class TestStitchChunkResults:
+    """Test merging chunk transcripts into episode time"""
+
+    def test_offsets_are_applied(self):
+        """Test that chunk-relative timestamps are shifted by the chunk start"""
+        chunks = [
+            {'index': 0, 'start': 0.0, 'segments': [segment([word(1.0, 1.5, " Hello")])]},
+            {'index': 1, 'start': 300.0, 'segments': [segment([word(2.0, 2.4, " world")])]}
+        ]
+
+        stitched = stitch_chunk_results(chunks)
+
+        assert [s['start'] for s in stitched] == [1.0, 302.0]
+        assert stitched[1]['words'][0]['end'] == pytest.approx(302.4)
+        assert [s['text'] for s in stitched] == ["Hello", "world"]
+
+    def test_overlap_words_are_deduplicated(self):
+        """Test that words transcribed by both chunks around a forced cut are kept once"""
+        chunks = [
+            {'index': 0, 'start': 0.0, 'segments': [
+                segment([word(297.5, 298.2, " the"), word(298.3, 299.6, " pipeline")])
+            ]},
+            {'index': 1, 'start': 299.0, 'segments': [
+                segment([word(0.0, 0.6, " pipeline"), word(0.7, 1.2, " runs")])
+            ]}
+        ]
+
+        stitched = stitch_chunk_results(chunks)
+        words = [w['word'].strip() for s in stitched for w in s['words']]
+
+        assert words == ["the", "pipeline", "runs"]
+        assert stitched[-1]['text'] == "runs"
+        assert stitched[-1]['start'] == pytest.approx(299.7)
+
+    def test_chunks_are_stitched_in_index_order(self):
+        """Test that pool completion order does not affect the result"""
+        chunks = [
+            {'index': 1, 'start': 10.0, 'segments': [segment([word(0.0, 0.5, " second")])]},
+            {'index': 0, 'start': 0.0, 'segments': [segment([word(0.0, 0.5, " first")])]}
+        ]
+
+        assert [s['text'] for s in stitch_chunk_results(chunks)] == ["first", "second"]
+
+    def test_segments_without_words_are_kept(self):
+        """Test segments lacking word timestamps"""
+        chunks = [{'index': 0, 'start': 5.0, 'segments': [
+            {'start': 0.0, 'end': 2.0, 'text': " No words here", 'avg_logprob': -0.1, 'words': []}
+        ]}]
+
+        stitched = stitch_chunk_results(chunks)
+
+        assert stitched == [{'start': 5.0, 'end': 7.0, 'text': "No words here", 'avg_logprob': -0.1, 'words': []}]
+
+
+def test_default_worker_count_is_positive():
+    """Test worker sizing never drops below one process"""
+    assert default_worker_count(10_000) == 1
+    assert default_worker_count(1) >= 1
+
+
+def test_cpu_workers_never_load_half_precision():
+    """Test that GPU compute types are mapped to one CTranslate2 supports on CPU"""
+    assert cpu_compute_type("float16") == "int8"
+    assert cpu_compute_type("int8_float16") == "int8"
+    assert cpu_compute_type("float32") == "float32"
+    assert cpu_compute_type("int8") == "int8"
+
+
+class FakeParallelEngine:
+    """TranscriptionEngine stand-in recording transcribe_parallel calls"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def transcribe_parallel(self, audio_path, language=None, chunk_seconds=300.0, max_workers=None):
+        self.calls.append({'language': language, 'chunk_seconds': chunk_seconds, 'max_workers': max_workers})
+        words = [SimpleNamespace(word=" Hello", start=0.0, end=0.4, probability=0.9),
+                 SimpleNamespace(word=" there.", start=0.4, end=0.9, probability=0.8)]
+        segment = SimpleNamespace(start=0.0, end=0.9, text="Hello there.", confidence=-0.2, words=words)
+        return SimpleNamespace(text="Hello there.", language="en", segments=[segment], duration=1.0)
+
+
+class TestTranscriptionStageRouting:
+    """Test that the transcription stage uses the CPU pool when configured"""
+
+    def setup_method(self):
+        """Setup output directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.audio_path = self.temp_dir / "ep-1.wav"
+        self.audio_path.write_bytes(b"RIFF")
+
+    def teardown_method(self):
+        """Cleanup output directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_processor(self, monkeypatch, **transcription):
+        torch = pytest.importorskip("torch")
+        pytest.importorskip("httpx")
+        from src.core import model_server
+        from src.stages.transcription_stage import TranscriptionStageProcessor
+
+        self.model = SimpleNamespace(transcribe=lambda *args, **kwargs: pytest.fail("single model used"))
+        self.engine = FakeParallelEngine()
+        monkeypatch.setattr(torch.cuda, "is_available", lambda: False)
+        monkeypatch.setattr(model_server, "get_model_server_client", lambda: object())
+        monkeypatch.setattr(model_server, "RemoteWhisperModel", lambda client, name: self.model)
+        monkeypatch.setattr(TranscriptionStageProcessor, "_parallel_engine", lambda processor: self.engine)
+        return TranscriptionStageProcessor(
+            output_dir=str(self.temp_dir),
+            config={'transcription': dict({'supported_languages': ['en']}, **transcription)}
+        )
+
+    @pytest.mark.asyncio
+    async def test_parallel_flag_uses_process_pool(self, monkeypatch):
+        """Test that transcription.parallel routes CPU transcription through transcribe_parallel"""
+        processor = self.make_processor(monkeypatch, parallel=True, parallel_chunk_seconds=120.0)
+
+        result = await processor.process(SimpleNamespace(episode_id="ep-1"), str(self.audio_path))
+
+        assert self.engine.calls == [{'language': None, 'chunk_seconds': 120.0, 'max_workers': None}]
+        assert result['text'] == "Hello there."
+        assert [w['word'] for w in result['words']] == [" Hello", " there."]
+        assert result['segments'][0]['avg_logprob'] == -0.2
+        assert Path(result['words_path']).exists()
+
+    @pytest.mark.asyncio
+    async def test_translation_uses_single_model(self, monkeypatch):
+        """Test that translation, which the pool does not support, stays on the single model"""
+        processor = self.make_processor(monkeypatch, parallel=True, translate_to_english=True)
+        self.model.transcribe = lambda *args, **kwargs: {
+            'text': "Hi.", 'language': 'en', 'segments': [{'id': 0, 'start': 0.0, 'end': 0.5, 'text': "Hi."}]
+        }
+
+        result = await processor.process(SimpleNamespace(episode_id="ep-1"), str(self.audio_path))
+
+        assert self.engine.calls == []
+        assert result['task_performed'] == 'translate'
@@ -0,0 +1,224 @@
+"""
+Tests for speaker attribution in the sentence alignment engine
+
+Checks the interval-index attribution against the original per-sentence
+scan over every diarization segment (kept here as a reference) and
+benchmarks the two on a 3-hour panel show.
+
+The benchmark is skipped unless selected with:
+    pytest -m benchmark tests/test_sentence_alignment.py
+Its timings are written to output/benchmarks/speaker-attribution.json, or
+to ALIGN_BENCH_OUTPUT when set.
+"""
+
+import copy
+import json
+import os
+import random
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.core.sentence_alignment import SentenceAlignmentEngine, SpeakerIndex, Sentence
+
+
+# ---------------------------------------------------------------------------
+# Reference: the original O(sentences x segments) attribution
+# ---------------------------------------------------------------------------
+
+def reference_attach_speakers(sentences, diarization):
+    """Speaker labels as assigned by the original scan-based implementation"""
+    segments = [s for s in diarization['segments']
+                if all(k in s for k in ['start', 'end', 'speaker']) and not (s['start'] >= s['end'] or s['start'] < 0)]
+    segments.sort(key=lambda x: x['start'])
+
+    for sentence in sentences:
+        sentence.speaker = _reference_find_speaker(sentence, segments)
+
+    for i, sentence in enumerate(sentences):
+        if sentence.speaker is None:
+            speaker = _reference_infer_from_context(sentences, i)
+            if speaker:
+                sentence.speaker = speaker
+    return [s.speaker for s in sentences]
+
+
+def _reference_find_speaker(sentence, segments):
+    start_s = sentence.start_ms / 1000.0
+    end_s = sentence.end_ms / 1000.0
+    duration = end_s - start_s
+    if duration <= 0:
+        return None
+
+    overlaps = []
+    for segment in segments:
+        overlap = max(0, min(end_s, segment['end']) - max(start_s, segment['start']))
+        if overlap > 0:
+            ratio = overlap / duration
+            segment_ratio = overlap / (segment['end'] - segment['start'])
+            overlaps.append({'speaker': segment['speaker'], 'overlap_duration': overlap,
+                             'sentence_overlap_ratio': ratio,
+                             'weighted_score': ratio * 0.7 + segment_ratio * 0.3})
+
+    if not overlaps:
+        center = (start_s + end_s) / 2
+        nearest, min_distance = None, float('inf')
+        for segment in segments:
+            distance = abs(center - (segment['start'] + segment['end']) / 2)
+            if distance < min_distance:
+                nearest, min_distance = segment['speaker'], distance
+        return nearest if min_distance <= 5.0 else None
+
+    overlaps.sort(key=lambda x: x['weighted_score'], reverse=True)
+    best = overlaps[0]
+    if best['sentence_overlap_ratio'] >= 0.5:
+        return best['speaker']
+    if best['sentence_overlap_ratio'] >= 0.3 and best['weighted_score'] >= 0.4:
+        return best['speaker']
+    if len(overlaps) == 1 and best['sentence_overlap_ratio'] >= 0.1:
+        return best['speaker']
+    if len(overlaps) > 1:
+        return max(overlaps, key=lambda x: x['overlap_duration'])['speaker']
+    return None
+
+
+def _reference_infer_from_context(sentences, index):
+    if index > 0 and sentences[index - 1].speaker:
+        if sentences[index].start_ms - sentences[index - 1].end_ms < 3000:
+            return sentences[index - 1].speaker
+    if index < len(sentences) - 1 and sentences[index + 1].speaker:
+        if sentences[index + 1].start_ms - sentences[index].end_ms < 3000:
+            return sentences[index + 1].speaker
+
+    nearby = {}
+    for other in sentences:
+        if other.speaker and abs(other.start_ms - sentences[index].start_ms) < 10000:
+            nearby[other.speaker] = nearby.get(other.speaker, 0) + 1
+    return max(nearby, key=nearby.get) if nearby else None
+
+
+# ---------------------------------------------------------------------------
+# Synthetic shows
+# ---------------------------------------------------------------------------
+
+def synthetic_show(duration_s, speakers=4, seed=0, round_to=None):
+    """Sentences and diarization for a panel show with overlaps, gaps and silences"""
+    rng = random.Random(seed)
+
+    segments = []
+    t = 0.0
+    while t < duration_s:
+        length = rng.uniform(0.5, 12.0)
+        start = t - rng.uniform(0, 1.5) if rng.random() < 0.2 else t
+        segments.append({'start': max(0.0, start), 'end': start + length, 'speaker': f"SPEAKER_{rng.randrange(speakers):02d}"})
+        t = start + length + (rng.uniform(5, 20) if rng.random() < 0.03 else rng.uniform(0, 0.8))
+    if round_to is not None:
+        for segment in segments:
+            segment['start'] = round(segment['start'], round_to)
+            segment['end'] = round(segment['end'], round_to) + 10 ** -round_to
+    # Invalid and unsorted segments the validator has to drop or order
+    segments.append({'start': 5.0, 'end': 5.0, 'speaker': 'SPEAKER_99'})
+    segments.append({'start': 1.0, 'end': 2.0})
+    rng.shuffle(segments)
+
+    sentences = []
+    t = 0
+    while t < duration_s * 1000:
+        length = rng.choice([0, rng.randint(300, 1500), rng.randint(1500, 9000)])
+        sentences.append(Sentence(text=f"Sentence {len(sentences)}.", start_ms=t, end_ms=t + length, words=[]))
+        t += length + (rng.randint(6000, 25000) if rng.random() < 0.02 else rng.randint(0, 700))
+
+    return sentences, {'segments': segments}
+
+
+class TestSpeakerIndex:
+    """Test interval and nearest-segment lookups"""
+
+    def setup_method(self):
+        segments = [
+            {'start': 0.0, 'end': 10.0, 'speaker': 'A'},
+            {'start': 2.0, 'end': 3.0, 'speaker': 'B'},
+            {'start': 12.0, 'end': 14.0, 'speaker': 'C'},
+            {'start': 16.0, 'end': 18.0, 'speaker': 'A'},
+        ]
+        self.index = SpeakerIndex(segments)
+
+    def test_candidate_ranges_cover_overlaps(self):
+        """Test that the candidate slice contains every overlapping segment"""
+        lo, hi = self.index.candidate_ranges(np.array([4.0, 10.0, 11.0, 14.0, 20.0]),
+                                             np.array([5.0, 12.5, 11.5, 16.0, 21.0]))
+
+        assert list(zip(lo.tolist(), hi.tolist())) == [(0, 2), (2, 3), (2, 2), (3, 3), (4, 4)]
+        assert self.index.labels == ['A', 'B', 'C']
+        assert self.index.speaker(3) == 'A'
+
+    def test_nearest_prefers_earliest_segment_on_ties(self):
+        """Test nearest centre lookup and tie-breaking"""
+        assert self.index.nearest(15.0) == (2, 2.0)
+        assert self.index.nearest(2.5) == (1, 0.0)
+        assert self.index.nearest(100.0) == (3, 83.0)
+        assert SpeakerIndex([]).nearest(1.0) == (None, float('inf'))
+
+
+class TestSpeakerAttribution:
+    """Test that indexed attribution matches the original scan"""
+
+    @pytest.mark.parametrize("seed,round_to", [(0, None), (1, None), (2, 1), (3, 0), (4, 2)])
+    def test_identical_labels(self, seed, round_to):
+        """Test identical labels on shows with overlaps, gaps and tied boundaries"""
+        sentences, diarization = synthetic_show(1800, seed=seed, round_to=round_to)
+        expected = reference_attach_speakers(copy.deepcopy(sentences), diarization)
+
+        attached = SentenceAlignmentEngine().attach_speakers(sentences, diarization)
+
+        assert [s.speaker for s in attached] == expected
+        assert len(set(expected)) > 2
+
+    def test_context_fallback_on_unsorted_sentences(self):
+        """Test the full nearby scan when sentences are not in start order"""
+        sentences, diarization = synthetic_show(600, seed=5)
+        random.Random(5).shuffle(sentences)
+        expected = reference_attach_speakers(copy.deepcopy(sentences), diarization)
+
+        assert [s.speaker for s in SentenceAlignmentEngine().attach_speakers(sentences, diarization)] == expected
+
+    def test_identical_labels_on_long_show(self):
+        """Test identical labels on a 3-hour panel show"""
+        sentences, diarization = synthetic_show(3 * 3600, speakers=6, seed=7)
+        expected = reference_attach_speakers(copy.deepcopy(sentences), diarization)
+
+        assert [s.speaker for s in SentenceAlignmentEngine().attach_speakers(sentences, diarization)] == expected
+
+
+@pytest.mark.benchmark
+@pytest.mark.slow
+def test_benchmark_speaker_attribution(request):
+    """Time indexed attribution against the original scan on a 3-hour panel show"""
+    if "benchmark" not in (request.config.getoption("markexpr") or ""):
+        pytest.skip("benchmarks run with -m benchmark")
+
+    sentences, diarization = synthetic_show(3 * 3600, speakers=6, seed=7)
+    engine = SentenceAlignmentEngine()
+
+    started = time.perf_counter()
+    reference_attach_speakers(copy.deepcopy(sentences), diarization)
+    reference_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    engine.attach_speakers(sentences, diarization)
+    indexed_s = time.perf_counter() - started
+
+    output = Path(os.getenv("ALIGN_BENCH_OUTPUT",
+                            Path(__file__).parent.parent / "output" / "benchmarks" / "speaker-attribution.json"))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        'sentences': len(sentences),
+        'segments': len(diarization['segments']),
+        'scan_ms': round(reference_s * 1000, 3),
+        'indexed_ms': round(indexed_s * 1000, 3),
+        'speedup': round(reference_s / indexed_s, 1)
+    }, indent=2))
+
+    assert indexed_s * 10 < reference_s
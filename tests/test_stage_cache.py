@@ -0,0 +1,195 @@
+"""
+Tests for the content-addressed stage result cache
+
+Tests cache storage, LRU eviction and orchestrator short-circuiting.
+"""
+
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.core.stage_cache import StageCache
+from src.core.models import (
+    EpisodeObject, ProcessingStage, SourceInfo, MediaInfo, EpisodeMetadata
+)
+
+
+class TestStageCache:
+    """Test cache entries and eviction"""
+
+    def setup_method(self):
+        """Setup cache directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.cache = StageCache(self.temp_dir / "cache", max_size_bytes=10_000)
+        self.output = self.temp_dir / "out" / "audio.wav"
+        self.output.parent.mkdir(parents=True)
+
+    def teardown_method(self):
+        """Cleanup cache directory"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_key_depends_on_every_component(self):
+        """Test that input, stage, config and code version all change the key"""
+        base = StageCache.compute_key("input", "prepped", "config", "1")
+
+        assert StageCache.compute_key("input", "prepped", "config", "1") == base
+        assert len({
+            base,
+            StageCache.compute_key("other", "prepped", "config", "1"),
+            StageCache.compute_key("input", "transcribed", "config", "1"),
+            StageCache.compute_key("input", "prepped", "changed", "1"),
+            StageCache.compute_key("input", "prepped", "config", "2")
+        }) == 5
+
+    def test_hit_restores_output_files(self):
+        """Test that a hit returns the result and copies outputs back"""
+        self.output.write_bytes(b"pcm" * 100)
+        result = {'success': True, 'audio_path': str(self.output)}
+
+        assert self.cache.put("prepped", "k1", result, [str(self.output)], duration_seconds=12.0)
+        self.output.unlink()
+
+        assert self.cache.get("prepped", "k1") == result
+        assert self.output.read_bytes() == b"pcm" * 100
+
+        metrics = self.cache.get_stats()['stages']['prepped']
+        assert (metrics['hits'], metrics['stores'], metrics['saved_seconds']) == (1, 1, 12.0)
+
+    def test_miss_is_counted(self):
+        """Test that lookups of unknown keys are misses"""
+        assert self.cache.get("prepped", "missing") is None
+        assert self.cache.get_stats()['stages']['prepped']['misses'] == 1
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """Test that the cache stays within its size bound"""
+        for key in ("a", "b", "c"):
+            path = self.temp_dir / f"{key}.bin"
+            path.write_bytes(b"x" * 4000)
+            self.cache.put("transcribed", key, {'success': True}, [str(path)])
+            if key == "b":
+                self.cache.get("transcribed", "a")  # refresh a so b is least recently used
+
+        stats = self.cache.get_stats()
+        assert stats['size_bytes'] <= 10_000
+        assert self.cache.get("transcribed", "b") is None
+        assert self.cache.get("transcribed", "a") is not None
+        assert self.cache.get("transcribed", "c") is not None
+        assert stats['stages']['transcribed']['evictions'] == 1
+
+    def test_results_are_shared_across_instances(self):
+        """Test that another process opening the directory sees stored entries"""
+        self.cache.put("rendered", "k1", {'success': True, 'html_path': None}, [])
+
+        other = StageCache(self.temp_dir / "cache", max_size_bytes=10_000)
+
+        assert other.get("rendered", "k1") == {'success': True, 'html_path': None}
+
+
+class TestOrchestratorStageCache:
+    """Test stage short-circuiting in the orchestrator"""
+
+    def setup_method(self):
+        """Setup orchestrator with a cached fake prep stage"""
+        from src.core.pipeline import PipelineOrchestrator
+        from src.core.config import PipelineConfig
+        from src.core.database import DatabaseManager, DatabaseConfig
+        from src.core.registry import EpisodeRegistry
+
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+        config = PipelineConfig()
+        config.database.path = str(self.temp_dir / "pipeline.db")
+        config.database.backup_enabled = False
+        config.clip_generation.enabled = False
+        config.stage_cache.enabled = True
+        config.stage_cache.directory = str(self.temp_dir / "cache")
+        self.orchestrator = PipelineOrchestrator(config=config)
+
+        self.db_manager = DatabaseManager(DatabaseConfig(path=config.database.path, backup_enabled=False))
+        self.db_manager.initialize()
+        EpisodeRegistry(self.db_manager).register_episode(EpisodeObject(
+            episode_id="ep-1",
+            content_hash="a" * 64,
+            source=SourceInfo(path="/test/ep-1.mp4", file_size=1000, last_modified=datetime.now()),
+            media=MediaInfo(duration_seconds=60.0),
+            metadata=EpisodeMetadata(show_name="Test Show", show_slug="test-show")
+        ))
+
+        self.audio_path = self.temp_dir / "audio" / "ep-1.wav"
+        self.prep_runs = 0
+
+        async def fake_prep(episode_id):
+            self.prep_runs += 1
+            self.audio_path.parent.mkdir(parents=True, exist_ok=True)
+            self.audio_path.write_bytes(b"wav")
+            return {'success': True, 'audio_path': str(self.audio_path)}
+
+        self.orchestrator._stage_processors[ProcessingStage.PREPPED] = fake_prep
+
+    def teardown_method(self):
+        """Cleanup"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @pytest.mark.asyncio
+    async def test_rerun_reuses_cached_stage(self):
+        """Test that a rerun restores the cached output instead of running the stage"""
+        first = await self.orchestrator.process_episode("ep-1", ProcessingStage.PREPPED)
+        self.audio_path.unlink()
+        second = await self.orchestrator._process_stage("ep-1", ProcessingStage.PREPPED)
+
+        assert first.success and second.success
+        assert self.prep_runs == 1
+        assert self.audio_path.read_bytes() == b"wav"
+
+        stats = self.orchestrator.get_stage_cache_stats()['stages']['prepped']
+        assert (stats['hits'], stats['misses']) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_force_reprocess_reuses_cache(self):
+        """Test that a forced rerun restores cached outputs instead of recomputing them"""
+        await self.orchestrator.process_episode("ep-1", ProcessingStage.PREPPED)
+        self.audio_path.unlink()
+        result = await self.orchestrator.process_episode("ep-1", ProcessingStage.PREPPED, force_reprocess=True)
+
+        assert result.success
+        assert self.prep_runs == 1
+        assert self.audio_path.read_bytes() == b"wav"
+
+    @pytest.mark.asyncio
+    async def test_bypass_cache_reruns_stage(self):
+        """Test that bypass_cache runs the stage again and stores the fresh result"""
+        await self.orchestrator.process_episode("ep-1", ProcessingStage.PREPPED)
+        result = await self.orchestrator.process_episode("ep-1", ProcessingStage.PREPPED,
+                                                         force_reprocess=True, bypass_cache=True)
+
+        assert result.success
+        assert self.prep_runs == 2
+        stats = self.orchestrator.get_stage_cache_stats()['stages']['prepped']
+        assert (stats['hits'], stats['misses']) == (0, 1)
+
+        self.audio_path.unlink()
+        await self.orchestrator._process_stage("ep-1", ProcessingStage.PREPPED)
+        assert self.prep_runs == 2
+        assert self.audio_path.read_bytes() == b"wav"
+
+    @pytest.mark.asyncio
+    async def test_config_change_invalidates_cache(self):
+        """Test that changing a stage's config misses the cache"""
+        await self.orchestrator.process_episode("ep-1", ProcessingStage.PREPPED)
+        self.orchestrator.config.transcription.streaming = True
+        await self.orchestrator._process_stage("ep-1", ProcessingStage.PREPPED)
+
+        assert self.prep_runs == 2
+
+    def test_downstream_keys_chain_upstream_config(self):
+        """Test that upstream config changes invalidate later stages"""
+        before = self.orchestrator._stage_cache_key("ep-1", ProcessingStage.RENDERED)
+        self.orchestrator.config.models.whisper = "small"
+        after = self.orchestrator._stage_cache_key("ep-1", ProcessingStage.RENDERED)
+
+        assert before != after
+        assert self.orchestrator._stage_cache_key("ep-1", ProcessingStage.DISCOVERED) is None
@@ -0,0 +1,166 @@
+"""
+Tests for stage-level resource scheduling
+
+Tests per-resource-class pools and pipelined batch processing.
+"""
+
+import asyncio
+import pytest
+
+from src.core.stage_scheduler import (
+    StageScheduler, ResourcePool, ResourceClass, STAGE_RESOURCE_CLASSES,
+    get_current_scheduler, set_current_scheduler, reset_current_scheduler
+)
+from src.core.models import ProcessingStage
+
+
+class TestResourcePool:
+    """Test single resource pool behaviour"""
+
+    def test_rejects_zero_capacity(self):
+        """Test that pools need at least one slot"""
+        with pytest.raises(ValueError):
+            ResourcePool(ResourceClass.LLM, 0)
+
+    @pytest.mark.asyncio
+    async def test_capacity_is_enforced(self):
+        """Test that no more than capacity tasks run at once"""
+        pool = ResourcePool(ResourceClass.FFMPEG, 2)
+        peak = 0
+
+        async def work():
+            nonlocal peak
+            async with pool.acquire():
+                peak = max(peak, pool.active)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(work() for _ in range(6)))
+
+        stats = pool.get_stats()
+        assert peak == 2
+        assert stats['completed'] == 6
+        assert stats['active'] == 0
+        assert stats['queue_depth'] == 0
+        assert stats['peak_queue_depth'] >= 4
+        assert 0.0 < stats['utilisation'] <= 1.0
+
+    @pytest.mark.asyncio
+    async def test_failures_are_counted_and_release_slot(self):
+        """Test that a failing task releases its slot"""
+        pool = ResourcePool(ResourceClass.LLM, 1)
+
+        with pytest.raises(RuntimeError):
+            async with pool.acquire():
+                raise RuntimeError("boom")
+
+        async with pool.acquire():
+            pass
+
+        stats = pool.get_stats()
+        assert stats['failed'] == 1
+        assert stats['completed'] == 1
+
+
+class TestStageScheduler:
+    """Test stage to pool routing"""
+
+    def test_every_stage_has_a_resource_class(self):
+        """Test that all stages are mapped"""
+        for stage in ProcessingStage:
+            assert stage in STAGE_RESOURCE_CLASSES
+
+    def test_pool_size_overrides(self):
+        """Test that configured sizes override defaults"""
+        scheduler = StageScheduler({'transcription': 3})
+        stats = scheduler.get_pool_stats()
+
+        assert stats['transcription']['capacity'] == 3
+        assert set(stats) == {rc.value for rc in ResourceClass}
+
+    @pytest.mark.asyncio
+    async def test_stages_on_different_pools_overlap(self):
+        """Test that a busy transcription pool does not block prep"""
+        scheduler = StageScheduler({'transcription': 1, 'ffmpeg': 1})
+        transcription_started = asyncio.Event()
+        release_transcription = asyncio.Event()
+        prep_done = asyncio.Event()
+
+        async def transcribe():
+            async with scheduler.slot(ProcessingStage.TRANSCRIBED):
+                transcription_started.set()
+                await release_transcription.wait()
+
+        async def prep():
+            await transcription_started.wait()
+            async with scheduler.slot(ProcessingStage.PREPPED) as resource_class:
+                assert resource_class == ResourceClass.FFMPEG
+                prep_done.set()
+
+        transcribe_task = asyncio.create_task(transcribe())
+        prep_task = asyncio.create_task(prep())
+
+        await asyncio.wait_for(prep_done.wait(), timeout=1.0)
+        assert scheduler.get_pool_stats()['transcription']['active'] == 1
+
+        release_transcription.set()
+        await asyncio.gather(transcribe_task, prep_task)
+
+    @pytest.mark.asyncio
+    async def test_current_scheduler_is_task_scoped(self):
+        """Test that the context variable is inherited by child tasks only"""
+        scheduler = StageScheduler()
+        assert get_current_scheduler() is None
+
+        token = set_current_scheduler(scheduler)
+        try:
+            seen = await asyncio.create_task(asyncio.sleep(0, result=get_current_scheduler()))
+            assert seen is scheduler
+        finally:
+            reset_current_scheduler(token)
+
+        assert get_current_scheduler() is None
+
+
+class TestPipelinedBatch:
+    """Test process_batch with per-stage scheduling"""
+
+    @pytest.mark.asyncio
+    async def test_batch_reports_pool_stats(self, tmp_path):
+        """Test that batch stats include per-pool metrics"""
+        from src.core.pipeline import PipelineOrchestrator
+        from src.core.config import PipelineConfig
+
+        config = PipelineConfig()
+        config.database.path = str(tmp_path / "pipeline.db")
+        config.database.backup_enabled = False
+        config.logging.directory = str(tmp_path / "logs")
+        config.staging.path = str(tmp_path / "staging")
+        config.stage_cache.directory = str(tmp_path / "cache")
+        config.processing.stage_pool_sizes = {'transcription': 1, 'ffmpeg': 2, 'llm': 1, 'disk_io': 2}
+        orchestrator = PipelineOrchestrator(config=config)
+
+        async def fake_stage(episode_id):
+            await asyncio.sleep(0.005)
+
+        async def fake_get_stage(episode_id):
+            return ProcessingStage.DISCOVERED
+
+        async def fake_update_stage(episode_id, stage):
+            return None
+
+        orchestrator._stage_processors = {stage: fake_stage for stage in ProcessingStage}
+        orchestrator._get_episode_stage = fake_get_stage
+        orchestrator._update_episode_stage = fake_update_stage
+
+        stats = await orchestrator.process_batch(
+            [f"ep-{i}" for i in range(4)],
+            target_stage=ProcessingStage.ENRICHED,
+            include_clip_discovery=False
+        )
+
+        assert stats.processed == 4
+        assert stats.failed == 0
+        assert stats.resource_pools['transcription']['completed'] == 4
+        assert stats.resource_pools['ffmpeg']['completed'] == 4
+        assert stats.resource_pools['llm']['completed'] == 4
+        assert orchestrator.get_processing_stats().resource_pools['llm']['capacity'] == 1
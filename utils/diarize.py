@@ -10,28 +10,19 @@ import sys
 import os
 from pathlib import Path
 
-def diarize_audio(audio_path, output_path=None, hf_token=None, num_speakers=None, device='cuda', merge_gap=2.0):
+def load_diarization_pipeline(hf_token=None, device='cuda'):
     """
-    Diarize audio file and return speaker segments
-    
-    Args:
-        audio_path: Path to audio/video file
-        output_path: Path to save JSON output (optional)
-        hf_token: Hugging Face API token
-        num_speakers: Expected number of speakers (optional, helps accuracy)
-        device: 'cuda' or 'cpu'
-        merge_gap: Maximum gap to merge adjacent segments from same speaker
+    Load the pyannote diarization pipeline
     
     Returns:
-        dict: Segments with speaker labels and timestamps
+        tuple: (pipeline, device actually used)
+    
+    Raises:
+        ImportError: If pyannote.audio or torch is missing
+        RuntimeError: If the pipeline cannot be loaded
     """
-    try:
-        from pyannote.audio import Pipeline
-        import torch
-    except ImportError as e:
-        print(f"ERROR: Missing dependencies: {e}", file=sys.stderr)
-        print("Run: pip install pyannote.audio torch", file=sys.stderr)
-        sys.exit(1)
+    from pyannote.audio import Pipeline
+    import torch
     
     # Check device availability
     if device == 'cuda' and not torch.cuda.is_available():
@@ -50,20 +41,26 @@ def diarize_audio(audio_path, output_path=None, hf_token=None, num_speakers=None
             pipeline = pipeline.to(torch.device("cuda"))
         
     except Exception as e:
-        print(f"ERROR: Failed to load pyannote pipeline: {e}", file=sys.stderr)
-        print("Make sure you have accepted the model terms at:", file=sys.stderr)
-        print("https://huggingface.co/pyannote/speaker-diarization", file=sys.stderr)
-        sys.exit(1)
+        raise RuntimeError(
+            f"Failed to load pyannote pipeline: {e}. Make sure you have accepted the model terms at "
+            "https://huggingface.co/pyannote/speaker-diarization"
+        )
+    
+    return pipeline, device
+
+
+def diarize_with_pipeline(pipeline, audio_path, num_speakers=None, device='cuda', merge_gap=2.0, output_path=None):
+    """
+    Diarize audio file with an already loaded pipeline
     
+    Used directly by the model server, which keeps the pipeline warm
+    between episodes. Arguments and result match diarize_audio.
+    """
     # Run diarization
-    try:
-        if num_speakers:
-            diarization = pipeline(audio_path, num_speakers=num_speakers)
-        else:
-            diarization = pipeline(audio_path)
-    except Exception as e:
-        print(f"ERROR: Diarization failed: {e}", file=sys.stderr)
-        sys.exit(1)
+    if num_speakers:
+        diarization = pipeline(audio_path, num_speakers=num_speakers)
+    else:
+        diarization = pipeline(audio_path)
     
     # Convert to JSON-serializable format
     segments = []
@@ -98,6 +95,38 @@ def diarize_audio(audio_path, output_path=None, hf_token=None, num_speakers=None
     return result
 
 
+def diarize_audio(audio_path, output_path=None, hf_token=None, num_speakers=None, device='cuda', merge_gap=2.0):
+    """
+    Diarize audio file and return speaker segments
+    
+    Args:
+        audio_path: Path to audio/video file
+        output_path: Path to save JSON output (optional)
+        hf_token: Hugging Face API token
+        num_speakers: Expected number of speakers (optional, helps accuracy)
+        device: 'cuda' or 'cpu'
+        merge_gap: Maximum gap to merge adjacent segments from same speaker
+    
+    Returns:
+        dict: Segments with speaker labels and timestamps
+    """
+    try:
+        pipeline, device = load_diarization_pipeline(hf_token, device)
+    except ImportError as e:
+        print(f"ERROR: Missing dependencies: {e}", file=sys.stderr)
+        print("Run: pip install pyannote.audio torch", file=sys.stderr)
+        sys.exit(1)
+    except RuntimeError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    try:
+        return diarize_with_pipeline(pipeline, audio_path, num_speakers, device, merge_gap, output_path)
+    except Exception as e:
+        print(f"ERROR: Diarization failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
 def merge_adjacent_segments(segments, max_gap=2.0):
     """Merge segments from same speaker if gap < max_gap seconds with optimization"""
     if not segments: